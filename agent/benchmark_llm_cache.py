@@ -0,0 +1,109 @@
+"""Prompt-cache report — per-step LLM latency, cache use and cost by layout.
+
+Reads the LLM_CALLS records every LLM step writes to its audit entry and
+groups them by (step, layout). "prefix" is LLM_PROMPT_CACHE_LAYOUT=True
+(instructions in the cached system prefix, run data on stdin); "single" is
+the legacy one-blob prompt. Run a few pipelines with each setting, then
+compare: uncached input tokens and cost should drop in the prefix layout
+while cache-read tokens rise.
+
+Usage:
+    python -m agent.benchmark_llm_cache            # all runs
+    python -m agent.benchmark_llm_cache --last 20  # most recent 20 runs
+"""
+
+import json
+import statistics
+import sys
+
+from . import db
+
+LAST = int(sys.argv[sys.argv.index("--last") + 1]) if "--last" in sys.argv else None
+
+
+def _pct(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _llm_calls():
+    """(step, call record) for every recorded LLM call."""
+    conn = db.get_connection()
+    query = ("SELECT run_id, step, metadata FROM audit_log "
+             "WHERE metadata LIKE '%\"LLM_CALLS\"%'")
+    params = ()
+    if LAST:
+        query += " AND run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)"
+        params = (LAST,)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    calls = []
+    for row in rows:
+        try:
+            meta = json.loads(row["metadata"] or "{}")
+        except (json.JSONDecodeError, TypeError):
+            continue
+        for call in meta.get("LLM_CALLS") or []:
+            calls.append((row["step"], call))
+    return calls
+
+
+def main():
+    db.init_db()
+    calls = _llm_calls()
+
+    print()
+    print("  LLM Prompt-Cache Report")
+    print("  " + "─" * 96)
+    if not calls:
+        print("  No LLM_CALLS recorded yet — run the pipeline first.\n")
+        sys.exit(1)
+
+    groups = {}
+    for step, call in calls:
+        if call.get("status") != "success":
+            continue
+        groups.setdefault((step, call.get("layout", "single")), []).append(call)
+
+    print(f"  {'step':24s} {'layout':7s} {'n':>4s} {'hit%':>5s} {'median s':>9s} {'p90 s':>7s} "
+          f"{'uncached':>9s} {'cache rd':>9s} {'prefix':>7s} {'suffix':>7s} {'cost $':>8s}")
+    for (step, layout), group in sorted(groups.items()):
+        durations = [c["duration_s"] for c in group]
+        with_usage = [c for c in group if "input_tokens" in c]
+        hit_rate = (sum(1 for c in with_usage if c.get("cache_hit")) / len(with_usage) * 100) if with_usage else 0
+        uncached = statistics.median(c["input_tokens"] for c in with_usage) if with_usage else 0
+        cache_read = statistics.median(c["cache_read_tokens"] for c in with_usage) if with_usage else 0
+        costs = [c["cost_usd"] for c in with_usage if c.get("cost_usd") is not None]
+        print(f"  {step:24s} {layout:7s} {len(group):4d} {hit_rate:5.0f} "
+              f"{statistics.median(durations):9.1f} {_pct(durations, 90):7.1f} "
+              f"{uncached:9,.0f} {cache_read:9,.0f} "
+              f"{statistics.median(c.get('prefix_tokens', 0) for c in group):7,.0f} "
+              f"{statistics.median(c.get('suffix_tokens', 0) for c in group):7,.0f} "
+              f"{(statistics.mean(costs) if costs else 0):8.4f}")
+
+    # ── Verdict: per-step savings where both layouts have data ───────
+    print()
+    steps = sorted({step for step, _ in groups})
+    compared = False
+    for step in steps:
+        prefix, single = groups.get((step, "prefix")), groups.get((step, "single"))
+        if not prefix or not single:
+            continue
+        compared = True
+        d_prefix = statistics.median(c["duration_s"] for c in prefix)
+        d_single = statistics.median(c["duration_s"] for c in single)
+        c_prefix = [c["cost_usd"] for c in prefix if c.get("cost_usd") is not None]
+        c_single = [c["cost_usd"] for c in single if c.get("cost_usd") is not None]
+        line = f"  {step}: median {d_single:.1f}s → {d_prefix:.1f}s ({d_single - d_prefix:+.1f}s saved)"
+        if c_prefix and c_single:
+            line += f", cost ${statistics.mean(c_single):.4f} → ${statistics.mean(c_prefix):.4f}"
+        print(line)
+    if not compared:
+        print("  Only one layout recorded so far — run with LLM_PROMPT_CACHE_LAYOUT toggled to compare.")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark s12 report assembly — "template" vs "llm" mode.
+
+Reads s12_assemble durations from the audit log, grouped by assembly mode
+(entries written before REPORT_ASSEMBLY_MODE existed were all "llm") and
+including s13_publish when publishing was deferred, then times the local
+template assembler against the sections stored on completed runs. With --publish, also publishes one template report to Notion to measure
+the end-to-end template path against the live API.
+
+Usage:
+    python -m agent.benchmark_s12              # audit-log stats + local assembly
+    python -m agent.benchmark_s12 --publish    # + one live Notion publish
+"""
+
+import json
+import statistics
+import sys
+import time
+
+from . import db
+from .config import NOTION_PARENT_PAGE_ID
+from .report import assemble_report
+
+PUBLISH = "--publish" in sys.argv
+ASSEMBLY_ITERATIONS = 200
+
+
+def _pct(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _audit_durations():
+    """s12_assemble durations from the audit log, keyed by assembly mode."""
+    conn = db.get_connection()
+    rows = conn.execute(
+        "SELECT run_id, duration_seconds, metadata FROM audit_log "
+        "WHERE step = 's12_assemble' AND status = 'success' AND duration_seconds IS NOT NULL"
+    ).fetchall()
+    # With PUBLISH_AFTER_VALIDATION the Notion publish runs in s13 — add it
+    # back so template and llm numbers both cover assemble + publish.
+    deferred = dict(conn.execute(
+        "SELECT run_id, duration_seconds FROM audit_log "
+        "WHERE step = 's13_publish' AND status = 'success' AND duration_seconds IS NOT NULL"
+    ).fetchall())
+    conn.close()
+
+    by_mode = {}
+    for row in rows:
+        try:
+            meta = json.loads(row["metadata"] or "{}")
+        except (json.JSONDecodeError, TypeError):
+            meta = {}
+        mode = (meta.get("ASSEMBLY") or {}).get("mode", "llm")
+        duration = row["duration_seconds"] + deferred.get(row["run_id"], 0)
+        by_mode.setdefault(mode, []).append(duration)
+    return by_mode
+
+
+def _completed_sections():
+    """Section inputs for every completed run that has them."""
+    conn = db.get_connection()
+    rows = conn.execute(
+        "SELECT id, featured_buyer_name, target_company, section_featured, "
+        "section_secondary, section_exec_summary, section_cta "
+        "FROM runs WHERE status = 'completed' AND section_featured IS NOT NULL"
+    ).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def _assemble(run):
+    return assemble_report(
+        run["featured_buyer_name"] or "", run["target_company"] or "",
+        section_featured=run["section_featured"] or "",
+        section_secondary=run["section_secondary"] or "",
+        section_exec_summary=run["section_exec_summary"] or "",
+        section_cta=run["section_cta"] or "",
+    )
+
+
+def _print_stats(label, values, unit="s"):
+    fmt = (lambda v: f"{v:.3f}{unit}") if unit == "ms" else (lambda v: f"{v:.1f}{unit}")
+    print(f"  {label:22s} n={len(values):<4d} median={fmt(statistics.median(values)):>10s}  "
+          f"p90={fmt(_pct(values, 90)):>10s}  max={fmt(max(values)):>10s}")
+
+
+def main():
+    db.init_db()
+
+    print()
+    print("  s12 Assembly Benchmark")
+    print("  " + "─" * 50)
+
+    # ── Audit log: recorded s12 latency per mode ─────────────────────
+    by_mode = _audit_durations()
+    if not by_mode:
+        print("  No s12_assemble entries in the audit log yet.")
+    for mode in sorted(by_mode):
+        _print_stats(f"s12 ({mode}) recorded", by_mode[mode])
+    print()
+
+    # ── Local template assembly ──────────────────────────────────────
+    runs = _completed_sections()
+    if not runs:
+        print("  No completed runs with stored sections — run the pipeline first.\n")
+        sys.exit(1)
+
+    timings_ms = []
+    for run in runs:
+        for _ in range(ASSEMBLY_ITERATIONS):
+            t0 = time.perf_counter()
+            _assemble(run)
+            timings_ms.append((time.perf_counter() - t0) * 1000)
+    _print_stats("template assemble", timings_ms, unit="ms")
+    print(f"  ({len(runs)} runs × {ASSEMBLY_ITERATIONS} iterations)")
+
+    # ── Optional: live template publish ──────────────────────────────
+    if PUBLISH:
+        if not NOTION_PARENT_PAGE_ID:
+            print("\n  ERROR: NOTION_PARENT_PAGE_ID not set — cannot publish\n")
+            sys.exit(1)
+        from .pipeline import _publish_report
+
+        run = runs[-1]
+        report = _assemble(run)
+        t0 = time.time()
+        url = _publish_report(run["featured_buyer_name"] or "", run["target_company"] or "", report)
+        publish_s = time.time() - t0
+        print(f"  template publish      {publish_s:.1f}s  run={run['id']}  {url}")
+        by_mode.setdefault("template (live)", []).append(publish_s)
+
+    # ── Verdict ──────────────────────────────────────────────────────
+    print()
+    llm_times = by_mode.get("llm")
+    template_times = by_mode.get("template") or by_mode.get("template (live)")
+    if llm_times and template_times:
+        saved = statistics.median(llm_times) - statistics.median(template_times)
+        print(f"  RESULT: template saves ~{saved:.1f}s per run at the median "
+              f"({statistics.median(llm_times):.1f}s → {statistics.median(template_times):.1f}s)")
+    elif llm_times:
+        print(f"  RESULT: llm median {statistics.median(llm_times):.1f}s vs local assembly "
+              f"{statistics.median(timings_ms):.3f}ms + one Notion call "
+              f"(run with --publish or a template-mode pipeline run to measure it)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Benchmark s4 buyer scoring — columnar engine vs the per-buyer loop it replaced.
+
+Generates a synthetic discovery result (signals spread over buyers, mixed date
+formats, numeric and free-text amounts, titles drawn from a procurement
+vocabulary), scores it with scoring.score_buyers and with the loop s4 used
+before, checks that every buyer gets the same score, and times both.
+
+Usage:
+    python -m agent.benchmark_s4                   # 100,000 signals
+    python -m agent.benchmark_s4 --signals 20000
+"""
+
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from .scoring import score_buyers
+
+SIGNALS = int(sys.argv[sys.argv.index("--signals") + 1]) if "--signals" in sys.argv else 100_000
+SIGNALS_PER_BUYER = 20
+ITERATIONS = 3
+
+_VOCAB = (
+    "school district cybersecurity software data database network cloud infrastructure "
+    "student safety transportation water utility modernization erp finance payroll records "
+    "management body camera police fire emergency board meeting approved budget renewal "
+    "contract rfp bid award vendor services procurement county city state agency upgrade"
+).split()
+_TYPES = ("RFP", "Contract", "Meeting", "Purchase", "Contract Expiration", "Grant", "")
+_BUYER_TYPES = ("SchoolDistrict", "City", "County", "StateAgency", "HigherEducation", "City, County")
+
+
+def _synthetic(n_signals, seed=7):
+    """(buyer_signals, keywords, target_types) shaped like s4's inputs."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    # Discovery pages overlap, so the same opportunity shows up more than once
+    pool = []
+    for _ in range(max(1, n_signals // 2)):
+        when = now - timedelta(days=rng.randint(-30, 900), seconds=rng.randint(0, 86400))
+        date = rng.choice((
+            when.isoformat().replace("+00:00", "Z"), when.isoformat(), when.strftime("%Y-%m-%d"),
+            when.strftime("%Y-%m-%dT%H:%M:%S"), "", "not a date",
+        ))
+        amount = rng.choice((
+            rng.randint(1_000, 5_000_000), rng.random() * 1e6,
+            f"${rng.randint(1, 900):,},{rng.randint(0, 999):03d}",
+            f"{rng.randint(1, 9)}.{rng.randint(0, 9)}M - {rng.randint(10, 20)}M", None, "TBD",
+        ))
+        pool.append({
+            "type": rng.choice(_TYPES),
+            "title": " ".join(rng.choices(_VOCAB, k=rng.randint(4, 12))).title(),
+            "summary": " ".join(rng.choices(_VOCAB, k=rng.randint(40, 160))),
+            "createdAt": date,
+            rng.choice(("amount", "value", "contractAmount")): amount,
+        })
+
+    buyer_signals = {}
+    n_buyers = max(1, n_signals // SIGNALS_PER_BUYER)
+    for _ in range(n_signals):
+        b = rng.randrange(n_buyers)
+        info = buyer_signals.setdefault(f"b{b}", {"name": f"Buyer {b}", "type": rng.choice(_BUYER_TYPES),
+                                                  "signals": []})
+        info["signals"].append(rng.choice(pool))
+    # primary_keywords words + ideal_buyer_profile words, as s4 builds kw_set
+    keywords = set(rng.sample(_VOCAB, 26)) | {"data", "ware", "base", "k-12"}
+    target_types = {"schooldistrict", "county"}
+    return buyer_signals, keywords, target_types
+
+
+def _loop_scores(buyer_signals, kw_set, target_types):
+    """s4's scoring before scoring.py — one buyer at a time, one signal at a time."""
+    scored = []
+    for bid, info in buyer_signals.items():
+        signals = info["signals"]
+        sig_count = len(signals)
+
+        recency = 0.0
+        for s in signals:
+            date_str = s.get("date") or s.get("createdAt") or s.get("created_at") or ""
+            if date_str:
+                try:
+                    dt = datetime.fromisoformat(str(date_str).replace("Z", "+00:00"))
+                    age_days = (datetime.now(dt.tzinfo) - dt).days if dt.tzinfo else (datetime.now() - dt).days
+                    recency = max(recency, max(0, 365 - age_days) / 365)
+                except (ValueError, TypeError):
+                    pass
+
+        urgency = 0.0
+        for s in signals:
+            stype = (s.get("type") or s.get("opportunityType") or "").lower()
+            if stype in ("rfp", "contract", "contract expiration"):
+                urgency = 1.0
+                break
+            title = (s.get("title") or s.get("summary") or "").lower()
+            if any(w in title for w in ["deadline", "expir", "due date", "rfp"]):
+                urgency = 1.0
+                break
+
+        max_dollar = 0.0
+        for s in signals:
+            amt = s.get("amount") or s.get("value") or s.get("contractAmount") or 0
+            if isinstance(amt, (int, float)):
+                max_dollar = max(max_dollar, float(amt))
+            elif isinstance(amt, str):
+                for n in re.findall(r'[\d]+(?:\.[\d]+)?', amt.replace(",", "")):
+                    try:
+                        max_dollar = max(max_dollar, float(n))
+                    except ValueError:
+                        pass
+
+        kw_hits = 0
+        for s in signals:
+            text = f"{s.get('title', '')} {s.get('summary', '')}".lower()
+            kw_hits += sum(1 for w in kw_set if w in text)
+
+        buyer_type_raw = (info["type"] or "").lower()
+        buyer_type_tokens = [t.strip().lower() for t in buyer_type_raw.split(",")]
+        type_match = 1.0 if any(t in target_types for t in buyer_type_tokens) else 0.0
+
+        scored.append({"buyerId": bid, "_sig": sig_count, "_rec": recency, "_urg": urgency,
+                       "_dol": max_dollar, "_kw": kw_hits, "_type": type_match})
+
+    max_sig = max((s["_sig"] for s in scored), default=1) or 1
+    max_dol = max((s["_dol"] for s in scored), default=1) or 1
+    max_kw = max((s["_kw"] for s in scored), default=1) or 1
+    return {
+        s["buyerId"]: round(
+            0.25 * s["_type"]
+            + 0.20 * (s["_sig"] / max_sig)
+            + 0.20 * s["_rec"]
+            + 0.15 * s["_urg"]
+            + 0.10 * (s["_dol"] / max_dol)
+            + 0.10 * (s["_kw"] / max_kw),
+            4,
+        )
+        for s in scored
+    }
+
+
+def _time(fn, *args):
+    timings, result = [], None
+    for _ in range(ITERATIONS):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings), result
+
+
+def main():
+    buyer_signals, keywords, target_types = _synthetic(SIGNALS)
+
+    print()
+    print("  s4 Scoring Benchmark")
+    print("  " + "─" * 50)
+    print(f"  {SIGNALS:,} signals, {len(buyer_signals):,} buyers, {len(keywords)} keywords "
+          f"(median of {ITERATIONS})")
+
+    loop_s, expected = _time(_loop_scores, buyer_signals, keywords, target_types)
+    columnar_s, scored = _time(score_buyers, buyer_signals, keywords, target_types)
+    print(f"  loop (before)         {loop_s * 1000:10.1f}ms")
+    print(f"  columnar              {columnar_s * 1000:10.1f}ms")
+
+    mismatches = [b["buyerId"] for b in scored if b["score"] != expected[b["buyerId"]]]
+    print()
+    if mismatches or len(scored) != len(expected):
+        print(f"  FAIL: {len(mismatches)} buyers scored differently (e.g. {mismatches[:5]})\n")
+        sys.exit(1)
+    print(f"  RESULT: identical scores for all {len(scored):,} buyers, "
+          f"{loop_s / columnar_s:.1f}x faster ({loop_s * 1000:.0f}ms → {columnar_s * 1000:.0f}ms)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
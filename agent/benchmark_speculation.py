@@ -0,0 +1,92 @@
+"""Speculative enrichment report — hit rate and time saved by ranking margin.
+
+Reads the SPECULATION record every run with SPECULATIVE_ENRICHMENT on writes
+to its "s6_speculation" audit entry: the frontrunner's margin over the
+runner-up when s6's calls started, whether the final pick agreed (hit), the
+seconds s6 no longer waited for (saved_s) and the call-seconds a miss threw
+away (wasted_s). The threshold table replays the recorded runs at each
+SPECULATION_MIN_MARGIN_PCT: a higher threshold skips the runs below it —
+fewer misses, but their hits are lost too. Runs are only recorded above the
+threshold they ran with, so lower it for a while to see what lies below.
+
+Usage:
+    python -m agent.benchmark_speculation            # all runs
+    python -m agent.benchmark_speculation --last 50  # most recent 50 runs
+"""
+
+import json
+import statistics
+import sys
+
+from . import db
+
+LAST = int(sys.argv[sys.argv.index("--last") + 1]) if "--last" in sys.argv else None
+THRESHOLDS = (0, 5, 10, 15, 20, 30, 40)
+
+
+def _outcomes():
+    """SPECULATION record of every run that speculated."""
+    conn = db.get_connection()
+    query = "SELECT run_id, metadata FROM audit_log WHERE step = 's6_speculation'"
+    params = ()
+    if LAST:
+        query += " AND run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)"
+        params = (LAST,)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    outcomes = []
+    for row in rows:
+        try:
+            spec = json.loads(row["metadata"] or "{}").get("SPECULATION")
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if spec and spec.get("margin") is not None:
+            outcomes.append(spec)
+    return outcomes
+
+
+def _row(label, group):
+    hits = [o for o in group if o["hit"]]
+    print(f"  {label:14s} {len(group):5d} {len(hits) / len(group) * 100:6.0f} "
+          f"{(statistics.mean(o['lead_s'] for o in group)):8.1f} "
+          f"{(statistics.mean(o['saved_s'] for o in hits) if hits else 0):9.1f} "
+          f"{sum(o['saved_s'] for o in group):9.1f} {sum(o['wasted_s'] for o in group):10.1f}")
+
+
+def main():
+    db.init_db()
+    outcomes = _outcomes()
+
+    print()
+    print("  Speculative Enrichment Report")
+    print("  " + "─" * 72)
+    if not outcomes:
+        print("  No s6_speculation entries yet — run with SPECULATIVE_ENRICHMENT on first.\n")
+        sys.exit(1)
+
+    header = (f"  {'':14s} {'runs':>5s} {'hit%':>6s} {'lead s':>8s} {'saved/hit':>9s} "
+              f"{'saved s':>9s} {'wasted s':>10s}")
+    print(f"  By margin at speculation (score × 100)\n{header}")
+    edges = THRESHOLDS + (float("inf"),)
+    for lo, hi in zip(edges, edges[1:]):
+        group = [o for o in outcomes if lo <= o["margin"] * 100 < hi]
+        if group:
+            _row(f"{lo}–{hi}" if hi != float("inf") else f"≥ {lo}", group)
+
+    print(f"\n  If SPECULATION_MIN_MARGIN_PCT were\n{header}")
+    for threshold in THRESHOLDS:
+        group = [o for o in outcomes if o["margin"] * 100 >= threshold]
+        if group:
+            _row(f"{threshold}", group)
+
+    hits = sum(1 for o in outcomes if o["hit"])
+    print()
+    print(f"  {len(outcomes)} runs speculated: {hits} hits ({hits / len(outcomes) * 100:.0f}%), "
+          f"{sum(o['saved_s'] for o in outcomes):.0f}s saved, "
+          f"{sum(o['wasted_s'] for o in outcomes):.0f} call-seconds wasted")
+    print()
+
+
+if __name__ == "__main__":
+    main()
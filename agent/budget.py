@@ -0,0 +1,143 @@
+"""Run deadline budget — one end-to-end deadline split across the remaining steps.
+
+A run with a deadline (RUN_DEADLINES per tier, or the request's deadline_s)
+carries a RunBudget on its RunContext. When a step starts, step() allots it
+a share of the time left:
+
+    share = time left × weight(step) / weight of the longest chain from the
+            step to the end of the run (itself included)
+
+with STEP_BUDGET_WEIGHTS as the nominal durations — so a step gets its
+proportion of what's left for its own critical path, and a step that
+overruns shrinks every share after it. allows(what) says whether the share
+still covers a BUDGET_DEGRADE minimum; when it doesn't, the step takes its
+degradation path (s6 skips buyer_chat, s10 uses template cards). clamp()
+caps the timeouts a step hands out — HTTP requests and buyer_chat polling
+(tools.py), CLI subprocesses (llm.resolve_profile) — at the run's time
+left, so no call outlives the deadline. Timeouts are not cut to the share
+itself: a step that needs longer than its share still finishes when the
+run can afford it, and the steps after it degrade instead.
+
+Every step's share and use is kept in a ledger, logged as audit step
+"budget" at the end of the run. Without a deadline nothing is clamped.
+"""
+
+import contextvars
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+
+from . import context
+from .context import cfg
+
+# Shortest timeout clamp() hands out, so an exhausted budget fails a call fast
+# instead of passing a zero/negative timeout
+MIN_TIMEOUT_S = 1
+
+_step = contextvars.ContextVar("budget_step", default=None)
+
+
+class RunBudget:
+    """The run's deadline and per-step ledger.
+
+    seconds: the end-to-end deadline, from started_at (the run's start).
+    tails: {step id: weight of the longest chain from that step to the end}.
+    source: where the deadline came from ("tier T1", "request", ...).
+    """
+
+    def __init__(self, seconds, started_at, tails, source):
+        self.seconds = seconds
+        self.started_at = started_at
+        self.deadline = started_at + seconds
+        self.tails = tails
+        self.source = source
+        self.ledger = {}
+
+    def left(self):
+        return self.deadline - time.time()
+
+    def allot(self, step_id):
+        """Open the step's ledger entry with its share of the time left."""
+        weight = cfg("STEP_BUDGET_WEIGHTS").get(step_id, 1)
+        left = max(0.0, self.left())
+        share = left * weight / max(self.tails.get(step_id, weight), weight)
+        entry = self.ledger[step_id] = {
+            "budget_s": round(share, 2),
+            "left_s": round(left, 2),
+            "deadline": time.time() + share,
+        }
+        return entry
+
+    def summary(self):
+        """Audit form of the ledger: {deadline_s, source, used_s, left_s, steps}."""
+        steps = {sid: {k: v for k, v in e.items() if k != "deadline"} for sid, e in self.ledger.items()}
+        return {
+            "deadline_s": self.seconds,
+            "source": self.source,
+            "used_s": round(time.time() - self.started_at, 2),
+            "left_s": round(self.left(), 2),
+            "over_budget": [sid for sid, e in steps.items() if e.get("used_s", 0) > e["budget_s"]],
+            "degraded": {sid: e["degraded"] for sid, e in steps.items() if e.get("degraded")},
+            "steps": steps,
+        }
+
+
+def current():
+    """The active run's RunBudget, or None when it has no deadline."""
+    ctx = context.current()
+    return ctx.budget if ctx else None
+
+
+@contextmanager
+def step(step_id):
+    """Allot step_id its share for the duration of the block and record its use."""
+    run = current()
+    if run is None:
+        yield None
+        return
+    entry = run.allot(step_id)
+    token = _step.set(entry)
+    started = time.time()
+    try:
+        yield entry
+    finally:
+        entry["used_s"] = round(time.time() - started, 2)
+        _step.reset(token)
+
+
+def bind(step_id, fn):
+    """fn (a registry step, sync or coroutine) wrapped to run under step(step_id)."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def run_async(state):
+            with step(step_id):
+                return await fn(state)
+        return run_async
+
+    @functools.wraps(fn)
+    def run(state):
+        with step(step_id):
+            return fn(state)
+    return run
+
+
+def clamp(seconds):
+    """`seconds` capped at the run's time left (≥ MIN_TIMEOUT_S); unchanged
+    without a deadline."""
+    run = current()
+    if run is None:
+        return seconds
+    return max(MIN_TIMEOUT_S, min(seconds, run.left()))
+
+
+def allows(what):
+    """True unless the running step's share has less than BUDGET_DEGRADE[what]
+    seconds left — in which case the degradation is recorded in its ledger entry."""
+    entry = _step.get()
+    if current() is None or entry is None:
+        return True
+    if entry["deadline"] - time.time() >= cfg("BUDGET_DEGRADE").get(what, 0):
+        return True
+    entry.setdefault("degraded", []).append(what)
+    return False
@@ -43,12 +43,78 @@ LLM_MODEL = os.environ.get("LLM_MODEL", "claude-opus-4-6")
 # Official CLI maximum is 64,000 tokens. We max it out to avoid truncation —
 # the s13 report shaper can produce long reports (3,000-8,000 tokens).
 # Note: this reduces the effective context window before auto-compaction.
+# Fallback only — each sub-agent's budget comes from LLM_PROFILES below.
 LLM_MAX_OUTPUT_TOKENS = 64000
 
-# Timeout for LLM sessions with MCP tool access (seconds).
-# Text-only LLM: 300s hardcoded in _call_llm(). With tools: same 300s default.
+# Timeout for LLM sessions with MCP tool access (seconds). Env-only: it seeds
+# the shape_and_publish_report entry in LLM_PROFILES below at import, so it is
+# not in CONFIG_METADATA — change that profile's timeout at runtime instead.
+# Text-only sub-agents use their own profile timeouts (300s default).
 LLM_TOOL_TIMEOUT = int(os.environ.get("LLM_TOOL_TIMEOUT", "300"))
 
+# Per-sub-agent LLM profiles — model, output budget (CLAUDE_CODE_MAX_OUTPUT_TOKENS)
+# and CLI timeout for each function in llm.py. An empty "model" inherits
+# LLM_MODEL, so switching LLM_MODEL still moves every sub-agent that hasn't been
+# pinned. Explicit per-call arguments win (s10 parallel mode passes
+# SECONDARY_CARD_TIMEOUT). Every call records its resolved profile in the
+# calling step's audit metadata under LLM_CALLS.
+#
+# Editable via PATCH /api/config with a partial dict, e.g.
+#   {"LLM_PROFILES": {"fact_check": {"model": "claude-haiku-4-5"}}}
+# Only the given fields of the given profiles change.
+#
+# Budgets are sized from observed outputs: s2 JSON ~1K tokens (~1K per vendor in
+# batch mode, up to STRATEGY_BATCH_SIZE vendors), s9 section 2-4K, s10 cards
+# ~1.5K, the full report (s12 llm mode, s13 fix) 3-8K, fact-check verdicts a
+# few hundred. max_tokens is capped at the CLI maximum (64,000).
+LLM_PROFILES = {
+    "search_strategy":          {"model": "", "max_tokens": 8000,  "timeout": 300},
+    "search_strategy_batch":    {"model": "", "max_tokens": 32000, "timeout": 300},
+    "featured_section":         {"model": "", "max_tokens": 16000, "timeout": 300},
+    "strategic_context":        {"model": "", "max_tokens": 2000,  "timeout": 120},
+    "secondary_cards":          {"model": "", "max_tokens": 8000,  "timeout": 300},
+    "shape_and_publish_report": {"model": "", "max_tokens": 64000, "timeout": LLM_TOOL_TIMEOUT},
+    "fact_check":               {"model": "", "max_tokens": 4000,  "timeout": 300},
+    "fix_report":               {"model": "", "max_tokens": 32000, "timeout": 300},
+    "ask":                      {"model": "", "max_tokens": 8000,  "timeout": 300},
+}
+LLM_PROFILE_FIELDS = {"model": str, "max_tokens": int, "timeout": int}
+
+# Prompt layout for provider-side prompt caching. True sends each sub-agent's
+# instructions (role, output format, valid enums) via --append-system-prompt,
+# so they become part of the cached system prefix, and only per-run data on
+# stdin. Instructions are then read from cache on repeat calls (every run's
+# s2/s9/s13, each card in s10 parallel mode) instead of re-processed. False
+# restores the single "instructions --- data" blob on stdin, for comparison.
+# Either way each call's cache hit, cache read/write tokens, prefix/suffix
+# token estimates and cost land in LLM_CALLS — see benchmark_llm_cache.py.
+LLM_PROMPT_CACHE_LAYOUT = True
+
+# Hedged requests for tail latency (opt-in). A few CLI calls run several times
+# the median for no visible reason and, with 300s timeouts, dominate run time.
+# With hedging on, a call to an idempotent text-only sub-agent (search_strategy,
+# featured_section, secondary_cards, fact_check — see llm.HEDGEABLE_PROFILES)
+# that is still running at that profile's historical p90 duration (successful
+# LLM_CALLS in audit_log) gets a second identical call. Whichever returns first
+# wins; the other process is killed. Both share the original timeout.
+#   LLM_HEDGE_MAX_PCT   — cap on the share of calls (since server start) that
+#                         may be hedged; each hedge adds one call's cost
+#   LLM_HEDGE_MIN_SAMPLES — history needed before a profile's p90 is trusted;
+#                         profiles with fewer recorded calls are never hedged
+# fix_report and the MCP tool session (s12 llm mode) are never hedged: the
+# first is a large rewrite, the second publishes to Notion.
+LLM_HEDGE_ENABLED = False
+LLM_HEDGE_MAX_PCT = 10
+LLM_HEDGE_MIN_SAMPLES = 20
+
+# s2 strategy validation (agent/strategy.py). The response is parsed with local
+# JSON repair and checked against strategy.SCHEMA; when a required key
+# (primary_keywords, buyer_types, opportunity_types) is still missing or has
+# no valid values, True sends one short follow-up asking for just those keys.
+# False falls straight back to defaults: primary_keywords=[company], and empty
+# opportunity_types / buyer_types (s3a/s3b search all types, s3c is skipped).
+STRATEGY_REASK_MISSING = True
+
 # ── Timeouts per step (seconds) ─────────────────────────────────────────────
 # Used as future.result(timeout=) in ThreadPoolExecutor. If a step exceeds its
 # timeout, the future raises TimeoutError and the pipeline hard-fails (no
@@ -74,6 +140,61 @@ TIMEOUTS = {
     "s13": 300,     # validation: deterministic checks + LLM fact-check — 5-15s
 }
 
+# End-to-end deadline per run, by the webhook's tier (1/2/3), in seconds from
+# the run's start; a request's own "deadline_s" takes precedence. 0 = no
+# deadline — only the TIMEOUTS above apply. With a deadline, each step (s2–s13)
+# is allotted, as it starts, its share of the time left: its STEP_BUDGET_WEIGHTS
+# entry over the weight of the longest chain from it to the end of the run.
+# Below the BUDGET_DEGRADE minimums a step degrades instead of starting work
+# its share can't cover, and no HTTP timeout, buyer_chat poll or LLM CLI
+# timeout runs past the deadline. Each run logs audit step "budget": per-step
+# budget_s / used_s, over-budget steps and degradations.
+# e.g. {"default": 0, "1": 15, "2": 60} — Tier 1 to the V2 "< 15 sec" target.
+RUN_DEADLINES = {
+    "default": 0,
+}
+
+# Nominal seconds of each step, for splitting the deadline — only the ratios
+# matter. Steps not listed weigh 1.
+STEP_BUDGET_WEIGHTS = {
+    "s2": 10, "s3a": 5, "s3b": 5, "s3c": 4, "s3d": 4, "s4a": 1, "s4": 1, "s5": 1,
+    "s6": 30, "s7": 5, "s8": 1, "s9": 10, "s10": 8, "s11": 1, "s12": 5, "s13": 10,
+    "s14": 1,
+}
+
+# Seconds a step's share must still hold for the optional work; below them:
+#   buyer_chat = s6 skips buyer_chat (featured section without AI context)
+#   llm_cards  = s10 renders template cards (the SECONDARY_CARD_FALLBACK ones)
+BUDGET_DEGRADE = {
+    "buyer_chat": 20,
+    "llm_cards": 10,
+}
+
+# Execution profiles — what a run does, picked by the webhook's tier
+# (profiles.py). Each profile declares:
+#   tiers       webhook tiers it applies to; "default" = tiers no profile lists
+#   deadline_s  end-to-end deadline (0 = RUN_DEADLINES); a request's deadline_s wins
+#   skip        optional work left out — buyer_chat (s6: no AI context)
+#   template    LLM steps replaced by their deterministic path:
+#                 s10  template secondary cards
+#                 s12  template assembly, whatever REPORT_ASSEMBLY_MODE says
+#                 s13  local fact verification + repair rules, no LLM fact-check/fix
+# A tier in no profile and no "default" profile = the full run. Each run logs
+# its profile as audit step "execution_profile"; GET /api/latency/tiers gives
+# p50/p90/p95/p99 run time per tier and profile.
+#
+# "fast" is the Tier 1 shape for the V2 "< 15 sec" target: no buyer_chat,
+# s9 the only LLM step. It applies to no tier until given one, e.g.
+#   PATCH /api/config {"EXECUTION_PROFILES": {"fast": {"tiers": ["1"]}}}
+# Patches are partial: only the given fields of the given profiles change, a
+# new name adds a profile and null removes one.
+EXECUTION_PROFILES = {
+    "full": {"tiers": ["default"], "deadline_s": 0, "skip": [], "template": []},
+    "fast": {"tiers": [], "deadline_s": 15, "skip": ["buyer_chat"], "template": ["s10", "s12", "s13"]},
+}
+EXECUTION_PROFILE_SKIPS = ("buyer_chat",)
+EXECUTION_PROFILE_TEMPLATES = ("s10", "s12", "s13")
+
 # ── Opportunity search ───────────────────────────────────────────────────────
 
 # Opportunity types are fully LLM-driven — the s2 sub-agent decides which types
@@ -116,7 +237,7 @@ FEATURED_CONTACT_PAGE_SIZE = 50
 # one contact per card. Keeping this small makes the parallel s7 fetches faster.
 SECONDARY_CONTACT_PAGE_SIZE = 20
 
-# ── LLM context truncation limits ────────────────────────────────────────────
+# ── LLM context token budgets ────────────────────────────────────────────────
 # These control how much source data gets passed to the LLM in each sub-agent
 # call. The LLM context window is large, but stuffing too much data causes:
 #   1. Slower response times (more input tokens to process)
@@ -124,33 +245,50 @@ SECONDARY_CONTACT_PAGE_SIZE = 20
 #   3. The LLM can lose focus when context is too large — hallucination risk
 #      actually increases with more data beyond a sweet spot
 #
-# These are CHARACTER limits (not token limits). Rough conversion: 1 token ~ 4 chars.
-# So 3000 chars ~ 750 tokens of input.
-
-# Buyer profile JSON passed to s9 featured section writer.
-# Profile is usually 500-2000 chars — 3000 gives headroom for verbose profiles.
-AI_PROFILE_CHAR_LIMIT = 3000
-
-# Contact list JSON passed to s9. Truncated after AI_CONTACTS_MAX entries.
-# Each contact is ~150 chars as JSON, so 20 contacts * 150 = 3000 chars.
-AI_CONTACTS_CHAR_LIMIT = 3000
-
-# Opportunities JSON passed to s9. Truncated after AI_OPPS_MAX entries.
-# Opportunities are verbose (300-500 chars each), so 15 * ~300 = 4500 chars.
-AI_OPPS_CHAR_LIMIT = 4000
+# These are TOKEN budgets (estimated — see agent/packing.py), not character
+# limits. Source data is serialized as compact JSON with unused fields pruned,
+# ranked by relevance, and packed with WHOLE records until the budget is spent,
+# so nothing is cut mid-record. The old char limits (3000/3000/4000/3000 on
+# indented JSON) correspond roughly to the budgets below but carried ~30% less
+# data because of whitespace and half-records.
+
+# Buyer profile passed to s9 featured section writer. Small scalar facts
+# (state, enrollment, procurement score) are kept first; long free-text fields
+# are shortened at a sentence boundary if they don't fit.
+AI_PROFILE_TOKEN_BUDGET = 750
+
+# Contacts passed to s9, best-first (verified email, then seniority).
+# A pruned contact is ~50 tokens, so 750 fits ~14 contacts (the old 3000-char
+# slice of indented JSON fit 3-4).
+AI_CONTACTS_TOKEN_BUDGET = 750
+
+# Opportunities passed to s9, ranked by keyword overlap then recency.
+# Opportunities are verbose (~150-250 tokens each pruned).
+AI_OPPS_TOKEN_BUDGET = 1000
 
 # AI strategic context (buyer_chat response) passed to s9.
-# This is free-text from the Starbridge AI — can be very long.
-# 3000 chars captures the key strategic insights without flooding context.
-AI_CONTEXT_CHAR_LIMIT = 3000
+# This is free-text from the Starbridge AI — can be very long. Shortened at a
+# paragraph/sentence boundary.
+AI_CONTEXT_TOKEN_BUDGET = 750
 
-# Source data passed to s14 validation fact-checker (per field).
+# Per-buyer budget for each of profile and contacts in s10 secondary cards.
+AI_SECONDARY_TOKEN_BUDGET = 200
+
+# Source data passed to the s13 LLM fact-checker when claims are escalated.
 # Smaller than s9 limits because the fact-checker only needs enough to verify,
 # not to generate — keeping it tight reduces false positives.
 AI_VALIDATION_SOURCE_LIMIT = 2000
 
+# When s13 runs the LLM fact-check (llm.fact_check, another 5-15s CLI call):
+#   "gated"  = factcheck.py first matches every dollar amount, date, buyer name,
+#              contact name and email in the report against state; the LLM is
+#              only called for claims it can't match (most runs skip it)
+#   "always" = every run, as before (unmatched claims still passed as focus)
+# Unmatched dates alone never escalate — the fact-check prompt ignores dates.
+LLM_FACT_CHECK_MODE = "gated"
+
 # Max number of contacts / opportunities to pass to the LLM (list slicing).
-# Applied BEFORE character truncation. Prevents passing 50 contacts when
+# Applied BEFORE token packing. Prevents passing 50 contacts when
 # the LLM only needs ~10-20 to pick a good one.
 AI_CONTACTS_MAX = 20
 AI_OPPS_MAX = 15
@@ -168,6 +306,29 @@ AI_REPORT_OPPS_CHAR_LIMIT = 6000
 # Character limit for each pre-generated section (exec summary, CTA) reference.
 AI_REPORT_SECTION_CHAR_LIMIT = 3000
 
+# How s12 builds and publishes the final report:
+#   "template" = assemble locally (agent/report.py) in milliseconds and publish
+#                via tools.notion_create_page — no LLM, deterministic layout
+#   "llm"      = Claude CLI session with Notion MCP access shapes + publishes
+#                (shape_and_publish_report). Slower (~60s+) and needs a retry
+#                loop; keep for experimenting with LLM-polished layouts.
+# The section limits above only apply to "llm" mode.
+REPORT_ASSEMBLY_MODE = "template"
+
+# Publish once, after validation (template mode only — llm mode publishes
+# inside its own CLI session). True: s12 assembles, s13 runs the checks and any
+# fix on the markdown, then creates the Notion page in its final form. False:
+# s12 publishes immediately and s13 replaces the page content if it had to fix
+# anything — two Notion writes for any run with a finding.
+PUBLISH_AFTER_VALIDATION = True
+
+# Patch mechanical s13 findings locally (repair.py) before any LLM rewrite:
+# stale/missing footer date, title missing buyer or product, contact rows with
+# no email and no phone, missing secondary buyer cards. Only findings the rules
+# can't fix (malformed emails, short reports, fact-check warnings) go to
+# llm.fix_report — a full-report rewrite that can take a minute.
+REPORT_REPAIR_RULES = True
+
 # ── Secondary buyers ─────────────────────────────────────────────────────────
 
 # How many secondary buyer cards to include in the report (after featured).
@@ -177,12 +338,38 @@ AI_REPORT_SECTION_CHAR_LIMIT = 3000
 # buyers 5+ are diminishing returns.
 MAX_SECONDARY_BUYERS = 4
 
+# s10 generation mode. False (default) packs every secondary buyer into one
+# `secondary_cards` prompt — latency grows with the buyer count and one slow
+# card holds up the whole section. True generates each card in its own smaller
+# LLM call, run concurrently (MAX_WORKERS_SECONDARY_CARDS) and stitched back
+# together in ranking order.
+SECONDARY_CARDS_PARALLEL = False
+
+# Per-card CLI timeout (seconds) in parallel mode. A card that misses it is
+# handled per SECONDARY_CARD_FALLBACK instead of failing the s7→s10 branch.
+SECONDARY_CARD_TIMEOUT = 90
+
+# What to do with a card that times out or errors in parallel mode:
+#   "template" = deterministic card built from ranking + s7 contact data
+#   "drop"     = omit the buyer from the Additional Buyers section
+SECONDARY_CARD_FALLBACK = "template"
+
 # ── Concurrent pipeline runs ──────────────────────────────────────────────────
 # Max pipelines executing simultaneously. Each run uses 3-5 API threads
 # internally, so 3 concurrent runs ≈ 15 concurrent Datagen calls at peak.
 # Batch uploads queue beyond this limit (semaphore-gated).
 MAX_CONCURRENT_RUNS = int(os.environ.get("MAX_CONCURRENT_RUNS", "3"))
 
+# How the server executes a run:
+#   "threads" = one server thread per run (run_pipeline), each step phase on
+#               its own ThreadPoolExecutor; kill via stop_event polling
+#   "asyncio" = every run is a task on one shared event loop
+#               (pipeline_async.run_pipeline_async) — tool calls and LLM
+#               subprocesses are awaited, not parked on threads; kill cancels
+#               the task. Only s2/s12/s13 still borrow executor threads.
+# Resumes (/api/resume) always use the threads runtime.
+PIPELINE_RUNTIME = os.environ.get("PIPELINE_RUNTIME", "threads")
+
 # ── Prior-run deduplication ──────────────────────────────────────────────────
 # When enabled (default), s1 loads completed runs for the same domain and s2
 # passes them to the LLM so it diversifies keywords, buyer segments, and
@@ -190,8 +377,111 @@ MAX_CONCURRENT_RUNS = int(os.environ.get("MAX_CONCURRENT_RUNS", "3"))
 # run for a domain starts fresh with no awareness of prior outcomes.
 ENABLE_PRIOR_RUN_DEDUP = True
 
+# ── Search strategy cache ────────────────────────────────────────────────────
+# s2 stores each validated strategy in the strategy_cache table, keyed on
+# (normalized domain, product-description hash, dedup mode, prior-run
+# fingerprint). The fingerprint is the set of completed prior runs s2 would
+# diversify against, so with dedup on a new strategy is generated exactly when
+# another run for the domain has completed; runs triggered while the first is
+# still in flight (a second prospect from the same company) reuse it instantly.
+# With dedup off the key ignores prior runs and every run within the TTL hits.
+# Concurrent misses for the same key wait for the first LLM call instead of
+# each starting their own. Strategies with required keys still missing after
+# the s2 re-ask are never cached. 0 disables the cache.
+STRATEGY_CACHE_TTL_HOURS = 24
+
+# Batched s2 for POST /api/batch. Instead of one search_strategy CLI session per
+# row (one cold start and one copy of the system prompt each), the server
+# groups the batch's rows — distinct strategy-cache keys that aren't already
+# cached — into chunks of this many vendors and asks for all their strategies
+# in one structured call (llm.search_strategies_batch, profile
+# search_strategy_batch). Chunks run concurrently as soon as the batch is
+# accepted; each run's s2 then waits for its chunk instead of calling the LLM.
+# Rows the batch response misses or leaves without a required key fall back to
+# their own search_strategy call (with the usual re-ask), as do runs whose
+# prior-run fingerprint changed since submission. 0 or 1 disables batching.
+STRATEGY_BATCH_SIZE = 10
+
+# ── Step scheduling ──────────────────────────────────────────────────────────
+# How run_pipeline schedules s2–s13 (agent/scheduler.py, pipeline.STEP_REGISTRY):
+#   "dag"    = each step starts the moment the steps writing its inputs finish.
+#              s8/s11 and s6/s7 start right after s4 (beside s5's SQLite
+#              writes), s9/s10 as soon as their own branch's intel lands, s12
+#              as soon as its four sections exist
+#   "phased" = the original barriers: III s2 · IV s3a-d · V s4 → s5 ·
+#              VI s8, s6 → s9, s7 → s10, s11 · VII s12 → s13
+# Both run the same steps, up to MAX_WORKERS_DISCOVERY + MAX_WORKERS_ENRICHMENT
+# at a time on the shared executors, with per-step TIMEOUTS for s3a-d and s6-s11.
+# Each run logs audit step "schedule": per-step start/end, the dependency that
+# gated each step, the critical path, and the makespan of both modes for the
+# measured durations (estimate.saved_s = wall-clock time the DAG saves).
+PIPELINE_SCHEDULE = "dag"
+
+# Phase IV quorum. A search that fails or overruns its TIMEOUTS entry no longer
+# fails the run — it is skipped (audit "s3x_skipped"). Once DISCOVERY_DEADLINE
+# seconds have passed since the searches started, s4 ranks as soon as
+# DISCOVERY_QUORUM of them have returned; searches still running are skipped
+# and their late results discarded (results landing before that are merged).
+# If every search has finished and the quorum still isn't met, s4 fails.
+# DISCOVERY_QUORUM: comma-separated alternatives, each a "+"-joined set of
+# steps or a count — "s3a+s3b, 3" = both opportunity searches, or any three
+# of the four. "4" = wait for all four and fail on any skip (the old behaviour).
+DISCOVERY_QUORUM = "s3a+s3b, 3"
+
+# Seconds from the start of discovery before s4 may proceed on a quorum.
+# Searches typically take 2-8s; 0 = rank the moment the quorum is met.
+DISCOVERY_DEADLINE = 20
+
+# Let s4a pick the featured buyer before every discovery search has returned.
+# An IncrementalRanker folds in each of s3a–d as it lands; once s3a and s3b
+# are in, the buyer searches can only add signal-less buyers (score ≤ 0.25,
+# ranked after every buyer with signals), so a leader with signals at or above
+# that ceiling can't be overtaken. s4a then starts, writes the featured buyer,
+# and s6 begins enriching it while s3c/s3d finish. s4 still ranks everything
+# when all four are in and confirms s4a's featured buyer.
+# Off = no s4a; s4 selects the featured buyer once the searches are in.
+EARLY_FEATURED_SELECTION = True
+
+# Start s6's calls (buyer_profile, buyer_contacts, buyer_chat — the 10-300s
+# one) for the partial ranking's frontrunner while discovery is still running,
+# instead of after s4a/s4 pick the featured buyer. s6 reuses them when the
+# final pick agrees and cancels them when it doesn't. Each run records the
+# outcome as audit step "s6_speculation" (hit, saved_s, wasted_s, margin) —
+# `python -m agent.benchmark_speculation` reports hit rate and time saved by
+# margin, to tune SPECULATION_MIN_MARGIN_PCT.
+# Off by default: a miss spends one buyer_chat on a buyer the report won't use.
+SPECULATIVE_ENRICHMENT = False
+
+# How far ahead of the runner-up (score points × 100; scores are 0–1) the
+# frontrunner must be before s6's calls start speculatively. Lower = earlier,
+# more misses. A leader locked by the ranker (see EARLY_FEATURED_SELECTION)
+# always qualifies.
+SPECULATION_MIN_MARGIN_PCT = 10
+
+# Don't let buyer_chat (10-300s, the slowest s6 call) hold up s9: s6 returns
+# once buyer_profile + buyer_contacts are in, s9 writes the featured section
+# from profile, contacts and opportunities, and buyer_chat keeps running
+# (latebind.py). s12 waits up to AI_CONTEXT_GRACE_S for it, then merges a
+# "Strategic Context" sub-section written from the answer into the featured
+# section before publish. If it answers later, the sub-section is patched
+# into the published Notion page (audit step "late_ai_context").
+# Off = s6 waits for buyer_chat and s9 writes it into the section.
+LATE_BIND_AI_CONTEXT = False
+
+# How long s12 waits for a late-bound buyer_chat before publishing without it
+# (capped at the run's time left). 0 = never wait, always patch after publish.
+AI_CONTEXT_GRACE_S = 15
+
+# Save each step's state delta (the keys it returned) to the checkpoints table
+# as it finishes — s0+s1 together as checkpoint "s1", then s2–s13 from the
+# scheduler. resume_pipeline(run_id) / POST /api/resume/{run_id} rebuilds state
+# from them and reruns only the steps without a checkpoint, so a failure at
+# s12/s13 costs seconds to recover instead of repeating every tool + LLM call.
+# Off = no checkpoints are written and runs cannot be resumed.
+ENABLE_CHECKPOINTS = True
+
 # ── Thread pool sizes ────────────────────────────────────────────────────────
-# ThreadPoolExecutor max_workers for each parallel phase.
+# How many of one run's calls run at once in each parallel stage.
 # These are I/O-bound (API calls), not CPU-bound, so higher counts are fine.
 # Gotcha: Datagen custom tool endpoints may rate-limit above 10 concurrent
 # requests. Keep individual pool sizes under 5 to stay safe.
@@ -199,7 +489,8 @@ ENABLE_PRIOR_RUN_DEDUP = True
 # Phase IV: s3a + s3b + s3c + s3d run in parallel. One per search type.
 MAX_WORKERS_DISCOVERY = 4
 
-# Phase VI: 4 parallel branches (s8, s6→s9, s7→s10, s11).
+# Phase VI: 4 parallel branches (s8, s6→s9, s7→s10, s11). The step scheduler
+# runs up to MAX_WORKERS_DISCOVERY + MAX_WORKERS_ENRICHMENT steps of a run at once.
 MAX_WORKERS_ENRICHMENT = 4
 
 # s6 internal: buyer_profile + buyer_contacts + buyer_chat in parallel.
@@ -209,6 +500,35 @@ MAX_WORKERS_FEATURED = 3
 # Set equal to MAX_SECONDARY_BUYERS to fetch all in parallel.
 MAX_WORKERS_SECONDARY = 4
 
+# s10 parallel mode: concurrent per-buyer card LLM calls. Each is a separate
+# claude CLI subprocess, so keep this modest.
+MAX_WORKERS_SECONDARY_CARDS = 4
+
+# The MAX_WORKERS_* sizes above are per run. Their threads come from shared,
+# process-wide executors (executors.py), so thread count no longer grows with
+# the number of runs in flight:
+#   steps      = scheduler step bodies (mostly waiting on the executors below)
+#   discovery  = s3a-d searches
+#   enrichment = s6/s7 tool calls + speculative s6 calls
+#   llm        = s10 per-buyer card calls (one claude subprocess each)
+# Work beyond an executor's workers queues, taken round-robin across runs.
+# Read live (not from a run's snapshot); a change applies on next use.
+EXECUTOR_WORKERS = {
+    "steps": 24,
+    "discovery": 12,
+    "enrichment": 16,
+    "llm": 8,
+}
+
+# Most workers of each executor one run may hold at once, so a single run's
+# burst (a batch row with 10 secondaries) can't take an executor over.
+EXECUTOR_RUN_SHARE = {
+    "steps": 8,
+    "discovery": 4,
+    "enrichment": 8,
+    "llm": 4,
+}
+
 # ── Async polling (Datagen async endpoint) ───────────────────────────────────
 # buyer_chat uses the async API to avoid SSE streaming timeouts:
 #   POST /apps/{uuid}/async → returns run_id
@@ -300,32 +620,64 @@ STATE_CODES = {
 # and paths (DB_PATH) are excluded.
 
 CONFIG_METADATA = {
-    "LLM_MODEL":                    {"cat": "LLM",           "type": "str",  "desc": "Claude model for all LLM sub-agents"},
-    "LLM_MAX_OUTPUT_TOKENS":        {"cat": "LLM",           "type": "int",  "desc": "Max output tokens for CLI subprocess"},
-    "LLM_TOOL_TIMEOUT":             {"cat": "LLM",           "type": "int",  "desc": "Timeout for MCP tool sessions (seconds)", "unit": "s"},
+    "LLM_MODEL":                    {"cat": "LLM",           "type": "str",  "desc": "Default Claude model for LLM sub-agents"},
+    "LLM_MAX_OUTPUT_TOKENS":        {"cat": "LLM",           "type": "int",  "desc": "Max output tokens when a call has no profile"},
+    "LLM_PROMPT_CACHE_LAYOUT":      {"cat": "LLM",           "type": "bool", "desc": "Send sub-agent instructions as a cacheable system-prompt prefix"},
+    "LLM_HEDGE_ENABLED":            {"cat": "LLM",           "type": "bool", "desc": "Hedge slow text-only LLM calls with a second call at the profile's p90"},
+    "LLM_HEDGE_MAX_PCT":            {"cat": "LLM",           "type": "int",  "desc": "Max share of LLM calls that may be hedged", "unit": "%"},
+    "LLM_HEDGE_MIN_SAMPLES":        {"cat": "LLM",           "type": "int",  "desc": "Recorded calls needed before a profile's p90 is used"},
+    "STRATEGY_REASK_MISSING":       {"cat": "LLM",           "type": "bool", "desc": "s2: re-ask only for required strategy keys missing after validation"},
+    "LLM_PROFILES":                 {"cat": "LLM",           "type": "profiles", "desc": "Per-sub-agent model / max output tokens / timeout (empty model = LLM_MODEL)"},
     "TIMEOUTS":                     {"cat": "Timeouts",      "type": "dict", "desc": "Per-step timeout seconds"},
+    "RUN_DEADLINES":                {"cat": "Timeouts",      "type": "dict", "desc": "End-to-end run deadline seconds by tier (0 = none)"},
+    "STEP_BUDGET_WEIGHTS":          {"cat": "Timeouts",      "type": "dict", "desc": "Nominal step seconds for splitting the deadline"},
+    "BUDGET_DEGRADE":               {"cat": "Timeouts",      "type": "dict", "desc": "Seconds left below which s6 skips buyer_chat / s10 uses template cards"},
+    "EXECUTION_PROFILES":           {"cat": "Pipeline",      "type": "execution_profiles", "desc": "Per-tier execution profiles: tiers, deadline, skipped work, template steps"},
     "OPPORTUNITY_PAGE_SIZE":        {"cat": "Search",        "type": "int",  "desc": "Results per opportunity search call"},
     "OPPORTUNITY_SORT_FIELD":       {"cat": "Search",        "type": "str",  "desc": "Sort order for opportunity results"},
     "BUYER_SEARCH_PAGE_SIZE":       {"cat": "Search",        "type": "int",  "desc": "Results per buyer search call"},
     "FEATURED_CONTACT_PAGE_SIZE":   {"cat": "Contacts",      "type": "int",  "desc": "Contacts fetched for featured buyer"},
     "SECONDARY_CONTACT_PAGE_SIZE":  {"cat": "Contacts",      "type": "int",  "desc": "Contacts fetched per secondary buyer"},
-    "AI_PROFILE_CHAR_LIMIT":        {"cat": "LLM Limits",    "type": "int",  "desc": "Profile JSON char limit for s9"},
-    "AI_CONTACTS_CHAR_LIMIT":       {"cat": "LLM Limits",    "type": "int",  "desc": "Contacts JSON char limit for s9"},
-    "AI_OPPS_CHAR_LIMIT":           {"cat": "LLM Limits",    "type": "int",  "desc": "Opportunities JSON char limit for s9"},
-    "AI_CONTEXT_CHAR_LIMIT":        {"cat": "LLM Limits",    "type": "int",  "desc": "AI context char limit for s9"},
+    "AI_PROFILE_TOKEN_BUDGET":      {"cat": "LLM Limits",    "type": "int",  "desc": "Profile token budget for s9"},
+    "AI_CONTACTS_TOKEN_BUDGET":     {"cat": "LLM Limits",    "type": "int",  "desc": "Contacts token budget for s9"},
+    "AI_OPPS_TOKEN_BUDGET":         {"cat": "LLM Limits",    "type": "int",  "desc": "Opportunities token budget for s9"},
+    "AI_CONTEXT_TOKEN_BUDGET":      {"cat": "LLM Limits",    "type": "int",  "desc": "AI context token budget for s9"},
+    "AI_SECONDARY_TOKEN_BUDGET":    {"cat": "LLM Limits",    "type": "int",  "desc": "Per-buyer profile/contacts token budget for s10"},
     "AI_VALIDATION_SOURCE_LIMIT":   {"cat": "LLM Limits",    "type": "int",  "desc": "Source data char limit for s13 fact-check"},
+    "LLM_FACT_CHECK_MODE":          {"cat": "Pipeline",      "type": "str",  "desc": "s13 LLM fact-check: gated (only unmatched claims) or always"},
     "AI_CONTACTS_MAX":              {"cat": "LLM Limits",    "type": "int",  "desc": "Max contacts passed to LLM"},
     "AI_OPPS_MAX":                  {"cat": "LLM Limits",    "type": "int",  "desc": "Max opportunities passed to LLM"},
     "AI_REPORT_OPPS_MAX":           {"cat": "LLM Limits",    "type": "int",  "desc": "Max opps for report shaper (s12)"},
     "AI_REPORT_OPPS_CHAR_LIMIT":    {"cat": "LLM Limits",    "type": "int",  "desc": "Opp signals char limit for shaper"},
     "AI_REPORT_SECTION_CHAR_LIMIT": {"cat": "LLM Limits",    "type": "int",  "desc": "Section reference char limit"},
+    "REPORT_ASSEMBLY_MODE":         {"cat": "Pipeline",      "type": "str",  "desc": "s12 assembly: template (local) or llm (CLI + MCP)"},
+    "PIPELINE_SCHEDULE":            {"cat": "Pipeline",      "type": "str",  "desc": "s2–s13 scheduling: dag (start on inputs) or phased (phase barriers)"},
+    "DISCOVERY_QUORUM":             {"cat": "Pipeline",      "type": "str",  "desc": "Searches s4 needs after the deadline: \"s3a+s3b, 3\" = both opportunity searches or any three"},
+    "DISCOVERY_DEADLINE":           {"cat": "Pipeline",      "type": "int",  "desc": "Seconds of discovery before s4 may proceed on a quorum", "unit": "s"},
+    "EARLY_FEATURED_SELECTION":     {"cat": "Pipeline",      "type": "bool", "desc": "Pick the featured buyer (s4a) once pending searches can no longer change it"},
+    "SPECULATIVE_ENRICHMENT":       {"cat": "Pipeline",      "type": "bool", "desc": "Start s6's calls for the frontrunner while discovery is still running"},
+    "SPECULATION_MIN_MARGIN_PCT":   {"cat": "Pipeline",      "type": "int",  "desc": "Frontrunner's lead (score × 100) needed before speculating"},
+    "LATE_BIND_AI_CONTEXT":         {"cat": "Pipeline",      "type": "bool", "desc": "s9 goes ahead without buyer_chat; its strategic context is merged before or patched after publish"},
+    "AI_CONTEXT_GRACE_S":           {"cat": "Pipeline",      "type": "int",  "desc": "How long s12 waits for a late-bound buyer_chat", "unit": "s"},
+    "ENABLE_CHECKPOINTS":           {"cat": "Pipeline",      "type": "bool", "desc": "Checkpoint each step's state delta so failed runs can be resumed"},
+    "PUBLISH_AFTER_VALIDATION":     {"cat": "Pipeline",      "type": "bool", "desc": "Publish to Notion once, after s13 validation + fix"},
+    "REPORT_REPAIR_RULES":          {"cat": "Pipeline",      "type": "bool", "desc": "Repair mechanical s13 findings locally before the LLM fix"},
     "MAX_SECONDARY_BUYERS":         {"cat": "Pipeline",      "type": "int",  "desc": "Secondary buyer cards in report"},
+    "SECONDARY_CARDS_PARALLEL":     {"cat": "Pipeline",      "type": "bool", "desc": "Generate each secondary card in its own concurrent LLM call"},
+    "SECONDARY_CARD_TIMEOUT":       {"cat": "Pipeline",      "type": "int",  "desc": "Per-card LLM timeout in parallel mode", "unit": "s"},
+    "SECONDARY_CARD_FALLBACK":      {"cat": "Pipeline",      "type": "str",  "desc": "Late/failed card handling: template or drop"},
     "MAX_CONCURRENT_RUNS":          {"cat": "Pipeline",      "type": "int",  "desc": "Max simultaneous pipeline runs"},
+    "PIPELINE_RUNTIME":             {"cat": "Pipeline",      "type": "str",  "desc": "Server run execution: threads (thread per run) or asyncio (shared event loop)"},
     "ENABLE_PRIOR_RUN_DEDUP":       {"cat": "Pipeline",      "type": "bool", "desc": "Diversify keywords across runs for same domain"},
+    "STRATEGY_CACHE_TTL_HOURS":     {"cat": "Pipeline",      "type": "int",  "desc": "s2 strategy cache lifetime (0 = off)", "unit": "h"},
+    "STRATEGY_BATCH_SIZE":          {"cat": "Pipeline",      "type": "int",  "desc": "Vendors per batched s2 strategy call in /api/batch (0/1 = off)"},
     "MAX_WORKERS_DISCOVERY":        {"cat": "Thread Pools",  "type": "int",  "desc": "Phase IV pool size"},
     "MAX_WORKERS_ENRICHMENT":       {"cat": "Thread Pools",  "type": "int",  "desc": "Phase VI pool size"},
     "MAX_WORKERS_FEATURED":         {"cat": "Thread Pools",  "type": "int",  "desc": "s6 internal pool size"},
     "MAX_WORKERS_SECONDARY":        {"cat": "Thread Pools",  "type": "int",  "desc": "s7 per-buyer pool size"},
+    "MAX_WORKERS_SECONDARY_CARDS":  {"cat": "Thread Pools",  "type": "int",  "desc": "s10 concurrent card calls (parallel mode)"},
+    "EXECUTOR_WORKERS":             {"cat": "Thread Pools",  "type": "dict", "desc": "Shared executor threads, process-wide (steps/discovery/enrichment/llm)"},
+    "EXECUTOR_RUN_SHARE":           {"cat": "Thread Pools",  "type": "dict", "desc": "Most shared-executor workers one run may hold at once"},
     "ASYNC_POLL_INTERVAL":          {"cat": "Async Polling", "type": "int",  "desc": "Seconds between poll requests", "unit": "s"},
     "ASYNC_DEFAULT_MAX_WAIT":       {"cat": "Async Polling", "type": "int",  "desc": "Default async tool max wait", "unit": "s"},
     "BUYER_CHAT_MAX_WAIT":          {"cat": "Async Polling", "type": "int",  "desc": "buyer_chat async max wait", "unit": "s"},
@@ -354,8 +706,8 @@ _FACTORY_DEFAULTS = {
 def reset_config():
     """Reset all tunable config values to factory defaults (as defined in source).
 
-    Returns the restored snapshot. Like set_config_value, this only updates
-    module globals — call apply_config_to_modules() to push to pipeline/tools/llm.
+    Returns the restored snapshot. Like set_config_value, this updates module
+    globals — runs started afterwards snapshot them; running ones keep theirs.
     """
     import copy
     g = globals()
@@ -364,12 +716,82 @@ def reset_config():
     return get_config_snapshot()
 
 
+def _merge_profiles(current, patch):
+    """Merge a partial {profile: {field: value}} update into a copy of current.
+
+    Raises ValueError for unknown profiles/fields or out-of-range values.
+    """
+    import copy
+    if not isinstance(patch, dict):
+        raise ValueError("requires a dict of {profile: {field: value}}")
+    merged = copy.deepcopy(current)
+    for name, fields in patch.items():
+        if name not in merged:
+            raise ValueError(f"unknown profile '{name}'")
+        if not isinstance(fields, dict):
+            raise ValueError(f"profile '{name}' requires a dict")
+        for field, val in fields.items():
+            if field not in LLM_PROFILE_FIELDS:
+                raise ValueError(f"unknown field '{field}' (expected {', '.join(LLM_PROFILE_FIELDS)})")
+            val = LLM_PROFILE_FIELDS[field](val)
+            if field == "max_tokens" and not 1 <= val <= 64000:
+                raise ValueError("max_tokens must be 1-64000")
+            if field == "timeout" and val < 1:
+                raise ValueError("timeout must be positive")
+            merged[name][field] = val.strip() if isinstance(val, str) else val
+    return merged
+
+
+def _merge_execution_profiles(current, patch):
+    """Merge a partial {profile: {field: value} | None} update into a copy of
+    current (None removes the profile).
+
+    Raises ValueError for unknown fields, skips or template steps, or a tier
+    listed by two profiles.
+    """
+    import copy
+    if not isinstance(patch, dict):
+        raise ValueError("requires a dict of {profile: {field: value}}")
+    merged = copy.deepcopy(current)
+    for name, fields in patch.items():
+        if fields is None:
+            merged.pop(name, None)
+            continue
+        if not isinstance(fields, dict):
+            raise ValueError(f"profile '{name}' requires a dict")
+        profile = merged.setdefault(name, {"tiers": [], "deadline_s": 0, "skip": [], "template": []})
+        for field, val in fields.items():
+            if field == "deadline_s":
+                val = int(val)
+                if val < 0:
+                    raise ValueError("deadline_s must be 0 or more")
+            elif field in ("tiers", "skip", "template"):
+                if not isinstance(val, (list, tuple)):
+                    raise ValueError(f"'{field}' requires a list")
+                val = [str(v).strip() for v in val]
+                allowed = {"skip": EXECUTION_PROFILE_SKIPS, "template": EXECUTION_PROFILE_TEMPLATES}.get(field)
+                unknown = [v for v in val if allowed is not None and v not in allowed]
+                if unknown:
+                    raise ValueError(f"unknown {field} {unknown} (expected {', '.join(allowed)})")
+            else:
+                raise ValueError(f"unknown field '{field}' (expected tiers, deadline_s, skip, template)")
+            profile[field] = val
+    owners = {}
+    for name, profile in merged.items():
+        for tier in profile["tiers"]:
+            if tier in owners:
+                raise ValueError(f"tier '{tier}' is in both '{owners[tier]}' and '{name}'")
+            owners[tier] = name
+    return merged
+
+
 def set_config_value(key: str, value):
     """Set a single config value at runtime. Returns (ok, error_msg).
 
     Validates the key exists in CONFIG_METADATA and coerces the value to
-    the declared type. Changes are held in this module's globals until
-    apply_config_to_modules() pushes them into the pipeline/tools/llm modules.
+    the declared type. Changes are held in this module's globals: code reads
+    them through context.cfg(), which prefers the active run's snapshot, so a
+    change reaches runs started after it and never a run already in flight.
     """
     if key not in CONFIG_METADATA:
         return False, f"Unknown config key: {key}"
@@ -391,29 +813,12 @@ def set_config_value(key: str, value):
             if not isinstance(value, dict):
                 return False, f"{key} requires a dict value"
             value = {k: int(v) for k, v in value.items()}
+        elif declared_type == "profiles":
+            value = _merge_profiles(globals()[key], value)
+        elif declared_type == "execution_profiles":
+            value = _merge_execution_profiles(globals()[key], value)
     except (ValueError, TypeError) as e:
         return False, f"Invalid value for {key}: {e}"
 
     globals()[key] = value
     return True, None
-
-
-def apply_config_to_modules(snapshot=None):
-    """Push config values into pipeline.py / tools.py / llm.py cached bindings.
-
-    These modules use `from .config import X` which creates module-level copies.
-    Changing config globals alone doesn't update those copies — this function
-    monkey-patches them so the next run_pipeline() call sees the new values.
-
-    If snapshot is None, reads current config globals.
-    """
-    if snapshot is None:
-        snapshot = get_config_snapshot()
-
-    import agent.pipeline as p
-    import agent.tools as t
-    import agent.llm as l
-    for key, val in snapshot.items():
-        for mod in (p, t, l):
-            if hasattr(mod, key):
-                setattr(mod, key, val)
@@ -0,0 +1,237 @@
+"""Run-scoped execution context — what one pipeline run carries through its
+steps, tool calls and LLM calls.
+
+A RunContext holds the run's config snapshot, its cancel token, a telemetry
+sink for its LLM call records, a per-run cache and its deadline budget.
+activate() binds it to a context variable, so every step, tool call and LLM
+call made on behalf of the run reads its own values — concurrent runs no
+longer share module globals:
+
+    cfg("TIMEOUTS")    the run's snapshot value (live config outside a run)
+    cancelled()        the run's cancel token, checked by the CLI poll loop
+    on_cancel(fn)      fn called the moment the run is cancelled
+    wait_cancelled(s)  sleep s seconds, or until the run is cancelled
+
+Context variables follow asyncio tasks and asyncio.to_thread on their own.
+Threads and ThreadPoolExecutor workers do not — hand them work with
+submit(pool, fn, ...) / bind(fn), which run it in a copy of the caller's
+context.
+
+Cancellation is cooperative, and reaches blocking calls through on_cancel():
+a CancelToken runs its callbacks when it is set, so tools.py shuts down the
+run's open sockets, llm.py kills its CLI subprocesses, and poll loops wake
+from wait_cancelled() — a killed run's threads are free within a second.
+Work that outlives its run anyway is visible: tracked() registers tool
+calls, subprocesses and pool tasks while they run, and leaked_work() lists
+those still running for runs already cancelled or finished.
+"""
+
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from . import config as _config
+
+logger = logging.getLogger("pipeline.context")
+
+_current = contextvars.ContextVar("run_context", default=None)
+
+# Work running on behalf of a run: {key: (RunContext, kind, name, started)} — see tracked()
+_work = {}
+_work_lock = threading.Lock()
+_work_keys = itertools.count()
+
+
+class CancelToken(threading.Event):
+    """A run's cancel token: a threading.Event that also runs the callbacks
+    registered with on_cancel() when it is set. A plain Event works as a
+    token too, but only for code that polls it."""
+
+    def __init__(self):
+        super().__init__()
+        self.cancelled_at = None
+        self._callbacks = {}
+        self._callbacks_lock = threading.Lock()
+
+    def set(self):
+        with self._callbacks_lock:
+            self.cancelled_at = self.cancelled_at or time.time()
+            super().set()
+            callbacks, self._callbacks = list(self._callbacks.values()), {}
+        for fn in callbacks:
+            try:
+                fn()
+            except Exception as e:
+                logger.warning(f"  cancel callback {fn!r} failed: {e}")
+
+    def on_cancel(self, fn):
+        """Call fn once when the token is set (now, if it already is).
+        Returns a function that unregisters it."""
+        with self._callbacks_lock:
+            if not self.is_set():
+                key = next(_work_keys)
+                self._callbacks[key] = fn
+                return lambda: self._callbacks.pop(key, None)
+        fn()
+        return lambda: None
+
+
+class RunContext:
+    """One pipeline run: config snapshot, cancel token, telemetry sink, caches.
+
+    config: {key: value} for the CONFIG_METADATA tunables — None snapshots the
+    live config now. cancel_event: the CancelToken the run is killed through
+    (server stop_event); a fresh one when omitted.
+    """
+
+    def __init__(self, config=None, cancel_event=None, run_id=None):
+        self.config = _config.get_config_snapshot() if config is None else dict(config)
+        self.cancel_event = cancel_event or CancelToken()
+        self.run_id = run_id
+        self.llm_calls = []  # every LLM call record of the run (llm._record_call)
+        self.cache = {}      # per-run memo — never shared with another run
+        self.budget = None   # budget.RunBudget when the run has a deadline
+        self.profile = None  # profiles.select(): the run's execution profile
+        self.finished_at = None  # set by finish() when the run returns
+        self.skipped = None  # why the scheduler skipped the step this context runs — its audit entries are dropped
+
+    def cfg(self, name):
+        if name in self.config:
+            return self.config[name]
+        return getattr(_config, name)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def on_cancel(self, fn):
+        """See CancelToken.on_cancel — a no-op with a plain Event as token."""
+        if isinstance(self.cancel_event, CancelToken):
+            return self.cancel_event.on_cancel(fn)
+        return lambda: None
+
+    def spawn(self):
+        """A RunContext for work done on this run's behalf under its own cancel
+        token (a speculative or late-bound call): the same config snapshot,
+        run_id, deadline budget and execution profile."""
+        child = RunContext(self.config, run_id=self.run_id)
+        child.budget, child.profile = self.budget, self.profile
+        return child
+
+    def finish(self):
+        """Mark the run returned: work of it still running counts as leaked."""
+        self.finished_at = time.time()
+
+    def llm_summary(self):
+        """Roll-up of llm_calls for the run's audit trail."""
+        calls = list(self.llm_calls)
+        return {
+            "calls": len(calls),
+            "failed": sum(1 for c in calls if c.get("status") != "success"),
+            "hedged": sum(1 for c in calls if c.get("hedged")),
+            "cost_usd": round(sum(c.get("cost_usd") or 0 for c in calls), 4),
+            "duration_s": round(sum(c.get("duration_s") or 0 for c in calls), 2),
+        }
+
+
+def current():
+    """The active RunContext, or None outside a run."""
+    return _current.get()
+
+
+@contextmanager
+def activate(ctx):
+    """Make ctx the active RunContext for this thread / task until exit."""
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+
+
+def cfg(name):
+    """Config value for the active run — its snapshot, else the live config module."""
+    ctx = _current.get()
+    if ctx is None:
+        return getattr(_config, name)
+    return ctx.cfg(name)
+
+
+def cancelled():
+    """True once the active run's cancel token is set."""
+    ctx = _current.get()
+    return ctx is not None and ctx.cancelled()
+
+
+def on_cancel(fn):
+    """Call fn when the active run is cancelled; returns the unregister function."""
+    ctx = _current.get()
+    return ctx.on_cancel(fn) if ctx else (lambda: None)
+
+
+def wait_cancelled(seconds):
+    """Sleep `seconds`, waking early if the active run is cancelled. True if it was."""
+    ctx = _current.get()
+    if ctx is None:
+        time.sleep(seconds)
+        return False
+    return ctx.cancel_event.wait(seconds)
+
+
+@contextmanager
+def tracked(kind, name):
+    """Register the block as outstanding work of the active run ("http", "cli",
+    "thread", ...) until it exits — what leaked_work() reports."""
+    key = next(_work_keys)
+    with _work_lock:
+        _work[key] = (_current.get(), kind, name, time.time())
+    try:
+        yield
+    finally:
+        with _work_lock:
+            del _work[key]
+
+
+def leaked_work():
+    """Tracked work still running for runs that were cancelled or have
+    finished: {"outstanding", "by_kind", "items": [{run_id, kind, name, age_s,
+    late_s}]} — late_s is how long it has outlived the run's end or cancel."""
+    now = time.time()
+    with _work_lock:
+        work = list(_work.values())
+    items = []
+    for ctx, kind, name, started in work:
+        if ctx is None or not (ctx.cancelled() or ctx.finished_at):
+            continue
+        ended = ctx.finished_at or getattr(ctx.cancel_event, "cancelled_at", None)
+        items.append({"run_id": ctx.run_id, "kind": kind, "name": name, "age_s": round(now - started, 1),
+                      "late_s": round(now - ended, 1) if ended else None})
+    by_kind = {}
+    for item in items:
+        by_kind[item["kind"]] = by_kind.get(item["kind"], 0) + 1
+    return {"outstanding": len(items), "by_kind": by_kind, "items": items}
+
+
+def bind(fn):
+    """fn wrapped to run in a copy of the calling context (threading.Thread targets)."""
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return ctx.run(fn, *args, **kwargs)
+    return run
+
+
+def submit(pool, fn, *args, **kwargs):
+    """pool.submit() that runs fn in a copy of the calling context, tracked
+    as "thread" work while it runs."""
+    return pool.submit(contextvars.copy_context().run, _tracked_call, fn, *args, **kwargs)
+
+
+def _tracked_call(fn, *args, **kwargs):
+    with tracked("thread", getattr(fn, "__qualname__", repr(fn))):
+        return fn(*args, **kwargs)
@@ -1,9 +1,10 @@
-"""SQLite operations for the pipeline — runs, discoveries, contacts, audit_log tables."""
+"""SQLite operations for the pipeline — runs, discoveries, contacts, audit_log, strategy_cache, checkpoints tables."""
 
 import sqlite3
 import json
 import os
 import time
+from . import context
 from .config import DB_PATH
 
 
@@ -92,7 +93,30 @@ def init_db():
             FOREIGN KEY (run_id) REFERENCES runs(id)
         );
 
+        CREATE TABLE IF NOT EXISTS strategy_cache (
+            cache_key TEXT PRIMARY KEY,
+            target_domain TEXT NOT NULL,
+            product_hash TEXT NOT NULL,
+            dedup INTEGER NOT NULL,
+            prior_fingerprint TEXT NOT NULL,
+            strategy TEXT NOT NULL,
+            source_run_id INTEGER,
+            hits INTEGER DEFAULT 0,
+            created_at REAL NOT NULL,
+            last_hit_at REAL
+        );
+
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            run_id INTEGER NOT NULL,
+            step TEXT NOT NULL,
+            delta TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (run_id, step),
+            FOREIGN KEY (run_id) REFERENCES runs(id)
+        );
+
         CREATE INDEX IF NOT EXISTS idx_runs_domain ON runs(target_domain);
+        CREATE INDEX IF NOT EXISTS idx_strategy_cache_domain ON strategy_cache(target_domain);
         CREATE INDEX IF NOT EXISTS idx_contacts_buyer ON contacts(buyer_id);
         CREATE INDEX IF NOT EXISTS idx_audit_run ON audit_log(run_id);
     """)
@@ -136,6 +160,53 @@ def load_prior_runs(target_domain):
 
 
 
+def get_cached_strategy(cache_key, max_age_seconds, touch=True):
+    """Return the cached strategy entry for a key if younger than max_age_seconds.
+
+    Bumps the hit counter unless touch=False (a lookup that won't be served).
+    Returns {"strategy", "source_run_id", "age_seconds", "hits"} or None.
+    """
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT strategy, source_run_id, created_at, hits FROM strategy_cache WHERE cache_key = ?",
+        (cache_key,)
+    ).fetchone()
+    if not row or time.time() - row["created_at"] > max_age_seconds:
+        conn.close()
+        return None
+    now = time.time()
+    if touch:
+        conn.execute(
+            "UPDATE strategy_cache SET hits = hits + 1, last_hit_at = ? WHERE cache_key = ?",
+            (now, cache_key)
+        )
+        conn.commit()
+    conn.close()
+    return {
+        "strategy": json.loads(row["strategy"]),
+        "source_run_id": row["source_run_id"],
+        "age_seconds": round(now - row["created_at"], 1),
+        "hits": row["hits"] + int(touch),
+    }
+
+
+def put_cached_strategy(key_parts, strategy, source_run_id):
+    """Store (or replace) a strategy under key_parts["key"]."""
+    conn = get_connection()
+    conn.execute("""
+        INSERT OR REPLACE INTO strategy_cache
+            (cache_key, target_domain, product_hash, dedup, prior_fingerprint,
+             strategy, source_run_id, hits, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)
+    """, (
+        key_parts["key"], key_parts["domain"], key_parts["product_hash"],
+        int(key_parts["dedup"]), key_parts["prior_fingerprint"],
+        json.dumps(strategy), source_run_id, time.time(),
+    ))
+    conn.commit()
+    conn.close()
+
+
 def get_batch_runs(batch_id):
     """Get all runs belonging to a batch, lightweight fields only."""
     conn = get_connection()
@@ -351,6 +422,18 @@ def update_run_completed(run_id, data):
     conn.close()
 
 
+def update_run_late_context(run_id, ai_context, report_markdown):
+    """Bind a buyer_chat answer that arrived after the run completed: its AI
+    context and the report with the strategic context patched in."""
+    conn = get_connection()
+    conn.execute("""
+        UPDATE runs SET feat_ai_context = ?, report_markdown = ?
+        WHERE id = ?
+    """, (ai_context, report_markdown, run_id))
+    conn.commit()
+    conn.close()
+
+
 def insert_contacts(run_id, buyer_id, contacts):
     conn = get_connection()
     for c in (contacts or []):
@@ -366,13 +449,62 @@ def insert_contacts(run_id, buyer_id, contacts):
     conn.close()
 
 
+def delete_run_rows(run_id, table):
+    """Remove a run's discoveries or contacts before the step that inserts them reruns."""
+    if table not in ("discoveries", "contacts"):
+        raise ValueError(f"Unknown table: {table}")
+    conn = get_connection()
+    conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+    conn.commit()
+    conn.close()
+
+
+# ── Checkpoints ──────────────────────────────────────────────────────────────
+
+def save_checkpoint(run_id, step, delta):
+    """Store the state keys `step` added for this run (replaces an earlier checkpoint)."""
+    conn = get_connection()
+    conn.execute(
+        "INSERT OR REPLACE INTO checkpoints (run_id, step, delta, created_at) VALUES (?, ?, ?, ?)",
+        (run_id, step, json.dumps(delta, default=str), time.time()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_checkpoints(run_id):
+    """{step: delta} for every checkpointed step of a run, oldest first."""
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT step, delta FROM checkpoints WHERE run_id = ? ORDER BY created_at",
+        (run_id,)
+    ).fetchall()
+    conn.close()
+    return {r["step"]: json.loads(r["delta"]) for r in rows}
+
+
+def delete_checkpoints(run_id, steps):
+    """Drop the checkpoints of `steps` so a resume reruns them."""
+    conn = get_connection()
+    conn.executemany("DELETE FROM checkpoints WHERE run_id = ? AND step = ?",
+                     [(run_id, step) for step in steps])
+    conn.commit()
+    conn.close()
+
+
 # ── Audit log ────────────────────────────────────────────────────────────────
 
 def log_step(run_id, step, status, message=None, duration=None, metadata=None):
     """Record an audit entry for a pipeline step.
 
     status: 'success' | 'failure' | 'timeout' | 'warning' | 'skipped'
+
+    Not recorded for a step the scheduler has already skipped (its thread may
+    still be winding down — see scheduler.py): the skip is its entry.
     """
+    ctx = context.current()
+    if ctx and ctx.skipped:
+        return
     conn = get_connection()
     conn.execute("""
         INSERT INTO audit_log (run_id, step, status, message, duration_seconds, metadata)
@@ -398,6 +530,60 @@ def get_audit_log(run_id):
     return [dict(r) for r in rows]
 
 
+def get_llm_call_durations(limit=500):
+    """Durations of recent successful LLM calls, grouped by profile.
+
+    Read from the LLM_CALLS records in the newest `limit` LLM step entries.
+    Returns {profile: [duration_s, ...]}, newest first.
+    """
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT metadata FROM audit_log WHERE metadata LIKE '%\"LLM_CALLS\"%' ORDER BY id DESC LIMIT ?",
+        (limit,)
+    ).fetchall()
+    conn.close()
+
+    durations = {}
+    for row in rows:
+        try:
+            calls = json.loads(row["metadata"]).get("LLM_CALLS") or []
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            continue
+        for call in calls:
+            if call.get("status") == "success" and call.get("duration_s") is not None:
+                durations.setdefault(call.get("profile"), []).append(call["duration_s"])
+    return durations
+
+
+def get_run_latencies(limit=500):
+    """Total run time of the newest `limit` completed runs, with their tier and
+    execution profile (from the s14_pipeline_complete entry).
+
+    Returns [{run_id, tier, profile, duration_s}], newest first.
+    """
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT a.run_id, a.duration_seconds, a.metadata, r.tier
+        FROM audit_log a LEFT JOIN runs r ON r.id = a.run_id
+        WHERE a.step = 's14_pipeline_complete' AND a.status = 'success'
+        ORDER BY a.id DESC LIMIT ?
+    """, (limit,)).fetchall()
+    conn.close()
+
+    runs = []
+    for row in rows:
+        try:
+            meta = json.loads(row["metadata"] or "{}")
+        except (json.JSONDecodeError, TypeError):
+            meta = {}
+        duration = meta.get("total_duration_seconds", row["duration_seconds"])
+        if duration is None:
+            continue
+        runs.append({"run_id": row["run_id"], "tier": meta.get("tier", row["tier"]),
+                     "profile": meta.get("profile"), "duration_s": duration})
+    return runs
+
+
 class StepTimer:
     """Context manager that times a step and logs to audit_log on exit.
 
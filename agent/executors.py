@@ -0,0 +1,281 @@
+"""Shared, bounded executors — one set of worker threads for every run in the process.
+
+Each run used to create its own pools: the scheduler's step pool, s6's and
+s7's tool-call pools, s10's card pool, a speculation's pool. Across a batch
+that is thousands of short-lived threads with no global cap. Instead, work
+goes to a few named executors, sized by EXECUTOR_WORKERS:
+
+    steps       scheduler step bodies (s2, s4a–s13 — mostly waiting on the rest)
+    discovery   s3a–d, the Starbridge searches
+    enrichment  s6/s7 tool calls and speculative s6 calls
+    llm         s10's per-buyer card calls (each supervises a claude subprocess)
+
+Their threads start on demand and stay. A caller gets a lane(name, limit):
+an Executor whose work runs at most `limit` at a time, and whose shutdown()
+drops only its own queued work — what each per-call ThreadPoolExecutor
+(max_workers, shutdown(cancel_futures=True)) did. Queued work is taken
+round-robin across runs, and no run holds more than its EXECUTOR_RUN_SHARE of
+an executor's workers at once, so one run's burst queues behind its own work
+rather than everyone else's.
+
+Work never waits on work of the same executor (steps wait on enrichment and
+llm, never on steps), so a full executor cannot deadlock. A step's future
+carries started_at — when a worker picked it up — so the scheduler times the
+step from there, and the trace records how long it waited.
+
+stats() is the gauge: per executor, workers / threads / busy / queued,
+utilization, peak queue depth, queue wait, and what each run holds and has
+queued (GET /api/executors).
+
+Sizes are process-wide: they are read from the live config (PATCH
+/api/config), not a run's snapshot, and applied the next time the executor
+is used.
+"""
+
+import collections
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future
+from concurrent.futures import wait as _wait
+
+from . import config as _config
+from . import context
+
+logger = logging.getLogger("pipeline.executors")
+
+NAMES = ("steps", "discovery", "enrichment", "llm")
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+class _Work:
+    __slots__ = ("future", "fn", "args", "kwargs", "lane", "run", "queued_at")
+
+    def __init__(self, lane, run, fn, args, kwargs):
+        self.future = Future()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.lane = lane
+        self.run = run
+        self.queued_at = time.time()
+
+
+class SharedExecutor:
+    """`workers` threads shared by every run, started on demand and kept.
+
+    Queued work is taken round-robin across runs; a run holds at most
+    `per_run` workers at once, and a lane at most its limit.
+    """
+
+    def __init__(self, name, workers, per_run):
+        self.name = name
+        self.workers = max(1, workers)
+        self.per_run = max(1, per_run)
+        self.started_at = time.time()
+        self._cv = threading.Condition()
+        self._queues = collections.OrderedDict()  # run key → deque of _Work, in turn order
+        self._held = collections.Counter()  # run key → workers held
+        self._queued = 0
+        self._threads = 0
+        self._idle = 0
+        self._busy = 0
+        self._ids = itertools.count(1)
+        self.counters = {"submitted": 0, "completed": 0, "cancelled": 0, "threads_started": 0,
+                         "peak_queued": 0, "wait_s": 0.0, "max_wait_s": 0.0, "busy_s": 0.0}
+
+    def resize(self, workers, per_run):
+        with self._cv:
+            self.workers, self.per_run = max(1, workers), max(1, per_run)
+            self._spawn()
+            self._cv.notify_all()  # surplus idle threads exit
+
+    def _put(self, lane, fn, args, kwargs):
+        ctx = context.current()
+        run = (ctx.run_id if ctx.run_id is not None else id(ctx)) if ctx else None
+        work = _Work(lane, run, fn, args, kwargs)
+        with self._cv:
+            self._queues.setdefault(run, collections.deque()).append(work)
+            self._queued += 1
+            lane._futures.add(work.future)
+            self.counters["submitted"] += 1
+            self.counters["peak_queued"] = max(self.counters["peak_queued"], self._queued)
+            self._spawn()
+            self._cv.notify()
+        return work.future
+
+    def _spawn(self):
+        # Under the lock: one more thread when work is queued and none is idle
+        if self._queued and not self._idle and self._threads < self.workers:
+            self._threads += 1
+            self.counters["threads_started"] += 1
+            threading.Thread(target=self._worker, name=f"{self.name}-{next(self._ids)}", daemon=True).start()
+
+    def _next(self):
+        """Under the lock: the first runnable work, taking runs in turn."""
+        for run, queue in self._queues.items():
+            if self._held[run] >= self.per_run:
+                continue
+            for work in queue:
+                if work.lane.running < work.lane.limit:
+                    queue.remove(work)
+                    if queue:
+                        self._queues.move_to_end(run)
+                    else:
+                        del self._queues[run]
+                    self._queued -= 1
+                    return work
+        return None
+
+    def _drop(self, lane):
+        """Under the lock: remove the lane's queued work; returns it."""
+        dropped = []
+        for run in list(self._queues):
+            queue = self._queues[run]
+            mine = [work for work in queue if work.lane is lane]
+            for work in mine:
+                queue.remove(work)
+            if not queue:
+                del self._queues[run]
+            dropped += mine
+        self._queued -= len(dropped)
+        return dropped
+
+    def _worker(self):
+        while True:
+            with self._cv:
+                self._idle += 1
+                while True:
+                    if self._threads > self.workers:
+                        self._threads -= 1
+                        self._idle -= 1
+                        return
+                    work = self._next()
+                    if work:
+                        break
+                    self._cv.wait()
+                self._idle -= 1
+                self._busy += 1
+                self._held[work.run] += 1
+                work.lane.running += 1
+                self._spawn()  # more queued than this thread takes
+
+            started = time.time()
+            ran = False
+            try:
+                work.future.started_at = started
+                if work.future.set_running_or_notify_cancel():
+                    ran = True
+                    try:
+                        result = work.fn(*work.args, **work.kwargs)
+                    except BaseException as e:
+                        work.future.set_exception(e)
+                    else:
+                        work.future.set_result(result)
+            finally:
+                with self._cv:
+                    self._busy -= 1
+                    self._held[work.run] -= 1
+                    if not self._held[work.run]:
+                        del self._held[work.run]
+                    work.lane.running -= 1
+                    work.lane._futures.discard(work.future)
+                    if ran:
+                        waited = started - work.queued_at
+                        self.counters["completed"] += 1
+                        self.counters["wait_s"] += waited
+                        self.counters["max_wait_s"] = max(self.counters["max_wait_s"], waited)
+                        self.counters["busy_s"] += time.time() - started
+                    else:
+                        self.counters["cancelled"] += 1
+                    self._cv.notify_all()
+
+    def stats(self):
+        """This executor's gauge (see the module docstring)."""
+        with self._cv:
+            runs = {}
+            for run, held in self._held.items():
+                runs.setdefault(run, {"running": 0, "queued": 0})["running"] = held
+            for run, queue in self._queues.items():
+                runs.setdefault(run, {"running": 0, "queued": 0})["queued"] = len(queue)
+            counters = dict(self.counters)
+            busy, queued, threads = self._busy, self._queued, self._threads
+        completed = counters["completed"] or 1
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        return {
+            "workers": self.workers,
+            "per_run": self.per_run,
+            "threads": threads,
+            "busy": busy,
+            "queued": queued,
+            "utilization": round(busy / self.workers, 2),
+            "avg_utilization": round(counters["busy_s"] / (self.workers * elapsed), 3),
+            "mean_wait_s": round(counters["wait_s"] / completed, 3),
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in counters.items()},
+            "runs": {str(run): held for run, held in runs.items()},
+        }
+
+
+class Lane(Executor):
+    """One caller's view of a SharedExecutor (see lane())."""
+
+    def __init__(self, executor, limit):
+        self.executor = executor
+        self.limit = max(1, limit)
+        self.running = 0
+        self._futures = set()
+        self._closed = False
+
+    def submit(self, fn, /, *args, **kwargs):
+        if self._closed:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        return self.executor._put(self, fn, args, kwargs)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        """Stop taking work; cancel_futures drops what hasn't started. Running
+        work is never interrupted (cancel the run for that)."""
+        with self.executor._cv:
+            self._closed = True
+            if cancel_futures:
+                for work in self.executor._drop(self):
+                    work.future.cancel()
+                    self._futures.discard(work.future)
+                    self.executor.counters["cancelled"] += 1
+            pending = list(self._futures)
+        if wait:
+            _wait(pending)
+
+
+def get(name):
+    """The process-wide executor `name`, sized from the live EXECUTOR_WORKERS /
+    EXECUTOR_RUN_SHARE."""
+    if name not in NAMES:
+        raise ValueError(f"Unknown executor '{name}' (expected one of {', '.join(NAMES)})")
+    workers = _config.EXECUTOR_WORKERS.get(name, 8)
+    per_run = _config.EXECUTOR_RUN_SHARE.get(name, workers)
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = SharedExecutor(name, workers, per_run)
+            return executor
+    if (executor.workers, executor.per_run) != (max(1, workers), max(1, per_run)):
+        logger.info(f"executor {name}: {workers} workers, {per_run} per run")
+        executor.resize(workers, per_run)
+    return executor
+
+
+def lane(name, limit=None):
+    """An Executor on the shared executor `name` running at most `limit` of the
+    caller's work at a time (default: the executor's per-run share)."""
+    executor = get(name)
+    return Lane(executor, limit or executor.per_run)
+
+
+def stats():
+    """{executor name: its gauge} for every executor used so far."""
+    with _executors_lock:
+        executors = dict(_executors)
+    return {name: executor.stats() for name, executor in executors.items()}
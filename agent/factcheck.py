@@ -0,0 +1,228 @@
+"""Deterministic fact verification for s13 — gates the LLM fact-check.
+
+Every checkable claim in the report (dollar amounts, dates, buyer names,
+contact names, emails) is extracted in one pass over the markdown with a single
+precompiled pattern, then matched against the source data already in state
+(FEAT_PROFILE, FEAT_CONTACTS, FEAT_OPPORTUNITIES, FEAT_AI_CONTEXT,
+SECONDARY_BUYERS, SEC_PROFILES, SEC_CONTACTS). s9/s10 are instructed to use
+only that data, so on a normal run everything matches and s13 can skip the
+`llm.fact_check` CLI session. Only claims that can't be matched are escalated.
+
+The footer (generation date) and the s8/s11 template sections (Executive
+Summary, What Starbridge Can Do — aggregate counts, no per-buyer facts) are
+not checked.
+"""
+
+import json
+import re
+
+_MONTHS = {
+    m: i for i, names in enumerate((
+        ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+        ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+        ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"),
+        ("december", "dec"),
+    ), start=1) for m in names
+}
+_MONTH_ALT = "|".join(sorted(_MONTHS, key=len, reverse=True))
+
+_EMAIL = r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+# Case-sensitive inside _CLAIM_RE's IGNORECASE: every word of a name is capitalized
+_PERSON = r"(?-i:(?:(?:Dr|Mr|Mrs|Ms)\.?\s+)?[A-Z][\w'’.-]*(?:\s+[A-Z][\w'’.-]*){1,4})"
+
+# One alternation, one finditer pass. Order matters: structural patterns that
+# contain an email (contact lines, table rows) come before the bare email.
+_CLAIM_RE = re.compile(
+    # "# 📊 Buyer — Intelligence Report for Product"
+    r"^#\s+\S+\s+(?P<title_buyer>[^\n]+?)\s+—\s+Intelligence Report\b"
+    # "> 🏫 **Buyer** · Type" (s9 snapshot card)
+    r"|^>\s*\S+\s+\*\*(?P<snapshot_buyer>[^*\n]+)\*\*\s*[·|]"
+    # "**Buyer** | Type" (s10 card header)
+    r"|^\*\*(?P<card_buyer>[^*\n]+)\*\*\s*\|"
+    # "Name — Title — email" (s9 key contact, s10 card contact)
+    rf"|(?<![\w*])\*{{0,2}}(?P<contact>{_PERSON})\*{{0,2}}\s+—\s+[^—\n]{{2,160}}?\s+—\s+(?P<contact_email>{_EMAIL})"
+    # "| Name | Title | email |" (contacts table)
+    rf"|^\|\s*(?P<row_contact>[^|\n]+?)\s*\|[^|\n]*\|\s*(?P<row_email>{_EMAIL})"
+    rf"|(?P<email>{_EMAIL})"
+    r"|(?P<money>\$\s?\d[\d,]*(?:\.\d+)?(?:\s?(?:[KMB]\b|thousand\b|million\b|billion\b))?)"
+    rf"|\b(?P<date>(?:{_MONTH_ALT})\.?(?:\s+\d{{1,2}}(?:st|nd|rd|th)?,?)?\s+\d{{4}}"
+    r"|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4})\b",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+# Source-side patterns: dates as written in prose or as ISO timestamps, and
+# numbers (with optional magnitude) anywhere in the serialized source data.
+_SOURCE_DATE_RE = re.compile(
+    rf"\b(?:(?:{_MONTH_ALT})\.?(?:\s+\d{{1,2}}(?:st|nd|rd|th)?,?)?\s+\d{{4}}"
+    r"|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4})",
+    re.IGNORECASE,
+)
+_SOURCE_NUMBER_RE = re.compile(
+    r"(?<![\w.])\d[\d,]*(?:\.\d+)?(?:\s?(?:[KMB]\b|thousand\b|million\b|billion\b))?",
+    re.IGNORECASE,
+)
+
+# Text the verifier skips: the footer carries the generation date, and the
+# s8/s11 template sections (report.assemble_report headings) only restate
+# aggregate counts — each runs to the next `---` rule or H1/H2 heading.
+_SKIP_RE = re.compile(
+    r"^\*Generated Starbridge Intelligence[^\n]*"
+    r"|^##\s+(?:Executive Summary|What Starbridge Can Do)\b.*?(?=^---\s*$|^#{1,2}\s|\Z)",
+    re.MULTILINE | re.DOTALL,
+)
+
+_MAGNITUDE = {"k": 1e3, "thousand": 1e3, "m": 1e6, "million": 1e6, "b": 1e9, "billion": 1e9}
+_HONORIFICS = frozenset({"dr", "mr", "mrs", "ms", "jr", "sr", "ii", "iii", "phd", "edd"})
+
+# Rounded amounts ("$2.3M" for 2,345,000) count as a match within this ratio.
+MONEY_TOLERANCE = 0.05
+
+
+def _parse_amount(text):
+    m = re.match(r"\$?\s?(\d[\d,]*(?:\.\d+)?)\s?([a-z]*)", text.strip(), re.IGNORECASE)
+    if not m:
+        return None
+    try:
+        value = float(m.group(1).replace(",", ""))
+    except ValueError:
+        return None
+    return value * _MAGNITUDE.get(m.group(2).lower(), 1)
+
+
+def _parse_date(text):
+    """Normalize a date string to (year, month, day-or-None)."""
+    text = text.strip().lower()
+    m = re.match(r"(\d{4})-(\d{2})-(\d{2})", text)
+    if m:
+        return int(m.group(1)), int(m.group(2)), int(m.group(3))
+    m = re.match(r"(\d{1,2})/(\d{1,2})/(\d{4})", text)
+    if m:
+        return int(m.group(3)), int(m.group(1)), int(m.group(2))
+    m = re.match(rf"({_MONTH_ALT})\.?(?:\s+(\d{{1,2}})(?:st|nd|rd|th)?,?)?\s+(\d{{4}})", text)
+    if m:
+        return int(m.group(3)), _MONTHS[m.group(1)], int(m.group(2)) if m.group(2) else None
+    return None
+
+
+def _name_tokens(name):
+    """Comparable tokens for a person or organization name."""
+    words = re.findall(r"[a-z0-9]+", (name or "").lower())
+    return [w for w in words if w not in _HONORIFICS and len(w) > 1]
+
+
+def _name_matches(claim, known):
+    """A claimed name matches if all its tokens appear in one known name
+    (middle initials and honorifics ignored): the same name, or a shorter
+    form of it. A claim with tokens no known name has — a fuller name made
+    up around a real one — does not."""
+    tokens = set(_name_tokens(claim))
+    if not tokens:
+        return True
+    return any(tokens <= k for k in known)
+
+
+def _contact_records(state):
+    records = list(state.get("FEAT_CONTACTS") or [])
+    for entry in state.get("SEC_CONTACTS") or []:
+        if isinstance(entry, dict):
+            records.extend(entry.get("contacts") or [])
+    return [r for r in records if isinstance(r, dict)]
+
+
+def _buyer_names(state):
+    names = [state.get("FEATURED_BUYER_NAME")]
+    names += [b.get("buyerName") for b in state.get("SECONDARY_BUYERS") or []]
+    for p in [state.get("FEAT_PROFILE")] + list(state.get("SEC_PROFILES") or []):
+        if isinstance(p, dict):
+            names.append(p.get("name"))
+    return [n for n in names if n]
+
+
+def build_source_index(state):
+    """Index everything in state the report may legitimately cite."""
+    contacts = _contact_records(state)
+    source_text = json.dumps([
+        state.get("FEAT_PROFILE"), state.get("FEAT_OPPORTUNITIES"),
+        state.get("FEAT_AI_CONTEXT"), state.get("SECONDARY_BUYERS"),
+        state.get("SEC_PROFILES"), contacts,
+    ], default=str, ensure_ascii=False)
+
+    dates = {_parse_date(m.group(0)) for m in _SOURCE_DATE_RE.finditer(source_text)}
+    dates.discard(None)
+    amounts = {_parse_amount(m.group(0)) for m in _SOURCE_NUMBER_RE.finditer(source_text)}
+    amounts.discard(None)
+
+    return {
+        "emails": {str(c.get("email") or "").lower() for c in contacts if c.get("email")}
+                  | {e.lower() for e in re.findall(_EMAIL, source_text)},
+        "people": [set(_name_tokens(c.get("name") or f"{c.get('firstName', '')} {c.get('lastName', '')}"))
+                   for c in contacts],
+        "buyers": [set(_name_tokens(n)) for n in _buyer_names(state)],
+        "dates": dates,
+        "months": {(y, m) for y, m, _ in dates},
+        "amounts": sorted(a for a in amounts if a >= 1),
+    }
+
+
+def _amount_matches(value, amounts):
+    return any(abs(value - a) <= MONEY_TOLERANCE * max(value, a) for a in amounts)
+
+
+def extract_claims(report):
+    """All checkable claims in the report, in order: [(kind, text), ...]."""
+    text = _SKIP_RE.sub("", report or "")
+    claims = []
+    for m in _CLAIM_RE.finditer(text):
+        groups = {k: v for k, v in m.groupdict().items() if v}
+        for key in ("title_buyer", "snapshot_buyer", "card_buyer"):
+            if key in groups:
+                claims.append(("buyer", groups[key].strip()))
+        if "contact" in groups or "row_contact" in groups:
+            claims.append(("contact", (groups.get("contact") or groups["row_contact"]).strip(" *")))
+        for key in ("contact_email", "row_email", "email"):
+            if key in groups:
+                claims.append(("email", groups[key]))
+        if "money" in groups:
+            claims.append(("money", groups["money"]))
+        if "date" in groups:
+            claims.append(("date", groups["date"]))
+    return claims
+
+
+def verify_report(report, state):
+    """Match every report claim against source data.
+
+    Returns {"claims", "verified", "unmatched": [{"kind", "text"}], "by_kind"}.
+    """
+    index = build_source_index(state)
+    unmatched, by_kind = [], {}
+    claims = extract_claims(report)
+
+    for kind, text in claims:
+        if kind == "email":
+            ok = text.lower() in index["emails"]
+        elif kind == "contact":
+            # Table header rows ("Name") and "No contacts available" aren't people.
+            ok = len(_name_tokens(text)) < 2 or _name_matches(text, index["people"])
+        elif kind == "buyer":
+            ok = _name_matches(text, index["buyers"])
+        elif kind == "money":
+            value = _parse_amount(text)
+            ok = value is None or _amount_matches(value, index["amounts"])
+        else:
+            y, m, d = _parse_date(text) or (None, None, None)
+            ok = y is None or ((y, m, d) in index["dates"] if d else (y, m) in index["months"])
+
+        stats = by_kind.setdefault(kind, {"checked": 0, "verified": 0})
+        stats["checked"] += 1
+        if ok:
+            stats["verified"] += 1
+        elif {"kind": kind, "text": text} not in unmatched:
+            unmatched.append({"kind": kind, "text": text})
+
+    return {
+        "claims": len(claims),
+        "verified": sum(s["verified"] for s in by_kind.values()),
+        "unmatched": unmatched,
+        "by_kind": by_kind,
+    }
@@ -0,0 +1,127 @@
+"""Late-bound buyer_chat context — the featured section without waiting for s6's slowest call.
+
+With LATE_BIND_AI_CONTEXT on, s6 returns as soon as buyer_profile and
+buyer_contacts are in, and s9 writes the featured section from profile,
+contacts and opportunities alone. buyer_chat (10-300s) keeps running as a
+LateContext in the run's cache, and is bound at one of two points:
+
+- s12, before publish: it waits up to AI_CONTEXT_GRACE_S for the answer.
+  If the answer arrives in time, a focused "Strategic Context" sub-section
+  (llm.strategic_context) is merged into the featured section before the
+  report is assembled and published.
+- after publish: otherwise s14, once the run is saved, passes the
+  LateContext to when_done(). When the answer lands (within
+  BUYER_CHAT_MAX_WAIT), the sub-section is written, merged into the final
+  report, and the published Notion page and the run's row are updated with
+  it. By then the run has already responded.
+
+The chat runs under its own RunContext (RunContext.spawn): same config
+snapshot, run_id, budget and profile, cancelled with the run's; a
+speculative chat s6 adopts brings the context it was started under. Its work
+is therefore not counted as leaked by a finished run (context.leaked_work),
+until finish() is called.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+from . import context, executors, tools
+from .context import RunContext
+
+
+class LateContext:
+    """A featured-buyer buyer_chat that outlives s6.
+
+    answer: Future of the raw buyer_chat output, whichever runtime the call
+    runs on. started_at / landed_at: when the call started and answered.
+    """
+
+    def __init__(self, buyer_name):
+        self.buyer_name = buyer_name
+        self.started_at = time.time()
+        self.landed_at = None
+        self.answer = Future()
+        self._call = None
+        run = context.current()
+        self.ctx = run.spawn() if run else RunContext()
+        self._unlink = run.on_cancel(self.cancel) if run else None
+
+    def start(self, buyer_id, question):
+        """Call buyer_chat: as a task on the running loop, else on the enrichment executor."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with context.activate(self.ctx):
+            if loop:
+                call = loop.create_task(tools.buyer_chat_aio(buyer_id, question), name="late buyer_chat")
+            else:
+                lane = executors.lane("enrichment", 1)
+                call = context.submit(lane, tools.buyer_chat, buyer_id, question)
+                lane.shutdown(wait=False)
+        return self.adopt(call)
+
+    def adopt(self, call, started_at=None, ctx=None):
+        """Bind a buyer_chat call already in flight (a speculation's Future or
+        Task). ctx: the RunContext it runs under (Speculation.hand_off), which
+        then replaces this LateContext's own — cancel() and finish() reach the
+        running call through it."""
+        self._call = call
+        self.started_at = started_at or self.started_at
+        if ctx is not None:
+            self.ctx.finish()
+            self.ctx = ctx
+        call.add_done_callback(self._landed)
+        return self
+
+    def _landed(self, call):
+        self.landed_at = time.time()
+        if self.answer.done():
+            return
+        if call.cancelled():
+            self.answer.cancel()
+        elif call.exception() is not None:
+            self.answer.set_exception(call.exception())
+        else:
+            self.answer.set_result(call.result())
+
+    def wait(self, timeout):
+        """The raw answer if it lands within `timeout` seconds, else None.
+        Raises the call's exception if it failed."""
+        try:
+            return self.answer.result(timeout=max(0, timeout))
+        except FuturesTimeout:
+            return None
+
+    def lead_s(self):
+        """Seconds from the call's start to its answer (or to now)."""
+        return round((self.landed_at or time.time()) - self.started_at, 2)
+
+    def when_done(self, fn):
+        """Call fn(self) on the "llm" executor, under this context, once the
+        answer lands (not if the call was cancelled)."""
+        def dispatch(answer):
+            if answer.cancelled():
+                self.finish()
+                return
+            with context.activate(self.ctx):
+                lane = executors.lane("llm", 1)
+                context.submit(lane, fn, self)
+                lane.shutdown(wait=False)
+        self.answer.add_done_callback(dispatch)
+
+    def cancel(self):
+        """Stop the call; nothing is bound."""
+        if self._call is not None:
+            self._call.cancel()
+        self.answer.cancel()
+        self.ctx.cancel()
+        self.finish()
+
+    def finish(self):
+        if self._unlink:
+            self._unlink()
+            self._unlink = None
+        self.ctx.finish()
@@ -5,10 +5,16 @@ Each public function is a focused sub-agent with a specific role and system prom
 Backend: `claude -p` (Claude Code CLI in print mode). Uses the OAuth token from
 CLAUDE_CODE_OAUTH_TOKEN in .env — no separate API key needed.
 
+Each call sends the sub-agent's instructions as a stable system-prompt prefix
+and the per-run data as the suffix, so the provider's prompt cache can reuse
+the prefix; `--output-format json` reports cache usage per call.
+
 If the claude CLI is not available or fails, the pipeline hard-fails and preserves
 all state collected up to that point.
 """
 
+import asyncio
+import contextvars
 import json
 import logging
 import os
@@ -16,13 +22,14 @@ import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
+from contextlib import contextmanager
 
-from .config import (
-    LLM_MAX_OUTPUT_TOKENS,
-    LLM_MODEL,
-    LLM_TOOL_TIMEOUT,
-)
+from . import budget, context, db, executors
+from . import strategy as strategy_schema
+from .context import cfg
+from .packing import estimate_tokens
 
 logger = logging.getLogger("pipeline.llm")
 
@@ -30,13 +37,66 @@ logger = logging.getLogger("pipeline.llm")
 
 _claude_path = None
 _oauth_token = None
-_cancel_event = None  # threading.Event — set by pipeline to enable kill
 
+# ── Per-call profiles + call records ────────────────────────────────────────
+
+# A context variable rather than a thread-local: each thread starts empty as
+# before, and each asyncio task (run_pipeline_async steps) gets its own copy.
+_call_records = contextvars.ContextVar("llm_call_records", default=None)
+
+
+@contextmanager
+def record_calls(calls=None):
+    """Collect a record of every LLM call made in this thread / task into a list.
+
+    Pipeline steps wrap their LLM work in this and put the list in their audit
+    metadata (LLM_CALLS). Pass an existing list to share it with worker
+    threads (s10 parallel mode) — list.append is thread-safe.
+    """
+    calls = [] if calls is None else calls
+    token = _call_records.set(calls)
+    try:
+        yield calls
+    finally:
+        _call_records.reset(token)
 
-def set_cancel_event(event):
-    """Register a threading.Event that, when set, kills any running CLI subprocess."""
-    global _cancel_event
-    _cancel_event = event
+
+def resolve_profile(profile, max_tokens=None, timeout=None):
+    """Resolve a sub-agent's model, output budget and timeout.
+
+    Explicit arguments win, then the LLM_PROFILES entry, then the global
+    LLM_MODEL / LLM_MAX_OUTPUT_TOKENS / 300s defaults. The timeout is capped
+    at the run's deadline (budget.clamp).
+    """
+    p = cfg("LLM_PROFILES").get(profile) or {}
+    return {
+        "profile": profile or "default",
+        "model": p.get("model") or cfg("LLM_MODEL"),
+        "max_tokens": int(max_tokens or p.get("max_tokens") or cfg("LLM_MAX_OUTPUT_TOKENS")),
+        "timeout": int(budget.clamp(timeout or p.get("timeout") or 300)),
+    }
+
+
+def _record_call(resolved, layout, started, output=None, usage=None, error=None, hedge=None):
+    """Append the call's record to the step's record_calls list and the run's telemetry sink."""
+    calls = _call_records.get()
+    ctx = context.current()
+    if calls is None and ctx is None:
+        return
+    record = {
+        **resolved,
+        **layout,
+        "duration_s": round(time.time() - started, 2),
+        "prompt_tokens": layout["prefix_tokens"] + layout["suffix_tokens"],
+        "output_chars": len(output) if output else 0,
+        **(usage or {}),
+        **(hedge or {}),
+        "status": "success" if error is None else type(error).__name__,
+    }
+    if calls is not None:
+        calls.append(record)
+    if ctx is not None:
+        ctx.llm_calls.append(record)
 
 
 def _init_backend():
@@ -65,12 +125,17 @@ def _init_backend():
     logger.info(f"LLM backend: claude CLI ({path})")
 
 
-def _run_cli(cmd, prompt, env, timeout, label):
-    """Run a CLI command via Popen with cancel-event polling.
+def _run_cli(cmd, prompt, env, timeout, label, stop=None, slow=None):
+    """Run a CLI command via Popen, killed the moment the run is cancelled.
 
-    Polls every 0.5s so the process can be killed within ~500ms of
-    _cancel_event being set. Raises PipelineCancelled (imported lazily to
-    avoid circular import) or RuntimeError on timeout/failure.
+    The kill is registered with context.on_cancel(), and the 0.5s poll wakes
+    on the cancel token too, so a killed run frees the process at once.
+    Raises PipelineCancelled (imported lazily to avoid circular import) or
+    RuntimeError on timeout/failure. Setting `stop` (a threading.Event) kills
+    just this process — the losing leg of a hedged call — and raises
+    _Superseded. slow=(seconds, fn) calls fn() once if the process is still
+    running after that long (_run_hedged starts its hedge from it). The
+    process is tracked as "cli" work (context.tracked).
     """
     proc = subprocess.Popen(
         cmd,
@@ -80,21 +145,34 @@ def _run_cli(cmd, prompt, env, timeout, label):
         text=True,
         env=env,
     )
-    proc.stdin.write(prompt)
-    proc.stdin.close()
-
-    deadline = time.time() + timeout
-    while proc.poll() is None:
-        if _cancel_event and _cancel_event.is_set():
-            proc.kill()
-            proc.wait()
-            from .pipeline import PipelineCancelled
-            raise PipelineCancelled("Pipeline killed by user (CLI subprocess terminated)")
-        if time.time() > deadline:
-            proc.kill()
-            proc.wait()
-            raise RuntimeError(f"{label} timed out after {timeout}s")
-        time.sleep(0.5)
+    unregister = context.on_cancel(proc.kill)
+    try:
+        with context.tracked("cli", label):
+            proc.stdin.write(prompt)
+            proc.stdin.close()
+
+            started = time.time()
+            deadline = started + timeout
+            while proc.poll() is None or context.cancelled():
+                if context.cancelled():
+                    proc.kill()
+                    proc.wait()
+                    from .pipeline import PipelineCancelled
+                    raise PipelineCancelled("Pipeline killed by user (CLI subprocess terminated)")
+                if stop is not None and stop.is_set():
+                    proc.kill()
+                    proc.wait()
+                    raise _Superseded(f"{label} superseded by its hedge")
+                if time.time() > deadline:
+                    proc.kill()
+                    proc.wait()
+                    raise RuntimeError(f"{label} timed out after {timeout}s")
+                if slow is not None and time.time() - started >= slow[0]:
+                    slow, on_slow = None, slow[1]
+                    on_slow()
+                context.wait_cancelled(0.5)
+    finally:
+        unregister()
 
     stdout = proc.stdout.read()
     stderr = proc.stderr.read()
@@ -110,26 +188,227 @@ def _run_cli(cmd, prompt, env, timeout, label):
     return output
 
 
-def _call_llm(system_prompt: str, user_content: str, max_tokens: int = None) -> str:
-    """Call Claude via the local CLI. Hard-fails on error.
+def _cli_env(max_tokens):
+    env = {
+        **os.environ,
+        "CLAUDE_CODE_OAUTH_TOKEN": _oauth_token,
+        "CLAUDE_CODE_MAX_OUTPUT_TOKENS": str(max_tokens),
+    }
+    env.pop("CLAUDECODE", None)
+    return env
+
+
+# ── Hedged calls ────────────────────────────────────────────────────────────
+
+# Idempotent, text-only sub-agents: a duplicate call has no side effects.
+HEDGEABLE_PROFILES = frozenset({"search_strategy", "featured_section", "secondary_cards", "fact_check"})
+
+_HISTORY_REFRESH_SECONDS = 300
+
+_hedge_lock = threading.Lock()
+_hedge_counts = {"calls": 0, "hedged": 0}
+_duration_history = {"loaded_at": 0.0, "durations": {}}
+
+
+class _Superseded(Exception):
+    """Raised in the losing leg of a hedged call after its process is killed."""
+
+
+def _p90(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+
 
-    max_tokens is accepted for interface compatibility but not used by the CLI.
-    Uses Popen with a poll loop so the process can be killed mid-run via _cancel_event.
+def _hedge_after(profile):
+    """Seconds after which a call for this profile gets a hedge, or None.
+
+    The profile's p90 over recent successful calls in audit_log (reloaded
+    every few minutes). None when hedging is off, the profile isn't
+    hedgeable, or there are fewer than LLM_HEDGE_MIN_SAMPLES recorded calls.
+    Within a run the value is cached on the RunContext, so every call of
+    the run hedges at the same threshold.
     """
-    _init_backend()
+    if not cfg("LLM_HEDGE_ENABLED") or profile not in HEDGEABLE_PROFILES:
+        return None
+    ctx = context.current()
+    memo = ctx.cache.setdefault("hedge_after", {}) if ctx else {}
+    with _hedge_lock:
+        _hedge_counts["calls"] += 1
+        if profile in memo:
+            return memo[profile]
+        if time.time() - _duration_history["loaded_at"] > _HISTORY_REFRESH_SECONDS:
+            try:
+                _duration_history["durations"] = db.get_llm_call_durations()
+            except Exception as e:
+                logger.warning(f"  hedge: could not load call history: {e}")
+            _duration_history["loaded_at"] = time.time()
+        durations = _duration_history["durations"].get(profile) or []
+    after = _p90(durations) if len(durations) >= max(1, cfg("LLM_HEDGE_MIN_SAMPLES")) else None
+    memo[profile] = after
+    return after
+
+
+def _claim_hedge():
+    """Take a hedge slot if that keeps hedged calls within LLM_HEDGE_MAX_PCT."""
+    with _hedge_lock:
+        if (_hedge_counts["hedged"] + 1) * 100 > _hedge_counts["calls"] * cfg("LLM_HEDGE_MAX_PCT"):
+            return False
+        _hedge_counts["hedged"] += 1
+        return True
+
+
+def hedge_stats():
+    """Calls eligible for hedging and calls hedged since process start."""
+    with _hedge_lock:
+        return dict(_hedge_counts)
+
+
+def _run_hedged(cmd, stdin, env, timeout, label, after):
+    """Run the CLI; if it is still running after `after` seconds, start an
+    identical second call on the shared "llm" executor. The primary leg runs
+    in the calling thread, as an unhedged call does. The first successful
+    result wins and the other process is killed; both legs share the original
+    deadline. A leg that fails leaves the other running — unless the hedge is
+    still queued, which is then dropped. Returns (output, hedge record fields).
+    """
+    deadline = time.time() + timeout
+    stops = {"primary": threading.Event(), "hedge": threading.Event()}
+    hedge = {}
+
+    def hedge_leg():
+        output = _run_cli(cmd, stdin, env, max(1, round(deadline - time.time())), label, stop=stops["hedge"])
+        stops["primary"].set()
+        return output
+
+    def start_hedge():
+        if not _claim_hedge():
+            return
+        logger.info(f"  hedge: {label} still running after p90 {after:.1f}s — starting a second call")
+        lane = executors.lane("llm", 1)
+        hedge["call"] = context.submit(lane, hedge_leg)
+        lane.shutdown(wait=False)
+
+    def record(winner):
+        if hedge:
+            logger.info(f"  hedge: {winner} call won")
+        return {"hedged": bool(hedge), "hedge_after_s": round(after, 2), "hedge_winner": winner}
 
+    try:
+        output = _run_cli(cmd, stdin, env, timeout, label, stop=stops["primary"], slow=(after, start_hedge))
+    except _Superseded:
+        return hedge["call"].result(), record("hedge")
+    except BaseException as e:
+        call = hedge.get("call")
+        if call is None or call.cancel() or type(e).__name__ == "PipelineCancelled":
+            stops["hedge"].set()
+            raise
+        try:
+            return call.result(), record("hedge")
+        except Exception:
+            raise e from None
+    stops["hedge"].set()
+    if hedge:
+        hedge["call"].cancel()
+    return output, record("primary")
+
+
+def _prompt_layout(cmd, system_prompt, user_content):
+    """Split a call into a stable prefix and a per-call suffix.
+
+    With LLM_PROMPT_CACHE_LAYOUT the sub-agent instructions (role, output
+    format, valid enums) go in via --append-system-prompt, so they sit in the
+    system prefix the provider caches, and only the per-run data is sent on
+    stdin. Identical instructions across runs — and across the per-card
+    calls in s10 parallel mode — are then read from cache instead of being
+    re-processed. Otherwise the legacy single blob is sent on stdin.
+    Returns (cmd, stdin, layout stats).
+    """
+    if cfg("LLM_PROMPT_CACHE_LAYOUT"):
+        return (
+            cmd + ["--append-system-prompt", system_prompt],
+            user_content,
+            {"layout": "prefix", "prefix_tokens": estimate_tokens(system_prompt),
+             "suffix_tokens": estimate_tokens(user_content)},
+        )
     prompt = f"{system_prompt}\n\n---\n\n{user_content}"
+    return cmd, prompt, {"layout": "single", "prefix_tokens": 0, "suffix_tokens": estimate_tokens(prompt)}
 
-    env = {
-        **os.environ,
-        "CLAUDE_CODE_OAUTH_TOKEN": _oauth_token,
-        "CLAUDE_CODE_MAX_OUTPUT_TOKENS": str(LLM_MAX_OUTPUT_TOKENS),
+
+def _parse_cli_output(output, label):
+    """Unwrap `--output-format json`. Returns (text, usage or None).
+
+    usage: {cache_hit, cache_read_tokens, cache_write_tokens, input_tokens,
+    output_tokens, cost_usd, api_ms}. Plain-text output (older CLI builds)
+    is passed through with usage None.
+    """
+    try:
+        data = json.loads(output)
+    except json.JSONDecodeError:
+        return output, None
+    if not isinstance(data, dict) or data.get("type") != "result":
+        return output, None
+    if data.get("is_error"):
+        raise RuntimeError(f"{label} error: {str(data.get('result') or data.get('subtype'))[:500]}")
+    text = (data.get("result") or "").strip()
+    if not text:
+        raise RuntimeError(f"{label} returned empty output")
+    usage = data.get("usage") or {}
+    cache_read = usage.get("cache_read_input_tokens") or 0
+    return text, {
+        "cache_hit": cache_read > 0,
+        "cache_read_tokens": cache_read,
+        "cache_write_tokens": usage.get("cache_creation_input_tokens") or 0,
+        "input_tokens": usage.get("input_tokens") or 0,
+        "output_tokens": usage.get("output_tokens") or 0,
+        "cost_usd": data.get("total_cost_usd"),
+        "api_ms": data.get("duration_api_ms"),
     }
-    env.pop("CLAUDECODE", None)
 
-    return _run_cli(
-        [_claude_path, "-p", "--model", LLM_MODEL],
-        prompt=prompt, env=env, timeout=300, label="claude CLI",
+
+def _run_recorded(cmd, system_prompt, user_content, resolved, label):
+    """Lay out the prompt, run the CLI (hedged when eligible) and record the
+    call (success or failure)."""
+    cmd, stdin, layout = _prompt_layout(cmd + ["--output-format", "json"], system_prompt, user_content)
+    logger.info(f"  prompt: ~{layout['prefix_tokens']:,} prefix + ~{layout['suffix_tokens']:,} suffix tokens "
+                f"[{resolved['profile']}: {resolved['model']}, {resolved['max_tokens']} max, {resolved['timeout']}s]")
+    after = _hedge_after(resolved["profile"])
+    hedge = None
+    started = time.time()
+    try:
+        if after is not None and after < resolved["timeout"]:
+            output, hedge = _run_hedged(cmd, stdin, _cli_env(resolved["max_tokens"]),
+                                        resolved["timeout"], label, after)
+        else:
+            output = _run_cli(cmd, prompt=stdin, env=_cli_env(resolved["max_tokens"]),
+                              timeout=resolved["timeout"], label=label)
+        text, usage = _parse_cli_output(output, label)
+    except BaseException as e:
+        _record_call(resolved, layout, started, error=e, hedge=hedge)
+        raise
+    if usage:
+        logger.info(f"  cache: {'hit' if usage['cache_hit'] else 'miss'} "
+                    f"(read {usage['cache_read_tokens']:,}, wrote {usage['cache_write_tokens']:,}, "
+                    f"uncached {usage['input_tokens']:,})")
+    _record_call(resolved, layout, started, output=text, usage=usage, hedge=hedge)
+    return text
+
+
+def _call_llm(system_prompt: str, user_content: str, max_tokens: int = None,
+              timeout: int = None, profile: str = None) -> str:
+    """Call Claude via the local CLI. Hard-fails on error.
+
+    Model, max output tokens and timeout come from LLM_PROFILES[profile];
+    explicit max_tokens/timeout override the profile. The system prompt is
+    the cacheable prefix, user_content the per-call suffix (_prompt_layout).
+    Uses Popen with a poll loop so the process can be killed mid-run via
+    the run's cancel token.
+    """
+    _init_backend()
+
+    resolved = resolve_profile(profile, max_tokens, timeout)
+    return _run_recorded(
+        [_claude_path, "-p", "--model", resolved["model"]],
+        system_prompt, user_content, resolved, label="claude CLI",
     )
 
 
@@ -170,72 +449,146 @@ def _call_llm_with_tools(
     mcp_config_path: str,
     allowed_tools: list = None,
     timeout: int = None,
+    profile: str = "shape_and_publish_report",
 ) -> str:
     """Call Claude CLI with MCP tool access. Returns final text output.
 
     Like _call_llm() but adds --mcp-config and --allowedTools for MCP server
     access. Used by s12 to give the LLM direct Notion access.
-    Uses Popen with a poll loop so the process can be killed mid-run via _cancel_event.
+    Uses Popen with a poll loop so the process can be killed mid-run via the run's cancel token.
     """
     _init_backend()
 
-    prompt = f"{system_prompt}\n\n---\n\n{user_content}"
-    timeout = timeout or LLM_TOOL_TIMEOUT
-
-    env = {
-        **os.environ,
-        "CLAUDE_CODE_OAUTH_TOKEN": _oauth_token,
-        "CLAUDE_CODE_MAX_OUTPUT_TOKENS": str(LLM_MAX_OUTPUT_TOKENS),
-    }
-    env.pop("CLAUDECODE", None)
-
+    resolved = resolve_profile(profile, timeout=timeout)
     cmd = [
         _claude_path,
         "-p",
-        "--model", LLM_MODEL,
+        "--model", resolved["model"],
         "--mcp-config", mcp_config_path,
     ]
     if allowed_tools:
         cmd.extend(["--allowedTools", ",".join(allowed_tools)])
 
-    return _run_cli(cmd, prompt=prompt, env=env, timeout=timeout, label="claude CLI (with tools)")
+    return _run_recorded(cmd, system_prompt, user_content, resolved, label="claude CLI (with tools)")
 
 
-def _extract_json(text):
-    """Extract first JSON object from LLM text response."""
-    if isinstance(text, dict):
-        return text
-    if not isinstance(text, str):
-        return {}
-    try:
-        return json.loads(text)
-    except (json.JSONDecodeError, TypeError):
-        pass
-    m = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
-    if m:
-        try:
-            return json.loads(m.group(1))
-        except json.JSONDecodeError:
-            pass
-    m = re.search(r'\{[\s\S]*\}', text)
-    if m:
+# ── asyncio variants (run_pipeline_async) ──────────────────────────────────
+# Same layout, hedging and call records as _call_llm(), on an asyncio
+# subprocess: waiting for the CLI holds no thread, and cancelling the task
+# kills the process — no cancel-token polling.
+
+async def _run_cli_aio(cmd, prompt, env, timeout, label):
+    """_run_cli() as a coroutine. Task cancellation or the timeout kills the process."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+    )
+    with context.tracked("cli", label):
         try:
-            return json.loads(m.group(0))
-        except json.JSONDecodeError:
-            pass
-    return {}
+            stdout, stderr = await asyncio.wait_for(proc.communicate(prompt.encode()), timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"{label} timed out after {timeout}s")
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await asyncio.shield(proc.wait())
+
+    stdout, stderr = stdout.decode(), stderr.decode()
+    if proc.returncode != 0:
+        detail = stderr.strip() or stdout.strip()[:500]
+        raise RuntimeError(f"{label} exited {proc.returncode}: {detail}")
+
+    output = stdout.strip()
+    if not output:
+        raise RuntimeError(f"{label} returned empty output")
+    return output
+
+
+async def _run_hedged_aio(cmd, stdin, env, timeout, label, after):
+    """_run_hedged() with tasks: the losing leg is cancelled, which kills its process."""
+    deadline = time.time() + timeout
+
+    def start(name):
+        return asyncio.create_task(
+            _run_cli_aio(cmd, stdin, env, max(1, round(deadline - time.time())), label), name=name)
+
+    legs = {start("primary")}
+    try:
+        done, _ = await asyncio.wait(legs, timeout=after)
+        if not done and _claim_hedge():
+            logger.info(f"  hedge: {label} still running after p90 {after:.1f}s — starting a second call")
+            legs.add(start("hedge"))
+
+        errors = []
+        pending = set(legs)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if len(legs) > 1:
+                        logger.info(f"  hedge: {task.get_name()} call won")
+                    return task.result(), {"hedged": len(legs) > 1, "hedge_after_s": round(after, 2),
+                                           "hedge_winner": task.get_name()}
+                errors.append(task.exception())
+        raise errors[0]
+    finally:
+        for task in legs:
+            task.cancel()
+
+
+async def _run_recorded_aio(cmd, system_prompt, user_content, resolved, label):
+    """_run_recorded() as a coroutine."""
+    cmd, stdin, layout = _prompt_layout(cmd + ["--output-format", "json"], system_prompt, user_content)
+    logger.info(f"  prompt: ~{layout['prefix_tokens']:,} prefix + ~{layout['suffix_tokens']:,} suffix tokens "
+                f"[{resolved['profile']}: {resolved['model']}, {resolved['max_tokens']} max, {resolved['timeout']}s, aio]")
+    after = _hedge_after(resolved["profile"])
+    hedge = None
+    started = time.time()
+    try:
+        if after is not None and after < resolved["timeout"]:
+            output, hedge = await _run_hedged_aio(cmd, stdin, _cli_env(resolved["max_tokens"]),
+                                                  resolved["timeout"], label, after)
+        else:
+            output = await _run_cli_aio(cmd, stdin, _cli_env(resolved["max_tokens"]),
+                                        resolved["timeout"], label)
+        text, usage = _parse_cli_output(output, label)
+    except BaseException as e:
+        _record_call(resolved, layout, started, error=e, hedge=hedge)
+        raise
+    _record_call(resolved, layout, started, output=text, usage=usage, hedge=hedge)
+    return text
+
+
+async def _call_llm_aio(system_prompt: str, user_content: str, max_tokens: int = None,
+                        timeout: int = None, profile: str = None) -> str:
+    """_call_llm() as a coroutine."""
+    _init_backend()
+
+    resolved = resolve_profile(profile, max_tokens, timeout)
+    return await _run_recorded_aio(
+        [_claude_path, "-p", "--model", resolved["model"]],
+        system_prompt, user_content, resolved, label="claude CLI",
+    )
 
 
 # ── Sub-agent: Search Strategy Analyst ───────────────────────────────────────
 
 def search_strategy(target_company, target_domain, product_description,
-                    prior_runs=None):
+                    prior_runs=None, validation=None):
     """Analyze vendor/product → SLED segments, keywords, buyer types, opportunity types.
 
     Returns typed keyword lists optimized per opportunity type:
     - primary_keywords / alternate_keywords: general procurement terms
     - meeting_keywords: board-meeting agenda language for early buying intent
     - rfp_keywords: terms that appear in RFP/procurement documents
+
+    The response is parsed with local JSON repair and validated against
+    strategy.SCHEMA (enums, list limits, state codes). Required keys still
+    missing are re-asked once. validation: optional dict filled with the
+    schema report (json_repairs, fixed, dropped, truncated, missing, reasked).
     """
     system_prompt = (
         "You are a SLED (State, Local, Education, District) procurement intelligence analyst.\n\n"
@@ -278,6 +631,37 @@ def search_strategy(target_company, target_domain, product_description,
         "primary_keywords or buyer_types from prior runs unless no alternatives exist."
     )
 
+    content = _strategy_content(target_company, target_domain, product_description, prior_runs)
+    raw = _call_llm(system_prompt, content, profile="search_strategy")
+    parsed, repairs = strategy_schema.parse_json(raw)
+    strategy, report = strategy_schema.validate(parsed)
+    report["json_repairs"] = repairs
+    report["parsed"] = parsed is not None
+
+    # Re-ask only for required keys that are missing/invalid — a short call
+    # instead of regenerating the whole strategy.
+    report["reasked"] = []
+    if report["missing"] and cfg("STRATEGY_REASK_MISSING"):
+        report["reasked"] = list(report["missing"])
+        try:
+            extra = _strategy_missing_keys(
+                target_company, target_domain, product_description,
+                report["missing"], strategy,
+            )
+            strategy_schema.merge(strategy, extra)
+        except Exception as e:
+            logger.warning(f"  strategy re-ask failed: {e}")
+            report["reask_error"] = f"{type(e).__name__}: {e}"[:200]
+        report["missing"] = [f for f in report["missing"] if not strategy.get(f)]
+
+    strategy_schema.apply_defaults(strategy, target_company, product_description)
+    if validation is not None:
+        validation.update(report)
+    return strategy
+
+
+def _strategy_content(target_company, target_domain, product_description, prior_runs=None):
+    """Per-vendor input block for search_strategy and search_strategies_batch."""
     content = (
         f"Company: {target_company}\n"
         f"Domain: {target_domain}\n"
@@ -299,29 +683,95 @@ def search_strategy(target_company, target_domain, product_description,
                 if sec:
                     content += f"  Secondary: {sec[:300]}\n"
                 content += "\n"
+    return content
 
-    raw = _call_llm(system_prompt, content)
-    strategy = _extract_json(raw)
 
-    # Ensure required keys with sensible fallbacks
-    fallback_kw = target_company
-    strategy.setdefault("primary_keywords", [fallback_kw])
-    strategy.setdefault("alternate_keywords", [])
-    strategy.setdefault("meeting_keywords", [])
-    strategy.setdefault("rfp_keywords", [])
-    strategy.setdefault("buyer_types", [])
-    strategy.setdefault("sled_segments", strategy["buyer_types"])
-    strategy.setdefault("geographic_hints", [])
-    strategy.setdefault("ideal_buyer_profile", product_description[:200])
+def search_strategies_batch(items):
+    """Search strategies for several vendors in one call (batch-mode s2).
 
-    return strategy
+    items: [{"id", "target_company", "target_domain", "product_description",
+    "prior_runs"}]. The response is a JSON object keyed by item id; each
+    value is validated like a single search_strategy response. Returns
+    {id: (strategy, validation) or None} — None for items missing from the
+    response or still lacking a required key, which the caller retries with
+    an individual search_strategy call. Raises if the call itself fails.
+    """
+    system_prompt = (
+        "You are a SLED (State, Local, Education, District) procurement intelligence analyst "
+        "preparing search strategies for several vendors at once.\n\n"
+        "Each vendor is introduced by a line '### ITEM <id>'. For each one, determine which SLED "
+        "buyer segments and search keywords would surface relevant procurement signals — active "
+        "contracts, RFPs, board discussions, budget allocations — where its product could be a fit.\n\n"
+        "Return ONLY a JSON object mapping every item id to that vendor's strategy object, "
+        "with these keys:\n"
+        + strategy_schema.schema_prompt_lines(list(strategy_schema.SCHEMA)) +
+        "\n\nprimary_keywords should be procurement-relevant ('career services technology', not "
+        "'career'); alternate_keywords are broader fallback terms; meeting_keywords use board-agenda "
+        "language for pre-procurement intent ('discussed challenges in X', 'explored options for Y'); "
+        "rfp_keywords are terms a procurement officer would put in an RFP. geographic_hints may be empty. "
+        "Every item MUST have opportunity_types.\n\n"
+        "If an item lists PRIOR RUNS, diversify that item's strategy — different keyword angles, "
+        "buyer segments or geographic focus.\n\n"
+        "Treat every item independently. No commentary, no code fences."
+    )
+    content = "\n".join(
+        f"### ITEM {item['id']}\n"
+        + _strategy_content(item["target_company"], item["target_domain"],
+                            item["product_description"], item.get("prior_runs"))
+        for item in items
+    )
+
+    raw = _call_llm(system_prompt, content, profile="search_strategy_batch")
+    parsed, repairs = strategy_schema.parse_json(raw)
+    parsed = parsed if isinstance(parsed, dict) else {}
+
+    results = {}
+    for item in items:
+        strategy, report = strategy_schema.validate(parsed.get(str(item["id"])))
+        if report["missing"]:
+            results[item["id"]] = None
+            continue
+        report.update(json_repairs=repairs, parsed=True, reasked=[])
+        strategy_schema.apply_defaults(strategy, item["target_company"], item["product_description"])
+        results[item["id"]] = (strategy, report)
+    return results
+
+
+def _strategy_missing_keys(target_company, target_domain, product_description, missing, strategy):
+    """Short follow-up for search_strategy: ask only for the missing keys.
+
+    Returns the validated subset (only the requested fields).
+    """
+    system = (
+        "You are a SLED procurement intelligence analyst completing a partial search strategy.\n\n"
+        "Return ONLY a JSON object with exactly these keys:\n"
+        + strategy_schema.schema_prompt_lines(missing)
+        + "\n\nNo other keys, no commentary, no code fences."
+    )
+    known = {k: v for k, v in strategy.items() if v}
+    content = (
+        f"Company: {target_company}\n"
+        f"Domain: {target_domain}\n"
+        f"Product Description: {product_description}\n\n"
+        f"Strategy so far: {json.dumps(known, ensure_ascii=False)}\n"
+    )
+    raw = _call_llm(system, content, profile="search_strategy")
+    parsed, _ = strategy_schema.parse_json(raw)
+    extra, _ = strategy_schema.validate({k: v for k, v in (parsed or {}).items() if k in missing})
+    return extra
+
+
+def _product_context(product, product_desc):
+    """Product block that opens the s9 and s10 suffixes — byte-identical
+    across those calls, and the most stable part of the per-run data."""
+    return f"PROSPECT PRODUCT: {product}\nPRODUCT DESCRIPTION: {product_desc}\n\n"
 
 
 # ── Sub-agent: Featured Buyer Report Writer ─────────────────────────────────
 
-def featured_section(buyer_name, buyer_type, product, product_desc,
-                     profile_json, contacts_json, opps_json, ai_context=None):
-    """Generate the featured buyer deep-dive section."""
+def _featured_section_prompt(buyer_name, buyer_type, product, product_desc,
+                             profile_json, contacts_json, opps_json, ai_context=None):
+    """(system prompt, content) for the featured buyer section."""
     system_prompt = (
         "You are generating the Featured Buyer section for a Starbridge SLED intelligence report.\n\n"
         "CRITICAL: You MUST use ONLY the data provided below. Do NOT use any outside knowledge.\n"
@@ -353,9 +803,8 @@ def featured_section(buyer_name, buyer_type, product, product_desc,
     )
 
     content = (
-        f"PROSPECT PRODUCT: {product}\n"
-        f"PRODUCT DESCRIPTION: {product_desc}\n\n"
-        f"BUYER: {buyer_name}\n"
+        _product_context(product, product_desc)
+        + f"BUYER: {buyer_name}\n"
         f"BUYER TYPE: {buyer_type}\n\n"
         f"BUYER PROFILE:\n{profile_json}\n\n"
         f"CONTACTS:\n{contacts_json}\n\n"
@@ -363,14 +812,55 @@ def featured_section(buyer_name, buyer_type, product, product_desc,
     )
     if ai_context:
         content += f"AI STRATEGIC CONTEXT:\n{ai_context}\n"
+    return system_prompt, content
 
-    return _call_llm(system_prompt, content)
+
+def featured_section(buyer_name, buyer_type, product, product_desc,
+                     profile_json, contacts_json, opps_json, ai_context=None):
+    """Generate the featured buyer deep-dive section."""
+    return _call_llm(*_featured_section_prompt(buyer_name, buyer_type, product, product_desc,
+                                               profile_json, contacts_json, opps_json, ai_context),
+                     profile="featured_section")
+
+
+async def featured_section_aio(buyer_name, buyer_type, product, product_desc,
+                               profile_json, contacts_json, opps_json, ai_context=None):
+    """featured_section() as a coroutine."""
+    return await _call_llm_aio(*_featured_section_prompt(buyer_name, buyer_type, product, product_desc,
+                                                         profile_json, contacts_json, opps_json, ai_context),
+                               profile="featured_section")
+
+
+def _strategic_context_prompt(buyer_name, product, product_desc, ai_context):
+    """(system prompt, content) for the late-bound strategic context sub-section."""
+    system_prompt = (
+        "You are adding a Strategic Context sub-section to the Featured Buyer section of a "
+        "Starbridge SLED intelligence report. The rest of the section is already written.\n\n"
+        "Use ONLY the AI STRATEGIC CONTEXT below — Starbridge's own answer about this buyer. "
+        "Do NOT use outside knowledge or repeat generic claims.\n\n"
+        "Output 2-4 bullets. Each names a specific priority, initiative, budget or timing from "
+        "the context and says in one sentence what it means for selling the prospect's product.\n"
+        "No heading, no preamble, no meta-commentary — clean markdown bullets only."
+    )
+    content = (
+        _product_context(product, product_desc)
+        + f"BUYER: {buyer_name}\n\n"
+        f"AI STRATEGIC CONTEXT:\n{ai_context}\n"
+    )
+    return system_prompt, content
+
+
+def strategic_context(buyer_name, product, product_desc, ai_context):
+    """Strategic context sub-section from a buyer_chat answer that arrived after
+    s9 wrote the featured section (LATE_BIND_AI_CONTEXT)."""
+    return _call_llm(*_strategic_context_prompt(buyer_name, product, product_desc, ai_context),
+                     profile="strategic_context")
 
 
 # ── Sub-agent: Secondary Buyer Card Writer ──────────────────────────────────
 
-def secondary_cards(product, product_desc, buyers_content):
-    """Generate compact cards for secondary SLED buyers."""
+def _secondary_cards_prompt(product, product_desc, buyers_content):
+    """(system prompt, content) for secondary buyer cards."""
     system_prompt = (
         "Generate compact buyer cards for secondary SLED buyers.\n\n"
         "For each buyer, output exactly:\n\n"
@@ -381,10 +871,23 @@ def secondary_cards(product, product_desc, buyers_content):
         "Keep each card to 3-4 lines. Be specific — name initiatives, not generic claims.\n"
         "Output as clean markdown. No meta-commentary."
     )
+    return system_prompt, _product_context(product, product_desc) + buyers_content
+
 
-    content = f"PROSPECT PRODUCT: {product}\nPRODUCT DESCRIPTION: {product_desc}\n\n{buyers_content}"
+def secondary_cards(product, product_desc, buyers_content, timeout=None):
+    """Generate compact cards for secondary SLED buyers.
+
+    Called once with every buyer block, or once per buyer (with a per-card
+    timeout) when s10 runs in parallel mode.
+    """
+    return _call_llm(*_secondary_cards_prompt(product, product_desc, buyers_content),
+                     timeout=timeout, profile="secondary_cards")
 
-    return _call_llm(system_prompt, content)
+
+async def secondary_cards_aio(product, product_desc, buyers_content, timeout=None):
+    """secondary_cards() as a coroutine."""
+    return await _call_llm_aio(*_secondary_cards_prompt(product, product_desc, buyers_content),
+                               timeout=timeout, profile="secondary_cards")
 
 
 # ── Sub-agent: Report Shaper + Notion Publisher (s12) ─────────────────────
@@ -566,11 +1069,16 @@ def fix_report(buyer_name, report_markdown, issues, warnings):
         f"ORIGINAL REPORT:\n{report_markdown}"
     )
 
-    return _call_llm(system_prompt, content)
+    return _call_llm(system_prompt, content, profile="fix_report")
+
 
+def fact_check(buyer_name, report_text, claims=None, source_excerpt=None):
+    """Check report for internal consistency. Returns (passed, detail).
 
-def fact_check(buyer_name, report_text):
-    """Check report for internal consistency. Returns (passed, detail)."""
+    claims: [{kind, text}] the deterministic verifier could not match to source
+    data (s13 gated mode) — listed first so the check focuses on them.
+    source_excerpt: compact source data the claims should have come from.
+    """
     system_prompt = (
         "You are a fact-checker reviewing a SLED intelligence report for internal consistency.\n\n"
         "CHECK FOR:\n"
@@ -585,8 +1093,16 @@ def fact_check(buyer_name, report_text):
         "Respond with ONLY: PASS or FAIL followed by a numbered list of issues found."
     )
 
-    content = f"BUYER: {buyer_name}\n\nREPORT TO CHECK:\n{report_text[:4000]}"
-    result = _call_llm(system_prompt, content, max_tokens=1024)
+    content = f"BUYER: {buyer_name}\n\n"
+    if claims:
+        content += (
+            "UNVERIFIED CLAIMS (not found in source data — check these first):\n"
+            + "\n".join(f"- [{c['kind']}] {c['text']}" for c in claims) + "\n\n"
+        )
+    if source_excerpt:
+        content += f"SOURCE DATA (excerpt):\n{source_excerpt}\n\n"
+    content += f"REPORT TO CHECK:\n{report_text[:4000]}"
+    result = _call_llm(system_prompt, content, profile="fact_check")
 
     if isinstance(result, str) and "FAIL" in result.upper():
         return False, result[:500]
@@ -613,7 +1129,7 @@ def ask(question: str, context: str = None) -> str:
     if context:
         content = f"CONTEXT:\n{context}\n\nQUESTION:\n{question}"
 
-    return _call_llm(system, content)
+    return _call_llm(system, content, profile="ask")
 
 
 if __name__ == "__main__":
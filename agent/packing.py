@@ -0,0 +1,186 @@
+"""Prompt packing — fit source data into LLM token budgets with whole records.
+
+The section generators (s9, s10) used to pass `json.dumps(x, indent=2)[:N]`:
+indentation burned a large share of the budget, and the hard slice cut records
+in half. Everything here serializes compactly, drops fields the prompts never
+use, ranks records by relevance, and adds records whole until the token budget
+is spent — so the prompt is shorter AND carries more real data.
+
+Token counts are estimates (no tokenizer dependency): each run of up to 4 word
+characters, each run of up to 3 punctuation marks (`":"`, `","`) and each
+newline+indent counts as one token, which tracks Claude's tokenizer closely
+enough for budgeting on JSON and English prose.
+"""
+
+import json
+import re
+
+_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]{1,3}|\n\s*| {2,}")
+
+# Sentence / paragraph boundaries used when free text must be shortened.
+_BOUNDARY_RE = re.compile(r"(?:\n\n|[.!?][\s\"')\]]|\n)")
+
+# Fields the s9/s10 prompts actually use. Everything else (ids, logo URLs,
+# search highlights, enrichment-run metadata) is dropped before packing.
+CONTACT_FIELDS = ("name", "title", "email", "emailVerified", "phone")
+OPPORTUNITY_FIELDS = (
+    "title", "summary", "type", "status", "documentType",
+    "postedDate", "dueDate", "untilDate", "createdAt",
+    "purchaseAmount", "amount", "value", "contractAmount",
+)
+
+# Profile keys with no value to the report writer. The profile schema is rich
+# and varies by buyer type, so it is pruned by exclusion rather than whitelist.
+PROFILE_DROP_KEYS = frozenset({
+    "id", "mainId", "main", "prime", "nameNormalized", "source", "file",
+    "foiaRequestContactId", "foiaRequestFormUrl", "logoUrl", "logoPath",
+    "buyerLogoUrl", "countryCode", "location", "createdAt", "updatedAt",
+    "ncesId", "ncesIdString", "ncesStateDistrictId", "lmsArray",
+})
+
+# Title words that mark a decision-maker, strongest first.
+_SENIORITY = (
+    "superintendent", "chief", "president", "chancellor", "provost",
+    "commissioner", "vice president", "vp", "dean", "director", "head",
+    "manager", "coordinator",
+)
+
+
+def estimate_tokens(text):
+    """Approximate token count for a string."""
+    return len(_TOKEN_RE.findall(text or ""))
+
+
+def compact_json(value):
+    """Serialize without whitespace padding or ASCII escaping."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def prune(value, fields=None, drop=frozenset()):
+    """Drop empty values recursively; restrict top-level keys to `fields` if given."""
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            if (fields is not None and k not in fields) or k in drop:
+                continue
+            v = prune(v, drop=drop)
+            if v not in (None, "", [], {}):
+                out[k] = v
+        return out
+    if isinstance(value, list):
+        items = [prune(v, drop=drop) for v in value]
+        return [v for v in items if v not in (None, "", [], {})]
+    return value
+
+
+def truncate_text(text, budget):
+    """Shorten free text to `budget` tokens, ending on a sentence or paragraph."""
+    text = str(text or "")
+    if estimate_tokens(text) <= budget:
+        return text
+    # Walk token matches to the char offset where the budget runs out.
+    cut = 0
+    for i, m in enumerate(_TOKEN_RE.finditer(text)):
+        if i >= budget:
+            break
+        cut = m.end()
+    head = text[:cut]
+    ends = [m.end() for m in _BOUNDARY_RE.finditer(head)]
+    # Only back off to a boundary if it keeps most of the allowance.
+    if ends and ends[-1] > len(head) // 2:
+        head = head[:ends[-1]]
+    return head.rstrip() + " …"
+
+
+def _fit(value, budget):
+    """Largest subset of `value` (order preserved) that serializes within budget.
+
+    Dicts keep their cheapest fields first, so short scalar facts survive when a
+    long free-text field doesn't fit. Lists keep whole leading items. Strings are
+    shortened at a sentence boundary. Returns None when nothing useful fits.
+    """
+    if estimate_tokens(compact_json(value)) <= budget:
+        return value
+    if isinstance(value, dict):
+        remaining = budget - 2
+        kept = {}
+        for k in sorted(value, key=lambda k: estimate_tokens(compact_json(value[k]))):
+            key_cost = estimate_tokens(compact_json(k)) + 1
+            sub = _fit(value[k], remaining - key_cost)
+            if sub is None:
+                continue
+            cost = key_cost + estimate_tokens(compact_json(sub))
+            if cost <= remaining:
+                kept[k] = sub
+                remaining -= cost
+        return {k: kept[k] for k in value if k in kept} or None
+    if isinstance(value, list):
+        out, remaining = [], budget - 2
+        for item in value:
+            cost = estimate_tokens(compact_json(item)) + 1
+            if cost > remaining:
+                break
+            out.append(item)
+            remaining -= cost
+        return out or None
+    if isinstance(value, str) and budget >= 8:
+        return truncate_text(value, budget - 2)
+    return None
+
+
+def pack_object(obj, budget, drop=PROFILE_DROP_KEYS):
+    """Pack a single object (e.g. a buyer profile). Returns (json_str, stats)."""
+    pruned = prune(obj, drop=drop) if isinstance(obj, (dict, list)) else obj
+    fitted = _fit(pruned, budget)
+    text = compact_json(fitted if fitted is not None else {})
+    return text, {"tokens": estimate_tokens(text), "budget": budget,
+                  "trimmed": fitted != pruned}
+
+
+def pack_records(records, budget, fields=None, max_records=None):
+    """Pack a ranked list of records as a JSON array of WHOLE records.
+
+    Records are added in order until the next one would overflow `budget`;
+    nothing is cut mid-record. Returns (json_str, stats).
+    """
+    records = list(records or [])[:max_records]
+    packed, used = [], 2
+    for r in records:
+        item = prune(r, fields=fields) if isinstance(r, dict) else r
+        cost = estimate_tokens(compact_json(item)) + 1
+        if used + cost > budget:
+            if not packed:
+                # A single oversized record is shortened rather than lost.
+                item = _fit(item, budget - used)
+                if item is not None:
+                    packed.append(item)
+            break
+        packed.append(item)
+        used += cost
+    text = compact_json(packed)
+    return text, {"records": len(records), "packed": len(packed),
+                  "tokens": estimate_tokens(text), "budget": budget}
+
+
+# ── Relevance ranking ───────────────────────────────────────────────────────
+
+def rank_contacts(contacts):
+    """Order contacts best-first: verified email, any email, then seniority."""
+    def _key(c):
+        title = (c.get("title") or "").lower()
+        seniority = next((len(_SENIORITY) - i for i, w in enumerate(_SENIORITY)
+                          if re.search(rf"\b{w}\b", title)), 0)
+        return (bool(c.get("emailVerified")), bool(c.get("email")), seniority)
+    return sorted(contacts or [], key=_key, reverse=True)
+
+
+def rank_opportunities(opps, keywords=()):
+    """Order opportunities best-first: keyword overlap, then most recent."""
+    words = {w.lower() for kw in keywords for w in str(kw).split() if len(w) > 2}
+
+    def _key(o):
+        text = f"{o.get('title') or ''} {o.get('summary') or ''}".lower()
+        hits = sum(1 for w in words if w in text)
+        date = str(o.get("postedDate") or o.get("date") or o.get("createdAt") or "")
+        return (hits, date)
+    return sorted(opps or [], key=_key, reverse=True)
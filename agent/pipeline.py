@@ -1,45 +1,38 @@
-"""Intel brief pipeline — 18 steps from webhook to published Notion report.
+"""Intel brief pipeline — 19 steps from webhook to published Notion report.
 
-LLM calls (s2, s9, s10, s12, s13) go through agent.llm sub-agents.
-s12 uses MCP tool access to shape the report AND publish to Notion in one session.
+LLM calls (s2, s9, s10, s13) go through agent.llm sub-agents.
+s12 assembles the report locally (agent.report) and publishes to Notion directly;
+REPORT_ASSEMBLY_MODE="llm" switches it to an MCP-enabled LLM session instead.
 Starbridge tool calls (s3a, s3b, s3c, s6=profile+contacts+chat, s7×N) go through agent.tools.
+Each run executes in its own RunContext (agent.context) — config snapshot,
+cancel token and LLM telemetry are per run, not module globals.
 """
 
 import json
 import logging
 import re
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 
-from . import llm, tools
+from . import (budget, context, executors, factcheck, latebind, llm, packing, profiles, repair, scheduler,
+               speculation, tools)
+from . import strategy as strategy_schema
 from .config import (
-    AI_CONTACTS_CHAR_LIMIT,
-    AI_CONTACTS_MAX,
-    AI_CONTEXT_CHAR_LIMIT,
-    AI_OPPS_CHAR_LIMIT,
-    AI_OPPS_MAX,
-    AI_PROFILE_CHAR_LIMIT,
-    AI_REPORT_SECTION_CHAR_LIMIT,
-    BUYER_SEARCH_PAGE_SIZE,
     BUYER_TYPE_LABEL,
-    CTA_BUYERS_COUNT,
-    CTA_RECORDS_COUNT,
-    ENABLE_PRIOR_RUN_DEDUP,
-    FEATURED_CONTACT_PAGE_SIZE,
-    MAX_SECONDARY_BUYERS,
-    MAX_WORKERS_DISCOVERY,
-    MAX_WORKERS_ENRICHMENT,
-    MAX_WORKERS_FEATURED,
-    MAX_WORKERS_SECONDARY,
-    NOTION_PARENT_PAGE_ID,
-    OPPORTUNITY_PAGE_SIZE,
-    SECONDARY_CONTACT_PAGE_SIZE,
     STATE_CODES,
-    TIMEOUTS,
 )
+from .context import RunContext, cfg
 from .db import (
     StepTimer,
+    delete_checkpoints,
+    delete_run_rows,
+    get_cached_strategy,
+    get_checkpoints,
+    get_run,
     init_db,
     insert_contacts,
     insert_discoveries,
@@ -47,11 +40,16 @@ from .db import (
     insert_run_stub,
     load_prior_runs,
     log_step,
+    put_cached_strategy,
+    save_checkpoint,
     update_run_cancelled,
     update_run_completed,
     update_run_discovery,
     update_run_failed,
+    update_run_late_context,
 )
+from .report import assemble_report, report_title, template_secondary_card, with_strategic_context
+from .scoring import IncrementalRanker, direct_buyer, score_buyers, signal_buyer
 
 logger = logging.getLogger("pipeline")
 
@@ -100,6 +98,20 @@ def _summarize_output(data, max_str=10000, max_items=10):
 
 # ── Helpers ─────────────────────────────────────────────────────────────────
 
+@contextmanager
+def _llm_step(run_id, step):
+    """StepTimer that also records each LLM call made inside it (profile,
+    model, max tokens, timeout, duration) as metadata["LLM_CALLS"] — on
+    failure too. The list is exposed as t.llm_calls for worker threads."""
+    with StepTimer(run_id, step) as t, llm.record_calls() as calls:
+        t.llm_calls = calls
+        try:
+            yield t
+        finally:
+            if calls:
+                t.metadata = {**(t.metadata or {}), "LLM_CALLS": calls}
+
+
 def _opps_list(raw):
     """Normalize opportunity search results to a list."""
     if isinstance(raw, list):
@@ -172,34 +184,206 @@ def s1_validate_and_load(state: dict) -> dict:
         run_id = insert_run_stub(state)
         logger.info(f"  run_id={run_id} (stub created)")
 
-    if ENABLE_PRIOR_RUN_DEDUP and domain:
+    dedup = cfg("ENABLE_PRIOR_RUN_DEDUP")
+    if dedup and domain:
         prior_runs = load_prior_runs(domain)
     else:
         prior_runs = []
 
-    logger.info(f"  prior runs: {len(prior_runs)} (dedup={'on' if ENABLE_PRIOR_RUN_DEDUP else 'off'})")
+    logger.info(f"  prior runs: {len(prior_runs)} (dedup={'on' if dedup else 'off'})")
     # Duration is added retroactively by the orchestrator
     return {"PRIOR_RUNS": prior_runs, "DB_RUN_ID": run_id}
 
 
 # ── Phase III: ANALYZE ──────────────────────────────────────────────────────
 
+# One lock per strategy-cache key: concurrent runs for the same domain +
+# product wait for the first LLM call instead of each making their own.
+_strategy_locks = {}
+_strategy_locks_guard = threading.Lock()
+
+
+def _strategy_lock(key):
+    with _strategy_locks_guard:
+        return _strategy_locks.setdefault(key, threading.Lock())
+
+
+# Batched s2 (POST /api/batch): run id → {"future", "key"}. prefetch_strategies
+# fills it when a batch is accepted, one entry per row run; that run's s2 takes
+# its own entry, and the server drops it when the run ends without reaching s2
+# (drop_prefetched_strategy). Runs outside the batch never see these entries.
+_strategy_prefetch = {}
+_strategy_prefetch_guard = threading.Lock()
+
+
+def prefetch_strategies(webhooks, run_ids):
+    """Start batched strategy generation for a /api/batch submission.
+
+    Each row is keyed exactly as s2 will key it (same prior runs s1 loads).
+    Rows already in the strategy cache are skipped and duplicate keys share
+    one item; the rest are split into chunks of STRATEGY_BATCH_SIZE, each
+    requested with one llm.search_strategies_batch call on its own thread.
+    run_ids: the batch's pre-created run ids, one per webhook — only those
+    runs take the results. Returns the number of chunks started (0 when
+    batching is off).
+    """
+    batch_size = cfg("STRATEGY_BATCH_SIZE")
+    if batch_size < 2:
+        return 0
+    init_db()
+
+    dedup = cfg("ENABLE_PRIOR_RUN_DEDUP")
+    ttl_hours = cfg("STRATEGY_CACHE_TTL_HOURS")
+    pending = {}
+    for wh, run_id in zip(webhooks, run_ids):
+        domain = wh.get("target_domain", "")
+        prior_runs = load_prior_runs(domain) if dedup and domain else []
+        key = strategy_schema.cache_key(domain, wh.get("product_description", ""),
+                                        dedup, prior_runs)["key"]
+        if key in pending:
+            pending[key]["run_ids"].append(run_id)
+            continue
+        if ttl_hours > 0 and get_cached_strategy(key, ttl_hours * 3600, touch=False):
+            continue
+        pending[key] = {"run_ids": [run_id], "item": {
+            "target_company": wh.get("target_company", ""),
+            "target_domain": domain,
+            "product_description": wh.get("product_description", ""),
+            "prior_runs": prior_runs,
+        }}
+
+    keys = list(pending)
+    chunks = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+    for chunk in chunks:
+        future = Future()
+        with _strategy_prefetch_guard:
+            for key in chunk:
+                for run_id in pending[key]["run_ids"]:
+                    _strategy_prefetch[run_id] = {"future": future, "key": key}
+        items = [{**pending[key]["item"], "id": str(i + 1)} for i, key in enumerate(chunk)]
+        threading.Thread(target=context.bind(_run_strategy_batch), args=(chunk, items, future),
+                         name="s2-batch", daemon=True).start()
+    if chunks:
+        logger.info(f"[s2] Batched strategies: {len(keys)} vendors in {len(chunks)} call(s) "
+                    f"({len(webhooks) - len(keys)} rows cached or duplicate)")
+    return len(chunks)
+
+
+def _run_strategy_batch(keys, items, future):
+    """Worker for prefetch_strategies: one batched call, results by cache key."""
+    calls = []
+    started = time.time()
+    batch = {"size": len(items), "results": {}}
+    try:
+        with llm.record_calls(calls):
+            results = llm.search_strategies_batch(items)
+        batch["results"] = {key: results.get(item["id"]) for key, item in zip(keys, items)}
+    except Exception as e:
+        logger.warning(f"[s2] batched strategy call failed ({len(items)} vendors): {e}")
+        batch["error"] = f"{type(e).__name__}: {e}"[:200]
+    batch["duration_s"] = round(time.time() - started, 2)
+    batch["llm_calls"] = calls
+    future.set_result(batch)
+
+
+def drop_prefetched_strategy(run_id):
+    """Forget a run's prefetched strategy — the run ended without taking it."""
+    with _strategy_prefetch_guard:
+        _strategy_prefetch.pop(run_id, None)
+
+
+def _take_prefetched_strategy(run_id, key):
+    """Take this run's batched strategy and wait for its chunk, if one was prefetched.
+
+    Returns (strategy, validation, STRATEGY_BATCH metadata) — strategy None
+    when the batch failed, missed the item, timed out or the run's prior-run
+    fingerprint changed since submission — or None when the run isn't part
+    of a batch.
+    """
+    with _strategy_prefetch_guard:
+        entry = _strategy_prefetch.pop(run_id, None)
+    if entry is None:
+        return None
+    if entry["key"] != key:
+        return None, None, {"used": False, "fallback": "prior runs changed since submission"}
+
+    waited = time.time()
+    try:
+        batch = entry["future"].result(timeout=llm.resolve_profile("search_strategy_batch")["timeout"] + 30)
+    except FuturesTimeout:
+        return None, None, {"used": False, "fallback": "timeout"}
+    meta = {"size": batch["size"], "duration_s": batch["duration_s"],
+            "waited_s": round(time.time() - waited, 2), "llm_calls": len(batch["llm_calls"])}
+    result = batch["results"].get(key)
+    if result is None:
+        return None, None, {**meta, "used": False, "fallback": batch.get("error") or "missing from batch response"}
+    strategy, validation = result
+    return json.loads(json.dumps(strategy)), dict(validation), {**meta, "used": True}
+
+
 def s2_search_strategy(state: dict) -> dict:
-    """s2 — LLM sub-agent: analyze target → SLED segments + search keywords + opp types."""
+    """s2 — LLM sub-agent: analyze target → SLED segments + search keywords + opp types.
+
+    Served from the strategy cache when a strategy for the same domain,
+    product description, dedup mode and completed prior runs is fresh. In
+    a /api/batch run, takes the strategy from the batch's shared call
+    (prefetch_strategies) and falls back to its own call if that failed.
+    """
     logger.info("[s2] Generating search strategy via LLM")
 
     run_id = state.get("DB_RUN_ID")
-
-    with StepTimer(run_id, "s2_search_strategy") as t:
-        strategy = llm.search_strategy(
-            target_company=state["target_company"],
-            target_domain=state["target_domain"],
-            product_description=state["product_description"],
-            prior_runs=state.get("PRIOR_RUNS", []),
-        )
-        t.message = f"kw={strategy['primary_keywords']}, types={strategy.get('opportunity_types', [])}"
-        t.metadata = _summarize_output({"SEARCH_STRATEGY": strategy})
-
+    prior_runs = state.get("PRIOR_RUNS", [])
+    key = strategy_schema.cache_key(
+        state["target_domain"], state["product_description"], cfg("ENABLE_PRIOR_RUN_DEDUP"), prior_runs,
+    )
+    cache = {k: key[k] for k in ("domain", "product_hash", "dedup", "prior_fingerprint")}
+    ttl_hours = cfg("STRATEGY_CACHE_TTL_HOURS")
+    cache_on = ttl_hours > 0
+    lock = _strategy_lock(key["key"]) if cache_on else nullcontext()
+
+    with _llm_step(run_id, "s2_search_strategy") as t:
+        # A batch run waits for its chunk before taking the key lock, so runs
+        # outside the batch with the same key aren't held behind that wait.
+        prefetched = _take_prefetched_strategy(run_id, key["key"])
+        with lock:
+            hit = get_cached_strategy(key["key"], ttl_hours * 3600) if cache_on else None
+            if hit:
+                strategy = hit["strategy"]
+                cache.update(hit=True, source_run_id=hit["source_run_id"],
+                             age_seconds=hit["age_seconds"], hits=hit["hits"])
+                t.message = (f"kw={strategy['primary_keywords']}, types={strategy.get('opportunity_types', [])} "
+                             f"(cache hit: run {hit['source_run_id']}, {hit['age_seconds'] / 60:.0f}m old)")
+                t.metadata = _summarize_output({"SEARCH_STRATEGY": strategy, "STRATEGY_CACHE": cache})
+            else:
+                strategy, validation, batch = prefetched or (None, {}, None)
+                if strategy is None:
+                    validation = {}
+                    strategy = llm.search_strategy(
+                        target_company=state["target_company"],
+                        target_domain=state["target_domain"],
+                        product_description=state["product_description"],
+                        prior_runs=prior_runs,
+                        validation=validation,
+                    )
+                t.message = f"kw={strategy['primary_keywords']}, types={strategy.get('opportunity_types', [])}"
+                if batch:
+                    t.message += (f" (batched: {batch['size']} vendors)" if batch["used"]
+                                  else f" (batch fallback: {batch['fallback']})")
+                if validation.get("json_repairs") or validation.get("reasked"):
+                    t.message += (f" (repaired: {', '.join(validation['json_repairs']) or 'none'}"
+                                  f"{', re-asked ' + ', '.join(validation['reasked']) if validation['reasked'] else ''})")
+                if validation.get("missing"):
+                    t.status = "warning"
+                cache["hit"] = False
+                cache["stored"] = cache_on and not validation.get("missing")
+                if cache["stored"]:
+                    put_cached_strategy(key, strategy, run_id)
+                t.metadata = _summarize_output({"SEARCH_STRATEGY": strategy, "STRATEGY_VALIDATION": validation,
+                                                "STRATEGY_CACHE": cache})
+                if batch:
+                    t.metadata["STRATEGY_BATCH"] = batch
+
+    logger.info(f"  strategy cache: {'hit' if cache.get('hit') else 'miss' if cache_on else 'off'}")
     logger.info(f"  primary kw: {strategy['primary_keywords']}")
     logger.info(f"  alternate kw: {strategy['alternate_keywords']}")
     logger.info(f"  buyer types: {strategy['buyer_types']}")
@@ -210,22 +394,61 @@ def s2_search_strategy(state: dict) -> dict:
 
 # ── Phase IV: DISCOVER ──────────────────────────────────────────────────────
 
+def _s3a_params(strategy):
+    """opportunity_search kwargs for s3a: primary + meeting keywords."""
+    return {
+        "search_query": " ".join(strategy.get("primary_keywords", []) + strategy.get("meeting_keywords", [])),
+        "types": strategy.get("opportunity_types", []),
+        "page_size": cfg("OPPORTUNITY_PAGE_SIZE"),
+    }
+
+
+def _s3b_params(strategy):
+    """opportunity_search kwargs for s3b: alternate + rfp keywords (None: nothing to search)."""
+    kw = " ".join(strategy.get("alternate_keywords", []) + strategy.get("rfp_keywords", []))
+    if not kw.strip():
+        return None
+    return {"search_query": kw, "types": strategy.get("opportunity_types", []),
+            "page_size": cfg("OPPORTUNITY_PAGE_SIZE")}
+
+
+def _s3c_params(strategy):
+    """buyer_search kwargs for s3c: buyer types + a name keyword (None: no buyer types)."""
+    buyer_types = strategy.get("buyer_types", [])
+    if not buyer_types:
+        return None
+    # Extract first significant keyword from ideal_buyer_profile for name-contains filter
+    profile = strategy.get("ideal_buyer_profile", "")
+    profile_words = [w for w in profile.split() if len(w) > 3 and w.lower() not in _STOP_WORDS]
+    return {"query": profile_words[0] if profile_words else None, "buyer_types": buyer_types,
+            "page_size": cfg("BUYER_SEARCH_PAGE_SIZE")}
+
+
+def _s3d_params(strategy):
+    """buyer_search kwargs for s3d: state codes from geographic hints (None: no usable hints)."""
+    state_codes = []
+    for hint in strategy.get("geographic_hints", [])[:3]:
+        h = hint.strip()
+        if len(h) == 2 and h.upper().isalpha():
+            state_codes.append(h.upper())
+        else:
+            code = STATE_CODES.get(h.lower())
+            if code:
+                state_codes.append(code)
+    if not state_codes:
+        return None
+    return {"states": state_codes, "page_size": cfg("BUYER_SEARCH_PAGE_SIZE")}
+
+
 def s3a_primary_search(state: dict) -> dict:
     """s3a — opportunity_search with primary keywords."""
-    primary = state["SEARCH_STRATEGY"].get("primary_keywords", [])
-    meeting = state["SEARCH_STRATEGY"].get("meeting_keywords", [])
-    kw = " ".join(primary + meeting)
-    opp_types = state["SEARCH_STRATEGY"].get("opportunity_types", [])
-    logger.info(f"[s3a] Opportunity search (primary+meeting): '{kw}' types={opp_types}")
+    params = _s3a_params(state["SEARCH_STRATEGY"])
+    logger.info(f"[s3a] Opportunity search (primary+meeting): '{params['search_query']}' types={params['types']}")
 
     run_id = state.get("DB_RUN_ID")
 
     with StepTimer(run_id, "s3a_primary_search") as t:
-        raw = tools.opportunity_search(
-            search_query=kw,
-            types=opp_types,
-            page_size=OPPORTUNITY_PAGE_SIZE,
-        )
+        raw = tools.opportunity_search(**params)
         opps = _opps_list(raw)
         t.message = f"{len(opps)} results"
         t.metadata = _summarize_output({"DISCOVERY_SIGNALS_A": opps})
@@ -236,26 +459,19 @@ def s3a_primary_search(state: dict) -> dict:
 
 def s3b_alternate_search(state: dict) -> dict:
     """s3b — opportunity_search with alternate keywords."""
-    alternate = state["SEARCH_STRATEGY"].get("alternate_keywords", [])
-    rfp = state["SEARCH_STRATEGY"].get("rfp_keywords", [])
-    kw = " ".join(alternate + rfp)
-    if not kw.strip():
+    params = _s3b_params(state["SEARCH_STRATEGY"])
+    if params is None:
         logger.info("[s3b] No alternate/rfp keywords, skipping")
         log_step(state.get("DB_RUN_ID"), "s3b_alternate_search", "skipped",
                  "No alternate/rfp keywords", duration=0)
         return {"DISCOVERY_SIGNALS_B": []}
 
-    opp_types = state["SEARCH_STRATEGY"].get("opportunity_types", [])
-    logger.info(f"[s3b] Opportunity search (alternate+rfp): '{kw}' types={opp_types}")
+    logger.info(f"[s3b] Opportunity search (alternate+rfp): '{params['search_query']}' types={params['types']}")
 
     run_id = state.get("DB_RUN_ID")
 
     with StepTimer(run_id, "s3b_alternate_search") as t:
-        raw = tools.opportunity_search(
-            search_query=kw,
-            types=opp_types,
-            page_size=OPPORTUNITY_PAGE_SIZE,
-        )
+        raw = tools.opportunity_search(**params)
         opps = _opps_list(raw)
         t.message = f"{len(opps)} results"
         t.metadata = _summarize_output({"DISCOVERY_SIGNALS_B": opps})
@@ -270,29 +486,18 @@ def s3c_buyer_type_search(state: dict) -> dict:
     Searches for buyers matching the LLM-selected buyer types (e.g.
     SchoolDistrict, City). Runs in parallel with s3d (geographic search).
     """
-    strategy = state["SEARCH_STRATEGY"]
-    buyer_types = strategy.get("buyer_types", [])
-
-    if not buyer_types:
+    params = _s3c_params(state["SEARCH_STRATEGY"])
+    if params is None:
         logger.info("[s3c] No buyer types — skipping")
         log_step(state.get("DB_RUN_ID"), "s3c_buyer_type_search", "skipped",
                  "No buyer types in strategy", duration=0)
         return {"DISCOVERY_BUYERS_C": []}
 
-    # Extract first significant keyword from ideal_buyer_profile for name-contains filter
-    profile = strategy.get("ideal_buyer_profile", "")
-    profile_words = [w for w in profile.split() if len(w) > 3 and w.lower() not in _STOP_WORDS]
-    query = profile_words[0] if profile_words else None
-
-    logger.info(f"[s3c] Buyer type search: types={buyer_types} query={query}")
+    logger.info(f"[s3c] Buyer type search: types={params['buyer_types']} query={params['query']}")
     run_id = state.get("DB_RUN_ID")
 
     with StepTimer(run_id, "s3c_buyer_type_search") as t:
-        raw = tools.buyer_search(
-            query=query,
-            buyer_types=buyer_types,
-            page_size=BUYER_SEARCH_PAGE_SIZE,
-        )
+        raw = tools.buyer_search(**params)
         buyers = _buyers_list(raw)
         t.message = f"{len(buyers)} buyers"
         t.metadata = _summarize_output({"DISCOVERY_BUYERS_C": buyers})
@@ -307,33 +512,18 @@ def s3d_buyer_geo_search(state: dict) -> dict:
     Searches for buyers in the LLM-identified geographic regions.
     Runs in parallel with s3c (buyer type search).
     """
-    strategy = state["SEARCH_STRATEGY"]
-    geo = strategy.get("geographic_hints", [])
-
-    state_codes = []
-    for hint in geo[:3]:
-        h = hint.strip()
-        if len(h) == 2 and h.upper().isalpha():
-            state_codes.append(h.upper())
-        else:
-            code = STATE_CODES.get(h.lower())
-            if code:
-                state_codes.append(code)
-
-    if not state_codes:
+    params = _s3d_params(state["SEARCH_STRATEGY"])
+    if params is None:
         logger.info("[s3d] No geographic hints — skipping")
         log_step(state.get("DB_RUN_ID"), "s3d_buyer_geo_search", "skipped",
                  "No geographic hints in strategy", duration=0)
         return {"DISCOVERY_BUYERS_D": []}
 
-    logger.info(f"[s3d] Buyer geo search: states={state_codes}")
+    logger.info(f"[s3d] Buyer geo search: states={params['states']}")
     run_id = state.get("DB_RUN_ID")
 
     with StepTimer(run_id, "s3d_buyer_geo_search") as t:
-        raw = tools.buyer_search(
-            states=state_codes,
-            page_size=BUYER_SEARCH_PAGE_SIZE,
-        )
+        raw = tools.buyer_search(**params)
         buyers = _buyers_list(raw)
         t.message = f"{len(buyers)} buyers"
         t.metadata = _summarize_output({"DISCOVERY_BUYERS_D": buyers})
@@ -344,11 +534,240 @@ def s3d_buyer_geo_search(state: dict) -> dict:
 
 # ── Phase V: SELECT ─────────────────────────────────────────────────────────
 
+def _scoring_terms(strategy):
+    """(keyword set, target buyer types) s4 scores against — lowercase."""
+    primary_kw = strategy.get("primary_keywords", [])
+    profile = strategy.get("ideal_buyer_profile", "")
+    profile_words = [w for w in profile.split() if len(w) > 3 and w.lower() not in _STOP_WORDS]
+    kw_set = set(w.lower() for kw in primary_kw for w in kw.split())
+    kw_set.update(w.lower() for w in profile_words)
+    target_types = set(t.lower() for t in strategy.get("buyer_types", []))
+    return kw_set, target_types
+
+
+# Discovery step → (IncrementalRanker source, state key it writes)
+_DISCOVERY_SOURCES = {
+    "s3a": ("A", "DISCOVERY_SIGNALS_A"),
+    "s3b": ("B", "DISCOVERY_SIGNALS_B"),
+    "s3c": ("C", "DISCOVERY_BUYERS_C"),
+    "s3d": ("D", "DISCOVERY_BUYERS_D"),
+}
+
+
+def _skipped_discovery():
+    """{discovery step id: reason} for the searches this run skipped."""
+    ctx = context.current()
+    skipped = ctx.cache.get("skipped_steps", {}) if ctx else {}
+    return {sid: reason for sid, reason in skipped.items() if sid in _DISCOVERY_SOURCES}
+
+
+def _skip_step(run_id, step_id, reason):
+    """scheduler on_step_skipped: an optional step failed, overran or was cut off."""
+    ctx = context.current()
+    if ctx:
+        ctx.cache.setdefault("skipped_steps", {})[step_id] = reason
+    log_step(run_id, f"{step_id}_skipped", "skipped", reason)
+
+
+def _discovery_quorum_met(returned, policy):
+    """True when the discovery steps in `returned` satisfy DISCOVERY_QUORUM.
+
+    policy: comma-separated alternatives, each a count ("3" = any three
+    searches) or a "+"-joined set of steps ("s3a+s3b" = both opportunity
+    searches). Raises ValueError on an unknown step.
+    """
+    for alternative in (a.strip() for a in policy.split(",")):
+        if alternative.isdigit():
+            if len(returned) >= int(alternative):
+                return True
+            continue
+        needed = {sid.strip() for sid in alternative.split("+")}
+        if not needed <= _DISCOVERY_SOURCES.keys():
+            raise ValueError(f"DISCOVERY_QUORUM '{policy}': unknown discovery step in '{alternative}' "
+                             f"(expected {', '.join(_DISCOVERY_SOURCES)} or a count)")
+        if needed <= returned:
+            return True
+    return False
+
+
+def _discovery_quorum(state, pending):
+    """scheduler start_when for s4: once DISCOVERY_DEADLINE has passed since
+    the searches started, rank as soon as DISCOVERY_QUORUM have returned.
+
+    s4 is `cutoff`, so the searches still running are skipped — their
+    results are merged only if they land before this returns True.
+    """
+    if not pending <= _DISCOVERY_SOURCES.keys():
+        return False
+    ctx = context.current()
+    opened = (ctx.cache if ctx else {}).setdefault("discovery_opened", time.time())
+    if time.time() - opened < cfg("DISCOVERY_DEADLINE"):
+        return False
+    returned = {sid for sid, (_, key) in _DISCOVERY_SOURCES.items() if key in state}
+    return _discovery_quorum_met(returned, cfg("DISCOVERY_QUORUM"))
+
+
+def _discovery_ranker(state):
+    """The run's IncrementalRanker, with every discovery result in state folded in.
+
+    Kept in the RunContext cache, so each search is folded once as it lands —
+    by the scheduler's s4a start check, then by s4a itself. A skipped search
+    folds in as empty.
+    """
+    ctx = context.current()
+    cache = ctx.cache if ctx else {}
+    ranker = cache.get("discovery_ranker")
+    if ranker is None:
+        ranker = cache["discovery_ranker"] = IncrementalRanker(*_scoring_terms(state.get("SEARCH_STRATEGY") or {}))
+    skipped = _skipped_discovery()
+    for sid, (source, key) in _DISCOVERY_SOURCES.items():
+        if (key in state or sid in skipped) and source not in ranker.folded:
+            ranker.add(source, state.get(key) or [])
+            st = ranker.stability()
+            logger.info(f"  [s4a] +{source}: leader={st['leader']} ({st['leader_score']}), "
+                        f"margin={st['margin']}, pending={st['pending']}, locked={st['locked']}")
+    return ranker
+
+
+def _watch_discovery(state, pending, early):
+    """Fold the searches landed so far into the run's ranking and, with
+    SPECULATIVE_ENRICHMENT, start s6's calls for a clear frontrunner — unless
+    s4a (`early`) is about to lock it anyway. Returns the ranking's
+    stability(), or None while nothing needs it."""
+    speculate = cfg("SPECULATIVE_ENRICHMENT")
+    if not (early or speculate) or "SEARCH_STRATEGY" not in state:
+        return None
+    if not pending <= _DISCOVERY_SOURCES.keys():
+        return None
+    stability = _discovery_ranker(state).stability()
+    if speculate and not (early and stability["locked"]):
+        _speculate(state, stability)
+    return stability
+
+
+def _featured_locked(state, pending):
+    """scheduler start_when for s4a (registered with EARLY_FEATURED_SELECTION):
+    start before the remaining searches finish once none of them can change
+    the featured buyer — or once the discovery quorum is met after
+    DISCOVERY_DEADLINE, since s4 waits for s4a and can't cut them off first.
+
+    Called as each search lands, so it is also where s6's calls are started
+    speculatively for a clear frontrunner (SPECULATIVE_ENRICHMENT).
+    """
+    stability = _watch_discovery(state, pending, early=True)
+    return bool(stability) and (stability["locked"] or _discovery_quorum(state, pending))
+
+
+def _rank_when(state, pending):
+    """scheduler start_when for s4: the discovery quorum (_discovery_quorum).
+    Without s4a it is also where the partial ranking is watched for a
+    speculation (_watch_discovery)."""
+    if not cfg("EARLY_FEATURED_SELECTION"):
+        _watch_discovery(state, pending, early=False)
+    return _discovery_quorum(state, pending)
+
+
+def _speculate(state, stability):
+    """Start s6's calls for the ranking's frontrunner, once per run, when its
+    margin over the runner-up reaches SPECULATION_MIN_MARGIN_PCT."""
+    ctx = context.current()
+    if ctx is None or "speculation" in ctx.cache or stability["leader_id"] is None:
+        return
+    if profiles.skips("buyer_chat"):
+        return  # the slow call speculation is for won't run
+    if not stability["locked"] and stability["margin"] * 100 < cfg("SPECULATION_MIN_MARGIN_PCT"):
+        return
+    logger.info(f"  [s6] speculating on {stability['leader']} (margin={stability['margin']}, "
+                f"pending={stability['pending']})")
+    ctx.cache["speculation"] = speculation.Speculation(
+        stability["leader_id"], stability["leader"], stability,
+    ).start(_featured_question(stability["leader"]), cfg("FEATURED_CONTACT_PAGE_SIZE"),
+            cfg("MAX_WORKERS_FEATURED"))
+
+
+def _take_speculation(state, buyer_id):
+    """s6: the speculative calls if they were for `buyer_id`, else None (and
+    cancel them). Records the outcome as audit step "s6_speculation"."""
+    ctx = context.current()
+    spec = ctx and ctx.cache.pop("speculation", None)
+    if spec is None:
+        return None
+    outcome = ctx.cache["speculation_outcome"] = spec.outcome(buyer_id)
+    if outcome["hit"]:
+        message = f"hit: {spec.buyer_name}, {outcome['saved_s']:.1f}s saved"
+    else:
+        spec.cancel()
+        message = f"miss: speculated {spec.buyer_name}, {outcome['wasted_s']:.1f} call-seconds discarded"
+    logger.info(f"  [s6] speculation {message}")
+    log_step(state.get("DB_RUN_ID"), "s6_speculation", "success" if outcome["hit"] else "warning",
+             message, metadata={"SPECULATION": outcome})
+    return spec if outcome["hit"] else None
+
+
+def _discard_speculation():
+    """Cancel a speculation no s6 took (the run failed or s6 was restored)."""
+    ctx = context.current()
+    spec = ctx and ctx.cache.pop("speculation", None)
+    if spec:
+        spec.cancel()
+
+
+def s4a_lock_featured(state: dict) -> dict:
+    """s4a — Featured buyer from the incremental ranker, as soon as it is final.
+
+    Registered only with EARLY_FEATURED_SELECTION, and then the one step that
+    writes FEATURED_BUYER_*. Normally scheduled early (see _featured_locked):
+    once s3a and s3b are in, the pending buyer searches can't overtake the
+    leader, so s6 can start enriching it while they finish. Past
+    DISCOVERY_DEADLINE it takes the leader of the quorum that returned. s4
+    then confirms the lock against the full ranking.
+    """
+    _s4a_start = time.time()
+    ranker = _discovery_ranker(state)
+    stability = ranker.stability()
+    pending = {sid for sid, (source, _) in _DISCOVERY_SOURCES.items() if source in stability["pending"]}
+    if not stability["locked"] and not _discovery_quorum(state, pending):
+        raise RuntimeError(f"s4a started before the featured buyer was final (pending {stability['pending']})")
+    top = ranker.top(cfg("MAX_SECONDARY_BUYERS") + 1)
+    featured = top[0]
+    early = f", {len(stability['pending'])} search(es) still running" if stability["pending"] else ""
+    if not stability["locked"]:
+        early += " (discovery quorum)"
+    logger.info(f"[s4a] Featured: {featured['buyerName']} (score={featured['score']:.3f}{early})")
+
+    log_step(state.get("DB_RUN_ID"), "s4a_lock_featured", "success",
+             f"Featured={featured['buyerName']}{early}",
+             duration=time.time() - _s4a_start,
+             metadata={"STABILITY": stability,
+                       "TOP_K": [{"name": b["buyerName"], "score": b["score"], "signals": b["signalCount"]}
+                                 for b in top]})
+
+    return {
+        "FEATURED_BUYER_ID": featured["buyerId"],
+        "FEATURED_BUYER_NAME": featured["buyerName"],
+        "FEATURED_BUYER_TYPE": featured.get("buyerType", ""),
+    }
+
+
 def s4_rank_and_select(state: dict) -> dict:
-    """s4 — Fully deterministic: merge, dedupe, score, select featured + secondary."""
+    """s4 — Fully deterministic: merge, dedupe, score, select featured + secondary.
+
+    Ranks whichever searches returned — all four, or a DISCOVERY_QUORUM of
+    them once DISCOVERY_DEADLINE passed (see _discovery_quorum). With s4a
+    registered (EARLY_FEATURED_SELECTION) it runs after s4a and keeps the
+    featured buyer s4a locked, echoing it; otherwise it selects it itself.
+    """
     logger.info("[s4] Ranking buyers (deterministic)")
     _s4_start = time.time()
 
+    returned = {sid for sid, (_, key) in _DISCOVERY_SOURCES.items() if key in state}
+    skipped = _skipped_discovery()
+    if not _discovery_quorum_met(returned, cfg("DISCOVERY_QUORUM")):
+        raise RuntimeError(f"Discovery quorum '{cfg('DISCOVERY_QUORUM')}' not met: "
+                           f"{', '.join(sorted(returned)) or 'no search'} returned, skipped {skipped}")
+    if skipped:
+        logger.warning(f"  ranking without {', '.join(sorted(skipped))}")
+
     opps_a = state.get("DISCOVERY_SIGNALS_A") or []
     opps_b = state.get("DISCOVERY_SIGNALS_B") or []
     buyers_c = state.get("DISCOVERY_BUYERS_C") or []
@@ -359,9 +778,7 @@ def s4_rank_and_select(state: dict) -> dict:
     # ── Build buyer → signals map from opportunity results ──
     buyer_signals = {}
     for opp in all_opps:
-        bid = opp.get("buyerId") or opp.get("buyer_id") or opp.get("id")
-        bname = opp.get("buyerName") or opp.get("buyer_name") or opp.get("name", "Unknown")
-        btype = opp.get("buyerType") or opp.get("buyer_type") or ""
+        bid, bname, btype = signal_buyer(opp)
         if not bid:
             continue
         if bid not in buyer_signals:
@@ -370,111 +787,28 @@ def s4_rank_and_select(state: dict) -> dict:
 
     # ── Add direct buyers from s3c + s3d (may have zero signals) ──
     for b in direct_buyers:
-        bid = b.get("id") or b.get("buyerId")
+        bid, bname, btype = direct_buyer(b)
         if bid and bid not in buyer_signals:
-            buyer_signals[bid] = {
-                "name": b.get("name") or b.get("buyerName", "Unknown"),
-                "type": b.get("type") or b.get("buyerType", ""),
-                "signals": [],
-            }
+            buyer_signals[bid] = {"name": bname, "type": btype, "signals": []}
 
     if not buyer_signals:
         raise ValueError("No buyers found across all searches — cannot generate report")
 
-    # ── Score each buyer ──
-    primary_kw = state.get("SEARCH_STRATEGY", {}).get("primary_keywords", [])
-    profile = state.get("SEARCH_STRATEGY", {}).get("ideal_buyer_profile", "")
-    profile_words = [w for w in profile.split() if len(w) > 3 and w.lower() not in _STOP_WORDS]
-    kw_set = set(w.lower() for kw in primary_kw for w in kw.split())
-    kw_set.update(w.lower() for w in profile_words)
-    target_types = set(t.lower() for t in state.get("SEARCH_STRATEGY", {}).get("buyer_types", []))
-
-    scored = []
-    for bid, info in buyer_signals.items():
-        signals = info["signals"]
-        sig_count = len(signals)
-
-        recency = 0.0
-        for s in signals:
-            date_str = s.get("date") or s.get("createdAt") or s.get("created_at") or ""
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(str(date_str).replace("Z", "+00:00"))
-                    age_days = (datetime.now(dt.tzinfo) - dt).days if dt.tzinfo else (datetime.now() - dt).days
-                    recency = max(recency, max(0, 365 - age_days) / 365)
-                except (ValueError, TypeError):
-                    pass
-
-        urgency = 0.0
-        for s in signals:
-            stype = (s.get("type") or s.get("opportunityType") or "").lower()
-            if stype in ("rfp", "contract", "contract expiration"):
-                urgency = 1.0
-                break
-            title = (s.get("title") or s.get("summary") or "").lower()
-            if any(w in title for w in ["deadline", "expir", "due date", "rfp"]):
-                urgency = 1.0
-                break
-
-        max_dollar = 0.0
-        for s in signals:
-            amt = s.get("amount") or s.get("value") or s.get("contractAmount") or 0
-            if isinstance(amt, (int, float)):
-                max_dollar = max(max_dollar, float(amt))
-            elif isinstance(amt, str):
-                for n in re.findall(r'[\d]+(?:\.[\d]+)?', amt.replace(",", "")):
-                    try:
-                        max_dollar = max(max_dollar, float(n))
-                    except ValueError:
-                        pass
-
-        kw_hits = 0
-        for s in signals:
-            text = f"{s.get('title', '')} {s.get('summary', '')}".lower()
-            kw_hits += sum(1 for w in kw_set if w in text)
-
-        buyer_type_raw = (info["type"] or "").lower()
-        buyer_type_tokens = [t.strip().lower() for t in buyer_type_raw.split(",")]
-        type_match = 1.0 if any(t in target_types for t in buyer_type_tokens) else 0.0
-
-        scored.append({
-            "buyerId": bid,
-            "buyerName": info["name"],
-            "buyerType": info["type"],
-            "signalCount": sig_count,
-            "topSignalType": signals[0].get("type", "") if signals else "",
-            "topSignalSummary": (signals[0].get("title") or signals[0].get("summary", ""))[:200] if signals else "",
-            "score": 0.0,
-            "_sig": sig_count,
-            "_rec": recency,
-            "_urg": urgency,
-            "_dol": max_dollar,
-            "_kw": kw_hits,
-            "_type": type_match,
-        })
-
-    # Normalize and compute final scores
-    max_sig = max((s["_sig"] for s in scored), default=1) or 1
-    max_dol = max((s["_dol"] for s in scored), default=1) or 1
-    max_kw = max((s["_kw"] for s in scored), default=1) or 1
-
-    for s in scored:
-        s["score"] = round(
-            0.25 * s["_type"]
-            + 0.20 * (s["_sig"] / max_sig)
-            + 0.20 * s["_rec"]
-            + 0.15 * s["_urg"]
-            + 0.10 * (s["_dol"] / max_dol)
-            + 0.10 * (s["_kw"] / max_kw),
-            4,
-        )
-        for k in ("_sig", "_rec", "_urg", "_dol", "_kw", "_type"):
-            del s[k]
-
+    # ── Score each buyer (columnar — scoring.py) ──
+    kw_set, target_types = _scoring_terms(state.get("SEARCH_STRATEGY", {}))
+    scored = score_buyers(buyer_signals, kw_set, target_types)
     scored.sort(key=lambda x: x["score"], reverse=True)
 
     featured = scored[0]
-    secondary = scored[1:MAX_SECONDARY_BUYERS + 1]
+    if "FEATURED_BUYER_ID" in state:
+        # s4a owns the featured buyer: confirm its lock against the full ranking
+        featured = next((b for b in scored if b["buyerId"] == state["FEATURED_BUYER_ID"]), None)
+        if featured is None:
+            raise RuntimeError(f"s4a's featured buyer {state.get('FEATURED_BUYER_NAME')} is not in the full ranking")
+        if featured is not scored[0]:
+            logger.warning(f"  s4a locked {featured['buyerName']}, the full ranking leads with "
+                           f"{scored[0]['buyerName']} — keeping the lock")
+    secondary = [b for b in scored if b is not featured][:cfg("MAX_SECONDARY_BUYERS")]
 
     rationale = (
         f"Selected {featured['buyerName']} (score: {featured['score']:.3f}) "
@@ -492,6 +826,7 @@ def s4_rank_and_select(state: dict) -> dict:
                  "FEATURED": {"name": featured["buyerName"], "id": featured["buyerId"], "score": featured["score"], "signals": featured["signalCount"]},
                  "SECONDARY_BUYERS": [{"name": s["buyerName"], "score": s["score"]} for s in secondary],
                  "TOTAL_SCORED": len(scored),
+                 **({"SKIPPED_SOURCES": skipped} if skipped else {}),
              }))
 
     return {
@@ -529,79 +864,160 @@ def s5_persist_discovery(state: dict) -> dict:
 
 # ── Phase VI: ENRICH & GENERATE ────────────────────────────────────────────
 
+def _featured_question(buyer_name):
+    """The buyer_chat question s6 asks about the featured buyer."""
+    return (
+        f"What are {buyer_name}'s key strategic priorities, recent technology initiatives, "
+        f"major procurement activity, and any leadership changes in the past 12 months? "
+        f"Include specific initiative names, dollar amounts, and dates where available."
+    )
+
+
+def _featured_profile(raw_prof):
+    """Unwrap a buyer_profile response."""
+    if isinstance(raw_prof, dict):
+        return raw_prof.get("profile") or raw_prof
+    return raw_prof
+
+
+def _featured_ai_context(raw_chat, buyer_name):
+    """Text answer from a buyer_chat response; raises on an empty one."""
+    if isinstance(raw_chat, dict):
+        ai_ctx = raw_chat.get("ai_response") or raw_chat.get("response") or raw_chat.get("answer")
+        return ai_ctx or json.dumps(raw_chat)
+    if raw_chat:
+        return str(raw_chat)
+    raise RuntimeError(f"buyer_chat returned empty response for {buyer_name}")
+
+
+def _fallback(what, by_profile):
+    """Why a step takes its non-LLM / reduced path for `what`: "profile" when
+    the run's execution profile rules it out (by_profile), "budget" when the
+    run's budget can't cover it (budget.allows), else None — do it."""
+    if by_profile:
+        return "profile"
+    return None if budget.allows(what) else "budget"
+
+
+def _skip_buyer_chat(run_id, reason):
+    """s6's AI context when buyer_chat is left out — by the run's execution
+    profile or its budget (BUDGET_DEGRADE["buyer_chat"]): none, s9 writes the
+    section without it."""
+    logger.warning(f"  buyer_chat skipped ({reason})")
+    message = ("budget: not enough time left for buyer_chat" if reason == "budget"
+               else f"profile: {profiles.current()['name']} skips buyer_chat")
+    log_step(run_id, "s6_buyer_chat", "skipped", message)
+    return ""
+
+
+def _late_ai_context(buyer_id, buyer_name, spec=None):
+    """s6 with LATE_BIND_AI_CONTEXT: leave buyer_chat running — the
+    speculation's call, or a new one — for s12/s14 to bind (latebind.py).
+    s9 writes the section without it, as with no AI context."""
+    late = latebind.LateContext(buyer_name)
+    if spec:
+        call, ctx = spec.hand_off("chat")
+        late.adopt(call, started_at=spec.started_at, ctx=ctx)
+    else:
+        late.start(buyer_id, _featured_question(buyer_name))
+    context.current().cache["late_ai_context"] = late
+    logger.info("  buyer_chat late-bound: s9 goes ahead without it")
+    return ""
+
+
+def _discard_late_context():
+    """Cancel a late buyer_chat nothing bound or followed up (the run failed
+    or was killed before s14)."""
+    ctx = context.current()
+    late = ctx and ctx.cache.pop("late_ai_context", None)
+    if late:
+        late.cancel()
+
+
 def s6_featured_intel(state: dict) -> dict:
     """s6 — Parallel fetch: buyer_profile + buyer_contacts + buyer_chat for featured buyer.
 
     Replaces full_intel (which was just a combo of these) to avoid SSE timeout.
     Opportunities are reused from s3a/s3b discovery results — no need to re-fetch.
+    buyer_chat is skipped when the run's execution profile leaves it out or
+    its budget can't cover it; otherwise, with LATE_BIND_AI_CONTEXT, it is
+    left running for s12/s14 to bind.
     """
     buyer_id = state["FEATURED_BUYER_ID"]
     buyer_name = state["FEATURED_BUYER_NAME"]
     logger.info(f"[s6] Enriching featured buyer: {buyer_name} ({buyer_id[:8]}...)")
 
     run_id = state.get("DB_RUN_ID")
+    skip_chat = _fallback("buyer_chat", profiles.skips("buyer_chat"))
+    chat = skip_chat is None
+    late = chat and cfg("LATE_BIND_AI_CONTEXT")
+
+    spec = _take_speculation(state, buyer_id)
+    if spec:
+        # Started during discovery for this buyer (SPECULATIVE_ENRICHMENT)
+        pool = spec.pool
+        f_profile, f_contacts, f_ai_chat = (spec.calls[name] for name in speculation.CALLS)
+        if not chat:
+            spec.stop("chat")  # already polling: Future.cancel() can't reach it
+    else:
+        pool = executors.lane("enrichment", cfg("MAX_WORKERS_FEATURED"))
+        f_profile = context.submit(pool, tools.buyer_profile, buyer_id)
+        f_contacts = context.submit(pool, tools.buyer_contacts, buyer_id, cfg("FEATURED_CONTACT_PAGE_SIZE"))
+        f_ai_chat = (context.submit(pool, tools.buyer_chat, buyer_id, _featured_question(buyer_name))
+                     if chat and not late else None)
 
-    ai_question = (
-        f"What are {buyer_name}'s key strategic priorities, recent technology initiatives, "
-        f"major procurement activity, and any leadership changes in the past 12 months? "
-        f"Include specific initiative names, dollar amounts, and dates where available."
-    )
-
-    pool = ThreadPoolExecutor(max_workers=MAX_WORKERS_FEATURED)
-    f_profile = pool.submit(tools.buyer_profile, buyer_id)
-    f_contacts = pool.submit(tools.buyer_contacts, buyer_id, FEATURED_CONTACT_PAGE_SIZE)
-    f_ai_chat = pool.submit(tools.buyer_chat, buyer_id, ai_question)
+    def _abandon():
+        pool.shutdown(wait=False, cancel_futures=True)
+        if spec:
+            spec.cancel()
 
     profile = None
     contacts = []
 
     _t0 = time.time()
     try:
-        raw_prof = f_profile.result(timeout=TIMEOUTS.get("s7", 20))
-        if isinstance(raw_prof, dict):
-            profile = raw_prof.get("profile") or raw_prof
-        else:
-            profile = raw_prof
+        profile = _featured_profile(f_profile.result(timeout=budget.clamp(cfg("TIMEOUTS").get("s7", 20))))
         logger.info("  buyer_profile ✓")
         log_step(run_id, "s6_buyer_profile", "success", duration=time.time() - _t0,
                  metadata=_summarize_output({"FEAT_PROFILE": profile}))
     except Exception as e:
         log_step(run_id, "s6_buyer_profile", "failure", f"{type(e).__name__}: {e}", duration=time.time() - _t0)
-        pool.shutdown(wait=False, cancel_futures=True)
+        _abandon()
         raise
 
     _t0 = time.time()
     try:
-        raw_con = f_contacts.result(timeout=TIMEOUTS.get("s7", 20))
+        raw_con = f_contacts.result(timeout=budget.clamp(cfg("TIMEOUTS").get("s7", 20)))
         contacts = _contacts_list(raw_con)
         logger.info(f"  buyer_contacts ✓ ({len(contacts)})")
         log_step(run_id, "s6_buyer_contacts", "success", f"{len(contacts)} contacts", duration=time.time() - _t0,
                  metadata=_summarize_output({"FEAT_CONTACTS": contacts}))
     except Exception as e:
         log_step(run_id, "s6_buyer_contacts", "failure", f"{type(e).__name__}: {e}", duration=time.time() - _t0)
-        pool.shutdown(wait=False, cancel_futures=True)
+        _abandon()
         raise
 
     _t0 = time.time()
-    try:
-        raw_chat = f_ai_chat.result(timeout=TIMEOUTS.get("s6", 330))
-        if isinstance(raw_chat, dict):
-            ai_ctx = raw_chat.get("ai_response") or raw_chat.get("response") or raw_chat.get("answer")
-            if not ai_ctx:
-                ai_ctx = json.dumps(raw_chat)
-        elif raw_chat:
-            ai_ctx = str(raw_chat)
-        else:
-            raise RuntimeError(f"buyer_chat returned empty response for {buyer_name}")
-        logger.info(f"  buyer_chat ✓ ({len(ai_ctx or '')} chars)")
-        log_step(run_id, "s6_buyer_chat", "success", f"{len(ai_ctx or '')} chars", duration=time.time() - _t0,
-                 metadata=_summarize_output({"FEAT_AI_CONTEXT": ai_ctx or ""}))
-    except Exception as e:
-        log_step(run_id, "s6_buyer_chat", "failure", f"{type(e).__name__}: {e}", duration=time.time() - _t0)
-        pool.shutdown(wait=False, cancel_futures=True)
-        raise
+    if not chat:
+        ai_ctx = _skip_buyer_chat(run_id, skip_chat)
+    elif late:
+        ai_ctx = _late_ai_context(buyer_id, buyer_name, spec)
+    else:
+        try:
+            ai_ctx = _featured_ai_context(f_ai_chat.result(timeout=budget.clamp(cfg("TIMEOUTS").get("s6", 330))),
+                                          buyer_name)
+            logger.info(f"  buyer_chat ✓ ({len(ai_ctx or '')} chars)")
+            log_step(run_id, "s6_buyer_chat", "success", f"{len(ai_ctx or '')} chars", duration=time.time() - _t0,
+                     metadata=_summarize_output({"FEAT_AI_CONTEXT": ai_ctx or ""}))
+        except Exception as e:
+            log_step(run_id, "s6_buyer_chat", "failure", f"{type(e).__name__}: {e}", duration=time.time() - _t0)
+            _abandon()
+            raise
 
-    pool.shutdown(wait=False, cancel_futures=True)
+    # A late-bound speculative chat may still be queued on the speculation's lane
+    pool.shutdown(wait=False, cancel_futures=not late)
+    if spec:
+        spec.finish()
 
     # Reuse opportunities from discovery phase
     all_opps = (state.get("DISCOVERY_SIGNALS_A") or []) + (state.get("DISCOVERY_SIGNALS_B") or [])
@@ -634,29 +1050,37 @@ def s7_secondary_intel(state: dict) -> dict:
         bid = buyer["buyerId"]
         bname = buyer["buyerName"]
         prof = tools.buyer_profile(bid)
-        cons = _contacts_list(tools.buyer_contacts(bid, page_size=SECONDARY_CONTACT_PAGE_SIZE))
+        cons = _contacts_list(tools.buyer_contacts(bid, page_size=cfg("SECONDARY_CONTACT_PAGE_SIZE")))
         return {"profile": prof, "contacts": cons, "buyerId": bid, "buyerName": bname}
 
-    profiles = []
+    sec_profiles = []
     contacts_out = []
 
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS_SECONDARY) as pool:
-        futures = {pool.submit(_fetch_one, b): b["buyerName"] for b in secondaries[:MAX_SECONDARY_BUYERS]}
-        for f in as_completed(futures, timeout=TIMEOUTS.get("s7", 20)):
+    pool = executors.lane("enrichment", cfg("MAX_WORKERS_SECONDARY"))
+    try:
+        futures = [context.submit(pool, _fetch_one, b) for b in secondaries[:cfg("MAX_SECONDARY_BUYERS")]]
+        for f in as_completed(futures, timeout=budget.clamp(cfg("TIMEOUTS").get("s7", 20))):
+            f.result()  # the first failure, as soon as it lands
+        # Results in ranking order, like the async s7: SEC_PROFILES[i] and SEC_CONTACTS[i] are one buyer's
+        for f in futures:
             r = f.result()
-            profiles.append(r["profile"])
+            sec_profiles.append(r["profile"])
             contacts_out.append({
                 "buyerId": r["buyerId"],
                 "buyerName": r["buyerName"],
                 "contacts": r["contacts"],
             })
+    finally:
+        # Never wait on a failed/cancelled fetch: queued ones are dropped, and a
+        # killed run's requests are already being shut down (tools._client)
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    logger.info(f"  fetched {len(profiles)} profiles, {len(contacts_out)} contact sets")
+    logger.info(f"  fetched {len(sec_profiles)} profiles, {len(contacts_out)} contact sets")
     log_step(run_id, "s7_secondary_intel", "success",
-             f"{len(profiles)} profiles, {len(contacts_out)} contact sets",
+             f"{len(sec_profiles)} profiles, {len(contacts_out)} contact sets",
              duration=time.time() - _s7_start,
-             metadata=_summarize_output({"SEC_PROFILES": profiles, "SEC_CONTACTS": contacts_out}))
-    return {"SEC_PROFILES": profiles, "SEC_CONTACTS": contacts_out}
+             metadata=_summarize_output({"SEC_PROFILES": sec_profiles, "SEC_CONTACTS": contacts_out}))
+    return {"SEC_PROFILES": sec_profiles, "SEC_CONTACTS": contacts_out}
 
 
 def s8_exec_summary(state: dict) -> dict:
@@ -696,6 +1120,36 @@ def s8_exec_summary(state: dict) -> dict:
     return {"SECTION_EXEC_SUMMARY": summary}
 
 
+def _pack_featured(profile, contacts, opps, ai_ctx, keywords):
+    """s9 prompt data: ({profile_json, contacts_json, opps_json, ai_context}, PROMPT_PACKING stats).
+
+    Compact, pruned, relevance-ranked JSON packed to token budgets with whole
+    records — replaces indent=2 dumps hard-sliced at a char limit.
+    """
+    profile_json, p_stats = packing.pack_object(profile, cfg("AI_PROFILE_TOKEN_BUDGET"))
+    contacts_json, c_stats = packing.pack_records(
+        packing.rank_contacts(contacts), cfg("AI_CONTACTS_TOKEN_BUDGET"),
+        fields=packing.CONTACT_FIELDS, max_records=cfg("AI_CONTACTS_MAX"),
+    )
+    opps_json, o_stats = packing.pack_records(
+        packing.rank_opportunities(opps, keywords), cfg("AI_OPPS_TOKEN_BUDGET"),
+        fields=packing.OPPORTUNITY_FIELDS, max_records=cfg("AI_OPPS_MAX"),
+    )
+    ai_context = packing.truncate_text(ai_ctx, cfg("AI_CONTEXT_TOKEN_BUDGET")) if ai_ctx else None
+    prompt_stats = {
+        "profile": p_stats, "contacts": c_stats, "opportunities": o_stats,
+        "ai_context_tokens": packing.estimate_tokens(ai_context),
+    }
+    prompt_stats["data_tokens"] = (p_stats["tokens"] + c_stats["tokens"]
+                                   + o_stats["tokens"] + prompt_stats["ai_context_tokens"])
+    logger.info(f"  prompt data: ~{prompt_stats['data_tokens']} tokens "
+                f"(contacts {c_stats['packed']}/{c_stats['records']}, "
+                f"opps {o_stats['packed']}/{o_stats['records']})")
+    packed = {"profile_json": profile_json, "contacts_json": contacts_json,
+              "opps_json": opps_json, "ai_context": ai_context}
+    return packed, prompt_stats
+
+
 def s9_featured_section(state: dict) -> dict:
     """s9 — LLM sub-agent: featured buyer deep-dive."""
     logger.info("[s9] Featured buyer section via LLM")
@@ -710,25 +1164,131 @@ def s9_featured_section(state: dict) -> dict:
     product = state.get("target_company", "")
     product_desc = state.get("product_description", "")
 
-    with StepTimer(run_id, "s9_featured_section") as t:
+    keywords = state.get("SEARCH_STRATEGY", {}).get("primary_keywords", [])
+    packed, prompt_stats = _pack_featured(profile, contacts, opps, ai_ctx, keywords)
+
+    with _llm_step(run_id, "s9_featured_section") as t:
         section = llm.featured_section(
             buyer_name=buyer_name,
             buyer_type=buyer_type,
             product=product,
             product_desc=product_desc,
-            profile_json=json.dumps(profile, indent=2, default=str)[:AI_PROFILE_CHAR_LIMIT],
-            contacts_json=json.dumps(contacts[:AI_CONTACTS_MAX], indent=2, default=str)[:AI_CONTACTS_CHAR_LIMIT],
-            opps_json=json.dumps(opps[:AI_OPPS_MAX], indent=2, default=str)[:AI_OPPS_CHAR_LIMIT],
-            ai_context=str(ai_ctx)[:AI_CONTEXT_CHAR_LIMIT] if ai_ctx else None,
+            **packed,
         )
-        t.message = f"{len(section)} chars"
-        t.metadata = _summarize_output({"SECTION_FEATURED": section})
+        t.message = f"{len(section)} chars, prompt data ~{prompt_stats['data_tokens']} tokens"
+        t.metadata = _summarize_output({"SECTION_FEATURED": section, "PROMPT_PACKING": prompt_stats})
 
     return {"SECTION_FEATURED": section}
 
 
+def _secondary_buyer_content(index, buyer, sec_profiles, sec_contacts):
+    """Build the s10 prompt block for one secondary buyer (profile + contacts)."""
+    content = f"--- BUYER {index+1} ---\n"
+    content += f"Name: {buyer['buyerName']} | Type: {buyer.get('buyerType', 'Unknown')}\n"
+    content += f"Score: {buyer.get('score', 0):.3f} | Signals: {buyer.get('signalCount', 0)}\n"
+    content += f"Top Signal: {buyer.get('topSignalType', '')} — {buyer.get('topSignalSummary', '')}\n"
+
+    # SEC_PROFILES[i] belongs to the buyer of SEC_CONTACTS[i] (s7) — find it by buyerId
+    at = next((i for i, sc in enumerate(sec_contacts) if sc.get("buyerId") == buyer["buyerId"]), None)
+    if at is not None and at < len(sec_profiles) and sec_profiles[at]:
+        profile_json, _ = packing.pack_object(sec_profiles[at], cfg("AI_SECONDARY_TOKEN_BUDGET"))
+        content += f"Profile: {profile_json}\n"
+
+    if at is not None and sec_contacts[at].get("contacts"):
+        contacts_json, _ = packing.pack_records(
+            packing.rank_contacts(sec_contacts[at]["contacts"]), cfg("AI_SECONDARY_TOKEN_BUDGET"),
+            fields=packing.CONTACT_FIELDS, max_records=5,
+        )
+        content += f"Contacts: {contacts_json}\n"
+
+    return content + "\n"
+
+
+def _card_fallback(buyer, error, entry, sec_contacts, product):
+    """Record a late/failed s10 card in `entry`; return its template card (None when dropped)."""
+    entry["error"] = f"{type(error).__name__}: {error}"[:200]
+    card = None
+    if cfg("SECONDARY_CARD_FALLBACK") == "drop":
+        entry["source"] = "dropped"
+    else:
+        card = template_secondary_card(buyer, sec_contacts, product)
+        entry["source"] = "template"
+    logger.warning(f"  card for {buyer['buyerName']} → {entry['source']} ({entry['error']})")
+    return card
+
+
+def _template_cards(secondaries, sec_contacts, product, reason):
+    """s10's template cards when the run's execution profile templates s10
+    or its budget can't cover the LLM calls (BUDGET_DEGRADE["llm_cards"]).
+    Returns (cards, per-card stats)."""
+    logger.warning(f"  {reason}: {len(secondaries)} template cards instead of LLM cards")
+    cards = [template_secondary_card(b, sec_contacts, product) for b in secondaries]
+    return cards, [{"buyer": b["buyerName"], "source": "template", "error": reason} for b in secondaries]
+
+
+def _cards_message(section, card_stats, total):
+    """s10 audit message for parallel mode."""
+    sources = [c["source"] for c in card_stats]
+    return (f"{len(section)} chars, {sources.count('llm') + sources.count('template')}/{total} cards "
+            f"({sources.count('llm')} llm, {sources.count('template')} template, "
+            f"{sources.count('dropped')} dropped)")
+
+
+def _secondary_cards_parallel(secondaries, sec_profiles, sec_contacts, product, product_desc,
+                              llm_calls=None):
+    """Generate one card per buyer concurrently. Returns (cards, per-card stats).
+
+    Each call carries SECONDARY_CARD_TIMEOUT, so the CLI subprocess is killed
+    once a card overruns. Results are stitched in ranking order regardless of
+    completion order. Late or failed cards fall back per SECONDARY_CARD_FALLBACK.
+    llm_calls: the step's call-record list, shared with the worker threads.
+    """
+    def _one(i, buyer):
+        t0 = time.time()
+        with llm.record_calls(llm_calls):
+            card = llm.secondary_cards(
+                product, product_desc,
+                _secondary_buyer_content(i, buyer, sec_profiles, sec_contacts),
+                timeout=cfg("SECONDARY_CARD_TIMEOUT"),
+            )
+        return card.strip(), time.time() - t0
+
+    workers = max(1, cfg("MAX_WORKERS_SECONDARY_CARDS"))
+    # Cards queue behind their lane, so the branch-level ceiling covers every wave
+    # of workers plus a small margin for subprocess teardown.
+    waves = -(-len(secondaries) // workers)
+    branch_deadline = time.time() + budget.clamp(cfg("SECONDARY_CARD_TIMEOUT") * waves + 5)
+
+    pool = executors.lane("llm", workers)
+    try:
+        futures = [context.submit(pool, _one, i, b) for i, b in enumerate(secondaries)]
+        cards, stats = [], []
+        for buyer, f in zip(secondaries, futures):
+            entry = {"buyer": buyer["buyerName"]}
+            try:
+                card, dur = f.result(timeout=max(0, branch_deadline - time.time()))
+                cards.append(card)
+                entry.update(source="llm", duration=round(dur, 2))
+            except Exception as e:
+                f.cancel()
+                card = _card_fallback(buyer, e, entry, sec_contacts, product)
+                if card:
+                    cards.append(card)
+            stats.append(entry)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return cards, stats
+
+
 def s10_secondary_cards(state: dict) -> dict:
-    """s10 — LLM sub-agent: compact cards for each secondary buyer."""
+    """s10 — LLM sub-agent: compact cards for each secondary buyer.
+
+    Batched mode (default) sends every buyer in one prompt. Parallel mode
+    (SECONDARY_CARDS_PARALLEL) generates each card in its own LLM call. When
+    the run's execution profile templates s10, or its budget is too low for
+    either, every card is a template card.
+    """
     secondaries = state.get("SECONDARY_BUYERS") or []
     if not secondaries:
         logger.info("[s10] No secondary buyers, skipping")
@@ -736,33 +1296,40 @@ def s10_secondary_cards(state: dict) -> dict:
 
     sec_profiles = state.get("SEC_PROFILES") or []
     sec_contacts = state.get("SEC_CONTACTS") or []
+    secondaries = secondaries[:cfg("MAX_SECONDARY_BUYERS")]
 
-    logger.info(f"[s10] Generating {len(secondaries)} secondary cards via LLM")
+    template = _fallback("llm_cards", profiles.templated("s10"))
+    llm_cards = template is None
+    if llm_cards:
+        mode = "parallel" if cfg("SECONDARY_CARDS_PARALLEL") else "batched"
+        logger.info(f"[s10] Generating {len(secondaries)} secondary cards via LLM ({mode})")
+    else:
+        logger.info(f"[s10] Generating {len(secondaries)} secondary cards from the template ({template})")
 
     run_id = state.get("DB_RUN_ID")
     product = state.get("target_company", "")
     product_desc = state.get("product_description", "")
 
-    buyers_content = ""
-    for i, buyer in enumerate(secondaries[:MAX_SECONDARY_BUYERS]):
-        buyers_content += f"--- BUYER {i+1} ---\n"
-        buyers_content += f"Name: {buyer['buyerName']} | Type: {buyer.get('buyerType', 'Unknown')}\n"
-        buyers_content += f"Score: {buyer.get('score', 0):.3f} | Signals: {buyer.get('signalCount', 0)}\n"
-        buyers_content += f"Top Signal: {buyer.get('topSignalType', '')} — {buyer.get('topSignalSummary', '')}\n"
-
-        if i < len(sec_profiles) and sec_profiles[i]:
-            buyers_content += f"Profile: {json.dumps(sec_profiles[i], default=str)[:800]}\n"
-
-        matching = [sc for sc in sec_contacts if sc.get("buyerId") == buyer["buyerId"]]
-        if matching and matching[0].get("contacts"):
-            buyers_content += f"Contacts: {json.dumps(matching[0]['contacts'][:5], default=str)[:800]}\n"
-
-        buyers_content += "\n"
-
-    with StepTimer(run_id, "s10_secondary_cards") as t:
-        section = llm.secondary_cards(product, product_desc, buyers_content)
-        t.message = f"{len(section)} chars, {len(secondaries)} buyers"
-        t.metadata = _summarize_output({"SECTION_SECONDARY": section})
+    with _llm_step(run_id, "s10_secondary_cards") as t:
+        if cfg("SECONDARY_CARDS_PARALLEL") or not llm_cards:
+            if llm_cards:
+                cards, card_stats = _secondary_cards_parallel(
+                    secondaries, sec_profiles, sec_contacts, product, product_desc,
+                    llm_calls=t.llm_calls,
+                )
+            else:
+                cards, card_stats = _template_cards(secondaries, sec_contacts, product, template)
+            section = "\n\n".join(cards)
+            t.message = _cards_message(section, card_stats, len(secondaries))
+            t.metadata = _summarize_output({"SECTION_SECONDARY": section, "CARDS": card_stats})
+        else:
+            buyers_content = "".join(
+                _secondary_buyer_content(i, b, sec_profiles, sec_contacts)
+                for i, b in enumerate(secondaries)
+            )
+            section = llm.secondary_cards(product, product_desc, buyers_content)
+            t.message = f"{len(section)} chars, {len(secondaries)} buyers"
+            t.metadata = _summarize_output({"SECTION_SECONDARY": section})
 
     return {"SECTION_SECONDARY": section}
 
@@ -784,8 +1351,8 @@ def s11_cta(state: dict) -> dict:
 
     cta = (
         f"## What Starbridge Can Do\n\n"
-        f"Starbridge monitors **{CTA_BUYERS_COUNT} government and education buyers** across all 50 states, "
-        f"with **{CTA_RECORDS_COUNT} indexed board meetings and procurement records**. "
+        f"Starbridge monitors **{cfg('CTA_BUYERS_COUNT')} government and education buyers** across all 50 states, "
+        f"with **{cfg('CTA_RECORDS_COUNT')} indexed board meetings and procurement records**. "
         f"For {product} targeting {seg_str} buyers, we surface:\n\n"
         f"- **Active procurement signals** — RFPs, contract expirations, board discussions, and budget allocations\n"
         f"- **Verified decision-maker contacts** — directors, VPs, superintendents, and budget authorities\n"
@@ -855,89 +1422,281 @@ def _extract_notion_url(result):
     return url
 
 
-def s12_assemble(state: dict) -> dict:
-    """s12 — LLM-driven report assembly + Notion publish.
+def _publish_report(buyer_name, product, report):
+    """Create the Notion page for a report. Returns the page URL.
 
-    LLM with Notion MCP tool access assembles the report from pre-generated
-    sections (s8 exec summary, s9 featured, s10 secondary, s11 CTA) and
-    publishes to Notion in a single Claude CLI session. Retries once on failure
-    (fresh LLM call may format MCP params differently). Hard-fails after 2nd attempt.
+    A resumed run that already published (_resumed_page) gets its page
+    replaced instead — content and title — so rerunning s12/s13 leaves no
+    duplicate page behind.
     """
-    logger.info("[s12] Assembling report from sections + publishing to Notion")
-    _s12_start = time.time()
+    page_url = _resumed_page()
+    page_id = page_url and _notion_page_id(page_url)
+    if page_id:
+        tools.notion_update_page(page_id, content=report)
+        tools.notion_update_page(page_id, properties={"title": report_title(buyer_name, product)})
+        logger.info(f"  Republished to the run's existing page: {page_url}")
+        return page_url
+    result = tools.notion_create_page(
+        report_title(buyer_name, product), report, parent_page_id=cfg("NOTION_PARENT_PAGE_ID"),
+    )
+    return _extract_notion_url(result)
 
-    run_id = state.get("DB_RUN_ID")
-    buyer_name = state.get("FEATURED_BUYER_NAME", "Unknown")
-    product = state.get("target_company", "")
 
-    if not NOTION_PARENT_PAGE_ID:
-        raise RuntimeError("NOTION_PARENT_PAGE_ID not set — cannot publish")
+def _resumed_page():
+    """The Notion page the active run published before it was resumed
+    (resume_pipeline), or None."""
+    ctx = context.current()
+    return ctx.cache.get("published_page_url") if ctx else None
+
+
+def _published_page(run, checkpoints):
+    """The Notion page URL a run has already published: its row's (s14), else
+    its s13 or s12 checkpoint's — s12 checkpoints written before s13 became
+    NOTION_PAGE_URL's writer carry it under that key. None if it never published."""
+    if run.get("notion_url"):
+        return run["notion_url"]
+    for sid, key in (("s13", "NOTION_PAGE_URL"), ("s12", "PUBLISHED_PAGE_URL"), ("s12", "NOTION_PAGE_URL")):
+        if (checkpoints.get(sid) or {}).get(key):
+            return checkpoints[sid][key]
+    return None
 
+
+def _shape_and_publish_llm(run_id, state):
+    """s12 "llm" mode — CLI session with Notion MCP access shapes + publishes.
+
+    Retries once on failure (fresh LLM call may format MCP params differently).
+    Hard-fails after the 2nd attempt.
+    """
     data_kwargs = {
-        "target_company": product,
+        "target_company": state.get("target_company", ""),
         "product_description": state.get("product_description", ""),
-        "buyer_name": buyer_name,
+        "buyer_name": state.get("FEATURED_BUYER_NAME", "Unknown"),
         "buyer_type": state.get("FEATURED_BUYER_TYPE", ""),
         "section_featured": (
             state.get("SECTION_FEATURED") or ""
-        )[:AI_REPORT_SECTION_CHAR_LIMIT],
+        )[:cfg("AI_REPORT_SECTION_CHAR_LIMIT")],
         "section_secondary": (
             state.get("SECTION_SECONDARY") or ""
-        )[:AI_REPORT_SECTION_CHAR_LIMIT],
+        )[:cfg("AI_REPORT_SECTION_CHAR_LIMIT")],
         "section_exec_summary": (
             state.get("SECTION_EXEC_SUMMARY") or ""
-        )[:AI_REPORT_SECTION_CHAR_LIMIT],
+        )[:cfg("AI_REPORT_SECTION_CHAR_LIMIT")],
         "section_cta": (
             state.get("SECTION_CTA") or ""
-        )[:AI_REPORT_SECTION_CHAR_LIMIT],
+        )[:cfg("AI_REPORT_SECTION_CHAR_LIMIT")],
     }
 
     # Retry on failure — the LLM may format MCP params wrong or Notion may 500.
     # A fresh LLM call can produce correct params on retry.
     max_attempts = 2
-    last_err = None
     for attempt in range(max_attempts):
         try:
             report, notion_url = llm.shape_and_publish_report(
                 **data_kwargs,
-                notion_parent_page_id=NOTION_PARENT_PAGE_ID,
+                notion_parent_page_id=cfg("NOTION_PARENT_PAGE_ID"),
             )
-            break
+            return re.sub(r'\n{3,}', '\n\n', report), notion_url
         except Exception as e:
-            last_err = e
             if attempt < max_attempts - 1:
                 log_step(run_id, "s12_assemble_retry", "warning",
                          f"Attempt {attempt+1} failed: {e}, retrying...")
                 logger.warning(f"  s12 attempt {attempt+1} failed: {e}, retrying...")
             else:
                 raise
-    report = re.sub(r'\n{3,}', '\n\n', report)
-    logger.info(f"  Report shaped + published: {len(report)} chars, URL: {notion_url}")
 
-    log_step(run_id, "s12_assemble", "success",
-             f"{len(report)} chars",
-             duration=time.time() - _s12_start,
-             metadata=_summarize_output({"REPORT_MARKDOWN": report, "NOTION_PAGE_URL": notion_url}))
 
-    return {"REPORT_MARKDOWN": report, "NOTION_PAGE_URL": notion_url}
+def _strategic_context(run_id, step, state, ai_ctx):
+    """The strategic context sub-section written from a late buyer_chat answer
+    (audit step `step`). None when the LLM call fails — the report goes without it."""
+    try:
+        with _llm_step(run_id, step) as t:
+            section = llm.strategic_context(
+                state.get("FEATURED_BUYER_NAME", "Unknown"), state.get("target_company", ""),
+                state.get("product_description", ""),
+                packing.truncate_text(ai_ctx, cfg("AI_CONTEXT_TOKEN_BUDGET")),
+            )
+            t.message = f"{len(section)} chars from {len(ai_ctx)} chars of buyer_chat"
+        return section
+    except Exception as e:
+        logger.warning(f"  strategic context failed (non-blocking): {e}")
+        return None
+
+
+def _bind_late_context(state):
+    """s12: wait up to AI_CONTEXT_GRACE_S for a late-bound buyer_chat.
+    Returns (ai_ctx, strategic context sub-section) when it answers in time,
+    else (None, None) — s14 leaves it to _patch_late_context."""
+    ctx = context.current()
+    late = ctx and ctx.cache.get("late_ai_context")
+    if late is None:
+        return None, None
+    run_id = state.get("DB_RUN_ID")
+    grace = cfg("AI_CONTEXT_GRACE_S")
+    try:
+        raw = late.wait(budget.clamp(grace) if grace > 0 else 0)
+        if raw is None:
+            logger.info(f"  buyer_chat not back after {grace}s grace — binding after publish")
+            log_step(run_id, "s12_strategic_context", "skipped",
+                     f"buyer_chat still running after {late.lead_s():.0f}s — patched in after publish")
+            return None, None
+        ai_ctx = _featured_ai_context(raw, late.buyer_name)
+    except Exception as e:
+        ctx.cache.pop("late_ai_context").finish()
+        log_step(run_id, "s6_buyer_chat", "failure", f"{type(e).__name__}: {e} (late-bound)",
+                 duration=late.lead_s())
+        return None, None
+    ctx.cache.pop("late_ai_context").finish()
+    logger.info(f"  buyer_chat ✓ ({len(ai_ctx)} chars, {late.lead_s():.0f}s) — bound before publish")
+    log_step(run_id, "s6_buyer_chat", "success", f"{len(ai_ctx)} chars, bound before publish",
+             duration=late.lead_s(), metadata=_summarize_output({"FEAT_AI_CONTEXT": ai_ctx}))
+    return ai_ctx, _strategic_context(run_id, "s12_strategic_context", state, ai_ctx)
+
+
+def _follow_up_late_context(state):
+    """s14: hand a buyer_chat still running past publish to _patch_late_context,
+    for when it answers. True if there was one to hand over."""
+    ctx = context.current()
+    late = ctx and ctx.cache.pop("late_ai_context", None)
+    if late is None:
+        return False
+    notion_url = state.get("NOTION_PAGE_URL")
+    report = state.get("VALIDATED_REPORT_MARKDOWN") or state.get("REPORT_MARKDOWN")
+    if not (notion_url and report):
+        late.cancel()
+        return False
+    late.when_done(lambda late: _patch_late_context(late, state, report, notion_url))
+    logger.info("  buyer_chat still running — its strategic context is patched in when it answers")
+    return True
+
+
+def _notion_page_id(notion_url):
+    """The 32-hex page ID at the end of a Notion URL, or None."""
+    match = re.search(r'([0-9a-f]{32})\s*$', notion_url.replace("-", ""))
+    return match.group(1) if match else None
+
+
+def _patch_late_context(late, state, report, notion_url):
+    """After publish: merge the late buyer_chat's strategic context into the
+    final report, replace the Notion page with it and update the run's row
+    (audit step "late_ai_context"). Non-fatal — the run has already responded."""
+    run_id = state.get("DB_RUN_ID")
+    try:
+        with StepTimer(run_id, "late_ai_context") as t:
+            ai_ctx = _featured_ai_context(late.answer.result(), late.buyer_name)
+            t.metadata = {"lead_s": late.lead_s(), **_summarize_output({"FEAT_AI_CONTEXT": ai_ctx})}
+            section = _strategic_context(run_id, "late_strategic_context", state, ai_ctx)
+            page_id = _notion_page_id(notion_url)
+            if not (section and page_id):
+                t.status = "warning"
+                t.message = ("strategic context failed" if not section
+                             else "Could not extract page ID from Notion URL") + " — page left as published"
+                return
+            patched = with_strategic_context(report, section)
+            tools.notion_update_page(page_id, content=patched)
+            update_run_late_context(run_id, ai_ctx, patched)
+            t.message = f"buyer_chat answered after {late.lead_s():.0f}s, patched into the published page"
+        logger.info(f"  [late] strategic context patched into {notion_url}")
+    except Exception as e:
+        logger.warning(f"  [late] buyer_chat context not bound (non-blocking): {type(e).__name__}: {e}")
+    finally:
+        late.finish()
 
 
-def s13_validate(state: dict) -> dict:
-    """s13 — Deterministic validation checks + mandatory LLM fact-check."""
-    logger.info("[s13] Validating report")
+def s12_assemble(state: dict) -> dict:
+    """s12 — Report assembly + Notion publish.
+
+    "template" mode (default) stitches the pre-generated sections (s8 exec
+    summary, s9 featured, s10 secondary, s11 CTA) locally via report.py and
+    publishes with a direct Notion call (transient 5xx retried in tools.py).
+    With PUBLISH_AFTER_VALIDATION the publish is deferred: s12 returns the
+    assembled markdown with PUBLISH_PENDING and s13 publishes the final version.
+    "llm" mode hands the sections to a Claude CLI session that shapes the
+    report and publishes through MCP (REPORT_ASSEMBLY_MODE).
+
+    A late-bound buyer_chat (LATE_BIND_AI_CONTEXT) that answers within
+    AI_CONTEXT_GRACE_S has its strategic context merged into the featured
+    section first; later ones are patched in after publish (s14).
+
+    An execution profile that templates s12 always assembles locally.
+    """
+    mode = "llm" if cfg("REPORT_ASSEMBLY_MODE") == "llm" and not profiles.templated("s12") else "template"
+    logger.info(f"[s12] Assembling report from sections + publishing to Notion ({mode})")
+    _s12_start = time.time()
 
     run_id = state.get("DB_RUN_ID")
-    report = state.get("REPORT_MARKDOWN", "")
+    buyer_name = state.get("FEATURED_BUYER_NAME", "Unknown")
+    product = state.get("target_company", "")
+
+    if not cfg("NOTION_PARENT_PAGE_ID"):
+        raise RuntimeError("NOTION_PARENT_PAGE_ID not set — cannot publish")
+
+    bound = {}
+    ai_ctx, strategic = _bind_late_context(state)
+    if ai_ctx is not None:
+        bound["FEAT_AI_CONTEXT"] = ai_ctx
+    if strategic:
+        bound["SECTION_FEATURED"] = with_strategic_context(state.get("SECTION_FEATURED") or "", strategic)
+    state = {**state, **bound}
+
+    timing = {"mode": mode}
+    publish_pending = False
+    llm_calls = []
+    if mode == "llm":
+        with llm.record_calls(llm_calls):
+            report, notion_url = _shape_and_publish_llm(run_id, state)
+        # The CLI session always creates a page: a resumed run's earlier one is left behind
+        replaced = _resumed_page()
+        if replaced and replaced != notion_url:
+            timing["replaced_page_url"] = replaced
+            logger.warning(f"  Resumed run republished to a new page; the earlier one is orphaned: {replaced}")
+    else:
+        report = assemble_report(
+            buyer_name, product,
+            section_featured=state.get("SECTION_FEATURED") or "",
+            section_secondary=state.get("SECTION_SECONDARY") or "",
+            section_exec_summary=state.get("SECTION_EXEC_SUMMARY") or "",
+            section_cta=state.get("SECTION_CTA") or "",
+        )
+        timing["assemble_ms"] = round((time.time() - _s12_start) * 1000, 2)
+
+        if cfg("PUBLISH_AFTER_VALIDATION"):
+            # s13 validates + repairs first, then publishes the final version
+            publish_pending = True
+            notion_url = None
+        else:
+            _publish_start = time.time()
+            notion_url = _publish_report(buyer_name, product, report)
+            timing["publish_s"] = round(time.time() - _publish_start, 2)
+
+    if publish_pending:
+        logger.info(f"  Report assembled ({mode}): {len(report)} chars, publish deferred to s13")
+    else:
+        logger.info(f"  Report assembled + published ({mode}): {len(report)} chars, URL: {notion_url}")
+
+    log_step(run_id, "s12_assemble", "success",
+             f"{len(report)} chars ({mode}{', publish deferred to s13' if publish_pending else ''})",
+             duration=time.time() - _s12_start,
+             metadata={**_summarize_output({"REPORT_MARKDOWN": report, "PUBLISHED_PAGE_URL": notion_url,
+                                            "ASSEMBLY": timing}),
+                       **({"LLM_CALLS": llm_calls} if llm_calls else {})})
+
+    # A late buyer_chat bound here replaces s6's (empty) AI context and s9's
+    # section; otherwise both are passed through unchanged. The page published
+    # here becomes the run's NOTION_PAGE_URL in s13, which writes it either way.
+    return {"REPORT_MARKDOWN": report, "PUBLISHED_PAGE_URL": notion_url, "PUBLISH_PENDING": publish_pending,
+            "FEAT_AI_CONTEXT": state.get("FEAT_AI_CONTEXT"), "SECTION_FEATURED": state.get("SECTION_FEATURED")}
+
+
+def _report_checks(report, buyer_name, product, secondary_names):
+    """s13 checks 1-7 (deterministic). Returns (issues, warnings)."""
     issues = []
     warnings = []
 
     # Check 1: buyer name in header
-    buyer_name = state.get("FEATURED_BUYER_NAME", "")
     if buyer_name and buyer_name not in report[:500]:
         issues.append(f"Header missing featured buyer name '{buyer_name}'")
 
     # Check 2: product name in report
-    product = state.get("target_company", "")
     if product and product.lower() not in report.lower():
         issues.append(f"Product name '{product}' not found in report")
 
@@ -962,19 +1721,66 @@ def s13_validate(state: dict) -> dict:
             issues.append(f"Malformed email '{email}' in report")
 
     # Check 7: secondary buyer names match scored buyers
-    secondary_names = {b["buyerName"] for b in (state.get("SECONDARY_BUYERS") or [])}
-    if secondary_names:
-        for name in secondary_names:
-            if name not in report:
-                warnings.append(f"Secondary buyer '{name}' not found in report")
-
-    # Check 8: LLM consistency check
-    with StepTimer(run_id, "s13_llm_fact_check") as t:
-        fc_passed, detail = llm.fact_check(buyer_name, report)
-        if not fc_passed:
-            warnings.append(f"LLM consistency check: {detail}")
-            t.status = "warning"
-        t.message = f"{'PASS' if fc_passed else 'FAIL'}: {detail[:100]}"
+    for name in secondary_names:
+        if name not in report:
+            warnings.append(f"Secondary buyer '{name}' not found in report")
+
+    return issues, warnings
+
+
+def _fact_check_source(state):
+    """Compact source excerpt for escalated claims (AI_VALIDATION_SOURCE_LIMIT)."""
+    contacts = [packing.prune(c, fields=packing.CONTACT_FIELDS) for c in state.get("FEAT_CONTACTS") or []]
+    opps = [packing.prune(o, fields=packing.OPPORTUNITY_FIELDS) for o in state.get("FEAT_OPPORTUNITIES") or []]
+    secondary = [b.get("buyerName") for b in state.get("SECONDARY_BUYERS") or []]
+    source = packing.compact_json({"contacts": contacts, "opportunities": opps,
+                                   "secondary_buyers": secondary})
+    return source[:cfg("AI_VALIDATION_SOURCE_LIMIT")]
+
+
+def s13_validate(state: dict) -> dict:
+    """s13 — Deterministic validation checks + fact verification (LLM fact-check if gated in).
+
+    An execution profile that templates s13 keeps it local: no LLM fact-check,
+    and findings the repair rules can't fix stay as reported.
+    """
+    logger.info("[s13] Validating report")
+
+    run_id = state.get("DB_RUN_ID")
+    report = state.get("REPORT_MARKDOWN", "")
+    buyer_name = state.get("FEATURED_BUYER_NAME", "")
+    product = state.get("target_company", "")
+    secondary_buyers = state.get("SECONDARY_BUYERS") or []
+    secondary_names = [b["buyerName"] for b in secondary_buyers]
+
+    # Checks 1-7: deterministic (re-run after local repair)
+    issues, warnings = _report_checks(report, buyer_name, product, secondary_names)
+
+    # Check 8: fact consistency — every amount/date/name/email is matched
+    # against source data locally; the LLM only sees what can't be matched.
+    with StepTimer(run_id, "s13_fact_verify") as t:
+        facts = factcheck.verify_report(report, state)
+        t.message = f"{facts['verified']}/{facts['claims']} claims matched source data"
+        t.metadata = facts
+    escalate = [c for c in facts["unmatched"] if c["kind"] != "date"]
+    fact_warnings = []
+    local_only = profiles.templated("s13")
+    llm_fact_check = not local_only and (cfg("LLM_FACT_CHECK_MODE") == "always" or bool(escalate))
+    if llm_fact_check:
+        with _llm_step(run_id, "s13_llm_fact_check") as t:
+            fc_passed, detail = llm.fact_check(
+                buyer_name, report, claims=escalate,
+                source_excerpt=_fact_check_source(state) if escalate else None,
+            )
+            if not fc_passed:
+                fact_warnings.append(f"LLM consistency check: {detail}")
+                t.status = "warning"
+            t.message = f"{'PASS' if fc_passed else 'FAIL'}: {detail[:100]}"
+    else:
+        logger.info(f"  fact-check: {facts['verified']}/{facts['claims']} claims verified locally, LLM skipped"
+                    + (" (profile)" if local_only and escalate else ""))
+
+    warnings += fact_warnings
 
     passed = len(issues) == 0
     all_findings = issues + warnings
@@ -987,34 +1793,63 @@ def s13_validate(state: dict) -> dict:
 
     # If any issues or warnings found, fix the report and update Notion
     validated_report = None
+    repaired_findings = []
+    publish_pending = bool(state.get("PUBLISH_PENDING"))
+    # Notion writes for the whole run — s12's publish counts when it happened
+    notion_url = state.get("PUBLISHED_PAGE_URL")
+    notion_writes = 0 if publish_pending or not notion_url else 1
     if all_findings:
-        notion_url = state.get("NOTION_PAGE_URL")
 
-        # Step 1: LLM fixes the report
-        with StepTimer(run_id, "s13_fix_report") as t_fix:
-            try:
-                validated_report = llm.fix_report(
-                    state.get("FEATURED_BUYER_NAME", ""),
-                    state.get("REPORT_MARKDOWN", ""),
-                    issues, warnings,
-                )
-                validated_report = re.sub(r'\n{3,}', '\n\n', validated_report)
-                t_fix.message = f"Fixed {len(all_findings)} findings, {len(validated_report)} chars"
-                logger.info(f"  Report fixed: {len(validated_report)} chars ({len(all_findings)} findings addressed)")
-            except Exception as e:
-                t_fix.status = "warning"
-                t_fix.message = f"Fix failed: {e}"
-                logger.warning(f"  Report fix failed (non-blocking): {e}")
-                validated_report = None
-
-        # Step 2: Update Notion page with fixed content
-        if validated_report and notion_url:
+        # Step 1: local repair rules patch mechanical findings in place
+        fix_issues, fix_warnings = issues, warnings
+        repaired = report
+        if cfg("REPORT_REPAIR_RULES"):
+            with StepTimer(run_id, "s13_repair") as t_rep:
+                repaired, applied = repair.repair_report(report, all_findings, {
+                    "buyer_name": buyer_name,
+                    "product": product,
+                    "secondary_buyers": secondary_buyers,
+                    "sec_contacts": state.get("SEC_CONTACTS") or [],
+                })
+                if applied:
+                    fix_issues, fix_warnings = _report_checks(repaired, buyer_name, product, secondary_names)
+                    fix_warnings += fact_warnings
+                remaining = fix_issues + fix_warnings
+                repaired_findings = [f for f in all_findings if f not in remaining]
+                t_rep.message = (f"{len(repaired_findings)}/{len(all_findings)} findings repaired locally"
+                                 + (f", {len(remaining)} left for LLM" if remaining else ""))
+                t_rep.metadata = {"applied": applied, "repaired": repaired_findings, "remaining": remaining}
+            if repaired_findings:
+                validated_report = repaired
+                logger.info(f"  Repaired locally: {len(repaired_findings)}/{len(all_findings)} findings")
+
+        # Step 2: LLM rewrites only for what the rules couldn't fix
+        if (fix_issues or fix_warnings) and local_only:
+            logger.info(f"  {len(fix_issues) + len(fix_warnings)} findings left as reported (profile: no LLM fix)")
+        elif fix_issues or fix_warnings:
+            with _llm_step(run_id, "s13_fix_report") as t_fix:
+                n_fix = len(fix_issues) + len(fix_warnings)
+                try:
+                    validated_report = llm.fix_report(buyer_name, repaired, fix_issues, fix_warnings)
+                    validated_report = re.sub(r'\n{3,}', '\n\n', validated_report)
+                    t_fix.message = f"Fixed {n_fix} findings, {len(validated_report)} chars"
+                    logger.info(f"  Report fixed: {len(validated_report)} chars ({n_fix} findings addressed)")
+                except Exception as e:
+                    t_fix.status = "warning"
+                    t_fix.message = f"Fix failed: {e}"
+                    logger.warning(f"  Report fix failed (non-blocking): {e}")
+                    # Keep whatever the local rules repaired
+                    validated_report = repaired if repaired_findings else None
+
+        # Step 3: Update Notion page with fixed content (only when s12 already
+        # published — deferred publishing writes the fixed report once below)
+        if validated_report and notion_url and not publish_pending:
             with StepTimer(run_id, "s13_notion_update") as t_nu:
                 try:
-                    page_id_match = re.search(r'([0-9a-f]{32})\s*$', notion_url.replace("-", ""))
-                    if page_id_match:
-                        page_id = page_id_match.group(1)
+                    page_id = _notion_page_id(notion_url)
+                    if page_id:
                         tools.notion_update_page(page_id, content=validated_report)
+                        notion_writes += 1
                         t_nu.message = f"Notion page updated with fixed report"
                         logger.info(f"  Notion page updated with corrected report")
                     else:
@@ -1026,23 +1861,48 @@ def s13_validate(state: dict) -> dict:
                     t_nu.message = f"Notion update failed: {e}"
                     logger.warning(f"  Notion page update failed (non-blocking): {e}")
 
+    # Deferred publish (PUBLISH_AFTER_VALIDATION): s12 only assembled, so the
+    # page is created here once, already in its final form. Hard-fails like s12.
+    if publish_pending:
+        final_report = validated_report or report
+        with StepTimer(run_id, "s13_publish") as t_pub:
+            notion_url = _publish_report(buyer_name, product, final_report)
+            notion_writes += 1
+            t_pub.message = (f"Published {'fixed' if validated_report else 'validated'} report "
+                             f"({len(final_report)} chars): {notion_url}")
+        logger.info(f"  Report published after validation: {notion_url}")
+
+    # A fixed report published after validation is one replace_content call
+    # (and one page the BDR could have opened half-finished) that never happened.
+    rewrites_avoided = 1 if (publish_pending and validated_report) else 0
+    if validated_report:
+        outcome = ", fixed before publish" if publish_pending else ", fixed + Notion updated"
+    else:
+        outcome = ", published" if publish_pending else ""
     log_step(run_id, "s13_validate", "success" if passed else "failure",
-             f"{'PASS' if passed else 'FAIL'}: {len(issues)} issues, {len(warnings)} warnings"
-             + (", fixed + Notion updated" if validated_report else ""),
-             metadata={"issues": issues, "warnings": warnings, "fixed": validated_report is not None})
-
-    result = {
+             f"{'PASS' if passed else 'FAIL'}: {len(issues)} issues, {len(warnings)} warnings" + outcome,
+             metadata={"issues": issues, "warnings": warnings, "fixed": validated_report is not None,
+                       "repaired_locally": repaired_findings,
+                       "facts": {"claims": facts["claims"], "verified": facts["verified"],
+                                 "unmatched": facts["unmatched"], "llm_fact_check": llm_fact_check},
+                       "local_only": local_only,
+                       "publish_after_validation": publish_pending,
+                       "notion_writes": notion_writes,
+                       "notion_rewrites_avoided": rewrites_avoided})
+
+    # NOTION_PAGE_URL is the run's page: s12's, or the one published above
+    return {
         "VALIDATION_RESULT": {
             "passed": passed,
             "issues": issues,
             "warnings": warnings,
             "fixed": validated_report is not None,
+            "repaired": repaired_findings,
             "checked_at": datetime.now().isoformat(),
-        }
+        },
+        "VALIDATED_REPORT_MARKDOWN": validated_report,
+        "NOTION_PAGE_URL": notion_url,
     }
-    if validated_report:
-        result["VALIDATED_REPORT_MARKDOWN"] = validated_report
-    return result
 
 
 def s14_save_and_respond(state: dict) -> dict:
@@ -1057,8 +1917,12 @@ def s14_save_and_respond(state: dict) -> dict:
         if feat_contacts:
             insert_contacts(run_id, state.get("FEATURED_BUYER_ID"), feat_contacts)
         logger.info(f"  run {run_id} → completed")
+    # After the row is saved, so a late patch is never overwritten by it
+    late_pending = _follow_up_late_context(state)
 
     elapsed = time.time() - state.get("_start_time", time.time())
+    ctx = context.current()
+    profile = profiles.current()
 
     log_step(run_id, "s14_pipeline_complete", "success",
              f"total={elapsed:.1f}s",
@@ -1067,6 +1931,14 @@ def s14_save_and_respond(state: dict) -> dict:
                  "total_duration_seconds": round(elapsed, 1),
                  "buyer_name": state.get("FEATURED_BUYER_NAME"),
                  "notion_url": state.get("NOTION_PAGE_URL"),
+                 "tier": str(state.get("tier") or ""),
+                 **({"profile": profile["name"]} if profile else {}),
+                 **({"llm": ctx.llm_summary()} if ctx else {}),
+                 **({"speculation": ctx.cache["speculation_outcome"]}
+                    if ctx and "speculation_outcome" in ctx.cache else {}),
+                 **({"late_ai_context": "pending"} if late_pending else {}),
+                 **({"budget": {"deadline_s": ctx.budget.seconds, "left_s": round(ctx.budget.left(), 2)}}
+                    if ctx and ctx.budget else {}),
              })
 
     response = {
@@ -1094,44 +1966,348 @@ def s14_save_and_respond(state: dict) -> dict:
     return response
 
 
+# ── Step registry ───────────────────────────────────────────────────────────
+# s2–s13 as scheduled by scheduler.run(). reads/writes are the state keys each
+# step uses (qa/qa_alignment.py checks them against the step bodies); a step
+# waits for the first step that writes each key it reads. s5 reads the
+# discovery keys through update_run_discovery(state). phase is the old barrier
+# grouping, used only by PIPELINE_SCHEDULE = "phased". timeout names the
+# TIMEOUTS entry enforced from the step's start (None: no step deadline).
+# start_when(state, pending) may start a step before all its dependencies are
+# done (s4a: once the pending searches can't change the featured buyer); with
+# cutoff, the dependencies still pending then are skipped (s4: discovery
+# quorum). This is the EARLY_FEATURED_SELECTION layout, where s4a owns
+# FEATURED_BUYER_* and s4 confirms its lock; _step_registry() drops s4a and
+# hands the keys to s4 when it is off. An optional step's failure or timeout skips it instead of failing
+# the run (s3a–d; audit "<id>_skipped"). executor names the shared executor
+# the step body runs on (executors.py; default "steps").
+# Order matters: every dependency must be declared before the step needing it.
+
+_FEATURED_KEYS = ("FEATURED_BUYER_ID", "FEATURED_BUYER_NAME", "FEATURED_BUYER_TYPE")
+
+STEP_REGISTRY = (
+    {"id": "s2", "fn": s2_search_strategy, "phase": 3, "timeout": None,
+     "reads": ("target_company", "target_domain", "product_description", "PRIOR_RUNS", "DB_RUN_ID"),
+     "writes": ("SEARCH_STRATEGY",)},
+    {"id": "s3a", "fn": s3a_primary_search, "phase": 4, "timeout": "s3a",
+     "reads": ("SEARCH_STRATEGY", "DB_RUN_ID"), "writes": ("DISCOVERY_SIGNALS_A",),
+     "optional": True, "executor": "discovery"},
+    {"id": "s3b", "fn": s3b_alternate_search, "phase": 4, "timeout": "s3b",
+     "reads": ("SEARCH_STRATEGY", "DB_RUN_ID"), "writes": ("DISCOVERY_SIGNALS_B",),
+     "optional": True, "executor": "discovery"},
+    {"id": "s3c", "fn": s3c_buyer_type_search, "phase": 4, "timeout": "s3c",
+     "reads": ("SEARCH_STRATEGY", "DB_RUN_ID"), "writes": ("DISCOVERY_BUYERS_C",),
+     "optional": True, "executor": "discovery"},
+    {"id": "s3d", "fn": s3d_buyer_geo_search, "phase": 4, "timeout": "s3d",
+     "reads": ("SEARCH_STRATEGY", "DB_RUN_ID"), "writes": ("DISCOVERY_BUYERS_D",),
+     "optional": True, "executor": "discovery"},
+    {"id": "s4a", "fn": s4a_lock_featured, "phase": 5, "timeout": None,
+     "reads": ("SEARCH_STRATEGY", "DISCOVERY_SIGNALS_A", "DISCOVERY_SIGNALS_B",
+               "DISCOVERY_BUYERS_C", "DISCOVERY_BUYERS_D", "DB_RUN_ID"),
+     "writes": _FEATURED_KEYS,
+     "start_when": _featured_locked},
+    {"id": "s4", "fn": s4_rank_and_select, "phase": 5, "timeout": None,
+     "reads": ("SEARCH_STRATEGY", "DISCOVERY_SIGNALS_A", "DISCOVERY_SIGNALS_B",
+               "DISCOVERY_BUYERS_C", "DISCOVERY_BUYERS_D", "FEATURED_BUYER_ID", "FEATURED_BUYER_NAME",
+               "DB_RUN_ID"),
+     "writes": ("ALL_SCORED_BUYERS", "DISCOVERY_BUYERS", "SECONDARY_BUYERS", "SELECTION_RATIONALE"),
+     "start_when": _rank_when, "cutoff": True},
+    {"id": "s5", "fn": s5_persist_discovery, "phase": 5, "timeout": None,
+     "reads": ("ALL_SCORED_BUYERS", "DISCOVERY_BUYERS", "DISCOVERY_SIGNALS_A", "DISCOVERY_SIGNALS_B",
+               "FEATURED_BUYER_ID", "FEATURED_BUYER_NAME", "FEATURED_BUYER_TYPE", "SEARCH_STRATEGY",
+               "SECONDARY_BUYERS", "SELECTION_RATIONALE", "DB_RUN_ID", "target_domain"),
+     "writes": ()},
+    {"id": "s8", "fn": s8_exec_summary, "phase": 6, "timeout": "s8",
+     "reads": ("ALL_SCORED_BUYERS", "DISCOVERY_SIGNALS_A", "DISCOVERY_SIGNALS_B", "FEATURED_BUYER_NAME",
+               "FEATURED_BUYER_TYPE", "SEARCH_STRATEGY", "target_company", "DB_RUN_ID"),
+     "writes": ("SECTION_EXEC_SUMMARY",)},
+    {"id": "s6", "fn": s6_featured_intel, "phase": 6, "timeout": "s6",
+     "reads": ("DISCOVERY_SIGNALS_A", "DISCOVERY_SIGNALS_B", "FEATURED_BUYER_ID", "FEATURED_BUYER_NAME",
+               "DB_RUN_ID"),
+     "writes": ("FEAT_AI_CONTEXT", "FEAT_CONTACTS", "FEAT_OPPORTUNITIES", "FEAT_PROFILE")},
+    {"id": "s9", "fn": s9_featured_section, "phase": 6, "timeout": "s9",
+     "reads": ("FEATURED_BUYER_NAME", "FEATURED_BUYER_TYPE", "FEAT_AI_CONTEXT", "FEAT_CONTACTS",
+               "FEAT_OPPORTUNITIES", "FEAT_PROFILE", "SEARCH_STRATEGY", "product_description",
+               "target_company", "DB_RUN_ID"),
+     "writes": ("SECTION_FEATURED",)},
+    {"id": "s7", "fn": s7_secondary_intel, "phase": 6, "timeout": "s7",
+     "reads": ("SECONDARY_BUYERS", "DB_RUN_ID"), "writes": ("SEC_CONTACTS", "SEC_PROFILES")},
+    {"id": "s10", "fn": s10_secondary_cards, "phase": 6, "timeout": "s10",
+     "reads": ("SECONDARY_BUYERS", "SEC_CONTACTS", "SEC_PROFILES", "product_description",
+               "target_company", "DB_RUN_ID"),
+     "writes": ("SECTION_SECONDARY",)},
+    {"id": "s11", "fn": s11_cta, "phase": 6, "timeout": "s11",
+     "reads": ("ALL_SCORED_BUYERS", "DISCOVERY_SIGNALS_A", "DISCOVERY_SIGNALS_B", "SEARCH_STRATEGY",
+               "target_company", "DB_RUN_ID"),
+     "writes": ("SECTION_CTA",)},
+    {"id": "s12", "fn": s12_assemble, "phase": 7, "timeout": None,
+     "reads": ("FEATURED_BUYER_NAME", "FEATURED_BUYER_TYPE", "FEAT_AI_CONTEXT", "SECTION_CTA", "SECTION_EXEC_SUMMARY",
+               "SECTION_FEATURED", "SECTION_SECONDARY", "target_company", "product_description", "DB_RUN_ID"),
+     "writes": ("FEAT_AI_CONTEXT", "PUBLISHED_PAGE_URL", "PUBLISH_PENDING", "REPORT_MARKDOWN", "SECTION_FEATURED")},
+    {"id": "s13", "fn": s13_validate, "phase": 7, "timeout": None,
+     "reads": ("FEATURED_BUYER_NAME", "PUBLISHED_PAGE_URL", "PUBLISH_PENDING", "REPORT_MARKDOWN",
+               "SECONDARY_BUYERS", "SEC_CONTACTS", "SEC_PROFILES", "FEAT_AI_CONTEXT", "FEAT_CONTACTS",
+               "FEAT_OPPORTUNITIES", "FEAT_PROFILE", "target_company", "DB_RUN_ID"),
+     "writes": ("NOTION_PAGE_URL", "VALIDATED_REPORT_MARKDOWN", "VALIDATION_RESULT")},
+)
+
+
+def _step_registry(early=None):
+    """STEP_REGISTRY as scheduled for a run: with s4a when `early` (default
+    EARLY_FEATURED_SELECTION), else without it and with s4 writing the
+    featured buyer."""
+    if early is None:
+        early = cfg("EARLY_FEATURED_SELECTION")
+    if early:
+        return STEP_REGISTRY
+    return tuple({**st, "reads": tuple(k for k in st["reads"] if k not in _FEATURED_KEYS),
+                  "writes": st["writes"] + _FEATURED_KEYS} if st["id"] == "s4" else st
+                 for st in STEP_REGISTRY if st["id"] != "s4a")
+
+
+def _resumed_early(checkpoints):
+    """Whether a resumed run schedules s4a: as it did before (its s4a or s4
+    checkpoint says), else as EARLY_FEATURED_SELECTION says now."""
+    if "s4a" in checkpoints:
+        return True
+    return False if "s4" in checkpoints else None
+
+
+def _log_schedule(run_id, schedule):
+    """Audit entry for the s2–s13 schedule: timings + critical path."""
+    est = schedule["estimate"]
+    log_step(run_id, "schedule", "success",
+             f"{schedule['mode']}: s2–s13 in {schedule['wall_s']:.1f}s, critical path "
+             f"{' → '.join(schedule['critical_path'])} ({schedule['critical_path_s']:.1f}s); "
+             f"phased {est['phased_s']:.1f}s vs dag {est['dag_s']:.1f}s (saves {est['saved_s']:.1f}s)",
+             duration=schedule["wall_s"], metadata=schedule)
+
+
+def _start_profile(state):
+    """Give the run the execution profile for its tier (profiles.select) and
+    log it as audit step "execution_profile"."""
+    profile = profiles.select(state.get("tier"))
+    if profile is None:
+        return None
+    parts = [f"skips {', '.join(profile['skip'])}" if profile["skip"] else "",
+             f"templates {', '.join(profile['template'])}" if profile["template"] else "",
+             f"{profile['deadline_s']}s deadline" if profile["deadline_s"] else ""]
+    detail = "; ".join(p for p in parts if p) or "full run"
+    logger.info(f"  execution profile: {profile['name']} (tier {profile['tier'] or '—'}) — {detail}")
+    log_step(state.get("DB_RUN_ID"), "execution_profile", "success",
+             f"{profile['name']} (tier {profile['tier'] or '—'}): {detail}", metadata=profile)
+    return profile
+
+
+def _start_budget(state, requested=None, completed=(), registry=STEP_REGISTRY):
+    """Give the run its deadline budget: the request's deadline_s, else its
+    execution profile's deadline_s, else RUN_DEADLINES for its tier, else
+    RUN_DEADLINES["default"]. No budget when that is 0. Steps of `registry`
+    in `completed` (restored on resume) take no share."""
+    deadlines = cfg("RUN_DEADLINES")
+    tier = str(state.get("tier") or "")
+    profile = profiles.current()
+    if requested:
+        try:
+            seconds, source = float(requested), "request"
+        except (TypeError, ValueError):
+            raise ValueError(f"deadline_s must be a number of seconds, got {requested!r}") from None
+    elif profile and profile["deadline_s"]:
+        seconds, source = profile["deadline_s"], f"profile {profile['name']}"
+    elif deadlines.get(tier):
+        seconds, source = deadlines[tier], f"tier {tier}"
+    else:
+        seconds, source = deadlines.get("default", 0), "default"
+    if seconds <= 0:
+        return None
+    weights = cfg("STEP_BUDGET_WEIGHTS")
+    registry = [st for st in registry if st["id"] not in completed]
+    tails = scheduler.tails(registry, {st["id"]: weights.get(st["id"], 1) for st in registry},
+                            cfg("PIPELINE_SCHEDULE"))
+    s14 = weights.get("s14", 1)  # s14 runs after every scheduled step
+    run = context.current().budget = budget.RunBudget(
+        seconds, state["_start_time"], {sid: tail + s14 for sid, tail in tails.items()}, source)
+    logger.info(f"  budget: {seconds:g}s ({source}), {run.left():.1f}s left for s2–s14")
+    return run
+
+
+def _budgeted(registry):
+    """registry with each step run under its share of the deadline (budget.bind)."""
+    if budget.current() is None:
+        return registry
+    return tuple({**st, "fn": budget.bind(st["id"], st["fn"])} for st in registry)
+
+
+def _log_budget(run_id):
+    """Audit entry for the run's deadline budget: each step's share and use."""
+    run = budget.current()
+    if run is None:
+        return
+    summary = run.summary()
+    notes = [f"over budget: {', '.join(summary['over_budget'])}"] if summary["over_budget"] else []
+    notes += [f"{sid} degraded: {', '.join(what)}" for sid, what in summary["degraded"].items()]
+    log_step(run_id, "budget", "warning" if summary["left_s"] < 0 else "success",
+             f"{summary['used_s']:.1f}s of {run.seconds:g}s ({run.source})"
+             + (f"; {'; '.join(notes)}" if notes else ""),
+             duration=summary["used_s"], metadata=summary)
+
+
 # ── Orchestrator ────────────────────────────────────────────────────────────
 
-def run_pipeline(webhook: dict, stop_event=None, run_id=None) -> dict:
-    """Execute the full 18-step intel brief pipeline.
+def _checkpoint(run_id, step, delta):
+    """Save a step's state delta for resume_pipeline (ENABLE_CHECKPOINTS)."""
+    if not cfg("ENABLE_CHECKPOINTS") or not run_id:
+        return
+    try:
+        save_checkpoint(run_id, step, {k: v for k, v in delta.items() if k != "_start_time"})
+    except Exception as e:
+        logger.warning(f"  checkpoint {step} not saved: {e}")
+
+
+def _check_cancelled():
+    """scheduler check_cancelled — raises PipelineCancelled once the run's cancel token is set."""
+    if context.cancelled():
+        raise PipelineCancelled("Pipeline killed by user")
+
+
+def _run_steps(state, completed=(), deadline=None, early=None):
+    """s2–s13 through the scheduler (skipping `completed`), then s14.
+
+    deadline: the request's deadline_s, if it set one (see _start_budget).
+    early: whether s4a is scheduled (_step_registry).
+    """
+    run_id = state["DB_RUN_ID"]
+    _check_cancelled()
+    logger.info(f"── s2–s13: {cfg('PIPELINE_SCHEDULE')} schedule ──")
+    registry = _step_registry(early)
+    _start_profile(state)
+    _start_budget(state, deadline, completed, registry)
+    try:
+        schedule = scheduler.run(
+            _budgeted(registry), state, mode=cfg("PIPELINE_SCHEDULE"),
+            max_workers=cfg("MAX_WORKERS_DISCOVERY") + cfg("MAX_WORKERS_ENRICHMENT"),
+            timeouts={st["id"]: cfg("TIMEOUTS").get(st["timeout"]) for st in STEP_REGISTRY if st["timeout"]},
+            check_cancelled=_check_cancelled,
+            completed=completed,
+            on_step_done=lambda step, delta: _checkpoint(run_id, step, delta),
+            on_step_skipped=lambda step, reason: _skip_step(run_id, step, reason),
+        )
+    finally:
+        _discard_speculation()
+        _log_budget(run_id)
+    _log_schedule(run_id, schedule)
+    logger.info(f"  critical path: {' → '.join(schedule['critical_path'])} "
+                f"(dag {schedule['estimate']['dag_s']:.1f}s vs phased {schedule['estimate']['phased_s']:.1f}s)")
+    return s14_save_and_respond(state)
+
+
+def _cancelled_response(state):
+    """Mark the run cancelled and build the cancel response."""
+    logger.warning("Pipeline cancelled by user")
+    run_id = state.get("DB_RUN_ID")
+    elapsed = time.time() - state.get("_start_time", time.time())
+    if run_id:
+        try:
+            update_run_cancelled(run_id)
+            log_step(run_id, "pipeline_cancelled", "failure",
+                     "Cancelled by user",
+                     duration=elapsed,
+                     metadata={"last_keys": sorted(state.keys())})
+        except Exception as db_err:
+            logger.error(f"  Failed to persist cancel state: {db_err}")
+    return {
+        "status": "cancelled",
+        "run_id": run_id,
+        "metadata": {
+            "generation_timestamp": datetime.now().isoformat(),
+            "cancelled_after_seconds": round(elapsed, 1),
+        },
+    }
+
+
+def _failed_response(state, e):
+    """Persist partial state, mark the run failed and build the error response."""
+    logger.error(f"Pipeline failed: {e}", exc_info=True)
+
+    # ── Persist failure state ───────────────────────────────────
+    run_id = state.get("DB_RUN_ID")
+    elapsed = time.time() - state.get("_start_time", time.time())
+
+    if run_id:
+        try:
+            update_run_failed(run_id, str(e), partial_state=state)
+            log_step(run_id, "pipeline_failed", "failure",
+                     f"{type(e).__name__}: {e}",
+                     duration=elapsed,
+                     metadata={"last_keys": sorted(state.keys())})
+        except Exception as db_err:
+            logger.error(f"  Failed to persist failure state: {db_err}")
+
+    return {
+        "status": "error",
+        "error": str(e),
+        "run_id": run_id,
+        "partial_state": {
+            k: v for k, v in state.items()
+            if k not in ("_start_time",) and not callable(v)
+        },
+        "metadata": {
+            "generation_timestamp": datetime.now().isoformat(),
+            "failed_after_seconds": round(elapsed, 1),
+            "last_completed_keys": sorted(state.keys()),
+        },
+    }
+
+
+def run_pipeline(webhook: dict, stop_event=None, run_id=None, config=None) -> dict:
+    """Execute the full 19-step intel brief pipeline.
 
     Phase I-II:  s0 → s1 (sequential — run stub created in s1)
-    Phase III:   s2 (LLM sub-agent)
-    Phase IV:    s3a, s3b, s3c, s3d (parallel)
-    Phase V:     s4 → s5 (sequential — discovery backfilled)
-    Phase VI:    4 parallel branches:
-                   a) s8           — exec summary (template)
-                   b) s6 → s9     — featured intel → featured section
-                   c) s7 → s10    — secondary intel → secondary cards
-                   d) s11          — CTA (template)
-    Phase VII:   s12 → s13 → s14 (sequential — s12 shapes + publishes to Notion)
+    s2–s13:      scheduler.run() over STEP_REGISTRY — each step starts as
+                 soon as the steps writing its inputs finish (PIPELINE_SCHEDULE
+                 = "dag"), e.g. s8/s11 and s6/s7 right after s4, beside s5.
+                 s4a locks the featured buyer before the last buyer search
+                 returns when it can no longer be overtaken, so s6/s7 start
+                 early (EARLY_FEATURED_SELECTION).
+                 "phased" keeps the old barriers:
+                   III s2 · IV s3a-d · V s4a ║ s4 → s5 · VI s8, s6 → s9, s7 → s10, s11
+                   · VII s12 → s13
+    s14:         save + respond, once everything else has finished
+
+    The schedule's timings and critical path are logged as audit step
+    "schedule" (see scheduler.trace). Each step's state delta is checkpointed
+    as it finishes (ENABLE_CHECKPOINTS) so a failed run can be picked up by
+    resume_pipeline().
+
+    The run executes inside its own RunContext (context.py): every step, tool
+    call and LLM call reads `config` and checks `stop_event` through it, so
+    concurrent runs never see each other's settings or cancel flag.
 
     Args:
         stop_event: threading.Event — set by /api/kill to cancel the pipeline.
         run_id: Pre-assigned DB run ID (batch mode). If provided, s1 skips
                 stub creation and reuses this ID.
+        config: Config snapshot for this run (server: taken at submission).
+                None = the live config module values.
 
     On failure: partial state is persisted to SQLite, run marked 'failed',
     and the error response includes all collected data.
     """
+    with context.activate(RunContext(config, cancel_event=stop_event, run_id=run_id)) as ctx:
+        try:
+            return _execute(webhook, run_id)
+        finally:
+            _discard_late_context()
+            ctx.finish()
+
+
+def _execute(webhook, run_id):
+    """run_pipeline() body, inside the run's context."""
     logger.info("=" * 60)
     logger.info("INTEL BRIEF PIPELINE — START")
     logger.info("=" * 60)
 
-    # Register the stop event so LLM subprocess calls can be killed mid-run
-    if stop_event:
-        llm.set_cancel_event(stop_event)
-
-    def _check_cancelled():
-        if stop_event and stop_event.is_set():
-            raise PipelineCancelled("Pipeline killed by user")
-
     state = {}
-    pipeline_error = None
 
     try:
         # ── Phase I-II: sequential ──────────────────────────────────
@@ -1143,7 +2319,7 @@ def run_pipeline(webhook: dict, stop_event=None, run_id=None) -> dict:
         t1 = time.time()
         state |= s1_validate_and_load(state)
         s1_dur = time.time() - t1
-        run_id = state["DB_RUN_ID"]
+        run_id = context.current().run_id = state["DB_RUN_ID"]
         # Retroactively log s0 + s1 with durations (ran before/during run_id creation)
         log_step(run_id, "s0_parse_webhook", "success",
                  f"target={state.get('target_company')} ({state.get('target_domain')})",
@@ -1152,122 +2328,105 @@ def run_pipeline(webhook: dict, stop_event=None, run_id=None) -> dict:
                            "product_description": state.get("product_description")})
         prior = state.get("PRIOR_RUNS", [])
         log_step(run_id, "s1_validate_and_load", "success",
-                 f"run_id={run_id}, prior={len(prior)}, dedup={'on' if ENABLE_PRIOR_RUN_DEDUP else 'off'}",
+                 f"run_id={run_id}, prior={len(prior)}, dedup={'on' if cfg('ENABLE_PRIOR_RUN_DEDUP') else 'off'}",
                  duration=s1_dur,
-                 metadata={"run_id": run_id, "prior_runs": len(prior), "dedup_enabled": ENABLE_PRIOR_RUN_DEDUP})
-
-        # ── Phase III: sequential (LLM sub-agent) ────────────────────
-        _check_cancelled()
-        state |= s2_search_strategy(state)
-
-        # ── Phase IV: parallel discovery ────────────────────────────
-        _check_cancelled()
-        logger.info("── Phase IV: parallel discovery (s3a, s3b, s3c, s3d) ──")
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS_DISCOVERY) as pool:
-            futures = {
-                pool.submit(s3a_primary_search, state): "s3a",
-                pool.submit(s3b_alternate_search, state): "s3b",
-                pool.submit(s3c_buyer_type_search, state): "s3c",
-                pool.submit(s3d_buyer_geo_search, state): "s3d",
-            }
-            for f in as_completed(futures, timeout=TIMEOUTS.get("s3a", 20)):
-                label = futures[f]
-                state |= f.result()
-                logger.info(f"  {label} ✓")
-
-        # ── Phase V: sequential ─────────────────────────────────────
-        _check_cancelled()
-        state |= s4_rank_and_select(state)
-        state |= s5_persist_discovery(state)
-
-        # ── Phase VI: 5 parallel branches ───────────────────────────
-        _check_cancelled()
-        logger.info("── Phase VI: parallel enrich + generate ──")
-
-        def _branch_featured(st):
-            """s6 → s9: full intel fetch, then generate featured section."""
-            r6 = s6_featured_intel(st)
-            r9 = s9_featured_section({**st, **r6})
-            return {**r6, **r9}
-
-        def _branch_secondary(st):
-            """s7 → s10: secondary intel fetch, then generate cards."""
-            r7 = s7_secondary_intel(st)
-            r10 = s10_secondary_cards({**st, **r7})
-            return {**r7, **r10}
-
-        pool = ThreadPoolExecutor(max_workers=MAX_WORKERS_ENRICHMENT)
-        try:
-            futures = {
-                pool.submit(s8_exec_summary, state): "s8 (exec summary)",
-                pool.submit(_branch_featured, state): "s6→s9 (featured)",
-                pool.submit(_branch_secondary, state): "s7→s10 (secondary)",
-                pool.submit(s11_cta, state): "s11 (CTA)",
-            }
-            for f in as_completed(futures, timeout=TIMEOUTS.get("s6", 330)):
-                label = futures[f]
-                state |= f.result()
-                logger.info(f"  {label} ✓")
-        finally:
-            pool.shutdown(wait=False, cancel_futures=True)
+                 metadata={"run_id": run_id, "prior_runs": len(prior), "dedup_enabled": cfg("ENABLE_PRIOR_RUN_DEDUP")})
+        _checkpoint(run_id, "s1", state)
 
-        # ── Phase VII: sequential (s12 shapes + publishes to Notion) ─
-        _check_cancelled()
-        state |= s12_assemble(state)
-        state |= s13_validate(state)
-        return s14_save_and_respond(state)
+        # ── Phases III-VII: s2–s13 by dependency ────────────────────
+        return _run_steps(state, deadline=webhook.get("deadline_s"))
 
     except PipelineCancelled:
-        logger.warning("Pipeline cancelled by user")
-        run_id = state.get("DB_RUN_ID")
-        elapsed = time.time() - state.get("_start_time", time.time())
-        if run_id:
-            try:
-                update_run_cancelled(run_id)
-                log_step(run_id, "pipeline_cancelled", "failure",
-                         "Cancelled by user",
-                         duration=elapsed,
-                         metadata={"last_keys": sorted(state.keys())})
-            except Exception as db_err:
-                logger.error(f"  Failed to persist cancel state: {db_err}")
-        return {
-            "status": "cancelled",
-            "run_id": run_id,
-            "metadata": {
-                "generation_timestamp": datetime.now().isoformat(),
-                "cancelled_after_seconds": round(elapsed, 1),
-            },
-        }
+        return _cancelled_response(state)
 
     except Exception as e:
-        pipeline_error = e
-        logger.error(f"Pipeline failed: {e}", exc_info=True)
+        return _failed_response(state, e)
 
-        # ── Persist failure state ───────────────────────────────────
-        run_id = state.get("DB_RUN_ID")
-        elapsed = time.time() - state.get("_start_time", time.time())
 
-        if run_id:
-            try:
-                update_run_failed(run_id, str(e), partial_state=state)
-                log_step(run_id, "pipeline_failed", "failure",
-                         f"{type(e).__name__}: {e}",
-                         duration=elapsed,
-                         metadata={"last_keys": sorted(state.keys())})
-            except Exception as db_err:
-                logger.error(f"  Failed to persist failure state: {db_err}")
-
-        return {
-            "status": "error",
-            "error": str(e),
-            "run_id": run_id,
-            "partial_state": {
-                k: v for k, v in state.items()
-                if k not in ("_start_time",) and not callable(v)
-            },
-            "metadata": {
-                "generation_timestamp": datetime.now().isoformat(),
-                "failed_after_seconds": round(elapsed, 1),
-                "last_completed_keys": sorted(state.keys()),
-            },
-        }
+RESUMABLE_STEPS = ("s1",) + tuple(st["id"] for st in STEP_REGISTRY) + ("s14",)
+
+
+def resume_plan(run_id, from_step=None):
+    """Which steps a resume of `run_id` would reuse and which it would rerun.
+
+    from_step=None reruns every step without a checkpoint. A step id reruns
+    that step and everything downstream of it (scheduler.downstream), even if
+    they were checkpointed; "s14" only saves + responds again.
+    Returns {"reused": [...], "rerun": [...]}; raises ValueError when the run
+    cannot be resumed.
+    """
+    run = get_run(run_id)
+    if not run:
+        raise ValueError(f"Run {run_id} not found")
+    if from_step is not None and from_step not in RESUMABLE_STEPS[1:]:
+        raise ValueError(f"Cannot resume from '{from_step}' (expected one of {', '.join(RESUMABLE_STEPS[1:])})")
+    if from_step is None and run["status"] == "completed":
+        raise ValueError(f"Run {run_id} already completed — pass from_step to regenerate part of it")
+    checkpoints = get_checkpoints(run_id)
+    if "s1" not in checkpoints:
+        raise ValueError(f"Run {run_id} has no checkpoints (ENABLE_CHECKPOINTS was off or it failed before s1)")
+
+    registry = _step_registry(_resumed_early(checkpoints))
+    scheduled = {"s1", "s14"} | {st["id"] for st in registry}
+    if from_step and from_step not in scheduled:
+        raise ValueError(f"Cannot resume from '{from_step}': run {run_id} does not schedule it")
+    invalid = set()
+    if from_step and from_step != "s14":
+        invalid = scheduler.downstream(registry, from_step)
+    reused = [sid for sid in RESUMABLE_STEPS[:-1] if sid in checkpoints and sid not in invalid]
+    rerun = [sid for sid in RESUMABLE_STEPS[1:] if sid not in reused and sid in scheduled]
+    return {"reused": reused, "rerun": rerun}
+
+
+def resume_pipeline(run_id, from_step=None, stop_event=None, config=None) -> dict:
+    """Resume a failed or cancelled run from its checkpoints.
+
+    Rebuilds state from the checkpointed deltas (s1 first, then s2–s13 in
+    registry order) and hands the scheduler the restored steps as completed,
+    so only the steps in resume_plan()["rerun"] make tool or LLM calls.
+    Checkpoints of rerun steps are dropped first, so a resume that fails
+    again never restores a stale downstream result. stop_event and config
+    as for run_pipeline(). Returns the same response shapes.
+
+    Rerunning s12 or s13 republishes the report. A run that already published
+    has that page replaced (template mode); an llm-mode s12 creates a new page
+    and reports the replaced one (s12_assemble metadata ASSEMBLY.replaced_page_url).
+    The resume audit entry records the earlier page as published_page_url.
+    """
+    plan = resume_plan(run_id, from_step)
+    early = _resumed_early(get_checkpoints(run_id))
+    published = _published_page(get_run(run_id), get_checkpoints(run_id))
+    logger.info("=" * 60)
+    logger.info(f"INTEL BRIEF PIPELINE — RESUME run {run_id} (rerun: {', '.join(plan['rerun'])})")
+    logger.info("=" * 60)
+
+    delete_checkpoints(run_id, plan["rerun"])
+    if "s5" in plan["rerun"]:
+        delete_run_rows(run_id, "discoveries")
+    delete_run_rows(run_id, "contacts")  # s14 always reruns
+
+    checkpoints = get_checkpoints(run_id)
+    state = {}
+    for sid in plan["reused"]:
+        state |= checkpoints[sid]
+    state["DB_RUN_ID"] = run_id
+    state["_start_time"] = time.time()
+    log_step(run_id, "resume", "success",
+             f"reused {len(plan['reused'])} checkpoints, rerunning {', '.join(plan['rerun'])}",
+             metadata={"from_step": from_step, **plan, "published_page_url": published})
+
+    with context.activate(RunContext(config, cancel_event=stop_event, run_id=run_id)) as ctx:
+        if published:
+            ctx.cache["published_page_url"] = published
+        try:
+            return _run_steps(state, completed=plan["reused"], early=early)
+
+        except PipelineCancelled:
+            return _cancelled_response(state)
+
+        except Exception as e:
+            return _failed_response(state, e)
+
+        finally:
+            _discard_late_context()
+            ctx.finish()
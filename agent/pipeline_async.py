@@ -0,0 +1,493 @@
+"""Asyncio orchestrator — run_pipeline_async(), the event-loop twin of run_pipeline().
+
+Same steps, STEP_REGISTRY, checkpoints, audit entries and responses as
+pipeline.run_pipeline. The steps that wait on the network are coroutines
+here: s3a-d, s6 and s7 use the tools `_aio` calls (httpx.AsyncClient,
+asyncio.sleep polling for buyer_chat), s9 and s10 the llm `_aio` sub-agents
+(asyncio subprocess). No ThreadPoolExecutor is created per run — s6's three
+calls, s7's per-buyer fetches and s10's per-card calls are tasks on the one
+loop. s4a, s4, s5, s8 and s11 (local work, milliseconds) run inline on the loop;
+s2, s12 and s13 still run their sync bodies on the loop's default executor
+(strategy cache locks + batch prefetch, Notion publish, validate + fix).
+
+Cancellation is task cancellation: cancelling the task that runs
+run_pipeline_async() cancels every running step task, which kills CLI
+subprocesses and closes HTTP requests — no stop_event polling. It also sets
+the run's cancel token, so a CLI call inside a step on the executor
+(s2/s12/s13) is killed too.
+
+Like run_pipeline(), the run executes in its own RunContext: tasks and
+executor calls inherit it, so concurrent runs on the loop each read their
+own config snapshot.
+
+Usage:
+    asyncio.run(run_pipeline_async(webhook))
+    # server.py: PIPELINE_RUNTIME = "asyncio" runs every pipeline on one loop
+"""
+
+import asyncio
+import logging
+import time
+
+from . import budget, context, llm, profiles, scheduler, tools
+from .context import RunContext, cfg
+from .db import StepTimer, log_step
+from .pipeline import (
+    STEP_REGISTRY,
+    _budgeted,
+    _buyers_list,
+    _card_fallback,
+    _cards_message,
+    _cancelled_response,
+    _checkpoint,
+    _contacts_list,
+    _discard_late_context,
+    _discard_speculation,
+    _failed_response,
+    _fallback,
+    _featured_ai_context,
+    _featured_profile,
+    _featured_question,
+    _late_ai_context,
+    _llm_step,
+    _log_budget,
+    _log_schedule,
+    _opps_list,
+    _pack_featured,
+    _s3a_params,
+    _s3b_params,
+    _s3c_params,
+    _s3d_params,
+    _secondary_buyer_content,
+    _skip_buyer_chat,
+    _skip_step,
+    _start_budget,
+    _start_profile,
+    _step_registry,
+    _summarize_output,
+    _take_speculation,
+    _template_cards,
+    s0_parse_webhook,
+    s1_validate_and_load,
+    s14_save_and_respond,
+)
+
+logger = logging.getLogger("pipeline.async")
+
+
+# ── Phase IV: DISCOVER ──────────────────────────────────────────────────────
+
+async def s3a_primary_search(state: dict) -> dict:
+    """s3a — opportunity_search with primary keywords (async)."""
+    params = _s3a_params(state["SEARCH_STRATEGY"])
+    logger.info(f"[s3a] Opportunity search (primary+meeting): '{params['search_query']}' types={params['types']}")
+
+    with StepTimer(state.get("DB_RUN_ID"), "s3a_primary_search") as t:
+        opps = _opps_list(await tools.opportunity_search_aio(**params))
+        t.message = f"{len(opps)} results"
+        t.metadata = _summarize_output({"DISCOVERY_SIGNALS_A": opps})
+        logger.info(f"  → {len(opps)} results")
+
+    return {"DISCOVERY_SIGNALS_A": opps}
+
+
+async def s3b_alternate_search(state: dict) -> dict:
+    """s3b — opportunity_search with alternate keywords (async)."""
+    params = _s3b_params(state["SEARCH_STRATEGY"])
+    if params is None:
+        logger.info("[s3b] No alternate/rfp keywords, skipping")
+        log_step(state.get("DB_RUN_ID"), "s3b_alternate_search", "skipped",
+                 "No alternate/rfp keywords", duration=0)
+        return {"DISCOVERY_SIGNALS_B": []}
+
+    logger.info(f"[s3b] Opportunity search (alternate+rfp): '{params['search_query']}' types={params['types']}")
+
+    with StepTimer(state.get("DB_RUN_ID"), "s3b_alternate_search") as t:
+        opps = _opps_list(await tools.opportunity_search_aio(**params))
+        t.message = f"{len(opps)} results"
+        t.metadata = _summarize_output({"DISCOVERY_SIGNALS_B": opps})
+        logger.info(f"  → {len(opps)} results")
+
+    return {"DISCOVERY_SIGNALS_B": opps}
+
+
+async def s3c_buyer_type_search(state: dict) -> dict:
+    """s3c — buyer_search by buyer_types filter only (async)."""
+    params = _s3c_params(state["SEARCH_STRATEGY"])
+    if params is None:
+        logger.info("[s3c] No buyer types — skipping")
+        log_step(state.get("DB_RUN_ID"), "s3c_buyer_type_search", "skipped",
+                 "No buyer types in strategy", duration=0)
+        return {"DISCOVERY_BUYERS_C": []}
+
+    logger.info(f"[s3c] Buyer type search: types={params['buyer_types']} query={params['query']}")
+
+    with StepTimer(state.get("DB_RUN_ID"), "s3c_buyer_type_search") as t:
+        buyers = _buyers_list(await tools.buyer_search_aio(**params))
+        t.message = f"{len(buyers)} buyers"
+        t.metadata = _summarize_output({"DISCOVERY_BUYERS_C": buyers})
+        logger.info(f"  → {len(buyers)} buyers")
+
+    return {"DISCOVERY_BUYERS_C": buyers}
+
+
+async def s3d_buyer_geo_search(state: dict) -> dict:
+    """s3d — buyer_search by geographic hints (state codes) only (async)."""
+    params = _s3d_params(state["SEARCH_STRATEGY"])
+    if params is None:
+        logger.info("[s3d] No geographic hints — skipping")
+        log_step(state.get("DB_RUN_ID"), "s3d_buyer_geo_search", "skipped",
+                 "No geographic hints in strategy", duration=0)
+        return {"DISCOVERY_BUYERS_D": []}
+
+    logger.info(f"[s3d] Buyer geo search: states={params['states']}")
+
+    with StepTimer(state.get("DB_RUN_ID"), "s3d_buyer_geo_search") as t:
+        buyers = _buyers_list(await tools.buyer_search_aio(**params))
+        t.message = f"{len(buyers)} buyers"
+        t.metadata = _summarize_output({"DISCOVERY_BUYERS_D": buyers})
+        logger.info(f"  → {len(buyers)} buyers")
+
+    return {"DISCOVERY_BUYERS_D": buyers}
+
+
+# ── Phase VI: ENRICH & GENERATE ────────────────────────────────────────────
+
+async def _await_logged(run_id, step, task, timeout, describe):
+    """Await one s6 sub-call and write its audit entry, as s6's sync path does.
+
+    describe(value) → (message, metadata). Failures are logged and re-raised.
+    """
+    t0 = time.time()
+    try:
+        value = await asyncio.wait_for(task, timeout)
+    except Exception as e:
+        log_step(run_id, step, "failure", f"{type(e).__name__}: {e}", duration=time.time() - t0)
+        raise
+    message, metadata = describe(value)
+    log_step(run_id, step, "success", message, duration=time.time() - t0, metadata=metadata)
+    return value
+
+
+async def s6_featured_intel(state: dict) -> dict:
+    """s6 — buyer_profile + buyer_contacts + buyer_chat for the featured buyer, as three tasks
+    (buyer_chat left running for s12/s14 with LATE_BIND_AI_CONTEXT)."""
+    buyer_id = state["FEATURED_BUYER_ID"]
+    buyer_name = state["FEATURED_BUYER_NAME"]
+    logger.info(f"[s6] Enriching featured buyer: {buyer_name} ({buyer_id[:8]}...)")
+
+    run_id = state.get("DB_RUN_ID")
+    skip_chat = _fallback("buyer_chat", profiles.skips("buyer_chat"))
+    chat = skip_chat is None
+    late = chat and cfg("LATE_BIND_AI_CONTEXT")
+
+    spec = _take_speculation(state, buyer_id)
+    if spec:
+        # Tasks started during discovery for this buyer (SPECULATIVE_ENRICHMENT)
+        if not chat:
+            spec.stop("chat")
+        raw = spec.calls
+    else:
+        raw = {"profile": tools.buyer_profile_aio(buyer_id),
+               "contacts": tools.buyer_contacts_aio(buyer_id, cfg("FEATURED_CONTACT_PAGE_SIZE"))}
+        if chat and not late:
+            raw["chat"] = tools.buyer_chat_aio(buyer_id, _featured_question(buyer_name))
+
+    async def _profile():
+        return _featured_profile(await raw["profile"])
+
+    async def _contacts():
+        return _contacts_list(await raw["contacts"])
+
+    async def _chat():
+        return _featured_ai_context(await raw["chat"], buyer_name)
+
+    calls = (_profile, _contacts, _chat) if chat and not late else (_profile, _contacts)
+    tasks = [asyncio.create_task(c()) for c in calls]
+    try:
+        profile = await _await_logged(
+            run_id, "s6_buyer_profile", tasks[0], budget.clamp(cfg("TIMEOUTS").get("s7", 20)),
+            lambda p: (None, _summarize_output({"FEAT_PROFILE": p})))
+        logger.info("  buyer_profile ✓")
+        contacts = await _await_logged(
+            run_id, "s6_buyer_contacts", tasks[1], budget.clamp(cfg("TIMEOUTS").get("s7", 20)),
+            lambda c: (f"{len(c)} contacts", _summarize_output({"FEAT_CONTACTS": c})))
+        logger.info(f"  buyer_contacts ✓ ({len(contacts)})")
+        if not chat:
+            ai_ctx = _skip_buyer_chat(run_id, skip_chat)
+        elif late:
+            ai_ctx = _late_ai_context(buyer_id, buyer_name, spec)
+        else:
+            ai_ctx = await _await_logged(
+                run_id, "s6_buyer_chat", tasks[2], budget.clamp(cfg("TIMEOUTS").get("s6", 330)),
+                lambda a: (f"{len(a or '')} chars", _summarize_output({"FEAT_AI_CONTEXT": a or ""})))
+            logger.info(f"  buyer_chat ✓ ({len(ai_ctx or '')} chars)")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    # Reuse opportunities from discovery phase
+    all_opps = (state.get("DISCOVERY_SIGNALS_A") or []) + (state.get("DISCOVERY_SIGNALS_B") or [])
+    opps = [o for o in all_opps if (o.get("buyerId") or o.get("buyer_id")) == buyer_id]
+
+    logger.info(f"  profile: {'yes' if profile else 'no'}, contacts: {len(contacts)}, "
+                f"opportunities: {len(opps)}, AI: {'yes' if ai_ctx else 'no'}")
+
+    return {
+        "FEAT_PROFILE": profile,
+        "FEAT_CONTACTS": contacts,
+        "FEAT_OPPORTUNITIES": opps,
+        "FEAT_AI_CONTEXT": ai_ctx,
+    }
+
+
+async def s7_secondary_intel(state: dict) -> dict:
+    """s7 — buyer_profile + buyer_contacts per secondary buyer, MAX_WORKERS_SECONDARY at a time.
+
+    Results stay in ranking order: SEC_PROFILES[i] and SEC_CONTACTS[i] are one buyer's.
+    """
+    secondaries = state.get("SECONDARY_BUYERS") or []
+    if not secondaries:
+        logger.info("[s7] No secondary buyers, skipping")
+        return {"SEC_PROFILES": [], "SEC_CONTACTS": []}
+
+    logger.info(f"[s7] Fetching intel for {len(secondaries)} secondary buyers")
+    _s7_start = time.time()
+
+    run_id = state.get("DB_RUN_ID")
+    limit = asyncio.Semaphore(cfg("MAX_WORKERS_SECONDARY"))
+
+    async def _fetch_one(buyer):
+        bid = buyer["buyerId"]
+        async with limit:
+            prof = await tools.buyer_profile_aio(bid)
+            cons = _contacts_list(await tools.buyer_contacts_aio(bid, page_size=cfg("SECONDARY_CONTACT_PAGE_SIZE")))
+        return {"profile": prof, "contacts": cons, "buyerId": bid, "buyerName": buyer["buyerName"]}
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(_fetch_one(b) for b in secondaries[:cfg("MAX_SECONDARY_BUYERS")])),
+        budget.clamp(cfg("TIMEOUTS").get("s7", 20)),
+    )
+    sec_profiles = [r["profile"] for r in results]
+    contacts_out = [{"buyerId": r["buyerId"], "buyerName": r["buyerName"], "contacts": r["contacts"]}
+                    for r in results]
+
+    logger.info(f"  fetched {len(sec_profiles)} profiles, {len(contacts_out)} contact sets")
+    log_step(run_id, "s7_secondary_intel", "success",
+             f"{len(sec_profiles)} profiles, {len(contacts_out)} contact sets",
+             duration=time.time() - _s7_start,
+             metadata=_summarize_output({"SEC_PROFILES": sec_profiles, "SEC_CONTACTS": contacts_out}))
+    return {"SEC_PROFILES": sec_profiles, "SEC_CONTACTS": contacts_out}
+
+
+async def s9_featured_section(state: dict) -> dict:
+    """s9 — LLM sub-agent: featured buyer deep-dive (async subprocess)."""
+    logger.info("[s9] Featured buyer section via LLM")
+
+    run_id = state.get("DB_RUN_ID")
+    keywords = state.get("SEARCH_STRATEGY", {}).get("primary_keywords", [])
+    packed, prompt_stats = _pack_featured(
+        state.get("FEAT_PROFILE"), state.get("FEAT_CONTACTS") or [], state.get("FEAT_OPPORTUNITIES") or [],
+        state.get("FEAT_AI_CONTEXT") or "", keywords,
+    )
+
+    with _llm_step(run_id, "s9_featured_section") as t:
+        section = await llm.featured_section_aio(
+            buyer_name=state.get("FEATURED_BUYER_NAME", "Unknown"),
+            buyer_type=state.get("FEATURED_BUYER_TYPE", ""),
+            product=state.get("target_company", ""),
+            product_desc=state.get("product_description", ""),
+            **packed,
+        )
+        t.message = f"{len(section)} chars, prompt data ~{prompt_stats['data_tokens']} tokens"
+        t.metadata = _summarize_output({"SECTION_FEATURED": section, "PROMPT_PACKING": prompt_stats})
+
+    return {"SECTION_FEATURED": section}
+
+
+async def _secondary_cards_parallel(secondaries, sec_profiles, sec_contacts, product, product_desc):
+    """One card per buyer as tasks, MAX_WORKERS_SECONDARY_CARDS at a time, each
+    bounded by SECONDARY_CARD_TIMEOUT. Returns (cards in ranking order, per-card stats)."""
+    limit = asyncio.Semaphore(max(1, cfg("MAX_WORKERS_SECONDARY_CARDS")))
+
+    async def _one(i, buyer):
+        async with limit:
+            t0 = time.time()
+            card = await llm.secondary_cards_aio(
+                product, product_desc,
+                _secondary_buyer_content(i, buyer, sec_profiles, sec_contacts),
+                timeout=cfg("SECONDARY_CARD_TIMEOUT"),
+            )
+            return card.strip(), time.time() - t0
+
+    results = await asyncio.gather(*(_one(i, b) for i, b in enumerate(secondaries)), return_exceptions=True)
+    cards, stats = [], []
+    for buyer, result in zip(secondaries, results):
+        entry = {"buyer": buyer["buyerName"]}
+        if isinstance(result, BaseException):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            card = _card_fallback(buyer, result, entry, sec_contacts, product)
+            if card:
+                cards.append(card)
+        else:
+            cards.append(result[0])
+            entry.update(source="llm", duration=round(result[1], 2))
+        stats.append(entry)
+    return cards, stats
+
+
+async def s10_secondary_cards(state: dict) -> dict:
+    """s10 — LLM sub-agent: compact cards for each secondary buyer (async subprocesses)."""
+    secondaries = state.get("SECONDARY_BUYERS") or []
+    if not secondaries:
+        logger.info("[s10] No secondary buyers, skipping")
+        return {"SECTION_SECONDARY": ""}
+
+    sec_profiles = state.get("SEC_PROFILES") or []
+    sec_contacts = state.get("SEC_CONTACTS") or []
+    secondaries = secondaries[:cfg("MAX_SECONDARY_BUYERS")]
+
+    template = _fallback("llm_cards", profiles.templated("s10"))
+    llm_cards = template is None
+    if llm_cards:
+        mode = "parallel" if cfg("SECONDARY_CARDS_PARALLEL") else "batched"
+        logger.info(f"[s10] Generating {len(secondaries)} secondary cards via LLM ({mode})")
+    else:
+        logger.info(f"[s10] Generating {len(secondaries)} secondary cards from the template ({template})")
+
+    run_id = state.get("DB_RUN_ID")
+    product = state.get("target_company", "")
+    product_desc = state.get("product_description", "")
+
+    with _llm_step(run_id, "s10_secondary_cards") as t:
+        if cfg("SECONDARY_CARDS_PARALLEL") or not llm_cards:
+            if llm_cards:
+                cards, card_stats = await _secondary_cards_parallel(
+                    secondaries, sec_profiles, sec_contacts, product, product_desc)
+            else:
+                cards, card_stats = _template_cards(secondaries, sec_contacts, product, template)
+            section = "\n\n".join(cards)
+            t.message = _cards_message(section, card_stats, len(secondaries))
+            t.metadata = _summarize_output({"SECTION_SECONDARY": section, "CARDS": card_stats})
+        else:
+            buyers_content = "".join(
+                _secondary_buyer_content(i, b, sec_profiles, sec_contacts)
+                for i, b in enumerate(secondaries)
+            )
+            section = await llm.secondary_cards_aio(product, product_desc, buyers_content)
+            t.message = f"{len(section)} chars, {len(secondaries)} buyers"
+            t.metadata = _summarize_output({"SECTION_SECONDARY": section})
+
+    return {"SECTION_SECONDARY": section}
+
+
+# ── Orchestrator ────────────────────────────────────────────────────────────
+
+# Coroutine replacements for STEP_REGISTRY entries.
+ASYNC_STEPS = {
+    "s3a": s3a_primary_search,
+    "s3b": s3b_alternate_search,
+    "s3c": s3c_buyer_type_search,
+    "s3d": s3d_buyer_geo_search,
+    "s6": s6_featured_intel,
+    "s7": s7_secondary_intel,
+    "s9": s9_featured_section,
+    "s10": s10_secondary_cards,
+}
+
+# Local, millisecond steps — called directly on the loop rather than handed
+# to the executor.
+INLINE_STEPS = frozenset({"s4a", "s4", "s5", "s8", "s11"})
+
+
+def _inline(fn):
+    async def step(state):
+        return fn(state)
+    return step
+
+
+def async_registry(steps=STEP_REGISTRY):
+    """`steps` (a _step_registry()) with each fn swapped for its coroutine form
+    (ASYNC_STEPS, INLINE_STEPS); the rest stay sync and run on the executor."""
+    registry = []
+    for st in steps:
+        if st["id"] in ASYNC_STEPS:
+            st = {**st, "fn": ASYNC_STEPS[st["id"]]}
+        elif st["id"] in INLINE_STEPS:
+            st = {**st, "fn": _inline(st["fn"])}
+        registry.append(st)
+    return tuple(registry)
+
+
+async def run_pipeline_async(webhook: dict, run_id=None, config=None) -> dict:
+    """Execute the pipeline on the running event loop — see run_pipeline().
+
+    Same phases, schedule (scheduler.run_async over async_registry()),
+    checkpoints, response shapes and `config` snapshot handling. Cancel the
+    task to kill the run: the run is marked 'cancelled' and CancelledError
+    propagates to the caller.
+    """
+    with context.activate(RunContext(config, run_id=run_id)) as ctx:
+        try:
+            return await _execute(webhook, run_id, ctx)
+        finally:
+            _discard_late_context()
+            ctx.finish()
+
+
+async def _execute(webhook, run_id, ctx):
+    """run_pipeline_async() body, inside the run's context."""
+    logger.info("=" * 60)
+    logger.info("INTEL BRIEF PIPELINE — START (asyncio)")
+    logger.info("=" * 60)
+
+    state = {}
+    try:
+        # ── Phase I-II: sequential ──────────────────────────────────
+        t0 = time.time()
+        state = s0_parse_webhook(webhook)
+        if run_id:
+            state["DB_RUN_ID"] = run_id  # Pre-assigned (batch mode)
+        s0_dur = time.time() - t0
+        t1 = time.time()
+        state |= s1_validate_and_load(state)
+        s1_dur = time.time() - t1
+        run_id = ctx.run_id = state["DB_RUN_ID"]
+        log_step(run_id, "s0_parse_webhook", "success",
+                 f"target={state.get('target_company')} ({state.get('target_domain')})",
+                 duration=s0_dur,
+                 metadata={"target_company": state.get("target_company"), "target_domain": state.get("target_domain"),
+                           "product_description": state.get("product_description")})
+        prior = state.get("PRIOR_RUNS", [])
+        log_step(run_id, "s1_validate_and_load", "success",
+                 f"run_id={run_id}, prior={len(prior)}, dedup={'on' if cfg('ENABLE_PRIOR_RUN_DEDUP') else 'off'}",
+                 duration=s1_dur,
+                 metadata={"run_id": run_id, "prior_runs": len(prior), "dedup_enabled": cfg("ENABLE_PRIOR_RUN_DEDUP")})
+        _checkpoint(run_id, "s1", state)
+
+        # ── Phases III-VII: s2–s13 by dependency ────────────────────
+        logger.info(f"── s2–s13: {cfg('PIPELINE_SCHEDULE')} schedule (asyncio) ──")
+        steps = _step_registry()
+        _start_profile(state)
+        _start_budget(state, webhook.get("deadline_s"), registry=steps)
+        try:
+            schedule = await scheduler.run_async(
+                _budgeted(async_registry(steps)), state, mode=cfg("PIPELINE_SCHEDULE"),
+                timeouts={st["id"]: cfg("TIMEOUTS").get(st["timeout"]) for st in STEP_REGISTRY if st["timeout"]},
+                on_step_done=lambda step, delta: _checkpoint(run_id, step, delta),
+                on_step_skipped=lambda step, reason: _skip_step(run_id, step, reason),
+            )
+        finally:
+            _discard_speculation()
+            _log_budget(run_id)
+        _log_schedule(run_id, schedule)
+        return s14_save_and_respond(state)
+
+    except asyncio.CancelledError:
+        ctx.cancel()
+        _cancelled_response(state)
+        raise
+
+    except Exception as e:
+        return _failed_response(state, e)
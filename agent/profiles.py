@@ -0,0 +1,87 @@
+"""Execution profiles — what a run does, chosen by the webhook's tier.
+
+Every run used to do the same work: buyer_chat, s9 and s10 through the LLM,
+s12's assembly mode, s13's LLM fact-check and fix. EXECUTION_PROFILES names
+profiles that each declare, for the tiers they list:
+
+    deadline_s  the run's end-to-end deadline (budget.py), ahead of RUN_DEADLINES
+    skip        optional work left out: buyer_chat (s6 writes no AI context)
+    template    LLM steps replaced by their deterministic path — s10 template
+                cards, s12 template assembly, s13 local fact verification and
+                repair rules only
+
+select() picks the run's profile when its steps start and keeps it on the
+RunContext; steps ask skips(what) / templated(step_id). A tier no profile
+lists gets the "default" one, and with no profile the run does everything.
+The choice is logged as audit step "execution_profile" and in the
+s14_pipeline_complete metadata, which latency_by_tier() reads back for
+per-tier, per-profile run-time percentiles (GET /api/latency/tiers).
+"""
+
+from . import context, db
+from .context import cfg
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def resolve(tier):
+    """(name, profile) for a webhook tier: the profile listing it, else the
+    "default" one, else (None, None)."""
+    tier = str(tier or "").strip()
+    profiles = cfg("EXECUTION_PROFILES")
+    for key in (tier, "default") if tier else ("default",):
+        for name, profile in profiles.items():
+            if key in profile.get("tiers", ()):
+                return name, profile
+    return None, None
+
+
+def select(tier):
+    """Give the active run the profile for `tier`; returns {name, tier, ...}
+    as kept on the RunContext (None when no profile applies)."""
+    name, profile = resolve(tier)
+    ctx = context.current()
+    chosen = {"name": name, "tier": str(tier or ""), **profile} if name else None
+    if ctx:
+        ctx.profile = chosen
+    return chosen
+
+
+def current():
+    """The active run's profile, or None."""
+    ctx = context.current()
+    return ctx.profile if ctx else None
+
+
+def skips(what):
+    """True when the run's profile leaves `what` out (EXECUTION_PROFILE_SKIPS)."""
+    profile = current()
+    return bool(profile) and what in profile.get("skip", ())
+
+
+def templated(step_id):
+    """True when the run's profile replaces step_id's LLM work with its template path."""
+    profile = current()
+    return bool(profile) and step_id in profile.get("template", ())
+
+
+def _pct(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def latency_by_tier(limit=500):
+    """Run-time percentiles of the newest `limit` completed runs, per tier and
+    profile: [{tier, profile, runs, p50, p90, p95, p99, max, mean}], slowest p90 first."""
+    groups = {}
+    for run in db.get_run_latencies(limit):
+        groups.setdefault((run["tier"] or "", run["profile"] or ""), []).append(run["duration_s"])
+    rows = []
+    for (tier, profile), durations in groups.items():
+        row = {"tier": tier, "profile": profile, "runs": len(durations)}
+        row.update({f"p{p}": round(_pct(durations, p), 1) for p in PERCENTILES})
+        row["max"] = round(max(durations), 1)
+        row["mean"] = round(sum(durations) / len(durations), 1)
+        rows.append(row)
+    return sorted(rows, key=lambda r: -r["p90"])
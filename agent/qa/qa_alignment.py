@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Pipeline QA Alignment Script — verifies code ↔ UI ↔ DB consistency.
 
-Checks 7 categories:
+Checks 8 categories:
 1. State flow: code reads/writes match UI inputs/outputs
 2. Output schema: every UI output has a schema entry
 3. Data flow graph: no orphans, no missing producers
@@ -9,6 +9,8 @@ Checks 7 categories:
 5. Content templates: structural check of code vs UI contentTemplate
 6. Config constants: values in code match config.py
 7. DB columns: state keys map to DB columns correctly
+8. Step registry: STEP_REGISTRY reads/writes cover what the step bodies (and
+   the helpers they pass state to) use
 
 Usage:
     python agent/qa/qa_alignment.py          # full report
@@ -50,6 +52,7 @@ DOT_NOTATION_PARENTS = {"SEARCH_STRATEGY"}
 DB_ONLY_KEYS = {
     "SELECTION_RATIONALE",  # Written to DB in s5 via update_run_discovery
     "DISCOVERY_BUYERS",     # Written to DB in s5 via update_run_discovery
+    "VALIDATED_REPORT_MARKDOWN",  # Written to DB in s14 via update_run_completed
 }
 
 # Keys read in the orchestrator's logging/timing block, not in a step function
@@ -62,15 +65,15 @@ RESPONSE_ONLY_STEPS = {"s14"}
 # Step IDs in execution order (matches STEP_ORDER in the UI)
 STEP_ORDER = [
     "s0", "s1", "s2", "s3a", "s3b", "s3c", "s3d",
-    "s4", "s5", "s8", "s6", "s9", "s7", "s10", "s11",
+    "s4a", "s4", "s5", "s8", "s6", "s9", "s7", "s10", "s11",
     "s12", "s13", "s14",
 ]
 
 # Map of LLM step IDs to their llm.py function names
 LLM_FUNCTIONS = {
     "s2": "search_strategy",
-    "s9": "featured_section",
-    "s10": "secondary_cards",
+    "s9": "_featured_section_prompt",
+    "s10": "_secondary_cards_prompt",
     "s12": "shape_and_publish_report",
     "s13": "fact_check",
 }
@@ -511,8 +514,8 @@ def check_config_constants(config, pipeline_src, html_src):
 
     # Check key numeric constants referenced in UI detail/timeout text
     check_constants = [
-        "AI_PROFILE_CHAR_LIMIT", "AI_CONTACTS_CHAR_LIMIT", "AI_OPPS_CHAR_LIMIT",
-        "AI_CONTEXT_CHAR_LIMIT", "AI_CONTACTS_MAX", "AI_OPPS_MAX",
+        "AI_PROFILE_TOKEN_BUDGET", "AI_CONTACTS_TOKEN_BUDGET", "AI_OPPS_TOKEN_BUDGET",
+        "AI_CONTEXT_TOKEN_BUDGET", "AI_CONTACTS_MAX", "AI_OPPS_MAX",
         "MAX_SECONDARY_BUYERS", "OPPORTUNITY_PAGE_SIZE", "BUYER_SEARCH_PAGE_SIZE",
         "BUYER_CHAT_MAX_WAIT", "LLM_TOOL_TIMEOUT",
     ]
@@ -571,6 +574,135 @@ def check_db_columns(db_schema, pipeline_steps):
     return passes, issues
 
 
+# ── 8. Step registry ──────────────────────────────────────────────────────
+
+def extract_step_registry(src):
+    """Extract declared reads/writes per step from pipeline.STEP_REGISTRY."""
+    registry = {}
+    block = re.search(r'^STEP_REGISTRY = \((.*?)^\)', src, re.MULTILINE | re.DOTALL)
+    if not block:
+        return registry
+    for entry in re.split(r'(?=\{"id":)', block.group(1)):
+        id_match = re.match(r'\{"id": "(s\d+[a-d]?)"', entry)
+        if not id_match:
+            continue
+        fields = {}
+        for field in ("reads", "writes"):
+            m = re.search(rf'"{field}": \((.*?)\)', entry, re.DOTALL)
+            fields[field] = set(re.findall(r'"(\w+)"', m.group(1))) if m else set()
+        registry[id_match.group(1)] = fields
+    return registry
+
+
+def _module_functions(module):
+    """{name: FunctionDef} for the top-level functions of agent/<module>.py,
+    plus {name: module} for what it imports with `from .x import name`."""
+    path = AGENT_DIR / f"{module}.py"
+    if not path.exists():
+        return {}, {}
+    tree = ast.parse(read_file(path))
+    functions = {n.name: n for n in tree.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))}
+    imported = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1 and node.module:
+            imported.update({alias.asname or alias.name: node.module for alias in node.names})
+    return functions, imported
+
+
+def extract_helper_reads():
+    """State keys each pipeline.py step reads through the helpers it passes
+    `state` to — pipeline.py functions and other agent modules
+    (factcheck.verify_report(report, state)), followed transitively."""
+    modules = {}
+    memo = {}
+
+    def functions(module):
+        if module not in modules:
+            modules[module] = _module_functions(module)
+        return modules[module]
+
+    def reads(module, name, param):
+        key = (module, name, param)
+        if key in memo:
+            return memo[key]
+        memo[key] = found = set()
+        fn = functions(module)[0].get(name)
+        if fn is None:
+            return found
+        for node in ast.walk(fn):
+            if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name)
+                    and node.value.id == param and isinstance(node.slice, ast.Constant)
+                    and isinstance(node.slice.value, str)):
+                found.add(node.slice.value)
+            if not isinstance(node, ast.Call):
+                continue
+            func = node.func
+            if (isinstance(func, ast.Attribute) and func.attr == "get" and isinstance(func.value, ast.Name)
+                    and func.value.id == param and node.args and isinstance(node.args[0], ast.Constant)):
+                found.add(node.args[0].value)
+                continue
+            if isinstance(func, ast.Name):
+                callee = (module if func.id in functions(module)[0] else functions(module)[1].get(func.id), func.id)
+            elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+                callee = (func.value.id, func.attr)
+            else:
+                continue
+            if callee[0] is None or callee[1] not in functions(callee[0])[0]:
+                continue
+            target = functions(callee[0])[0][callee[1]]
+            params = [a.arg for a in target.args.posonlyargs + target.args.args]
+            passed = [params[i] for i, a in enumerate(node.args)
+                      if i < len(params) and isinstance(a, ast.Name) and a.id == param]
+            passed += [k.arg for k in node.keywords if isinstance(k.value, ast.Name) and k.value.id == param]
+            for callee_param in passed:
+                found |= reads(callee[0], callee[1], callee_param)
+        return found
+
+    steps = {}
+    for name in functions("pipeline")[0]:
+        step_id = re.match(r'(s\d+[a-d]?)_', name)
+        if step_id:
+            steps[step_id.group(1)] = reads("pipeline", name, "state")
+    return steps
+
+
+def check_step_registry(registry, pipeline_steps, helper_reads=None):
+    """[8] Scheduler registry: every key a step reads — itself or through the
+    helpers it passes state to — is declared (so the scheduler waits for its
+    producer and resume_plan reruns it), and declared writes are really returned."""
+    issues = []
+    passes = 0
+
+    for step_id in STEP_ORDER:
+        if step_id in ("s0", "s1") or step_id in RESPONSE_ONLY_STEPS:
+            continue
+        if step_id not in registry:
+            issues.append(f"  \u2717 {step_id}: missing from STEP_REGISTRY")
+            continue
+        declared = registry[step_id]
+        code = pipeline_steps.get(step_id, {"reads": set(), "returns": set()})
+
+        # What the body reads directly, and what the helpers it hands state to read
+        used = code["reads"] | (helper_reads or {}).get(step_id, set())
+        # Webhook fields have no producer step (optional ones may be absent), so
+        # they order nothing and are never declared
+        undeclared = used - declared["reads"] - WEBHOOK_KEYS - {"_start_time"}
+        if undeclared:
+            issues.append(f"  \u2717 {step_id}: reads {sorted(undeclared)} not declared in STEP_REGISTRY")
+        else:
+            passes += 1
+
+        # Steps that build their return dict in a variable (s13) can't be checked
+        if code["returns"]:
+            unreturned = declared["writes"] - code["returns"]
+            if unreturned:
+                issues.append(f"  \u2717 {step_id}: STEP_REGISTRY writes {sorted(unreturned)} not returned by code")
+            else:
+                passes += 1
+
+    return passes, issues
+
+
 # ── Main ──────────────────────────────────────────────────────────────────
 
 def main():
@@ -590,6 +722,8 @@ def main():
     llm_prompts = extract_llm_prompts(llm_src)
     config = extract_config(config_src)
     db_schema = extract_db_schema(db_src)
+    step_registry = extract_step_registry(pipeline_src)
+    helper_reads = extract_helper_reads()
 
     # Run all checks
     checks = [
@@ -600,6 +734,7 @@ def main():
         ("CONTENT TEMPLATES", check_content_templates(ui_steps)),
         ("CONFIG CONSTANTS", check_config_constants(config, pipeline_src, html_src)),
         ("DB COLUMNS", check_db_columns(db_schema, pipeline_steps)),
+        ("STEP REGISTRY", check_step_registry(step_registry, pipeline_steps, helper_reads)),
     ]
 
     total_pass = 0
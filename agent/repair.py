@@ -0,0 +1,120 @@
+"""Local repair rules for s13 validation findings.
+
+Most deterministic findings are mechanical — a stale footer date, a title that
+lost the product name, contact rows with no way to reach the person, a
+secondary buyer whose card went missing. Each rule patches one of these
+directly in the markdown from data already in state, in microseconds, instead
+of sending the whole report through `llm.fix_report` for a full rewrite.
+Findings no rule can fix (malformed emails, short reports, LLM fact-check
+warnings) are left for the LLM.
+
+Rules are matched against the finding strings s13 produces. s13 re-runs its
+checks on the repaired report, so a rule that doesn't fully fix its finding
+just hands it on to the LLM.
+"""
+
+import re
+from datetime import datetime
+
+from .report import report_footer, report_title, template_secondary_card
+
+# Same row pattern as s13 check 4: name | title | — | — |
+_EMPTY_CONTACT_ROW_RE = re.compile(r"^.*\|[^|\n]+\|[^|\n]+\|\s*—\s*\|\s*—\s*\|.*\n?", re.MULTILINE)
+# A table left with only its header + separator row after rows were dropped.
+_HEADER_ONLY_TABLE_RE = re.compile(r"^\|[^\n]*\|\n\|[\s:|-]+\|\n(?!\|)", re.MULTILINE)
+_FOOTER_DATE_RE = re.compile(r"^\*Generated Starbridge Intelligence[^*\n]*\*", re.MULTILINE)
+_CARD_HEADER_RE = re.compile(r"^\*\*(?P<name>[^*\n]+)\*\*(?=\s*\|)", re.MULTILINE)
+_SECTION_BREAK = "\n\n---\n\n"
+
+
+def _fix_title(report, match, ctx):
+    """Rewrite (or insert) the H1 title with the featured buyer + product."""
+    title = f"# \U0001f4ca {report_title(ctx['buyer_name'], ctx['product'])}"
+    lines = report.split("\n", 1)
+    if lines[0].startswith("# "):
+        return title + ("\n" + lines[1] if len(lines) > 1 else "")
+    return f"{title}\n\n{report}"
+
+
+def _fix_footer_date(report, match, ctx):
+    """Stamp the current month/year on the footer, adding the footer if absent."""
+    now = ctx.get("now") or datetime.now()
+    stamp = f"*Generated Starbridge Intelligence {now.strftime('%B %Y')}*"
+    if _FOOTER_DATE_RE.search(report):
+        return _FOOTER_DATE_RE.sub(stamp, report, count=1)
+    return report.rstrip() + _SECTION_BREAK + report_footer(now)
+
+
+def _drop_empty_contact_rows(report, match, ctx):
+    """Remove contact table rows with neither email nor phone."""
+    report = _EMPTY_CONTACT_ROW_RE.sub("", report)
+    return _HEADER_ONLY_TABLE_RE.sub("", report)
+
+
+def _name_words(name):
+    return set(re.findall(r"[a-z0-9]+", name.lower())) - {"of", "the", "and"}
+
+
+def _restore_secondary(report, match, ctx):
+    """Put a missing secondary buyer back — rename a near-miss card header, or
+    insert a template card built from the buyer's s4/s7 data."""
+    name = match.group("name")
+    buyer = next((b for b in ctx["secondary_buyers"] if b.get("buyerName") == name), None)
+    if buyer is None:
+        return None
+
+    # A card whose header is a near-miss of the name (LLM re-cased, shortened
+    # or punctuated it) — restore the exact name instead of adding a duplicate.
+    target = _name_words(name)
+    others = {b.get("buyerName") for b in ctx["secondary_buyers"]} - {name}
+    for m in _CARD_HEADER_RE.finditer(report):
+        found = m.group("name").strip()
+        words = _name_words(found)
+        if found not in others and words and len(target & words) / len(target | words) >= 0.5:
+            return report[:m.start("name")] + name + report[m.end("name"):]
+
+    card = template_secondary_card(buyer, ctx["sec_contacts"], ctx["product"])
+    heading = re.search(r"^## Additional Buyers[^\n]*$", report, re.MULTILINE)
+    if heading:
+        # Append to the end of the existing section
+        end = report.find(_SECTION_BREAK, heading.end())
+        end = len(report) if end == -1 else end
+        return report[:end].rstrip() + "\n\n" + card + report[end:]
+
+    # No section yet — add one where assemble_report would have put it
+    section = f"## Additional Buyers\n\n{card}"
+    for anchor in (r"^## Executive Summary", r"^## What Starbridge Can Do", r"^\*Generated Starbridge Intelligence"):
+        m = re.search(anchor, report, re.MULTILINE)
+        if m:
+            return report[:m.start()] + section + _SECTION_BREAK + report[m.start():]
+    return report.rstrip() + _SECTION_BREAK + section
+
+
+# (name, finding pattern, rule). First matching pattern wins.
+RULES = (
+    ("title", re.compile(r"^Header missing featured buyer name|^Product name '.*' not found in report"), _fix_title),
+    ("footer_date", re.compile(r"^Footer missing current date"), _fix_footer_date),
+    ("empty_contact_rows", re.compile(r"contact rows with no email AND no phone$"), _drop_empty_contact_rows),
+    ("secondary_name", re.compile(r"^Secondary buyer '(?P<name>.+)' not found in report$"), _restore_secondary),
+)
+
+
+def repair_report(report, findings, ctx):
+    """Apply every rule that matches a finding.
+
+    ctx: {buyer_name, product, secondary_buyers, sec_contacts[, now]}.
+    Returns (report, applied) — applied is [{"rule", "finding"}] for each
+    finding a rule changed the report for. Re-validate to confirm the fix.
+    """
+    applied = []
+    for finding in findings:
+        for name, pattern, rule in RULES:
+            m = pattern.search(finding)
+            if not m:
+                continue
+            patched = rule(report, m, ctx)
+            if patched is not None and patched != report:
+                report = re.sub(r"\n{3,}", "\n\n", patched)
+                applied.append({"rule": name, "finding": finding})
+            break
+    return report, applied
@@ -0,0 +1,118 @@
+"""Report assembly — stitch the s8–s11 sections into the final brief.
+
+The sections are fully written upstream (s8 exec summary and s11 CTA from
+templates, s9 featured and s10 secondary cards from LLM sub-agents), so the
+final document is pure layout: title, sections in a fixed order separated by
+horizontal rules, footer. Building it here takes milliseconds and produces the
+same structure every time, which is what s13 validates against.
+
+The LLM shaping path (`llm.shape_and_publish_report`) remains available via
+REPORT_ASSEMBLY_MODE = "llm".
+"""
+
+import re
+from datetime import datetime
+
+from .config import BUYER_TYPE_LABEL
+
+REPORT_FOOTER_SOURCE = "*Data source: Starbridge buyer profile, contacts, and opportunity database*"
+
+# s10 placeholders that mean "no secondary cards" — the section is omitted.
+_EMPTY_SECONDARY = ("", "no secondary buyers", "no secondary buyers.")
+
+SECTION_SEPARATOR = "\n\n---\n\n"
+
+# Heading of the late-bound buyer_chat sub-section (latebind.py)
+STRATEGIC_CONTEXT_HEADING = "### \U0001f9ed Strategic Context"
+
+
+def report_title(buyer_name, product):
+    """Notion page title (no emoji — the H1 inside the page carries it)."""
+    return f"{buyer_name} — Intelligence Report for {product}"
+
+
+def report_footer(generated_at=None):
+    """Footer lines; the month/year is what s13's footer-date check looks for."""
+    month_year = (generated_at or datetime.now()).strftime("%B %Y")
+    return f"*Generated Starbridge Intelligence {month_year}*\n{REPORT_FOOTER_SOURCE}"
+
+
+def _with_heading(section, heading):
+    """Prefix an H2 heading unless the section already opens with one."""
+    section = section.strip()
+    if re.match(r"#{1,3}\s", section):
+        return section
+    return f"## {heading}\n\n{section}"
+
+
+def assemble_report(buyer_name, product, section_featured, section_secondary,
+                    section_exec_summary, section_cta, generated_at=None):
+    """Build the final report markdown from pre-generated sections.
+
+    Order: title → featured → additional buyers (omitted if empty) → exec
+    summary → CTA → footer, with `---` between sections. Section content is
+    used as-is; nothing is added beyond the title, headings and footer.
+    """
+    parts = [f"# \U0001f4ca {report_title(buyer_name, product)}"]
+    if (section_featured or "").strip():
+        parts.append(section_featured.strip())
+    if (section_secondary or "").strip().lower() not in _EMPTY_SECONDARY:
+        parts.append(_with_heading(section_secondary, "Additional Buyers"))
+    if (section_exec_summary or "").strip():
+        parts.append(_with_heading(section_exec_summary, "Executive Summary"))
+    if (section_cta or "").strip():
+        parts.append(section_cta.strip())
+    parts.append(report_footer(generated_at))
+
+    report = SECTION_SEPARATOR.join(parts)
+    return re.sub(r"\n{3,}", "\n\n", report)
+
+
+def with_strategic_context(markdown, section):
+    """The featured section — or a whole report — with the strategic context
+    sub-section at the end of the featured section.
+
+    In a report that is the part after the title; anything else (a bare
+    section, an LLM-shaped report without the title) gets it appended. A
+    markdown that already has the sub-section is returned unchanged.
+    """
+    section = section.strip()
+    if not section or STRATEGIC_CONTEXT_HEADING in markdown:
+        return markdown
+    if not re.match(r"#{1,3}\s", section):
+        section = f"{STRATEGIC_CONTEXT_HEADING}\n\n{section}"
+    parts = markdown.split(SECTION_SEPARATOR)
+    if len(parts) > 2 and parts[0].startswith("# ") and "\n" not in parts[0].strip():
+        parts[1] = f"{parts[1].rstrip()}\n\n{section}"
+        return SECTION_SEPARATOR.join(parts)
+    return f"{markdown.rstrip()}\n\n{section}"
+
+
+def template_secondary_card(buyer, sec_contacts, product):
+    """Deterministic secondary card — same shape as the LLM card, no LLM call.
+
+    Built only from s4 ranking data and s7 contacts, so it can't hallucinate.
+    Used when a parallel-mode s10 card misses its deadline or errors, and by
+    s13's repair rules to restore a secondary buyer missing from the report.
+    """
+    btype = buyer.get("buyerType", "")
+    type_label = ", ".join(BUYER_TYPE_LABEL.get(t.strip(), t.strip()) for t in btype.split(",") if t.strip())
+
+    top_signal = buyer.get("topSignalSummary") or ""
+    if buyer.get("topSignalType"):
+        top_signal = f"{buyer['topSignalType']} — {top_signal}" if top_signal else buyer["topSignalType"]
+
+    contact_line = "No contacts available"
+    matching = [sc for sc in sec_contacts or [] if sc.get("buyerId") == buyer.get("buyerId")]
+    contacts = (matching[0].get("contacts") or []) if matching else []
+    best = next((c for c in contacts if c.get("emailVerified") and c.get("email")), None) \
+        or next((c for c in contacts if c.get("email")), None)
+    if best:
+        contact_line = " — ".join(v for v in (best.get("name"), best.get("title"), best.get("email")) if v)
+
+    card = f"**{buyer['buyerName']}**" + (f" | {type_label}" if type_label else "") + "\n"
+    card += f"- **Top Signal:** {top_signal or 'No recent signals on record'}\n"
+    card += f"- **Key Contact:** {contact_line}\n"
+    card += (f"- **Relevance:** {buyer.get('signalCount', 0)} matching procurement signals "
+             f"for {product} (score {buyer.get('score', 0):.2f})")
+    return card
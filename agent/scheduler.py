@@ -0,0 +1,427 @@
+"""Dependency-driven step scheduler for the pipeline (s2–s13).
+
+Each step is declared once in pipeline.STEP_REGISTRY with the state keys it
+reads and writes — the same keys qa/qa_alignment.py extracts from the step
+bodies and checks against the registry. A step depends on the first step that
+writes each key it reads, plus any ordering-only `after` steps. run() starts
+every step the moment its dependencies have finished, so s8/s11 no longer
+wait for s5's SQLite writes or for Phase VI to open, s7 starts beside s6, and
+s12 starts as soon as its four sections exist.
+
+The old phase barriers are one schedule of the same registry: mode "phased"
+adds a dependency on every step of an earlier phase.
+
+A registry step may also declare start_when(state, pending dependency ids):
+while it waits, the scheduler asks it after every completed step (and every
+poll) and starts the step early once it returns True — s4a uses this to pick
+the featured buyer before the last buyer search returns. If the step is also
+marked `cutoff`, the dependencies still pending when it starts early are cut
+off: skipped for every step, their late output discarded (s4 proceeding on a
+discovery quorum).
+
+run() hands step bodies to the shared executors (executors.py): the one a
+step's `executor` names, else "steps". A step's timeout counts from when a
+worker picks it up; the time it queued for one is its waited_s.
+
+A step marked `optional` (s3a–d) does not fail the run: an exception or a
+timeout skips it — it counts as finished without output, and
+on_step_skipped(step id, reason) is called. Each optional step runs under
+its own RunContext (RunContext.spawn, cancelled with the run's), and
+skipping it cancels that context: a thread still running the step has its
+tool calls stopped, and its audit entries are dropped (RunContext.skipped)
+so the run's record doesn't show it succeeding after it was skipped.
+
+A run can start part-way through: steps listed in `completed` (restored from
+checkpoints by pipeline.resume_pipeline) count as finished from the start,
+and on_step_done is called with each step's output as it lands so the
+caller can checkpoint it.
+
+run_async() is the same schedule on an event loop (run_pipeline_async):
+coroutine steps run as tasks, plain functions on the loop's default
+executor, and cancelling the calling task cancels every running step.
+
+Every run returns a trace: per-step start/end (seconds from the start of the
+schedule), the dependency that gated each step, the critical path, and the
+makespan both schedules would have had with the measured step durations —
+the wall-clock time the DAG saved (or would save) on this run.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import contextmanager
+
+from . import context, executors
+
+logger = logging.getLogger("pipeline.scheduler")
+
+MODES = ("dag", "phased")
+
+# Poll interval while steps run — bounds how late a cancel or timeout is seen.
+_POLL_SECONDS = 0.5
+
+
+def build_graph(registry, mode="dag", external=()):
+    """{step id: set of step ids it waits for}.
+
+    `external` are keys already in state when the schedule starts (webhook
+    fields, s1 output). Raises ValueError when a read has no producer or a
+    dependency is declared after the step that needs it.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown schedule mode '{mode}' (expected one of {', '.join(MODES)})")
+    order = {step["id"]: i for i, step in enumerate(registry)}
+    producers = {}
+    for step in registry:
+        for key in step["writes"]:
+            producers.setdefault(key, step["id"])
+
+    external = set(external)
+    graph = {}
+    for step in registry:
+        sid = step["id"]
+        unknown = [k for k in step["reads"] if k not in producers and k not in external]
+        if unknown:
+            raise ValueError(f"{sid} reads {unknown} but no step writes them")
+        deps = {producers[k] for k in step["reads"] if k in producers and producers[k] != sid}
+        deps |= set(step.get("after", ()))
+        if mode == "phased":
+            deps |= {s["id"] for s in registry if s["phase"] < step["phase"]}
+        late = [d for d in deps if order.get(d, len(registry)) >= order[sid]]
+        if late:
+            raise ValueError(f"{sid} depends on {late}, declared at or after it")
+        graph[sid] = deps
+    return graph
+
+
+def makespan(registry, durations, mode):
+    """Wall-clock seconds `mode` needs for these step durations (unbounded workers)."""
+    graph = build_graph(registry, mode, external=_all_reads(registry))
+    end = {}
+    for step in registry:
+        start = max((end[d] for d in graph[step["id"]]), default=0.0)
+        end[step["id"]] = start + durations.get(step["id"], 0.0)
+    return max(end.values(), default=0.0)
+
+
+def downstream(registry, step_id):
+    """step_id plus every step that depends on it, directly or transitively."""
+    graph = build_graph(registry, "dag", external=_all_reads(registry))
+    found = {step_id}
+    for step in registry:
+        if graph[step["id"]] & found:
+            found.add(step["id"])
+    return found
+
+
+def tails(registry, durations, mode="dag"):
+    """{step id: seconds of the longest chain from that step to the end of the
+    schedule, the step itself included} — what's still ahead of it."""
+    graph = build_graph(registry, mode, external=_all_reads(registry))
+    tail = {}
+    for step in reversed(registry):
+        sid = step["id"]
+        after = [tail[s["id"]] for s in registry if sid in graph[s["id"]]]
+        tail[sid] = durations.get(sid, 0.0) + max(after, default=0.0)
+    return tail
+
+
+def _all_reads(registry):
+    return {k for step in registry for k in step["reads"]}
+
+
+def run(registry, state, mode="dag", max_workers=8, timeouts=None, check_cancelled=None,
+        completed=(), on_step_done=None, on_step_skipped=None):
+    """Run every registry step against `state`, merging each result in as it lands.
+
+    Each step receives a copy of state taken when it starts, and runs on its
+    shared executor, at most max_workers of this run's steps per executor.
+    timeouts: {step id: seconds} for steps with a deadline (measured from
+    that step's start on a worker); an overrun raises TimeoutError. check_cancelled is called between
+    polls and may raise. A step's exception propagates and abandons the rest.
+    completed: step ids whose outputs are already in state — not run again.
+    on_step_done(step id, output) is called after each output is merged.
+    A step with start_when(state, pending) in its registry entry also starts
+    once that returns True, with whatever state exists at that point.
+    An optional step that raises or overruns is skipped instead, and
+    on_step_skipped(step id, reason) is called — so is a step cut off by a
+    `cutoff` step (see the module docstring).
+    Returns the trace (see trace()); it covers only the steps this call ran.
+    """
+    graph = build_graph(registry, mode, external=state.keys())
+    steps = {step["id"]: step for step in registry}
+    timeouts = timeouts or {}
+    started_at = time.time()
+    spans = {}
+    done = set(completed) & steps.keys()
+    running = {}
+    detached = _Detached()
+
+    def skip(sid, reason):
+        for future in [f for f, running_sid in running.items() if running_sid == sid]:
+            del running[future]
+            future.cancel()  # a thread already running is stopped through its context below
+        detached.skip(sid, reason)
+        _skipped(sid, reason, spans, done, started_at, on_step_skipped)
+
+    lanes = {}
+    try:
+        while len(done) < len(steps):
+            if check_cancelled:
+                check_cancelled()
+            for sid in _start_ready(steps, graph, state, spans, done, started_at, skip):
+                name = steps[sid].get("executor", "steps")
+                if name not in lanes:
+                    lanes[name] = executors.lane(name, max_workers)
+                # Each step runs in a copy of the caller's context (its RunContext),
+                # an optional one under a RunContext of its own
+                with detached.activate(steps[sid]):
+                    running[context.submit(lanes[name], steps[sid]["fn"], dict(state))] = sid
+
+            finished, _ = wait(running, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future not in running:
+                    continue  # cut off while this batch finished
+                sid = running.pop(future)
+                try:
+                    output = future.result() or {}
+                except Exception as e:
+                    if not steps[sid].get("optional"):
+                        raise
+                    skip(sid, f"{type(e).__name__}: {e}")
+                    continue
+                detached.release(sid)
+                state |= output
+                if on_step_done:
+                    on_step_done(sid, output)
+                spans[sid]["end_s"] = round(time.time() - started_at, 3)
+                spans[sid]["waited_s"] = round(future.started_at - started_at - spans[sid]["start_s"], 3)
+                done.add(sid)
+                logger.info(f"  {sid} ✓ ({spans[sid]['end_s'] - spans[sid]['start_s']:.1f}s)")
+
+            now = time.time()
+            for future, sid in list(running.items()):
+                limit = timeouts.get(sid)
+                worker_start = getattr(future, "started_at", None)  # None while queued
+                if limit and worker_start and now - worker_start > limit:
+                    if not steps[sid].get("optional"):
+                        raise TimeoutError(f"{sid} exceeded its {limit}s timeout")
+                    skip(sid, f"exceeded its {limit}s timeout")
+    finally:
+        for lane in lanes.values():
+            lane.shutdown(wait=False, cancel_futures=True)
+        detached.close()
+
+    return trace(registry, graph, spans, mode)
+
+
+async def run_async(registry, state, mode="dag", timeouts=None, completed=(), on_step_done=None,
+                    on_step_skipped=None):
+    """run() as a coroutine: each step is an asyncio task.
+
+    `fn` may be a coroutine function (awaited on the loop) or a plain one
+    (run with asyncio.to_thread). A timeout cancels the step and raises
+    TimeoutError (or skips an optional step, as does cutting it off);
+    there is no worker cap, and no polling except while a start_when step
+    waits — cancellation of the caller propagates to every running step.
+    """
+    graph = build_graph(registry, mode, external=state.keys())
+    steps = {step["id"]: step for step in registry}
+    timeouts = timeouts or {}
+    started_at = time.time()
+    spans = {}
+    done = set(completed) & steps.keys()
+    running = {}
+    detached = _Detached()
+
+    async def _run(sid):
+        fn = steps[sid]["fn"]
+        call = fn(dict(state)) if inspect.iscoroutinefunction(fn) else asyncio.to_thread(fn, dict(state))
+        limit = timeouts.get(sid)
+        if not limit:
+            return await call
+        t0 = time.time()
+        try:
+            return await asyncio.wait_for(call, limit)
+        except asyncio.TimeoutError:
+            if time.time() - t0 < limit:
+                raise  # the step's own timeout, not the scheduler's
+            raise TimeoutError(f"{sid} exceeded its {limit}s timeout") from None
+
+    def skip(sid, reason):
+        for task in [t for t, running_sid in running.items() if running_sid == sid]:
+            del running[task]
+            task.cancel()
+        detached.skip(sid, reason)
+        _skipped(sid, reason, spans, done, started_at, on_step_skipped)
+
+    try:
+        while len(done) < len(steps):
+            for sid in _start_ready(steps, graph, state, spans, done, started_at, skip):
+                # the task (and a plain step's thread) copies the context current here
+                with detached.activate(steps[sid]):
+                    running[asyncio.create_task(_run(sid), name=sid)] = sid
+
+            # start_when is re-asked on a poll, like run(), while such a step waits
+            polling = any(step.get("start_when") and sid not in spans and sid not in done
+                          for sid, step in steps.items())
+            finished, _ = await asyncio.wait(running, timeout=_POLL_SECONDS if polling else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                if task not in running:
+                    continue  # cut off while this batch finished
+                sid = running.pop(task)
+                try:
+                    output = task.result() or {}
+                except Exception as e:
+                    if not steps[sid].get("optional"):
+                        raise
+                    skip(sid, f"{type(e).__name__}: {e}")
+                    continue
+                detached.release(sid)
+                state |= output
+                if on_step_done:
+                    on_step_done(sid, output)
+                spans[sid]["end_s"] = round(time.time() - started_at, 3)
+                done.add(sid)
+                logger.info(f"  {sid} ✓ ({spans[sid]['end_s'] - spans[sid]['start_s']:.1f}s)")
+    finally:
+        for task in running:
+            task.cancel()
+        detached.close()
+
+    return trace(registry, graph, spans, mode)
+
+
+class _Detached:
+    """The RunContexts optional steps run under: spawned from the caller's
+    run and cancelled with it, and cancelled on their own when the step is
+    skipped — marked skipped, so a step still running stops writing audit
+    entries (db.log_step)."""
+
+    def __init__(self):
+        self.run = context.current()
+        self._ctxs = {}
+
+    @contextmanager
+    def activate(self, step):
+        """Make the step's own RunContext current while it is submitted."""
+        if not (step.get("optional") and self.run):
+            yield
+            return
+        ctx = self.run.spawn()
+        self._ctxs[step["id"]] = (ctx, self.run.on_cancel(ctx.cancel))
+        with context.activate(ctx):
+            yield
+
+    def skip(self, sid, reason):
+        """Stop a skipped step: mark its context skipped, then cancel it."""
+        if sid in self._ctxs:
+            self._ctxs[sid][0].skipped = reason
+            self._ctxs[sid][0].cancel()
+            self.release(sid)
+
+    def release(self, sid):
+        """The step is over: unlink its context from the run's and finish it."""
+        ctx, unlink = self._ctxs.pop(sid, (None, None))
+        if ctx:
+            unlink()
+            ctx.finish()
+
+    def close(self):
+        """The schedule is over: steps still running stop with it."""
+        for sid in list(self._ctxs):
+            self._ctxs[sid][0].cancel()
+            self.release(sid)
+
+
+def _start_ready(steps, graph, state, spans, done, started_at, skip):
+    """Ids of the steps to launch now: dependencies done, or start_when says go.
+
+    A `cutoff` step started early skips its pending dependencies first, which
+    can free other waiting steps — so the scan repeats until nothing starts.
+    """
+    ready = []
+    scanning = True
+    while scanning:
+        scanning = False
+        for sid, step in steps.items():
+            pending = graph[sid] - done
+            if sid in spans or sid in done or not _startable(step, pending, state):
+                continue
+            spans[sid] = _span(started_at, pending)
+            ready.append(sid)
+            if pending and step.get("cutoff"):
+                for dep in sorted(pending):
+                    skip(dep, f"cut off when {sid} started")
+                scanning = True
+    return ready
+
+
+def _skipped(sid, reason, spans, done, started_at, on_step_skipped):
+    """Record an optional / cut-off step as finished without output."""
+    span = spans.setdefault(sid, {"start_s": round(time.time() - started_at, 3)})
+    span["end_s"] = round(time.time() - started_at, 3)
+    span["skipped"] = reason
+    done.add(sid)
+    logger.warning(f"  {sid} skipped — {reason}")
+    if on_step_skipped:
+        on_step_skipped(sid, reason)
+
+
+def _startable(step, pending, state):
+    """A step starts once its dependencies are done — or before, if its
+    start_when(state, pending dependency ids) says it can."""
+    if not pending:
+        return True
+    start_when = step.get("start_when")
+    return bool(start_when and start_when(state, set(pending)))
+
+
+def _span(started_at, pending):
+    span = {"start_s": round(time.time() - started_at, 3)}
+    if pending:
+        span["early"] = sorted(pending)  # started by start_when ahead of these
+    return span
+
+
+def trace(registry, graph, spans, mode):
+    """Critical-path trace for a finished schedule.
+
+    steps: {id: {start_s, end_s, gated_by, queued_s[, waited_s][, early][, skipped]}} —
+    gated_by is the dependency that finished last, queued_s the time between
+    that and the step's start, waited_s how much of the span it then queued
+    on its shared executor (not counted in its duration); early lists the
+    dependencies still running when start_when started the step, skipped the
+    reason an optional step produced no output. critical_path follows gated_by back
+    from the last step to finish. estimate: makespan of both modes for the
+    measured durations, and what the DAG saves over the phase barriers.
+    """
+    steps = {}
+    for sid, span in spans.items():
+        deps = graph[sid] - set(span.get("early", ()))
+        gate = max((d for d in deps if d in spans), key=lambda d: spans[d]["end_s"], default=None)
+        ready = spans[gate]["end_s"] if gate else 0.0
+        steps[sid] = {**span, "gated_by": gate, "queued_s": round(max(0.0, span["start_s"] - ready), 3)}
+
+    path = []
+    sid = max(steps, key=lambda s: steps[s]["end_s"], default=None)
+    while sid:
+        path.append(sid)
+        sid = steps[sid]["gated_by"]
+    path.reverse()
+
+    durations = {sid: s["end_s"] - s["start_s"] - s.get("waited_s", 0.0) for sid, s in steps.items()}
+    dag_s = makespan(registry, durations, "dag")
+    phased_s = makespan(registry, durations, "phased")
+    return {
+        "mode": mode,
+        "wall_s": round(max((s["end_s"] for s in steps.values()), default=0.0), 2),
+        "steps": steps,
+        "critical_path": path,
+        "critical_path_s": round(sum(durations[s] for s in path), 2),
+        "estimate": {"dag_s": round(dag_s, 2), "phased_s": round(phased_s, 2),
+                     "saved_s": round(phased_s - dag_s, 2)},
+    }
@@ -0,0 +1,304 @@
+"""Buyer scoring for s4_rank_and_select (columnar) and s4a_lock_featured (incremental).
+
+s4 used to score buyer by buyer in nested loops: a datetime.fromisoformat and
+a datetime.now() per signal, a re.findall per string amount, and a substring
+scan per keyword per signal. Here each signal is read once into a row of the
+fields scoring uses (date, type, title, summary, amount), the rows are
+factorized — the four signal-level factors are computed once per distinct row
+(discovery pages overlap, so the same opportunity arrives more than once), with
+date parses and keyword scans memoized per string — and the per-buyer factors
+are group-by reductions over the gathered columns (bincount for counts and
+sums, maximum.at for maxima).
+
+Scores are identical to the loop version: same six factors, same weights,
+applied in the same order, rounded with Python's round().
+
+IncrementalRanker produces the same scores from running per-buyer aggregates,
+one discovery result at a time, so s4a can settle the featured buyer before
+the slowest search returns.
+"""
+
+import heapq
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+
+# (factor, weight) in the order they are summed — the order fixes the rounding
+WEIGHTS = (
+    ("type", 0.25),
+    ("signals", 0.20),
+    ("recency", 0.20),
+    ("urgency", 0.15),
+    ("dollar", 0.10),
+    ("keywords", 0.10),
+)
+
+# A signal is urgent if its type is one of these, or its title mentions one of
+# the _URGENT_RE phrases.
+URGENT_TYPES = frozenset({"rfp", "contract", "contract expiration"})
+_URGENT_RE = re.compile("deadline|expir|due date|rfp")
+_AMOUNT_RE = re.compile(r"[\d]+(?:\.[\d]+)?")
+
+
+class KeywordMatcher:
+    """Counts how many of a keyword set occur (as substrings) in a text.
+
+    Memoized per text, so a text shared by several signals is scanned once.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(set(keywords))
+        self._memo = {}
+
+    def count(self, text):
+        hits = self._memo.get(text)
+        if hits is None:
+            hits = self._memo[text] = sum(1 for k in self.keywords if k in text)
+        return hits
+
+
+def _age_days(date_str, now_utc, now_local):
+    """Whole days since date_str (ISO 8601, "Z" allowed), None if unparseable."""
+    try:
+        dt = datetime.fromisoformat(str(date_str).replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    return ((now_utc if dt.tzinfo else now_local) - dt).days
+
+
+def _dollar(amount):
+    """Largest number in a signal's amount field (0.0 if none)."""
+    if isinstance(amount, (int, float)):
+        return max(0.0, float(amount))
+    if isinstance(amount, str):
+        return max((float(n) for n in _AMOUNT_RE.findall(amount.replace(",", ""))), default=0.0)
+    return 0.0
+
+
+def signal_buyer(opp):
+    """(buyer id, name, type) of an opportunity signal (s3a/s3b)."""
+    return (
+        opp.get("buyerId") or opp.get("buyer_id") or opp.get("id"),
+        opp.get("buyerName") or opp.get("buyer_name") or opp.get("name", "Unknown"),
+        opp.get("buyerType") or opp.get("buyer_type") or "",
+    )
+
+
+def direct_buyer(buyer):
+    """(buyer id, name, type) of a buyer_search result (s3c/s3d)."""
+    return (
+        buyer.get("id") or buyer.get("buyerId"),
+        buyer.get("name") or buyer.get("buyerName", "Unknown"),
+        buyer.get("type") or buyer.get("buyerType", ""),
+    )
+
+
+def _row(s):
+    """The fields of a signal the scoring factors read (hashable)."""
+    amt = s.get("amount") or s.get("value") or s.get("contractAmount") or 0
+    return (
+        s.get("date") or s.get("createdAt") or s.get("created_at") or "",
+        s.get("type") or s.get("opportunityType") or "",
+        s.get("title", ""),
+        s.get("summary", ""),
+        amt if isinstance(amt, (int, float, str)) else None,
+    )
+
+
+class _SignalFactors:
+    """Signal-level factors of a row: (age in days or nan, urgent, dollar, keyword hits).
+
+    Date parses and keyword scans are memoized per string; "now" is read once.
+    """
+
+    def __init__(self, keywords):
+        self.matcher = KeywordMatcher(keywords)
+        self.now_utc, self.now_local = datetime.now(timezone.utc), datetime.now()
+        self._ages = {}
+
+    def __call__(self, date_str, stype, title, summary, amount):
+        if date_str not in self._ages:
+            self._ages[date_str] = _age_days(date_str, self.now_utc, self.now_local) if date_str else None
+        age = self._ages[date_str]
+        return (
+            np.nan if age is None else age,
+            stype.lower() in URGENT_TYPES or _URGENT_RE.search((title or summary or "").lower()) is not None,
+            _dollar(amount),
+            self.matcher.count(f"{title} {summary}".lower()),
+        )
+
+
+def _type_match(buyer_type, target_types):
+    return 1.0 if any(t.strip().lower() in target_types for t in (buyer_type or "").lower().split(",")) else 0.0
+
+
+def _final_scores(factors):
+    """Rounded six-factor scores from per-buyer factor arrays (raw counts/maxima)."""
+    # Signal count, dollar and keyword factors are normalized by the batch max
+    for name in ("signals", "dollar", "keywords"):
+        factors[name] = factors[name] / (factors[name].max(initial=0) or 1)
+    total = np.zeros(len(factors["type"]))
+    for name, weight in WEIGHTS:
+        total = total + weight * factors[name]
+    return [round(score, 4) for score in total.tolist()]
+
+
+def _scored(bid, name, btype, signal_count, top_signal, score):
+    return {
+        "buyerId": bid,
+        "buyerName": name,
+        "buyerType": btype,
+        "signalCount": signal_count,
+        "topSignalType": top_signal.get("type", "") if top_signal else "",
+        "topSignalSummary": (top_signal.get("title") or top_signal.get("summary", ""))[:200] if top_signal else "",
+        "score": score,
+    }
+
+
+def score_buyers(buyer_signals, keywords, target_types):
+    """Score every buyer in buyer_signals ({id: {name, type, signals}}).
+
+    keywords: lowercase keyword set matched against signal title + summary.
+    target_types: lowercase buyer types from the search strategy.
+    Returns one dict per buyer, in buyer_signals order: buyerId, buyerName,
+    buyerType, signalCount, topSignalType, topSignalSummary, score.
+    """
+    buyers = list(buyer_signals.items())
+    n = len(buyers)
+    factors_of = _SignalFactors(keywords)
+
+    # ── Signals into rows of the fields scoring reads ──
+    rows = [_row(s) for _, info in buyers for s in info["signals"]]
+    owner = np.repeat(np.arange(n), [len(info["signals"]) for _, info in buyers])
+
+    # ── Factorize: score each distinct row once, then gather per signal ──
+    distinct = {row: i for i, row in enumerate(dict.fromkeys(rows))}
+    table = np.array([factors_of(*row) for row in distinct], dtype=np.float64).reshape(-1, 4)
+    columns = table[np.fromiter(map(distinct.__getitem__, rows), np.intp, len(rows))]
+    age, urgency, dollar, keyword = columns.T
+
+    # ── Group by buyer ──
+    factors = {
+        "type": np.array([_type_match(info["type"], target_types) for _, info in buyers]),
+        "signals": np.bincount(owner, minlength=n).astype(np.float64),
+        "recency": np.zeros(n),
+        "urgency": (np.bincount(owner, weights=urgency, minlength=n) > 0).astype(np.float64),
+        "dollar": np.zeros(n),
+        "keywords": np.bincount(owner, weights=keyword, minlength=n),
+    }
+    dated = ~np.isnan(age)
+    np.maximum.at(factors["recency"], owner[dated], np.maximum(0, 365 - age[dated]) / 365)
+    np.maximum.at(factors["dollar"], owner, dollar)
+
+    return [
+        _scored(bid, info["name"], info["type"], len(info["signals"]),
+                info["signals"][0] if info["signals"] else None, score)
+        for (bid, info), score in zip(buyers, _final_scores(factors))
+    ]
+
+
+# ── Incremental ranking (s4a) ────────────────────────────────────────────────
+
+# Discovery sources in the order s4 merges them: opportunity signals (s3a,
+# s3b), then buyer_search buyers (s3c, s3d) that add buyers but no signals.
+SIGNAL_SOURCES = ("A", "B")
+BUYER_SOURCES = ("C", "D")
+SOURCES = SIGNAL_SOURCES + BUYER_SOURCES
+
+
+class IncrementalRanker:
+    """s4's ranking, built up one discovery result at a time.
+
+    add() folds a search's results into running per-buyer aggregates (signal
+    count, max recency, urgency, max dollar, keyword hits); top(k) is the live
+    ranking, selected with a heap. Buyers keep the position s4 would give them
+    (first appearance in A, B, C, D order), so ties and the final ranking
+    match score_buyers over the merged map whatever order results arrive in.
+
+    stability() says whether the leader can still be overtaken. A pending
+    buyer search can only add buyers with no signals — at most the type weight
+    (0.25), no change to any other buyer's score, and ranked after every buyer
+    that has signals — so once both opportunity searches are in, a leader with
+    signals scoring at least that ceiling is final. A pending opportunity
+    search has no ceiling: a future-dated signal or an unbounded amount can
+    lift any buyer past the leader.
+    """
+
+    def __init__(self, keywords, target_types):
+        self.target_types = target_types
+        self.folded = []
+        self._factors = _SignalFactors(keywords)
+        self._buyers = {}
+
+    def add(self, source, results):
+        """Fold one search's results in (source: "A"–"D"); a repeat is ignored."""
+        if source in self.folded:
+            return
+        self.folded.append(source)
+        rank = SOURCES.index(source)
+        for i, item in enumerate(results or []):
+            bid, name, btype = signal_buyer(item) if source in SIGNAL_SOURCES else direct_buyer(item)
+            if not bid:
+                continue
+            pos = (rank, i)
+            agg = self._buyers.get(bid)
+            if agg is None:
+                agg = self._buyers[bid] = {"pos": pos, "name": name, "type": btype, "signals": 0,
+                                           "recency": 0.0, "urgency": 0.0, "dollar": 0.0, "keywords": 0.0,
+                                           "top": None, "top_pos": None}
+            elif pos < agg["pos"]:
+                agg.update(pos=pos, name=name, type=btype)
+            if source not in SIGNAL_SOURCES:
+                continue
+            age, urgent, dollar, hits = self._factors(*_row(item))
+            agg["signals"] += 1
+            if age == age:  # not nan
+                agg["recency"] = max(agg["recency"], max(0, 365 - age) / 365)
+            agg["urgency"] = max(agg["urgency"], float(urgent))
+            agg["dollar"] = max(agg["dollar"], dollar)
+            agg["keywords"] += hits
+            if agg["top_pos"] is None or pos < agg["top_pos"]:
+                agg["top"], agg["top_pos"] = item, pos
+
+    def pending(self):
+        return [s for s in SOURCES if s not in self.folded]
+
+    def ranked(self):
+        """[(buyer id, aggregates, score)] in s4's merge order."""
+        buyers = sorted(self._buyers.items(), key=lambda item: item[1]["pos"])
+        if not buyers:
+            return []
+        factors = {name: np.array([agg[name] for _, agg in buyers], dtype=np.float64)
+                   for name in ("signals", "recency", "urgency", "dollar", "keywords")}
+        factors["type"] = np.array([_type_match(agg["type"], self.target_types) for _, agg in buyers])
+        return [(bid, agg, score) for (bid, agg), score in zip(buyers, _final_scores(factors))]
+
+    def top(self, k):
+        """The k best buyers as scored dicts, best first (ties: s4's merge order)."""
+        ranked = self.ranked()
+        best = heapq.nlargest(k, range(len(ranked)), key=lambda i: (ranked[i][2], -i))
+        return [_scored(bid, agg["name"], agg["type"], agg["signals"], agg["top"], score)
+                for bid, agg, score in (ranked[i] for i in best)]
+
+    def stability(self):
+        """Leader, runner-up, margin, the ceiling pending searches could reach, locked."""
+        pending = self.pending()
+        leader, runner_up = (self.top(2) + [None, None])[:2]
+        if any(s in SIGNAL_SOURCES for s in pending):
+            ceiling = None
+        else:
+            ceiling = dict(WEIGHTS)["type"] if pending and self.target_types else 0.0
+        locked = leader is not None and (not pending or (
+            ceiling is not None and leader["signalCount"] > 0 and leader["score"] >= ceiling))
+        return {
+            "leader": leader and leader["buyerName"],
+            "leader_id": leader and leader["buyerId"],
+            "leader_score": leader and leader["score"],
+            "runner_up": runner_up and runner_up["buyerName"],
+            "margin": round(leader["score"] - (runner_up["score"] if runner_up else 0.0), 4) if leader else None,
+            "pending": pending,
+            "ceiling": ceiling,
+            "headroom": round(leader["score"] - ceiling, 4) if leader and ceiling is not None else None,
+            "locked": locked,
+        }
@@ -1,7 +1,12 @@
 """FastAPI server for the pipeline monitor.
 
 Serves pipeline-explorer.html and provides API endpoints for launching
-pipeline runs (single + batch), polling status, and managing active runs.
+pipeline runs (single + batch), resuming failed runs from their checkpoints,
+polling status, and managing active runs.
+
+With PIPELINE_RUNTIME = "asyncio" new runs are tasks on one shared event
+loop (pipeline_async.run_pipeline_async) instead of a thread each; kill
+cancels the task. Resumes always run on a thread.
 
 Usage:
     cd /Users/oliviagao/project/starbridge
@@ -9,6 +14,7 @@ Usage:
     # or: uvicorn agent.server:app --port 8111
 """
 
+import asyncio
 import json
 import os
 import threading
@@ -18,21 +24,30 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import FileResponse, JSONResponse
 import uvicorn
 
-from . import db
+from . import db, executors, profiles
 from .config import (
-    MAX_CONCURRENT_RUNS, CONFIG_METADATA,
-    get_config_snapshot, set_config_value, reset_config, apply_config_to_modules,
+    MAX_CONCURRENT_RUNS, PIPELINE_RUNTIME, CONFIG_METADATA,
+    get_config_snapshot, set_config_value, reset_config,
 )
-from .pipeline import run_pipeline
+from .context import CancelToken, RunContext, activate, leaked_work
+from .pipeline import drop_prefetched_strategy, prefetch_strategies, resume_pipeline, resume_plan, run_pipeline
+from .pipeline_async import run_pipeline_async
 
 app = FastAPI()
 
 # ── State ────────────────────────────────────────────────────────────────────
 
 # Multi-run tracking: run_id → {"thread", "stop_event", "error", "batch_id"}
+# (+ "resume": {"from_step"} for runs started by /api/resume). "thread" is a
+# _LoopRun for runs on the asyncio runtime.
 _active_runs: dict[int, dict] = {}
 _lock = threading.Lock()
 _run_semaphore = threading.Semaphore(MAX_CONCURRENT_RUNS)
+_async_run_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+
+# Event loop for the asyncio runtime — started on first use, one daemon thread.
+_loop = None
+_loop_lock = threading.Lock()
 _batch_counter = 0
 
 AGENT_DIR = os.path.dirname(__file__)
@@ -53,29 +68,117 @@ def _active_count():
     return sum(1 for entry in _active_runs.values() if entry["thread"].is_alive())
 
 
+def _mark_processing(run_id):
+    """Mark a run as actually running once it has a semaphore slot."""
+    conn = db.get_connection()
+    conn.execute("UPDATE runs SET status='processing' WHERE id=?", (run_id,))
+    conn.commit()
+    conn.close()
+
+
 def _run_pipeline_managed(webhook, run_entry, run_id, semaphore=None):
-    """Wrapper: acquire semaphore slot, apply config snapshot, run pipeline, release."""
+    """Wrapper: acquire semaphore slot, run (or resume) pipeline with its config snapshot, release."""
     sem = semaphore or _run_semaphore
     sem.acquire()
     try:
-        # Mark as actually running now that we have a semaphore slot
-        conn = db.get_connection()
-        conn.execute("UPDATE runs SET status='processing' WHERE id=?", (run_id,))
-        conn.commit()
-        conn.close()
+        _mark_processing(run_id)
 
-        # Apply the config snapshot captured at submission time so this run
-        # uses the config that was active when it was started, not whatever
-        # the user may have changed in the UI since then.
+        # The config snapshot captured at submission time becomes the run's
+        # RunContext config, so this run uses the config that was active when
+        # it was started — not whatever the user (or another run) changed since.
         snapshot = run_entry.get("config_snapshot")
-        if snapshot:
-            apply_config_to_modules(snapshot)
-        run_pipeline(webhook, stop_event=run_entry["stop_event"], run_id=run_id)
+        if run_entry.get("resume"):
+            resume_pipeline(run_id, from_step=run_entry["resume"]["from_step"],
+                            stop_event=run_entry["stop_event"], config=snapshot)
+        else:
+            run_pipeline(webhook, stop_event=run_entry["stop_event"], run_id=run_id, config=snapshot)
     except Exception as e:
         with _lock:
             run_entry["error"] = str(e)
     finally:
         sem.release()
+        drop_prefetched_strategy(run_id)
+
+
+# ── asyncio runtime ──────────────────────────────────────────────────────────
+
+class _LoopRun:
+    """Thread-like handle (is_alive / join) for a run scheduled on the event loop."""
+
+    def __init__(self, loop, coro):
+        self.loop = loop
+        self.task = None
+        self.finished = threading.Event()
+        loop.call_soon_threadsafe(self._start, coro)
+
+    def _start(self, coro):
+        self.task = self.loop.create_task(coro)
+        self.task.add_done_callback(lambda _: self.finished.set())
+
+    def is_alive(self):
+        return not self.finished.is_set()
+
+    def join(self, timeout=None):
+        self.finished.wait(timeout)
+
+    def cancel(self):
+        """Cancel the run's task; the pipeline records the run as cancelled."""
+        self.loop.call_soon_threadsafe(lambda: self.task.cancel())
+
+
+def _event_loop():
+    """The shared event loop all asyncio-runtime runs are scheduled on."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="pipeline-loop", daemon=True).start()
+    return _loop
+
+
+async def _run_pipeline_managed_async(webhook, run_entry, run_id, semaphore=None):
+    """_run_pipeline_managed for the asyncio runtime — runs as a task on _event_loop()."""
+    try:
+        async with semaphore or _async_run_semaphore:
+            _mark_processing(run_id)
+            await run_pipeline_async(webhook, run_id=run_id, config=run_entry.get("config_snapshot"))
+    except Exception as e:
+        with _lock:
+            run_entry["error"] = str(e)
+    finally:
+        drop_prefetched_strategy(run_id)
+
+
+def _runtime(config_snapshot):
+    return (config_snapshot or {}).get("PIPELINE_RUNTIME", PIPELINE_RUNTIME)
+
+
+def _new_semaphore(config_snapshot):
+    """Per-batch MAX_CONCURRENT_RUNS gate for the runtime the batch will use."""
+    limit = (config_snapshot or {}).get("MAX_CONCURRENT_RUNS", MAX_CONCURRENT_RUNS)
+    return asyncio.Semaphore(limit) if _runtime(config_snapshot) == "asyncio" else threading.Semaphore(limit)
+
+
+def _launch(webhook, entry, run_id, semaphore=None):
+    """Register the run in _active_runs and start it on its snapshot's runtime."""
+    if _runtime(entry.get("config_snapshot")) == "asyncio" and not entry.get("resume"):
+        with _lock:
+            entry["thread"] = _LoopRun(_event_loop(), _run_pipeline_managed_async(webhook, entry, run_id, semaphore))
+            _active_runs[run_id] = entry
+        return
+
+    t = threading.Thread(target=_run_pipeline_managed, args=(webhook, entry, run_id, semaphore), daemon=True)
+    entry["thread"] = t
+    with _lock:
+        _active_runs[run_id] = entry
+    t.start()
+
+
+def _stop(entry):
+    """Signal a run to stop: stop_event for thread runs, task cancellation on the loop."""
+    entry["stop_event"].set()
+    if isinstance(entry["thread"], _LoopRun):
+        entry["thread"].cancel()
 
 
 # ── Endpoints ────────────────────────────────────────────────────────────────
@@ -116,15 +219,10 @@ def start_run(webhook: dict):
     # even if the user changes config in the UI before the run finishes.
     config_snapshot = get_config_snapshot()
 
-    stop_event = threading.Event()
+    stop_event = CancelToken()
     entry = {"thread": None, "stop_event": stop_event, "error": None,
              "batch_id": None, "config_snapshot": config_snapshot}
-    t = threading.Thread(target=_run_pipeline_managed, args=(webhook, entry, run_id), daemon=True)
-    entry["thread"] = t
-
-    with _lock:
-        _active_runs[run_id] = entry
-    t.start()
+    _launch(webhook, entry, run_id)
 
     return {"run_id": run_id}
 
@@ -134,7 +232,8 @@ def start_batch(webhooks: list[dict]):
     """Launch multiple pipeline runs. Returns batch_id + run_ids.
 
     Runs are throttled by MAX_CONCURRENT_RUNS semaphore — excess runs
-    queue until a slot opens.
+    queue until a slot opens. s2 strategies for the whole batch are
+    requested up front in STRATEGY_BATCH_SIZE chunks (prefetch_strategies).
     """
     global _batch_counter
 
@@ -164,21 +263,54 @@ def start_batch(webhooks: list[dict]):
     # Snapshot config once for the entire batch — all runs use the same config.
     config_snapshot = get_config_snapshot()
 
+    # Start batched s2 strategy calls now, with the batch's config, so queued
+    # runs find their strategy ready instead of each making their own call.
+    with activate(RunContext(config_snapshot)):
+        strategy_batches = prefetch_strategies(webhooks, run_ids)
+
     # Create a per-batch semaphore from the current MAX_CONCURRENT_RUNS config
-    batch_semaphore = threading.Semaphore(config_snapshot.get("MAX_CONCURRENT_RUNS", MAX_CONCURRENT_RUNS))
+    batch_semaphore = _new_semaphore(config_snapshot)
 
-    # Spawn threads (semaphore gates actual execution)
+    # Spawn threads / loop tasks (semaphore gates actual execution)
     for rid, wh in zip(run_ids, webhooks):
-        stop_event = threading.Event()
+        stop_event = CancelToken()
         entry = {"thread": None, "stop_event": stop_event, "error": None,
                  "batch_id": batch_id, "config_snapshot": config_snapshot}
-        t = threading.Thread(target=_run_pipeline_managed, args=(wh, entry, rid, batch_semaphore), daemon=True)
-        entry["thread"] = t
-        with _lock:
-            _active_runs[rid] = entry
-        t.start()
+        _launch(wh, entry, rid, batch_semaphore)
+
+    return {"batch_id": batch_id, "run_ids": run_ids, "total": len(run_ids),
+            "strategy_batches": strategy_batches}
 
-    return {"batch_id": batch_id, "run_ids": run_ids, "total": len(run_ids)}
+
+@app.post("/api/resume/{run_id}")
+def resume_run(run_id: int, from_step: str | None = None):
+    """Resume a failed or cancelled run from its checkpoints in a background thread.
+
+    Only steps without a checkpoint are rerun; ?from_step=s12 also reruns that
+    step and everything downstream of it. Uses the current config.
+    """
+    if not db.get_run(run_id):
+        raise HTTPException(404, "Run not found")
+
+    with _lock:
+        _prune_dead_runs()
+        if run_id in _active_runs:
+            raise HTTPException(409, f"Run {run_id} is still active")
+        if _active_count() >= MAX_CONCURRENT_RUNS:
+            raise HTTPException(409, f"Max concurrent runs ({MAX_CONCURRENT_RUNS}) reached")
+
+    try:
+        plan = resume_plan(run_id, from_step)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+
+    stop_event = CancelToken()
+    entry = {"thread": None, "stop_event": stop_event, "error": None,
+             "batch_id": None, "config_snapshot": get_config_snapshot(),
+             "resume": {"from_step": from_step}}
+    _launch(None, entry, run_id)
+
+    return {"run_id": run_id, "from_step": from_step, **plan}
 
 
 @app.get("/api/batch-status/{batch_id}")
@@ -213,7 +345,7 @@ def kill_batch(batch_id: int):
                    if e.get("batch_id") == batch_id and e["thread"].is_alive()]
 
     for rid, entry in entries:
-        entry["stop_event"].set()
+        _stop(entry)
 
     # Brief wait for graceful exit
     for rid, entry in entries:
@@ -314,7 +446,7 @@ def kill_run(run_id: int):
     if not entry or not entry["thread"].is_alive():
         raise HTTPException(409, "No active pipeline for this run_id")
 
-    entry["stop_event"].set()
+    _stop(entry)
     entry["thread"].join(timeout=5)
 
     # If the pipeline thread handled it, status is already 'cancelled'.
@@ -324,7 +456,27 @@ def kill_run(run_id: int):
         db.update_run_cancelled(run_id)
         db.log_step(run_id, "pipeline_killed", "failure", "Killed by user via monitor UI")
 
-    return {"status": "cancelled", "run_id": run_id}
+    # Anything of this run's still running after the join didn't stop on cancel
+    leaked = [w for w in leaked_work()["items"] if w["run_id"] == run_id]
+    return {"status": "cancelled", "run_id": run_id, "leaked": leaked}
+
+
+@app.get("/api/leaked-work")
+def get_leaked_work():
+    """Tool calls, subprocesses and pool tasks still running for cancelled or finished runs."""
+    return leaked_work()
+
+
+@app.get("/api/executors")
+def get_executors():
+    """Shared executors: workers, threads, busy, queue depth, utilization and per-run holdings."""
+    return executors.stats()
+
+
+@app.get("/api/latency/tiers")
+def get_tier_latency(limit: int = 500):
+    """p50/p90/p95/p99 run time per tier and execution profile, over the newest `limit` completed runs."""
+    return {"runs": limit, "tiers": profiles.latency_by_tier(limit)}
 
 
 @app.get("/api/config")
@@ -200,12 +200,17 @@ def test_s13_no_findings():
         "FEATURED_BUYER_NAME": run.get("featured_buyer_name", ""),
         "target_company": run.get("target_company", ""),
         "SECONDARY_BUYERS": json.loads(run["secondary_buyers"]) if run.get("secondary_buyers") else [],
-        "NOTION_PAGE_URL": None,  # prevent any Notion writes
+        "PUBLISHED_PAGE_URL": None,  # prevent any Notion writes
     }
+    # Source data for the local fact verifier — with it, a clean report's
+    # claims all match and the LLM fact-check is skipped (gated mode).
+    for key in ("feat_profile", "feat_contacts", "feat_opportunities", "sec_profiles", "sec_contacts"):
+        state[key.upper()] = json.loads(run[key]) if run.get(key) else None
+    state["FEAT_AI_CONTEXT"] = run.get("feat_ai_context")
 
     result = s13_validate(state)
     validation = result.get("VALIDATION_RESULT", {})
-    has_no_fix = "VALIDATED_REPORT_MARKDOWN" not in result
+    has_no_fix = not result.get("VALIDATED_REPORT_MARKDOWN")
     return True, f"passed={validation.get('passed')}, fixed={validation.get('fixed')}, no_fix_applied={has_no_fix}"
 
 
@@ -232,7 +237,7 @@ def test_s13_fix_path():
         "FEATURED_BUYER_NAME": real_buyer,
         "target_company": run.get("target_company", ""),
         "SECONDARY_BUYERS": [],
-        "NOTION_PAGE_URL": None,  # don't actually update Notion
+        "PUBLISHED_PAGE_URL": None,  # don't actually update Notion
     }
 
     result = s13_validate(state)
@@ -242,7 +247,7 @@ def test_s13_fix_path():
     return has_issues, (
         f"issues={validation.get('issues', [])}, "
         f"fix_attempted={fix_attempted}, "
-        f"has_validated_report={'VALIDATED_REPORT_MARKDOWN' in result}"
+        f"has_validated_report={bool(result.get('VALIDATED_REPORT_MARKDOWN'))}"
     )
 
 
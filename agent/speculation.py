@@ -0,0 +1,148 @@
+"""Speculative featured-buyer enrichment — s6's calls started during discovery.
+
+With SPECULATIVE_ENRICHMENT on, the scheduler's start check for s4a (or
+for s4, without s4a — pipeline._watch_discovery) folds each finished search
+into the IncrementalRanker while s3a–d are still running. Once the partial ranking has a frontrunner that leads the runner-up
+by at least SPECULATION_MIN_MARGIN_PCT, start() submits s6's three calls —
+buyer_profile, buyer_contacts, buyer_chat — for it: on the shared
+"enrichment" executor (executors.py), or as tasks when the run is on an event loop (run_pipeline_async).
+
+s6 then takes the speculation (pipeline._take_speculation) for the buyer
+actually selected. A hit hands over the calls already in flight; one s6
+doesn't want (buyer_chat skipped by the profile or budget) is stopped on its
+own. A miss cancels them: queued calls never start, buyer_chat stops polling,
+and requests already sent are discarded. Either way outcome() is what the run
+records (audit step "s6_speculation"): hit, lead_s (how long the calls ran
+before s6 started), saved_s (how much of that s6 no longer waits for) and
+wasted_s (call-seconds thrown away).
+"""
+
+import asyncio
+import time
+from . import context, executors, tools
+from .context import RunContext
+
+CALLS = ("profile", "contacts", "chat")
+
+
+class Speculation:
+    """s6's three calls for one buyer, started before it was selected.
+
+    calls: {"profile" | "contacts" | "chat": Future or Task} of the raw tool
+    outputs; pool: the "enrichment" executor lane running them (None on an
+    event loop). stability: the ranker's stability() when it was started.
+    On threads each call runs under its own RunContext (RunContext.spawn),
+    cancelled with the run's, so stop() can reach one that already started.
+    """
+
+    def __init__(self, buyer_id, buyer_name, stability):
+        self.buyer_id = buyer_id
+        self.buyer_name = buyer_name
+        self.stability = stability
+        self.started_at = time.time()
+        self.finished_at = {}
+        self.calls = {}
+        self.pool = None
+        self._ctxs = {}
+        self._unlinks = {}
+
+    def start(self, question, page_size, max_workers):
+        """Submit the calls — as tasks on the running loop, else on an executor lane."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop:
+            coros = {"profile": tools.buyer_profile_aio(self.buyer_id),
+                     "contacts": tools.buyer_contacts_aio(self.buyer_id, page_size),
+                     "chat": tools.buyer_chat_aio(self.buyer_id, question)}
+            self.calls = {name: loop.create_task(self._timed_aio(name, coro), name=f"speculative {name}")
+                          for name, coro in coros.items()}
+            return self
+
+        # A cancel token per call, so a miss — or s6 not wanting buyer_chat —
+        # can stop a running call's poll loop without touching the run's; but
+        # killing the run cancels them too. The run's config, budget and
+        # profile are shared.
+        run = context.current()
+        self.pool = executors.lane("enrichment", max_workers)
+        fns = {"profile": (tools.buyer_profile, self.buyer_id),
+               "contacts": (tools.buyer_contacts, self.buyer_id, page_size),
+               "chat": (tools.buyer_chat, self.buyer_id, question)}
+        for name, fn in fns.items():
+            ctx = self._ctxs[name] = run.spawn() if run else RunContext()
+            if run:
+                self._unlinks[name] = run.on_cancel(ctx.cancel)
+            with context.activate(ctx):
+                self.calls[name] = context.submit(self.pool, self._timed, name, *fn)
+        return self
+
+    def _timed(self, name, fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            self.finished_at[name] = time.time()
+
+    async def _timed_aio(self, name, coro):
+        try:
+            return await coro
+        finally:
+            self.finished_at[name] = time.time()
+
+    def stop(self, name):
+        """Stop one call: drop it if queued, cancel its own token (or task) if
+        running — buyer_chat stops polling and frees its worker."""
+        call = self.calls.pop(name, None)
+        if call is not None:
+            call.cancel()
+        ctx = self._ctxs.pop(name, None)
+        if ctx:
+            ctx.cancel()
+            ctx.finish()
+        self._unlink(name)
+
+    def hand_off(self, name):
+        """(call, its RunContext) for a call that outlives s6 — a late-bound
+        buyer_chat (latebind.LateContext.adopt). The speculation no longer
+        stops or finishes it. The context is None on an event loop."""
+        self._unlink(name)
+        return self.calls.pop(name), self._ctxs.pop(name, None)
+
+    def finish(self):
+        """s6 is done with the calls: anything of theirs still running counts
+        as leaked work (context.leaked_work)."""
+        for name in list(self._ctxs):
+            self._ctxs.pop(name).finish()
+            self._unlink(name)
+
+    def cancel(self):
+        """Stop what hasn't finished; results of calls already in flight are dropped."""
+        for name in list(self.calls):
+            self.stop(name)
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _unlink(self, name):
+        unlink = self._unlinks.pop(name, None)
+        if unlink:
+            unlink()
+
+    def outcome(self, featured_id, taken_at=None):
+        """What speculating on this run bought (hit, saved_s) or cost (wasted_s)."""
+        taken_at = taken_at or time.time()
+        lead = taken_at - self.started_at
+        ran = [min(self.finished_at.get(name, taken_at), taken_at) - self.started_at for name in CALLS]
+        hit = featured_id == self.buyer_id
+        return {
+            "hit": hit,
+            "buyer": self.buyer_name,
+            "buyer_id": self.buyer_id,
+            "featured_id": featured_id,
+            "margin": self.stability["margin"],
+            "pending": self.stability["pending"],
+            "lead_s": round(lead, 2),
+            # s6 waits for the slowest call: a hit saves all of the lead it had
+            # run for, up to the moment the last call finished
+            "saved_s": round(max(ran), 2) if hit else 0.0,
+            "wasted_s": 0.0 if hit else round(sum(ran), 2),
+        }
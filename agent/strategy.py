@@ -0,0 +1,317 @@
+"""Schema validation + local repair for the s2 search strategy.
+
+`llm.search_strategy` returns JSON that drives every discovery search, so a
+malformed response used to degrade s3 silently (three regex extraction
+attempts, then `{}` plus defaults). Here the raw text is parsed with cheap
+local repairs for the usual near-misses — code fences, prose around the
+object, trailing commas, smart quotes, output truncated mid-array — then
+checked against SCHEMA: enum values for buyer/opportunity types (case, plural
+and spacing variants mapped back), list-length limits, state names normalized
+to two-letter codes. Required keys that are still missing or empty are
+reported so the caller can re-ask for just those keys instead of regenerating
+the whole strategy.
+
+cache_key() builds the s2 strategy-cache key: normalized domain, product
+description hash, dedup mode and a fingerprint of the completed prior runs
+the LLM would diversify against.
+"""
+
+import hashlib
+import json
+import re
+
+from .config import BUYER_TYPE_LABEL, STATE_CODES
+
+BUYER_TYPES = tuple(BUYER_TYPE_LABEL)
+OPPORTUNITY_TYPES = ("Meeting", "Purchase", "RFP", "Contract")
+
+# Field → shape. "enum" values are matched loosely (see _enum_key); "max"
+# truncates, "min" marks the field missing when fewer valid items remain.
+SCHEMA = {
+    "sled_segments":       {"type": "list", "enum": BUYER_TYPES, "max": 10},
+    "primary_keywords":    {"type": "list", "min": 1, "max": 5},
+    "alternate_keywords":  {"type": "list", "max": 3},
+    "meeting_keywords":    {"type": "list", "max": 8},
+    "rfp_keywords":        {"type": "list", "max": 8},
+    "buyer_types":         {"type": "list", "enum": BUYER_TYPES, "min": 1, "max": 10},
+    "opportunity_types":   {"type": "list", "enum": OPPORTUNITY_TYPES, "min": 1, "max": 4},
+    "geographic_hints":    {"type": "list", "states": True, "max": 10},
+    "ideal_buyer_profile": {"type": "str", "max_chars": 300},
+}
+
+# Keys worth a re-ask when missing — discovery can't run well without them.
+# The rest fall back to defaults (see apply_defaults).
+REQUIRED = ("primary_keywords", "buyer_types", "opportunity_types")
+
+# Common non-canonical spellings the LLM produces for enum values.
+_ENUM_ALIASES = {
+    "k12": "SchoolDistrict", "k12district": "SchoolDistrict", "schooldistricts": "SchoolDistrict",
+    "university": "HigherEducation", "universities": "HigherEducation", "college": "HigherEducation",
+    "colleges": "HigherEducation", "highered": "HigherEducation",
+    "municipality": "City", "municipal": "City", "town": "City",
+    "state": "StateAgency", "stategovernment": "StateAgency", "police": "PoliceDepartment",
+    "fire": "FireDepartment", "rfps": "RFP", "rfq": "RFP", "bid": "RFP",
+    "boardmeeting": "Meeting", "contracts": "Contract", "purchaseorder": "Purchase",
+}
+
+_STATE_CODE_SET = frozenset(STATE_CODES.values())
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|\Z)", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+
+# ── JSON parsing with local repair ──────────────────────────────────────────
+
+def _scan(text):
+    """Track bracket nesting outside strings.
+
+    Returns (stack at end, in_string at end, [(comma index, stack there)]).
+    """
+    stack, commas = [], []
+    in_str = escaped = False
+    for i, ch in enumerate(text):
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            commas.append((i, tuple(stack)))
+    return stack, in_str, commas
+
+
+def _closers(stack):
+    return "".join("}" if c == "{" else "]" for c in reversed(stack))
+
+
+def _close_truncated(text):
+    """Close a JSON object cut off mid-output. Tries closing in place first,
+    then drops the trailing partial element at each earlier comma."""
+    stack, in_str, commas = _scan(text)
+    candidates = [text + ('"' if in_str else "") + _closers(stack)]
+    for i, at in reversed(commas[-20:]):
+        candidates.append(text[:i] + _closers(at))
+    for candidate in candidates:
+        candidate = _TRAILING_COMMA_RE.sub(r"\1", candidate)
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def parse_json(text):
+    """Parse the strategy object out of LLM text. Returns (obj or None, repairs)."""
+    if isinstance(text, dict):
+        return text, []
+    if not isinstance(text, str):
+        return None, []
+
+    repairs = []
+    body = text.strip()
+    fence = _FENCE_RE.search(body)
+    if fence:
+        body = fence.group(1).strip()
+        repairs.append("code_fence")
+    start = body.find("{")
+    if start == -1:
+        return None, repairs
+    if start > 0:
+        repairs.append("surrounding_text")
+    body = body[start:]
+
+    # Clean parse of the first complete object (ignores trailing prose)
+    try:
+        obj, end = json.JSONDecoder().raw_decode(body)
+        if end < len(body.rstrip()) and "surrounding_text" not in repairs:
+            repairs.append("surrounding_text")
+        return obj, repairs
+    except json.JSONDecodeError:
+        pass
+
+    fixed = body.translate(_SMART_QUOTES)
+    if fixed != body:
+        repairs.append("smart_quotes")
+    stripped = _TRAILING_COMMA_RE.sub(r"\1", fixed)
+    if stripped != fixed:
+        repairs.append("trailing_comma")
+    try:
+        obj, _ = json.JSONDecoder().raw_decode(stripped)
+        return obj, repairs
+    except json.JSONDecodeError:
+        pass
+
+    obj = _close_truncated(stripped.rstrip().rstrip("`"))
+    if obj is not None:
+        repairs.append("truncated")
+    return obj, repairs
+
+
+# ── Schema validation + normalization ──────────────────────────────────────
+
+def _enum_key(value):
+    return re.sub(r"[^a-z0-9]", "", value.lower())
+
+
+_ENUM_INDEX = {
+    field: {**{_enum_key(v): v for v in spec["enum"]},
+            **{_enum_key(v) + "s": v for v in spec["enum"]},
+            **{k: v for k, v in _ENUM_ALIASES.items() if v in spec["enum"]}}
+    for field, spec in SCHEMA.items() if "enum" in spec
+}
+
+
+def _state_code(value):
+    v = value.strip().rstrip(".")
+    if len(v) == 2 and v.upper() in _STATE_CODE_SET:
+        return v.upper()
+    return STATE_CODES.get(re.sub(r"\s+", " ", v.lower()).removeprefix("state of "))
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return re.split(r"[,;\n]", value)
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def validate(obj):
+    """Validate + normalize a parsed strategy against SCHEMA.
+
+    Returns (strategy, report). strategy holds only schema keys; report is
+    {"fixed": [field, ...], "dropped": {field: [values]}, "truncated":
+    [field, ...], "missing": [required fields absent or empty]}.
+    """
+    obj = obj if isinstance(obj, dict) else {}
+    strategy = {}
+    report = {"fixed": [], "dropped": {}, "truncated": [], "missing": []}
+
+    for field, spec in SCHEMA.items():
+        if field not in obj:
+            continue
+        raw = obj[field]
+        if spec["type"] == "str":
+            value = " ".join(str(raw).split()) if raw is not None else ""
+            if len(value) > spec["max_chars"]:
+                value = value[:spec["max_chars"]].rsplit(" ", 1)[0]
+                report["truncated"].append(field)
+            if value:
+                strategy[field] = value
+            continue
+
+        if not isinstance(raw, list):
+            report["fixed"].append(field)
+        items, seen, dropped = [], set(), []
+        for item in _as_list(raw):
+            text = str(item).strip() if item is not None else ""
+            if not text:
+                continue
+            if "enum" in spec:
+                value = _ENUM_INDEX[field].get(_enum_key(text))
+            elif spec.get("states"):
+                value = _state_code(text)
+            else:
+                value = text
+            if value is None:
+                dropped.append(text)
+                continue
+            if value != text and field not in report["fixed"]:
+                report["fixed"].append(field)
+            if value.lower() not in seen:
+                seen.add(value.lower())
+                items.append(value)
+        if dropped:
+            report["dropped"][field] = dropped
+        if len(items) > spec["max"]:
+            items = items[:spec["max"]]
+            report["truncated"].append(field)
+        strategy[field] = items
+
+    report["missing"] = [f for f in REQUIRED if len(strategy.get(f) or []) < SCHEMA[f]["min"]]
+    return strategy, report
+
+
+def apply_defaults(strategy, target_company, product_description):
+    """Fill optional keys (and required ones a re-ask couldn't recover) so s3
+    always sees the full shape — same fallbacks search_strategy always used."""
+    strategy.setdefault("primary_keywords", [target_company])
+    if not strategy["primary_keywords"]:
+        strategy["primary_keywords"] = [target_company]
+    for field in ("alternate_keywords", "meeting_keywords", "rfp_keywords", "buyer_types",
+                  "opportunity_types", "geographic_hints"):
+        strategy.setdefault(field, [])
+    if not strategy.get("sled_segments"):
+        strategy["sled_segments"] = list(strategy["buyer_types"])
+    strategy.setdefault("ideal_buyer_profile", product_description[:200])
+    return strategy
+
+
+def merge(strategy, extra):
+    """Merge a re-ask response (already validated) into strategy — only
+    fields the original lacked are taken."""
+    for field, value in extra.items():
+        if not strategy.get(field) and value:
+            strategy[field] = value
+    return strategy
+
+
+def schema_prompt_lines(fields):
+    """Describe the requested fields for the re-ask prompt, one bullet each."""
+    lines = []
+    for field in fields:
+        spec = SCHEMA[field]
+        if spec["type"] == "str":
+            lines.append(f'- "{field}": string, max {spec["max_chars"]} chars')
+            continue
+        line = f'- "{field}": list of {spec.get("min", 0)}-{spec["max"]} strings'
+        if "enum" in spec:
+            line += f", each one of: {', '.join(spec['enum'])}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# ── Strategy cache key ─────────────────────────────────────────────────────
+
+def normalize_domain(domain):
+    d = (domain or "").strip().lower()
+    d = re.sub(r"^[a-z]+://", "", d).split("/", 1)[0].split(":", 1)[0]
+    return d.removeprefix("www.").rstrip(".")
+
+
+def product_hash(product_description):
+    """Hash of the description with case, whitespace and end punctuation folded."""
+    text = " ".join((product_description or "").lower().split()).rstrip(".!")
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def prior_fingerprint(prior_runs):
+    """Fingerprint of the completed prior runs — the only ones search_strategy
+    diversifies against. Changes as soon as another run for the domain completes."""
+    ids = sorted(r["id"] for r in prior_runs or [] if r.get("status") == "completed" and r.get("id"))
+    return ",".join(str(i) for i in ids) or "-"
+
+
+def cache_key(domain, product_description, dedup, prior_runs):
+    """Key parts for the s2 strategy cache: {key, domain, product_hash, dedup, prior_fingerprint}."""
+    parts = {
+        "domain": normalize_domain(domain),
+        "product_hash": product_hash(product_description),
+        "dedup": bool(dedup),
+        "prior_fingerprint": prior_fingerprint(prior_runs) if dedup else "-",
+    }
+    parts["key"] = hashlib.sha256(
+        f"{parts['domain']}|{parts['product_hash']}|{int(parts['dedup'])}|{parts['prior_fingerprint']}".encode()
+    ).hexdigest()[:32]
+    return parts
@@ -64,11 +64,8 @@ def _get_domain_info(domain):
 
 def _run_early_steps(webhook, dedup_enabled):
     """Run s0 → s1 → s2 and return the search strategy + timing."""
-    # Set the dedup toggle
+    # Set the dedup toggle (read via context.cfg — no run context here, so the live value)
     config.ENABLE_PRIOR_RUN_DEDUP = dedup_enabled
-    # Push to pipeline module (apply_config_to_modules pushes via setattr)
-    import agent.pipeline as p
-    p.ENABLE_PRIOR_RUN_DEDUP = dedup_enabled
 
     t0 = time.time()
 
@@ -0,0 +1,101 @@
+"""Behavior tests for factcheck.py — the local verifier that gates s13's LLM fact-check.
+
+Usage:
+    python -m pytest agent/test_factcheck.py -q
+"""
+
+from . import factcheck
+from .report import assemble_report
+
+STATE = {
+    "FEATURED_BUYER_NAME": "Springfield Public Schools",
+    "FEAT_PROFILE": {"name": "Springfield Public Schools", "budget": 2345000},
+    "FEAT_CONTACTS": [
+        {"name": "Jane Doe", "title": "CIO", "email": "jdoe@springfield.k12.us"},
+        {"firstName": "Sam", "lastName": "Lee", "title": "CFO", "email": "slee@springfield.k12.us"},
+    ],
+    "FEAT_OPPORTUNITIES": [{"title": "Data platform RFP", "createdAt": "2026-09-14"}],
+    "SECONDARY_BUYERS": [{"buyerName": "Shelby County"}],
+    "SEC_CONTACTS": [{"buyerId": "2", "contacts": [{"name": "Ann Park", "email": "apark@shelby.gov"}]}],
+}
+
+
+def _report(featured, exec_summary="", cta=""):
+    return assemble_report("Springfield Public Schools", "VMock", featured, "", exec_summary, cta)
+
+
+def _unmatched(report, state=STATE):
+    return [(u["kind"], u["text"]) for u in factcheck.verify_report(report, state)["unmatched"]]
+
+
+def test_clean_report_verifies_everything():
+    report = _report(
+        "## Springfield Public Schools\n\n"
+        "Budget of $2.3M for a data platform RFP opened September 14, 2026.\n\n"
+        "**Jane Doe** — CIO — jdoe@springfield.k12.us\n\n"
+        "| Name | Title | Email |\n|---|---|---|\n| Sam Lee | CFO | slee@springfield.k12.us |\n"
+    )
+    result = factcheck.verify_report(report, STATE)
+    assert result["unmatched"] == []
+    assert result["by_kind"]["contact"]["checked"] >= 2
+    assert result["by_kind"]["money"] == {"checked": 1, "verified": 1}
+
+
+def test_lowercase_prose_is_not_a_contact_claim():
+    claims = factcheck.extract_claims(
+        "we spoke with the district — about budget timing — jdoe@springfield.k12.us\n"
+    )
+    assert ("contact", "we spoke with the district") not in claims
+    assert [kind for kind, _ in claims] == ["email"]
+
+
+def test_capitalized_name_is_a_contact_claim():
+    claims = factcheck.extract_claims("Jane Doe — CIO — jdoe@springfield.k12.us\n")
+    assert ("contact", "Jane Doe") in claims
+
+
+def test_made_up_fuller_name_is_unmatched():
+    report = _report("**Jane Marie Doe-Smith** — CIO — jdoe@springfield.k12.us\n")
+    assert ("contact", "Jane Marie Doe-Smith") in _unmatched(report)
+
+
+def test_shorter_form_of_a_known_name_matches():
+    assert factcheck._name_matches("Dr. Jane Doe", [{"jane", "doe"}])
+    assert factcheck._name_matches("Springfield Schools", [{"springfield", "public", "schools"}])
+    assert not factcheck._name_matches("Springfield Public Schools District", [{"springfield", "public", "schools"}])
+
+
+def test_unknown_email_money_and_date_are_unmatched():
+    report = _report(
+        "Contract worth $9.9M signed March 3, 2025.\n\n"
+        "**Jane Doe** — CIO — jane@elsewhere.com\n"
+    )
+    kinds = {kind for kind, _ in _unmatched(report)}
+    assert kinds == {"money", "date", "email"}
+
+
+def test_rounded_amount_within_tolerance_matches():
+    assert ("money", "$2.3M") not in _unmatched(_report("A budget of $2.3M."))
+    assert ("money", "$2.6M") in _unmatched(_report("A budget of $2.6M."))
+
+
+def test_exec_summary_cta_and_footer_are_skipped():
+    report = _report(
+        "## Springfield Public Schools\n\nNo new facts.",
+        exec_summary="We scanned **48 procurement signals** worth $12,345,678 as of January 2024.",
+        cta="## What Starbridge Can Do\n\nMonitors **$1B** in spend across 98,000 buyers since May 2019.",
+    )
+    claims = factcheck.extract_claims(report)
+    assert not [c for c in claims if c[0] in ("money", "date")]
+    assert factcheck.verify_report(report, STATE)["unmatched"] == []
+
+
+def test_skipped_section_ends_at_the_next_rule():
+    report = ("## Executive Summary\n\n$5 of aggregate.\n\n---\n\n"
+              "## Featured\n\nUnbacked $7.7M figure.\n")
+    assert factcheck.extract_claims(report) == [("money", "$7.7M")]
+
+
+def test_footer_skip_stops_at_its_line():
+    report = _report("Nothing checkable.") + "\n\nThe board approved a $9.7M grant.\n"
+    assert ("money", "$9.7M") in _unmatched(report)
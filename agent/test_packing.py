@@ -0,0 +1,101 @@
+"""Behavior tests for packing.py — s9/s10 prompt data packed to token budgets.
+
+Usage:
+    python -m pytest agent/test_packing.py -q
+"""
+
+import json
+
+from . import packing
+
+
+def _contact(i, **extra):
+    return {"id": f"c{i}", "name": f"Person {i}", "title": "Teacher",
+            "email": f"p{i}@district.org", "logoUrl": "https://x/logo.png", **extra}
+
+
+def test_compact_json_is_cheaper_than_indented():
+    records = [_contact(i) for i in range(5)]
+    compact = packing.compact_json(records)
+    assert json.loads(compact) == records
+    assert packing.estimate_tokens(compact) < packing.estimate_tokens(json.dumps(records, indent=2))
+
+
+def test_prune_drops_empty_values_and_unlisted_fields():
+    pruned = packing.prune({"name": "A", "title": "", "email": None, "tags": [], "id": 1},
+                           fields=("name", "title", "email"))
+    assert pruned == {"name": "A"}
+
+
+def test_records_stay_within_budget_and_whole():
+    records = [_contact(i) for i in range(50)]
+    budget = 120
+    text, stats = packing.pack_records(records, budget, fields=packing.CONTACT_FIELDS)
+    packed = json.loads(text)
+    assert stats["tokens"] <= budget
+    assert 0 < stats["packed"] < stats["records"] == 50
+    # Every packed record is complete: same fields as the pruned source record
+    assert packed == [packing.prune(r, fields=packing.CONTACT_FIELDS) for r in records[:len(packed)]]
+
+
+def test_max_records_caps_before_the_budget():
+    text, stats = packing.pack_records([_contact(i) for i in range(10)], 10_000, max_records=3)
+    assert (stats["records"], stats["packed"]) == (3, 3)
+    assert len(json.loads(text)) == 3
+
+
+def test_single_oversized_record_is_shortened_not_lost():
+    record = {"title": "Bus fleet RFP", "summary": "Replacement of buses. " * 200}
+    text, stats = packing.pack_records([record], 60, fields=packing.OPPORTUNITY_FIELDS)
+    packed = json.loads(text)
+    assert stats["packed"] == 1
+    assert packed[0]["title"] == "Bus fleet RFP"
+    assert stats["tokens"] <= 60
+
+
+def test_pack_object_keeps_cheap_facts_when_long_text_overflows():
+    profile = {"name": "Springfield USD", "enrollment": 12000, "logoUrl": "https://x/l.png",
+               "description": "A district with a long history. " * 300}
+    text, stats = packing.pack_object(profile, 80)
+    packed = json.loads(text)
+    assert stats["trimmed"] and stats["tokens"] <= 80
+    assert packed["name"] == "Springfield USD" and packed["enrollment"] == 12000
+    assert "logoUrl" not in packed
+
+
+def test_pack_object_untrimmed_when_it_fits():
+    text, stats = packing.pack_object({"name": "Springfield USD", "id": 7}, 100)
+    assert json.loads(text) == {"name": "Springfield USD"}
+    assert not stats["trimmed"]
+
+
+def test_truncate_text_ends_on_a_sentence():
+    text = "First sentence here. Second sentence is a bit longer than the first. Third one."
+    short = packing.truncate_text(text, 12)
+    assert short.endswith(" …")
+    assert short.startswith("First sentence here.")
+    assert packing.estimate_tokens(short) <= 14
+    assert packing.truncate_text(text, 1000) == text
+
+
+def test_contacts_rank_verified_then_email_then_seniority():
+    contacts = [
+        {"name": "A", "title": "Teacher"},
+        {"name": "B", "title": "Superintendent"},
+        {"name": "C", "title": "Director", "email": "c@x.org"},
+        {"name": "D", "title": "Coordinator", "email": "d@x.org", "emailVerified": True},
+    ]
+    assert [c["name"] for c in packing.rank_contacts(contacts)] == ["D", "C", "B", "A"]
+
+
+def test_opportunities_rank_by_keyword_hits_then_recency():
+    opps = [
+        {"title": "Roof repair", "postedDate": "2026-09-01"},
+        {"title": "LMS platform renewal", "postedDate": "2025-01-01"},
+        {"title": "Learning platform LMS RFP", "postedDate": "2024-01-01"},
+        {"title": "Cafeteria supplies", "postedDate": "2026-10-01"},
+    ]
+    ranked = packing.rank_opportunities(opps, keywords=["LMS platform", "learning"])
+    assert [o["title"] for o in ranked] == [
+        "Learning platform LMS RFP", "LMS platform renewal", "Cafeteria supplies", "Roof repair",
+    ]
@@ -0,0 +1,128 @@
+"""Behavior tests for repair.py — local fixes for mechanical s13 findings.
+
+Usage:
+    python -m pytest agent/test_repair.py -q
+"""
+
+from datetime import datetime
+
+from . import repair
+from .report import assemble_report
+
+NOW = datetime(2026, 10, 19)
+SECONDARY = [
+    {"buyerId": "1", "buyerName": "Shelby County Schools", "buyerType": "SchoolDistrict",
+     "topSignalType": "RFP", "topSignalSummary": "LMS replacement", "signalCount": 4, "score": 0.71},
+    {"buyerId": "2", "buyerName": "City of Memphis", "buyerType": "City", "signalCount": 2, "score": 0.52},
+]
+CTX = {
+    "buyer_name": "Springfield Public Schools",
+    "product": "VMock",
+    "secondary_buyers": SECONDARY,
+    "sec_contacts": [{"buyerId": "1", "contacts": [{"name": "Ann Park", "title": "CTO", "email": "ap@scs.org"}]}],
+    "now": NOW,
+}
+
+CONTACTS_TABLE = (
+    "| Name | Title | Email | Phone |\n|---|---|---|---|\n"
+    "| Jane Doe | CIO | jdoe@sps.org | — |\n"
+    "| Sam Lee | CFO | — | — |\n"
+)
+
+
+def _report(featured="## Springfield Public Schools\n\nOverview.", secondary="", generated_at=NOW):
+    return assemble_report(CTX["buyer_name"], CTX["product"], featured, secondary,
+                           "Summary.", "## What Starbridge Can Do\n\nCTA.", generated_at=generated_at)
+
+
+def test_no_findings_changes_nothing():
+    report = _report()
+    assert repair.repair_report(report, [], CTX) == (report, [])
+
+
+def test_unmatched_finding_is_left_for_the_llm():
+    report = _report()
+    patched, applied = repair.repair_report(report, ["Malformed email: jdoe@"], CTX)
+    assert patched == report and applied == []
+
+
+def test_title_is_rewritten_from_state():
+    report = _report().replace("Springfield Public Schools — Intelligence Report for VMock", "Report")
+    patched, applied = repair.repair_report(report, ["Product name 'VMock' not found in report"], CTX)
+    assert patched.startswith("# \U0001f4ca Springfield Public Schools — Intelligence Report for VMock\n")
+    assert [a["rule"] for a in applied] == ["title"]
+
+
+def test_title_is_inserted_when_absent():
+    report = "Just a body."
+    patched, _ = repair.repair_report(report, ["Header missing featured buyer name 'Springfield Public Schools'"], CTX)
+    assert patched == "# \U0001f4ca Springfield Public Schools — Intelligence Report for VMock\n\nJust a body."
+
+
+def test_stale_footer_date_is_restamped():
+    report = _report(generated_at=datetime(2025, 3, 1))
+    patched, applied = repair.repair_report(report, ["Footer missing current date 'October 2026'"], CTX)
+    assert "*Generated Starbridge Intelligence October 2026*" in patched
+    assert "March 2025" not in patched
+    assert applied[0]["rule"] == "footer_date"
+
+
+def test_missing_footer_is_appended():
+    patched, _ = repair.repair_report("# Title\n\nBody.", ["Footer missing current date 'October 2026'"], CTX)
+    assert patched.split("---")[-1].strip().startswith("*Generated Starbridge Intelligence October 2026*")
+
+
+def test_unreachable_contact_rows_are_dropped():
+    report = _report(featured="## Springfield Public Schools\n\n" + CONTACTS_TABLE)
+    patched, applied = repair.repair_report(report, ["1 contact rows with no email AND no phone"], CTX)
+    assert "Sam Lee" not in patched
+    assert "| Jane Doe | CIO | jdoe@sps.org | — |" in patched
+    assert applied[0]["rule"] == "empty_contact_rows"
+
+
+def test_table_left_header_only_is_removed():
+    table = "| Name | Title | Email | Phone |\n|---|---|---|---|\n| Sam Lee | CFO | — | — |\n"
+    report = _report(featured=f"## Springfield Public Schools\n\nContacts:\n\n{table}\nMore text.")
+    patched, _ = repair.repair_report(report, ["1 contact rows with no email AND no phone"], CTX)
+    assert "| Name |" not in patched
+    assert "More text." in patched
+
+
+def test_near_miss_card_header_is_renamed():
+    secondary = "**Shelby County Schools** | K-12\n- detail\n\n**Memphis City** | City\n- detail"
+    report = _report(secondary=secondary)
+    patched, applied = repair.repair_report(report, ["Secondary buyer 'City of Memphis' not found in report"], CTX)
+    assert "**City of Memphis** | City" in patched
+    assert "Memphis City" not in patched
+    assert patched.count("**Shelby County Schools**") == 1
+    assert applied[0]["rule"] == "secondary_name"
+
+
+def test_missing_card_is_inserted_into_additional_buyers():
+    report = _report(secondary="**City of Memphis** | City\n- detail")
+    patched, _ = repair.repair_report(report, ["Secondary buyer 'Shelby County Schools' not found in report"], CTX)
+    section = patched.split("## Additional Buyers", 1)[1].split("---", 1)[0]
+    assert "**Shelby County Schools** | School District" in section
+    assert "Ann Park — CTO — ap@scs.org" in section
+    assert section.index("City of Memphis") < section.index("Shelby County Schools")
+
+
+def test_missing_section_is_added_before_the_exec_summary():
+    patched, _ = repair.repair_report(_report(), ["Secondary buyer 'City of Memphis' not found in report"], CTX)
+    assert patched.index("## Additional Buyers") < patched.index("## Executive Summary")
+    assert "**City of Memphis**" in patched
+
+
+def test_unknown_secondary_name_is_not_invented():
+    report = _report()
+    patched, applied = repair.repair_report(report, ["Secondary buyer 'Nowhere County' not found in report"], CTX)
+    assert patched == report and applied == []
+
+
+def test_several_findings_in_one_pass():
+    report = _report(featured="## Springfield Public Schools\n\n" + CONTACTS_TABLE, generated_at=datetime(2025, 3, 1))
+    findings = ["Footer missing current date 'October 2026'", "1 contact rows with no email AND no phone",
+                "Secondary buyer 'City of Memphis' not found in report"]
+    patched, applied = repair.repair_report(report, findings, CTX)
+    assert [a["rule"] for a in applied] == ["footer_date", "empty_contact_rows", "secondary_name"]
+    assert "\n\n\n" not in patched
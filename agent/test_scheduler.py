@@ -0,0 +1,218 @@
+"""Behavior tests for scheduler.py — registry graph and step ordering.
+
+Step bodies here are tiny functions that record when they ran; no pipeline
+step, API or LLM is involved.
+
+Usage:
+    python -m pytest agent/test_scheduler.py -q
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from . import context, scheduler
+from .context import RunContext
+
+
+def _step(sid, reads=(), writes=(), phase=1, delay=0.0, log=None, **extra):
+    """A registry entry whose body sleeps `delay`, logs its id and writes `writes`."""
+    def fn(state):
+        time.sleep(delay)
+        if log is not None:
+            log.append(sid)
+        return {k: sid for k in writes}
+    return {"id": sid, "phase": phase, "reads": tuple(reads), "writes": tuple(writes), "fn": fn, **extra}
+
+
+def _registry(log=None):
+    """s2 → (s3a ∥ s3b) → s4 → s8, with s8 in a later phase than s3b."""
+    return [
+        _step("s2", reads=("webhook",), writes=("STRATEGY",), phase=1, log=log),
+        _step("s3a", reads=("STRATEGY",), writes=("SIGNALS_A",), phase=2, delay=0.2, log=log),
+        _step("s3b", reads=("STRATEGY",), writes=("SIGNALS_B",), phase=2, delay=0.05, log=log),
+        _step("s4", reads=("SIGNALS_A", "SIGNALS_B"), writes=("RANKED",), phase=3, delay=0.02, log=log),
+        _step("s8", reads=("STRATEGY",), writes=("SUMMARY",), phase=3, log=log),
+    ]
+
+
+# ── build_graph ─────────────────────────────────────────────────────────────
+
+def test_dependencies_come_from_the_first_writer():
+    registry = _registry() + [_step("s9", reads=("RANKED",), writes=("RANKED",), phase=4)]
+    graph = scheduler.build_graph(registry, external={"webhook"})
+    assert graph == {"s2": set(), "s3a": {"s2"}, "s3b": {"s2"}, "s4": {"s3a", "s3b"},
+                     "s8": {"s2"}, "s9": {"s4"}}
+
+
+def test_phased_mode_adds_the_phase_barriers():
+    graph = scheduler.build_graph(_registry(), mode="phased", external={"webhook"})
+    assert graph["s8"] == {"s2", "s3a", "s3b"}
+
+
+def test_after_adds_an_ordering_only_dependency():
+    registry = _registry()
+    registry[4]["after"] = ("s4",)
+    assert scheduler.build_graph(registry, external={"webhook"})["s8"] == {"s2", "s4"}
+
+
+def test_read_without_a_producer_raises():
+    with pytest.raises(ValueError, match="no step writes"):
+        scheduler.build_graph(_registry())  # "webhook" not external
+
+
+def test_dependency_declared_after_the_step_raises():
+    registry = _registry()
+    registry[0], registry[3] = registry[3], registry[0]
+    with pytest.raises(ValueError, match="declared at or after it"):
+        scheduler.build_graph(registry, external={"webhook"})
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError, match="Unknown schedule mode"):
+        scheduler.build_graph(_registry(), mode="serial", external={"webhook"})
+
+
+# ── makespan / downstream / tails ───────────────────────────────────────────
+
+DURATIONS = {"s2": 1.0, "s3a": 4.0, "s3b": 2.0, "s4": 1.0, "s8": 0.5}
+
+
+def test_makespan_dag_vs_phased():
+    assert scheduler.makespan(_registry(), DURATIONS, "dag") == 6.0
+    assert scheduler.makespan(_registry(), DURATIONS, "phased") == 6.0
+    durations = {**DURATIONS, "s8": 5.0}
+    assert scheduler.makespan(_registry(), durations, "dag") == 6.0
+    assert scheduler.makespan(_registry(), durations, "phased") == 10.0
+
+
+def test_downstream_and_tails():
+    assert scheduler.downstream(_registry(), "s3b") == {"s3b", "s4"}
+    assert scheduler.downstream(_registry(), "s2") == {"s2", "s3a", "s3b", "s4", "s8"}
+    tails = scheduler.tails(_registry(), DURATIONS)
+    assert tails["s2"] == 6.0 and tails["s3b"] == 3.0 and tails["s8"] == 0.5
+
+
+# ── run ─────────────────────────────────────────────────────────────────────
+
+def test_run_orders_steps_by_dependency():
+    log = []
+    state = {"webhook": {}}
+    result = scheduler.run(_registry(log), state)
+    assert log[0] == "s2" and log[-1] == "s4"
+    assert log.index("s3b") < log.index("s3a")  # the faster search lands first
+    assert log.index("s8") < log.index("s3a")   # s8 doesn't wait for discovery
+    assert state["RANKED"] == "s4" and state["SUMMARY"] == "s8"
+    assert result["critical_path"] == ["s2", "s3a", "s4"]
+    assert result["steps"]["s4"]["gated_by"] == "s3a"
+
+
+def test_phased_run_holds_later_phases():
+    log = []
+    scheduler.run(_registry(log), {"webhook": {}}, mode="phased")
+    assert log.index("s8") > log.index("s3a")
+
+
+def test_completed_steps_are_not_rerun():
+    log, done = [], []
+    state = {"webhook": {}, "STRATEGY": "cached", "SIGNALS_A": "cached"}
+    scheduler.run(_registry(log), state, completed=("s2", "s3a"), on_step_done=lambda sid, out: done.append(sid))
+    assert sorted(log) == ["s3b", "s4", "s8"]
+    assert sorted(done) == ["s3b", "s4", "s8"]
+    assert state["SIGNALS_A"] == "cached"
+
+
+def test_a_failing_step_fails_the_run():
+    registry = _registry()
+    registry[3]["fn"] = lambda state: 1 / 0
+    with pytest.raises(ZeroDivisionError):
+        scheduler.run(registry, {"webhook": {}})
+
+
+def test_optional_failure_and_timeout_are_skipped():
+    registry = _registry()
+    registry[1]["optional"] = registry[2]["optional"] = True
+    registry[1]["fn"] = _step("s3a", writes=("SIGNALS_A",), delay=1.0)["fn"]
+    registry[2]["fn"] = lambda state: 1 / 0
+    skipped = {}
+    state = {"webhook": {}}
+    result = scheduler.run(registry, state, timeouts={"s3a": 0.05},
+                           on_step_skipped=lambda sid, reason: skipped.setdefault(sid, reason))
+    assert skipped["s3b"].startswith("ZeroDivisionError")
+    assert skipped["s3a"] == "exceeded its 0.05s timeout"
+    assert "SIGNALS_A" not in state and "SIGNALS_B" not in state
+    assert state["RANKED"] == "s4"
+    assert result["steps"]["s3a"]["skipped"]
+
+
+def test_non_optional_timeout_raises():
+    registry = _registry()
+    registry[1]["fn"] = _step("s3a", writes=("SIGNALS_A",), delay=1.0)["fn"]
+    with pytest.raises(TimeoutError, match="s3a exceeded"):
+        scheduler.run(registry, {"webhook": {}}, timeouts={"s3a": 0.05})
+
+
+def test_start_when_with_cutoff_skips_pending_dependencies():
+    log = []
+    registry = _registry(log)
+    registry[1]["optional"] = True
+    registry[1]["fn"] = _step("s3a", writes=("SIGNALS_A",), delay=1.5, log=log)["fn"]
+    registry[3].update(reads=("SIGNALS_B",), after=("s3a",), cutoff=True,
+                       start_when=lambda state, pending: "SIGNALS_B" in state)
+    skipped = []
+    state = {"webhook": {}}
+    result = scheduler.run(registry, state, on_step_skipped=lambda sid, reason: skipped.append(sid))
+    assert skipped == ["s3a"]
+    assert result["steps"]["s4"]["early"] == ["s3a"]
+    assert state["RANKED"] == "s4" and "SIGNALS_A" not in state
+
+
+def test_cut_off_step_is_cancelled_through_its_context():
+    seen = {}
+    stopped = threading.Event()
+
+    def slow(state):
+        ctx = context.current()
+        seen["ctx"] = ctx
+        ctx.on_cancel(stopped.set)
+        stopped.wait(5)
+        return {"SIGNALS_A": "late"}
+
+    registry = _registry()
+    registry[1].update(fn=slow, optional=True)
+    registry[3].update(reads=("SIGNALS_B",), after=("s3a",), cutoff=True,
+                       start_when=lambda state, pending: "SIGNALS_B" in state)
+    run = RunContext()
+    with context.activate(run):
+        scheduler.run(registry, {"webhook": {}})
+    assert stopped.wait(1)
+    assert seen["ctx"] is not run and seen["ctx"].skipped == "cut off when s4 started"
+
+
+# ── run_async ───────────────────────────────────────────────────────────────
+
+def test_run_async_orders_steps_like_run():
+    log = []
+    registry = _registry(log)
+
+    async def s8(state):
+        log.append("s8")
+        return {"SUMMARY": "s8"}
+    registry[4]["fn"] = s8
+    state = {"webhook": {}}
+    result = asyncio.run(scheduler.run_async(registry, state))
+    assert log[0] == "s2" and log[-1] == "s4"
+    assert log.index("s8") < log.index("s3a")
+    assert result["critical_path"] == ["s2", "s3a", "s4"]
+
+
+def test_run_async_timeout_skips_an_optional_step():
+    registry = _registry()
+    registry[1]["optional"] = True
+    skipped = []
+    state = {"webhook": {}}
+    asyncio.run(scheduler.run_async(registry, state, timeouts={"s3a": 0.05},
+                                    on_step_skipped=lambda sid, reason: skipped.append(sid)))
+    assert skipped == ["s3a"] and state["RANKED"] == "s4"
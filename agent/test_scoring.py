@@ -0,0 +1,130 @@
+"""Behavior tests for scoring.py — columnar s4 scoring and the s4a incremental ranker.
+
+Scores must stay identical to the per-buyer loop s4 used before
+(benchmark_s4._loop_scores), and IncrementalRanker must rank exactly like
+s4 over the merged results whatever order the searches land in.
+
+Usage:
+    python -m pytest agent/test_scoring.py -q
+"""
+
+import itertools
+from datetime import datetime, timedelta, timezone
+
+from .benchmark_s4 import _loop_scores, _synthetic
+from .scoring import IncrementalRanker, direct_buyer, score_buyers, signal_buyer
+
+KEYWORDS = {"lms", "learning", "platform"}
+TARGET_TYPES = {"schooldistrict"}
+
+
+def _days_ago(n):
+    return (datetime.now(timezone.utc) - timedelta(days=n)).isoformat().replace("+00:00", "Z")
+
+
+def _s4_ranking(results):
+    """s4's merge + score + sort, as in pipeline.s4_rank_and_select."""
+    buyer_signals = {}
+    for opp in results.get("A", []) + results.get("B", []):
+        bid, name, btype = signal_buyer(opp)
+        buyer_signals.setdefault(bid, {"name": name, "type": btype, "signals": []})["signals"].append(opp)
+    for b in results.get("C", []) + results.get("D", []):
+        bid, name, btype = direct_buyer(b)
+        buyer_signals.setdefault(bid, {"name": name, "type": btype, "signals": []})
+    scored = score_buyers(buyer_signals, KEYWORDS, TARGET_TYPES)
+    return sorted(scored, key=lambda x: x["score"], reverse=True)
+
+
+RESULTS = {
+    "A": [
+        {"buyerId": "1", "buyerName": "Springfield USD", "buyerType": "SchoolDistrict",
+         "type": "RFP", "title": "LMS platform RFP", "createdAt": _days_ago(20), "amount": 250000},
+        {"buyerId": "2", "buyerName": "Shelby County", "buyerType": "County",
+         "type": "Meeting", "title": "Board meeting", "createdAt": _days_ago(400), "value": "$1,200,000"},
+    ],
+    "B": [
+        {"buyerId": "1", "buyerName": "Springfield USD", "buyerType": "SchoolDistrict",
+         "type": "Purchase", "title": "Learning licenses", "createdAt": _days_ago(90)},
+        {"buyerId": "3", "buyerName": "Memphis City Schools", "buyerType": "SchoolDistrict",
+         "type": "Contract", "title": "Gradebook", "createdAt": "not a date", "contractAmount": "2.5M - 3M"},
+    ],
+    "C": [{"id": "4", "name": "Knox County Schools", "type": "SchoolDistrict"},
+          {"id": "1", "name": "Springfield USD", "type": "SchoolDistrict"}],
+    "D": [{"id": "5", "name": "State DOE", "type": "StateAgency"}],
+}
+
+
+# ── score_buyers ────────────────────────────────────────────────────────────
+
+def test_columnar_scores_match_the_per_buyer_loop():
+    for seed in (1, 7, 42):
+        buyer_signals, keywords, target_types = _synthetic(3000, seed=seed)
+        expected = _loop_scores(buyer_signals, keywords, target_types)
+        scored = score_buyers(buyer_signals, keywords, target_types)
+        assert [b["buyerId"] for b in scored] == list(buyer_signals)
+        assert {b["buyerId"]: b["score"] for b in scored} == expected
+
+
+def test_buyers_without_signals_score_on_type_only():
+    scored = score_buyers({
+        "x": {"name": "X", "type": "SchoolDistrict, County", "signals": []},
+        "y": {"name": "Y", "type": "City", "signals": []},
+    }, KEYWORDS, TARGET_TYPES)
+    assert [(b["score"], b["signalCount"], b["topSignalType"]) for b in scored] == [(0.25, 0, ""), (0.0, 0, "")]
+
+
+def test_scored_fields_come_from_the_first_signal():
+    ranking = _s4_ranking(RESULTS)
+    top = ranking[0]
+    assert top["buyerId"] == "1"
+    assert (top["signalCount"], top["topSignalType"], top["topSignalSummary"]) == (2, "RFP", "LMS platform RFP")
+
+
+def test_empty_input():
+    assert score_buyers({}, KEYWORDS, TARGET_TYPES) == []
+
+
+# ── IncrementalRanker ───────────────────────────────────────────────────────
+
+def test_ranker_matches_s4_in_any_arrival_order():
+    expected = _s4_ranking(RESULTS)
+    for order in itertools.permutations("ABCD"):
+        ranker = IncrementalRanker(KEYWORDS, TARGET_TYPES)
+        for source in order:
+            ranker.add(source, RESULTS[source])
+        assert ranker.top(len(expected)) == expected, order
+
+
+def test_repeated_source_is_ignored():
+    ranker = IncrementalRanker(KEYWORDS, TARGET_TYPES)
+    ranker.add("A", RESULTS["A"])
+    ranker.add("A", RESULTS["A"])
+    assert ranker.top(1)[0]["signalCount"] == 1
+
+
+def test_leader_not_locked_while_an_opportunity_search_is_pending():
+    ranker = IncrementalRanker(KEYWORDS, TARGET_TYPES)
+    for source in "ACD":
+        ranker.add(source, RESULTS[source])
+    stability = ranker.stability()
+    assert stability["pending"] == ["B"]
+    assert stability["ceiling"] is None and not stability["locked"]
+
+
+def test_leader_locked_when_only_buyer_searches_remain():
+    ranker = IncrementalRanker(KEYWORDS, TARGET_TYPES)
+    ranker.add("A", RESULTS["A"])
+    ranker.add("B", RESULTS["B"])
+    stability = ranker.stability()
+    assert stability["pending"] == ["C", "D"]
+    assert stability["ceiling"] == 0.25
+    assert stability["leader_id"] == "1" and stability["locked"]
+    assert stability["headroom"] == round(stability["leader_score"] - 0.25, 4)
+
+
+def test_everything_in_is_locked():
+    ranker = IncrementalRanker(KEYWORDS, TARGET_TYPES)
+    for source in "ABCD":
+        ranker.add(source, RESULTS[source])
+    assert ranker.stability()["locked"]
+    assert ranker.stability()["ceiling"] == 0.0
@@ -0,0 +1,148 @@
+"""Behavior tests for strategy.py — s2's JSON repair, schema validation and cache key.
+
+Usage:
+    python -m pytest agent/test_strategy.py -q
+"""
+
+from . import strategy
+
+VALID = {
+    "sled_segments": ["SchoolDistrict"],
+    "primary_keywords": ["learning management"],
+    "alternate_keywords": ["LMS"],
+    "meeting_keywords": [],
+    "rfp_keywords": ["LMS RFP"],
+    "buyer_types": ["SchoolDistrict", "HigherEducation"],
+    "opportunity_types": ["RFP", "Meeting"],
+    "geographic_hints": ["CA"],
+    "ideal_buyer_profile": "Mid-size districts replacing a legacy LMS.",
+}
+
+
+# ── parse_json ──────────────────────────────────────────────────────────────
+
+def test_clean_json_needs_no_repair():
+    obj, repairs = strategy.parse_json('{"primary_keywords": ["lms"]}')
+    assert obj == {"primary_keywords": ["lms"]}
+    assert repairs == []
+
+
+def test_code_fence_and_prose_are_stripped():
+    text = 'Here is the strategy:\n```json\n{"buyer_types": ["City"]}\n```\nLet me know.'
+    obj, repairs = strategy.parse_json(text)
+    assert obj == {"buyer_types": ["City"]}
+    assert "code_fence" in repairs
+
+
+def test_trailing_prose_after_object():
+    obj, repairs = strategy.parse_json('{"a": 1} and that is all')
+    assert obj == {"a": 1}
+    assert repairs == ["surrounding_text"]
+
+
+def test_smart_quotes_and_trailing_commas():
+    obj, repairs = strategy.parse_json('{“primary_keywords”: [“lms”, “sis”,],}')
+    assert obj == {"primary_keywords": ["lms", "sis"]}
+    assert {"smart_quotes", "trailing_comma"} <= set(repairs)
+
+
+def test_output_truncated_mid_array_keeps_whole_items():
+    obj, repairs = strategy.parse_json('{"primary_keywords": ["lms", "sis"], "buyer_types": ["City", "Coun')
+    assert "truncated" in repairs
+    assert obj["primary_keywords"] == ["lms", "sis"]
+    assert obj["buyer_types"][0] == "City"
+
+
+def test_no_object_at_all():
+    assert strategy.parse_json("I could not produce a strategy.") == (None, [])
+    assert strategy.parse_json(None) == (None, [])
+
+
+# ── validate ────────────────────────────────────────────────────────────────
+
+def test_valid_strategy_passes_unchanged():
+    result, report = strategy.validate(VALID)
+    assert result == VALID
+    assert report == {"fixed": [], "dropped": {}, "truncated": [], "missing": []}
+
+
+def test_enum_variants_are_mapped_back():
+    result, report = strategy.validate({
+        "buyer_types": ["school districts", "Universities", "k-12"],
+        "opportunity_types": ["RFPs", "board meeting", "contracts"],
+    })
+    assert result["buyer_types"] == ["SchoolDistrict", "HigherEducation"]
+    assert result["opportunity_types"] == ["RFP", "Meeting", "Contract"]
+    assert {"buyer_types", "opportunity_types"} <= set(report["fixed"])
+
+
+def test_unknown_enum_values_are_dropped():
+    result, report = strategy.validate({"buyer_types": ["City", "Spaceport"]})
+    assert result["buyer_types"] == ["City"]
+    assert report["dropped"] == {"buyer_types": ["Spaceport"]}
+
+
+def test_states_are_normalized_to_codes():
+    result, report = strategy.validate({"geographic_hints": ["California", "State of New York", "tx", "Midwest"]})
+    assert result["geographic_hints"] == ["CA", "NY", "TX"]
+    assert report["dropped"] == {"geographic_hints": ["Midwest"]}
+
+
+def test_list_limits_truncate():
+    result, report = strategy.validate({
+        "primary_keywords": [f"kw{i}" for i in range(9)],
+        "ideal_buyer_profile": "word " * 100,
+    })
+    assert len(result["primary_keywords"]) == strategy.SCHEMA["primary_keywords"]["max"]
+    assert len(result["ideal_buyer_profile"]) <= strategy.SCHEMA["ideal_buyer_profile"]["max_chars"]
+    assert set(report["truncated"]) == {"primary_keywords", "ideal_buyer_profile"}
+
+
+def test_string_where_list_expected_is_split():
+    result, report = strategy.validate({"primary_keywords": "lms, sis; gradebook"})
+    assert result["primary_keywords"] == ["lms", "sis", "gradebook"]
+    assert "primary_keywords" in report["fixed"]
+
+
+def test_duplicates_are_folded():
+    result, _ = strategy.validate({"primary_keywords": ["LMS", "lms", "SIS"]})
+    assert result["primary_keywords"] == ["LMS", "SIS"]
+
+
+def test_missing_required_keys_are_reported():
+    _, report = strategy.validate({"primary_keywords": ["lms"], "buyer_types": ["Spaceport"]})
+    assert report["missing"] == ["buyer_types", "opportunity_types"]
+    assert strategy.validate(None)[1]["missing"] == list(strategy.REQUIRED)
+
+
+def test_reask_merge_only_fills_gaps():
+    merged = strategy.merge({"primary_keywords": ["lms"], "buyer_types": []},
+                            {"primary_keywords": ["other"], "buyer_types": ["City"]})
+    assert merged == {"primary_keywords": ["lms"], "buyer_types": ["City"]}
+
+
+def test_defaults_fill_the_full_shape():
+    result = strategy.apply_defaults({"buyer_types": ["City"]}, "Acme", "Acme sells permits software.")
+    assert result["primary_keywords"] == ["Acme"]
+    assert result["sled_segments"] == ["City"]
+    assert result["ideal_buyer_profile"] == "Acme sells permits software."
+    assert set(strategy.SCHEMA) <= set(result)
+
+
+# ── cache_key ───────────────────────────────────────────────────────────────
+
+def test_cache_key_folds_domain_and_description_variants():
+    a = strategy.cache_key("https://www.Acme.com/about", "Permits software.", True, [])
+    b = strategy.cache_key("acme.com", "  permits   SOFTWARE ", True, [])
+    assert a["key"] == b["key"]
+    assert a["domain"] == "acme.com"
+
+
+def test_cache_key_tracks_completed_prior_runs_only_with_dedup():
+    runs = [{"id": 3, "status": "completed"}, {"id": 4, "status": "failed"}]
+    base = strategy.cache_key("acme.com", "x", True, [])
+    with_runs = strategy.cache_key("acme.com", "x", True, runs)
+    assert with_runs["prior_fingerprint"] == "3"
+    assert with_runs["key"] != base["key"]
+    assert strategy.cache_key("acme.com", "x", False, runs)["prior_fingerprint"] == "-"
+    assert strategy.cache_key("acme.com", "x", False, runs)["key"] != base["key"]
@@ -5,22 +5,32 @@ REST endpoint at api.datagen.dev/apps/{uuid}, NOT via client.execute_tool().
 Long-running tools (buyer_chat) use the async endpoint: POST /apps/{uuid}/async
 then poll GET /apps/run/{run_id}/output until ready (status != 202).
 Notion MCP goes through the SDK.
+The `_aio` functions are coroutine versions of the Starbridge tools for
+run_pipeline_async. Request timeouts and polling windows are capped at the
+run's deadline when it has one (budget.clamp).
+
+Killing a run reaches into the sync calls: each request's sockets are shut
+down the moment the run is cancelled (_client), and buyer_chat's poll wait
+wakes at once — the call raises PipelineCancelled instead of running on to
+its timeout. The `_aio` calls stop with their task. Every call is tracked as
+"http" work of its run (context.tracked) for the leaked-work gauge.
 """
 
+import asyncio
 import json
 import logging
 import os
+import socket
 import time
+from contextlib import contextmanager
 
+import httpcore
 import httpx
 from datagen_sdk import DatagenClient
 
-from .config import (
-    ASYNC_DEFAULT_MAX_WAIT,
-    ASYNC_POLL_INTERVAL,
-    BUYER_CHAT_MAX_WAIT,
-    OPPORTUNITY_SORT_FIELD,
-)
+from . import context
+from .budget import clamp
+from .context import cancelled, cfg
 
 logger = logging.getLogger("pipeline.tools")
 client = DatagenClient()
@@ -40,26 +50,165 @@ _UUIDS = {
 }
 
 
+class _Stream(httpcore.NetworkStream):
+    """A connection's stream, kept current across start_tls so shutdown()
+    reaches the socket actually in use."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def read(self, max_bytes, timeout=None):
+        return self.stream.read(max_bytes, timeout)
+
+    def write(self, buffer, timeout=None):
+        self.stream.write(buffer, timeout)
+
+    def close(self):
+        self.stream.close()
+
+    def start_tls(self, ssl_context, server_hostname=None, timeout=None):
+        self.stream = self.stream.start_tls(ssl_context, server_hostname, timeout)
+        return self
+
+    def get_extra_info(self, info):
+        return self.stream.get_extra_info(info)
+
+    def shutdown(self):
+        sock = self.stream.get_extra_info("socket")
+        try:
+            sock.shutdown(socket.SHUT_RDWR)  # wakes a recv() blocked in another thread
+        except (AttributeError, OSError):
+            pass
+
+
+class _RunSockets(httpcore.NetworkBackend):
+    """httpcore backend that remembers the streams it opens, so they can be
+    shut down from another thread."""
+
+    def __init__(self):
+        self.backend = httpcore.SyncBackend()
+        self.streams = []
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        stream = _Stream(self.backend.connect_tcp(host, port, timeout, local_address, socket_options))
+        self.streams.append(stream)
+        return stream
+
+    def sleep(self, seconds):
+        self.backend.sleep(seconds)
+
+    def shutdown(self):
+        for stream in list(self.streams):
+            stream.shutdown()
+
+
+@contextmanager
+def _mapped():
+    """httpcore errors as the httpx errors of the same name (httpx.TransportError else)."""
+    try:
+        yield
+    except httpcore.TimeoutException as e:
+        raise getattr(httpx, type(e).__name__, httpx.TimeoutException)(str(e)) from e
+    except (httpcore.NetworkError, httpcore.ProtocolError, httpcore.ProxyError, httpcore.UnsupportedProtocol) as e:
+        raise getattr(httpx, type(e).__name__, httpx.TransportError)(str(e)) from e
+
+
+class _ResponseStream(httpx.SyncByteStream):
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __iter__(self):
+        with _mapped():
+            yield from self.stream
+
+    def close(self):
+        if hasattr(self.stream, "close"):
+            self.stream.close()
+
+
+class _RunTransport(httpx.BaseTransport):
+    """httpx transport over an httpcore.ConnectionPool on _RunSockets, which
+    httpx's own HTTPTransport has no way to take. TLS verification and
+    certificates come from httpx.create_ssl_context (SSL_CERT_FILE /
+    SSL_CERT_DIR honoured) and pool limits from httpx.Limits. Environment
+    proxies stay with the client, which mounts httpx's proxy transports for
+    them."""
+
+    def __init__(self, sockets, verify=True, limits=httpx.Limits()):
+        self.pool = httpcore.ConnectionPool(
+            ssl_context=httpx.create_ssl_context(verify=verify),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=sockets,
+        )
+
+    def handle_request(self, request):
+        req = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(scheme=request.url.raw_scheme, host=request.url.raw_host,
+                             port=request.url.port, target=request.url.raw_path),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _mapped():
+            resp = self.pool.handle_request(req)
+        return httpx.Response(status_code=resp.status, headers=resp.headers,
+                              stream=_ResponseStream(resp.stream), extensions=resp.extensions)
+
+    def close(self):
+        self.pool.close()
+
+
+@contextmanager
+def _client(tool_name, timeout):
+    """httpx.Client for one tool call of the active run. Cancelling the run
+    shuts its sockets down (and closes the client, for requests through an
+    environment proxy), and the blocked request raises PipelineCancelled."""
+    sockets = _RunSockets()
+    unregister = lambda: None  # noqa: E731
+    try:
+        with context.tracked("http", tool_name), \
+                httpx.Client(transport=_RunTransport(sockets), timeout=timeout) as http:
+            unregister = context.on_cancel(lambda: (sockets.shutdown(), http.close()))
+            yield http
+    except httpx.TransportError:
+        _raise_if_cancelled(tool_name)
+        raise
+    finally:
+        unregister()
+
+
+def _raise_if_cancelled(tool_name):
+    if cancelled():
+        from .pipeline import PipelineCancelled  # lazy — pipeline imports tools
+        raise PipelineCancelled(f"{tool_name} stopped (run cancelled)")
+
+
 def _call_custom(tool_name, params):
     """Execute a Starbridge custom tool via Datagen sync REST endpoint."""
     uuid = _UUIDS[tool_name]
     url = f"{DATAGEN_APPS_URL}/{uuid}"
     logger.info(f"  tool: {tool_name} (custom/{uuid[:8]})")
 
-    resp = httpx.post(
-        url,
-        headers={"x-api-key": DATAGEN_API_KEY, "Content-Type": "application/json"},
-        json={"input_vars": params},
-        timeout=300,
-    )
+    with _client(tool_name, clamp(300)) as http:
+        resp = http.post(
+            url,
+            headers={"x-api-key": DATAGEN_API_KEY, "Content-Type": "application/json"},
+            json={"input_vars": params},
+        )
+
+    return _tool_output(tool_name, resp.json())
 
-    data = resp.json()
 
+def _tool_output(tool_name, data, failed="failed"):
+    """Unwrap a Datagen response to the tool's output; raise on tool/API errors."""
     if not data.get("success", True):
         error_msg = data.get("error", {})
         if isinstance(error_msg, dict):
             error_msg = error_msg.get("message", error_msg)
-        raise RuntimeError(f"{tool_name} failed: {error_msg}")
+        raise RuntimeError(f"{tool_name} {failed}: {error_msg}")
 
     inner = data.get("data", data)
     out = inner.get("output_vars", inner)
@@ -78,84 +227,72 @@ def _call_custom(tool_name, params):
     return out
 
 
-def _call_custom_async(tool_name, params,
-                       poll_interval=ASYNC_POLL_INTERVAL,
-                       max_wait=ASYNC_DEFAULT_MAX_WAIT):
+def _call_custom_async(tool_name, params, poll_interval=None, max_wait=None):
     """Execute a Starbridge custom tool via async endpoint + polling.
 
     POST /apps/{uuid}/async → get run_id
     GET  /apps/run/{run_id}/output → poll until status != 202
+    poll_interval / max_wait default to ASYNC_POLL_INTERVAL / ASYNC_DEFAULT_MAX_WAIT.
+    Stops with PipelineCancelled as soon as the run's cancel token is set —
+    mid-request or mid-wait.
     """
+    poll_interval = poll_interval or cfg("ASYNC_POLL_INTERVAL")
+    max_wait = clamp(max_wait or cfg("ASYNC_DEFAULT_MAX_WAIT"))
     uuid = _UUIDS[tool_name]
     url = f"{DATAGEN_APPS_URL}/{uuid}/async"
     headers = {"x-api-key": DATAGEN_API_KEY, "Content-Type": "application/json"}
     logger.info(f"  tool: {tool_name} (async/{uuid[:8]})")
 
-    resp = httpx.post(url, headers=headers, json={"input_vars": params}, timeout=30)
-    data = resp.json()
+    with _client(tool_name, clamp(30)) as http:
+        resp = http.post(url, headers=headers, json={"input_vars": params})
+        run_id = _async_run_id(tool_name, resp.json())
 
-    inner_data = data.get("data", {})
-    run_id = (
-        data.get("run_id") or data.get("run_uuid")
-        or inner_data.get("run_id") or inner_data.get("run_uuid")
-    )
-    if not run_id:
-        raise RuntimeError(f"{tool_name} async submit failed: no run_id in {data}")
-
-    logger.info(f"  async run_id: {run_id}")
+        logger.info(f"  async run_id: {run_id}")
 
-    poll_url = f"https://api.datagen.dev/apps/run/{run_id}/output"
-    start = time.time()
+        poll_url = f"https://api.datagen.dev/apps/run/{run_id}/output"
+        start = time.time()
 
-    while time.time() - start < max_wait:
-        time.sleep(poll_interval)
-        poll_resp = httpx.get(poll_url, headers={"x-api-key": DATAGEN_API_KEY}, timeout=15)
+        while time.time() - start < max_wait:
+            if context.wait_cancelled(poll_interval):
+                _raise_if_cancelled(tool_name)
+            poll_resp = http.get(poll_url, headers={"x-api-key": DATAGEN_API_KEY}, timeout=clamp(15))
 
-        if poll_resp.status_code == 202:
-            continue
+            if poll_resp.status_code == 202:
+                continue
 
-        poll_data = poll_resp.json()
+            out = _tool_output(tool_name, poll_resp.json(), failed="async failed")
+            elapsed = time.time() - start
+            logger.info(f"  async complete in {elapsed:.1f}s")
+            return out
 
-        if not poll_data.get("success", True):
-            error_msg = poll_data.get("error", {})
-            if isinstance(error_msg, dict):
-                error_msg = error_msg.get("message", error_msg)
-            raise RuntimeError(f"{tool_name} async failed: {error_msg}")
-
-        inner = poll_data.get("data", poll_data)
-        out = inner.get("output_vars", inner)
-        if isinstance(out, dict) and "output" in out:
-            out = out["output"]
-        if isinstance(out, str):
-            try:
-                out = json.loads(out)
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        if isinstance(out, dict) and out.get("error"):
-            status = out.get("status_code", "unknown")
-            raise RuntimeError(f"{tool_name}: API error {status}")
+    raise TimeoutError(f"{tool_name} async polling timed out after {max_wait}s")
 
-        elapsed = time.time() - start
-        logger.info(f"  async complete in {elapsed:.1f}s")
-        return out
 
-    raise TimeoutError(f"{tool_name} async polling timed out after {max_wait}s")
+def _async_run_id(tool_name, data):
+    """run_id from an async-endpoint submit response."""
+    inner_data = data.get("data", {})
+    run_id = (
+        data.get("run_id") or data.get("run_uuid")
+        or inner_data.get("run_id") or inner_data.get("run_uuid")
+    )
+    if not run_id:
+        raise RuntimeError(f"{tool_name} async submit failed: no run_id in {data}")
+    return run_id
 
 
 # ── Starbridge Custom Tools ────────────────────────────────────────────────
 
-def opportunity_search(search_query, types=None, page_size=40, buyer_ids=None,
-                       sort_field=OPPORTUNITY_SORT_FIELD):
-    params = {"search_query": search_query, "page_size": page_size, "sort_field": sort_field}
+def _opportunity_params(search_query, types=None, page_size=40, buyer_ids=None, sort_field=None):
+    params = {"search_query": search_query, "page_size": page_size,
+              "sort_field": sort_field or cfg("OPPORTUNITY_SORT_FIELD")}
     if types:
         params["types"] = types
     if buyer_ids:
         params["buyer_ids"] = buyer_ids
-    return _call_custom("starbridge_opportunity_search", params)
+    return params
 
 
-def buyer_search(query=None, buyer_types=None, states=None, page_size=25):
+def _buyer_search_params(query=None, buyer_types=None, states=None, page_size=25):
     params = {"page_size": page_size}
     if query:
         params["query"] = query
@@ -163,7 +300,17 @@ def buyer_search(query=None, buyer_types=None, states=None, page_size=25):
         params["buyer_types"] = buyer_types
     if states:
         params["states"] = states
-    return _call_custom("starbridge_buyer_search", params)
+    return params
+
+
+def opportunity_search(search_query, types=None, page_size=40, buyer_ids=None, sort_field=None):
+    return _call_custom("starbridge_opportunity_search",
+                        _opportunity_params(search_query, types, page_size, buyer_ids, sort_field))
+
+
+def buyer_search(query=None, buyer_types=None, states=None, page_size=25):
+    return _call_custom("starbridge_buyer_search",
+                        _buyer_search_params(query, buyer_types, states, page_size))
 
 
 def buyer_profile(buyer_id):
@@ -174,17 +321,92 @@ def buyer_contacts(buyer_id, page_size=50):
     return _call_custom("starbridge_buyer_contacts", {"buyer_id": buyer_id, "page_size": page_size})
 
 
-def buyer_chat(buyer_id, question, max_wait=BUYER_CHAT_MAX_WAIT):
+def buyer_chat(buyer_id, question, max_wait=None):
     """AI chat about a buyer — uses async endpoint to avoid SSE timeout.
 
-    max_wait=60s gives most responses time to complete (typical: 10-30s)
-    while leaving margin within the Phase VI 90s timeout window.
+    max_wait (default BUYER_CHAT_MAX_WAIT, 60s) gives most responses time to
+    complete (typical: 10-30s) while leaving margin within the Phase VI 90s
+    timeout window.
     """
     return _call_custom_async(
         "starbridge_buyer_chat",
         {"buyer_id": buyer_id, "question": question},
-        poll_interval=ASYNC_POLL_INTERVAL,
-        max_wait=max_wait,
+        max_wait=max_wait or cfg("BUYER_CHAT_MAX_WAIT"),
+    )
+
+
+# ── asyncio variants (run_pipeline_async) ──────────────────────────────────
+# Same tools and response handling, on httpx.AsyncClient so a request or a
+# buyer_chat poll wait holds no thread. `_aio` rather than `_async`, which
+# already names Datagen's async-endpoint protocol above.
+
+async def _call_custom_aio(tool_name, params):
+    """_call_custom() as a coroutine."""
+    uuid = _UUIDS[tool_name]
+    logger.info(f"  tool: {tool_name} (custom/{uuid[:8]}, aio)")
+    with context.tracked("http", tool_name):
+        async with httpx.AsyncClient(timeout=clamp(300)) as http:
+            resp = await http.post(
+                f"{DATAGEN_APPS_URL}/{uuid}",
+                headers={"x-api-key": DATAGEN_API_KEY, "Content-Type": "application/json"},
+                json={"input_vars": params},
+            )
+    return _tool_output(tool_name, resp.json())
+
+
+async def _call_custom_async_aio(tool_name, params, poll_interval=None, max_wait=None):
+    """_call_custom_async() as a coroutine — polls with asyncio.sleep on one client."""
+    poll_interval = poll_interval or cfg("ASYNC_POLL_INTERVAL")
+    max_wait = clamp(max_wait or cfg("ASYNC_DEFAULT_MAX_WAIT"))
+    uuid = _UUIDS[tool_name]
+    logger.info(f"  tool: {tool_name} (async/{uuid[:8]}, aio)")
+    with context.tracked("http", tool_name):
+        async with httpx.AsyncClient() as http:
+            resp = await http.post(
+                f"{DATAGEN_APPS_URL}/{uuid}/async",
+                headers={"x-api-key": DATAGEN_API_KEY, "Content-Type": "application/json"},
+                json={"input_vars": params}, timeout=clamp(30),
+            )
+            run_id = _async_run_id(tool_name, resp.json())
+            logger.info(f"  async run_id: {run_id}")
+
+            poll_url = f"https://api.datagen.dev/apps/run/{run_id}/output"
+            start = time.time()
+            while time.time() - start < max_wait:
+                await asyncio.sleep(poll_interval)
+                poll_resp = await http.get(poll_url, headers={"x-api-key": DATAGEN_API_KEY}, timeout=clamp(15))
+                if poll_resp.status_code == 202:
+                    continue
+                out = _tool_output(tool_name, poll_resp.json(), failed="async failed")
+                logger.info(f"  async complete in {time.time() - start:.1f}s")
+                return out
+
+    raise TimeoutError(f"{tool_name} async polling timed out after {max_wait}s")
+
+
+async def opportunity_search_aio(search_query, types=None, page_size=40, buyer_ids=None, sort_field=None):
+    return await _call_custom_aio("starbridge_opportunity_search",
+                                  _opportunity_params(search_query, types, page_size, buyer_ids, sort_field))
+
+
+async def buyer_search_aio(query=None, buyer_types=None, states=None, page_size=25):
+    return await _call_custom_aio("starbridge_buyer_search",
+                                  _buyer_search_params(query, buyer_types, states, page_size))
+
+
+async def buyer_profile_aio(buyer_id):
+    return await _call_custom_aio("starbridge_buyer_profile", {"buyer_id": buyer_id})
+
+
+async def buyer_contacts_aio(buyer_id, page_size=50):
+    return await _call_custom_aio("starbridge_buyer_contacts", {"buyer_id": buyer_id, "page_size": page_size})
+
+
+async def buyer_chat_aio(buyer_id, question, max_wait=None):
+    return await _call_custom_async_aio(
+        "starbridge_buyer_chat",
+        {"buyer_id": buyer_id, "question": question},
+        max_wait=max_wait or cfg("BUYER_CHAT_MAX_WAIT"),
     )
 
 
@@ -199,7 +421,8 @@ def _call_notion(tool_name, params):
     last_err = None
     for attempt in range(NOTION_MAX_RETRIES):
         try:
-            return client.execute_tool(tool_name, params)
+            with context.tracked("mcp", tool_name):
+                return client.execute_tool(tool_name, params)
         except Exception as e:
             last_err = e
             err_str = str(e)
@@ -211,7 +434,8 @@ def _call_notion(tool_name, params):
             delay = NOTION_RETRY_DELAYS[attempt]
             logger.warning(f"  Notion {tool_name} attempt {attempt+1} failed ({type(e).__name__}), "
                            f"retrying in {delay}s...")
-            time.sleep(delay)
+            if context.wait_cancelled(delay):
+                _raise_if_cancelled(tool_name)
     raise last_err  # unreachable, but keeps type checker happy
 
 